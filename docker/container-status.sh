@@ -95,30 +95,10 @@ echo "FFmpeg 버전: $(ffmpeg -version 2>/dev/null | head -1 | cut -d' ' -f3 ||
 echo "Streamlink 버전: $(streamlink --version 2>/dev/null || echo "설치되지 않음")"
 echo
 
-# 8. 헬스체크 결과 (있는 경우)
+# 8. 헬스체크 결과 (녹화 프로세스의 /healthz)
 echo "🏥 헬스체크 결과:"
 echo "-------------------------------------------"
-HEALTH_FILE="/app/logs/health_status.json"
-if [ -f "$HEALTH_FILE" ]; then
-    echo "헬스체크 파일 업데이트 시간: $(stat -c %y "$HEALTH_FILE" 2>/dev/null)"
-    echo "상태 요약:"
-    python3 -c "
-import json
-try:
-    with open('$HEALTH_FILE', 'r') as f:
-        data = json.load(f)
-    print(f'전체 상태: {\"✅ 정상\" if data.get(\"healthy\") else \"❌ 문제 있음\"}')
-    for name, check in data.get('checks', {}).items():
-        status_icon = '✅' if check['status'] == 'pass' else '⚠️' if check['status'] == 'warn' else '❌'
-        print(f'{status_icon} {name}: {check.get(\"description\", \"\")}')
-except Exception as e:
-    print(f'헬스체크 파일 읽기 실패: {e}')
-    "
-else
-    echo "헬스체크 파일이 없습니다."
-    # 직접 헬스체크 실행
-    python3 /app/healthcheck.py 2>/dev/null || echo "헬스체크 실행 실패"
-fi
+python3 /app/healthcheck.py 2>/dev/null || echo "헬스체크 실패 (녹화 프로세스의 /healthz 응답 없음 또는 실패 항목 있음)"
 
 echo
 echo "==========================================="
@@ -0,0 +1,56 @@
+"""
+방송 시작 예측 폴링 오프라인 평가 스크립트
+
+방송 시작 기록(golive_history.jsonl)을 시간순으로 재생하면서, 각 방송 시작 직전까지의
+기록으로 만든 모델의 예상 감지 지연과 하루 요청 수를 고정 간격 폴링과 비교합니다.
+
+    uv run python evaluate_golive.py
+    uv run python evaluate_golive.py --history ./logs/golive_history.jsonl --interval 180
+"""
+
+import argparse
+
+from src.chzzk_recorder.monitor.golive_model import GoLivePredictor, evaluate_history
+from src.config import config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="방송 시작 예측 폴링 오프라인 평가")
+    parser.add_argument("--history", default=str(config.prediction.history_path), help="방송 시작 기록 파일")
+    parser.add_argument("--interval", type=float, default=config.recording.polling_interval,
+                        help="기본 폴링 간격 (초, 요청 수 예산 기준)")
+    parser.add_argument("--min-events", type=int, default=config.prediction.min_events,
+                        help="학습에 쓰는 최소 방송 시작 기록 수")
+    args = parser.parse_args()
+
+    predictor = GoLivePredictor(args.history, min_events=args.min_events)
+    options = dict(min_interval=config.prediction.min_interval,
+                   max_interval=config.prediction.max_interval,
+                   half_life_days=config.prediction.half_life_days)
+
+    results = [evaluate_history(channel_id, starts, args.interval, args.min_events, **options)
+               for channel_id, starts in sorted(predictor.history.items())]
+    results = [result for result in results if result]
+    if not results:
+        print(f"평가할 기록이 없습니다 (채널별 방송 시작 {args.min_events + 1}건 이상 필요): {args.history}")
+        return
+
+    print(f"기본 간격 {args.interval:g}초 기준 (지연: 방송 시작부터 감지까지 평균, 초)")
+    print(f"{'채널':34s} {'기록':>5s} {'평가':>5s} {'고정 지연':>9s} {'예측 지연':>9s} "
+          f"{'고정 요청/일':>11s} {'예측 요청/일':>11s}")
+    for result in results:
+        print(f"{result.channel_id:34s} {result.events:5d} {result.evaluated:5d} "
+              f"{result.baseline_delay:9.1f} {result.model_delay:9.1f} "
+              f"{result.baseline_requests_per_day:11.0f} {result.model_requests_per_day:11.0f}")
+
+    evaluated = sum(result.evaluated for result in results)
+    baseline = sum(result.baseline_delay * result.evaluated for result in results) / evaluated
+    model = sum(result.model_delay * result.evaluated for result in results) / evaluated
+    print(f"\n전체 {evaluated}건: 평균 감지 지연 {baseline:.1f}초 → {model:.1f}초 "
+          f"({(1 - model / baseline) * 100:.0f}% 감소), 채널당 요청/일 "
+          f"{sum(r.baseline_requests_per_day for r in results) / len(results):.0f} → "
+          f"{sum(r.model_requests_per_day for r in results) / len(results):.0f}")
+
+
+if __name__ == "__main__":
+    main()
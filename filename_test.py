@@ -2,8 +2,17 @@
 파일명 생성 테스트 스크립트
 """
 
+import re
+import tempfile
+import time
+import unicodedata
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
 from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
 from src.config import config
+from src.filename_template import compile_template, FilenameTemplateError
 
 
 def test_filename_generation():
@@ -78,11 +87,141 @@ def test_filename_generation():
     print(f"   생성된 파일명: {filename4}")
     print()
     
+    # 테스트 케이스 5: 긴 한글 제목 (UTF-8 바이트 기준 길이 제한)
+    stream_info_long_title = StreamInfo(
+        channel_id="test_channel",
+        status=LiveStatus.ONLINE,
+        title="아주 긴 방송 제목 " * 30,
+        category="리그 오브 레전드",
+        streamer_name="테스트스트리머"
+    )
+    
+    filename5 = config.recording.generate_filename(stream_info_long_title)
+    print("📁 긴 한글 제목:")
+    print(f"   생성된 파일명: {filename5}")
+    print(f"   바이트 수: {len(filename5.encode('utf-8'))}")
+    print()
+    
     # 설정 정보 출력
     print("=== 현재 설정 ===")
     print(f"파일명 형식: {config.recording.filename_format}")
     print(f"날짜 형식: {config.recording.date_format}")
 
 
+def test_filename_template():
+    """템플릿 엔진 동작 확인"""
+    print("\n=== 파일명 템플릿 엔진 테스트 ===\n")
+    
+    now = datetime(2025, 1, 2, 3, 4, 5)
+    info = StreamInfo(
+        channel_id="abc123",
+        status=LiveStatus.ONLINE,
+        title="  오늘도   솔랭__도전!  ",
+        category="리그 오브 레전드",
+        streamer_name="테스트/스트리머"
+    )
+    no_category = replace(info, category=None)
+    
+    # 기본 형식: 카테고리 유무
+    template = compile_template("{date}_{category}_{title}")
+    assert template.render(info, now=now) == "20250102_030405_리그_오브_레전드_오늘도_솔랭_도전!.mp4"
+    assert template.render(no_category, now=now) == "20250102_030405_오늘도_솔랭_도전!.mp4"
+    
+    # 같은 설정이면 재파싱하지 않음
+    assert compile_template("{date}_{category}_{title}") is template
+    
+    # 조건부 구간
+    template = compile_template("{streamer}[ ({category})] {title}")
+    assert template.render(info, now=now) == "테스트스트리머 (리그_오브_레전드) 오늘도_솔랭_도전!.mp4"
+    assert template.render(no_category, now=now) == "테스트스트리머 오늘도_솔랭_도전!.mp4"
+    
+    # 255바이트 제한 (한글 3바이트, 글자 중간에서 자르지 않음)
+    long_info = replace(info, title="가" * 200)
+    filename = compile_template("{date}_{category}_{title}").render(long_info, now=now)
+    assert len(filename.encode("utf-8")) <= 255 - 4, filename
+    assert filename.endswith("가.mp4") and "리그_오브_레전드" in filename
+    
+    # 중복 회피 접미사도 제한 안에 들어감
+    filename = compile_template("{date}_{title}").render(long_info, now=now, index=12)
+    assert filename.endswith("_12.mp4") and len(filename.encode("utf-8")) <= 255
+    
+    # 정규화: NFD로 들어온 한글도 NFC로
+    nfd_info = replace(info, title=unicodedata.normalize("NFD", "한글"), category=None)
+    assert compile_template("{title}").render(nfd_info, now=now) == "한글.mp4"
+    
+    # directory 지정 시 기존 파일과 겹치지 않음
+    with tempfile.TemporaryDirectory() as tmp:
+        first = config.recording.generate_filename(info, now=now, directory=Path(tmp))
+        (Path(tmp) / first).touch()
+        second = config.recording.generate_filename(info, now=now, directory=Path(tmp))
+        (Path(tmp) / second).touch()
+        third = config.recording.generate_filename(info, now=now, directory=Path(tmp))
+        assert second == first.replace(".mp4", "_1.mp4") and third == first.replace(".mp4", "_2.mp4")
+    
+    # 잘못된 템플릿
+    for bad in ["{date}_{unknown}", "{date}[_{title}", "{date}]", "[[{title}]]"]:
+        try:
+            compile_template(bad)
+        except FilenameTemplateError:
+            continue
+        raise AssertionError(f"잘못된 템플릿이 허용되었습니다: {bad}")
+    
+    print("✅ 템플릿 엔진 테스트 통과")
+
+
+def _legacy_generate_filename(stream_info, now: datetime) -> str:
+    """이전 구현 (str.replace + format + 정규식, 비교용)"""
+    def safe(text):
+        safe = re.sub(r'[<>:"/\\|?*]', '', text)
+        safe = re.sub(r'\s+', '_', safe.strip())
+        safe = re.sub(r'_+', '_', safe)
+        return safe[:50] or "unknown"
+    
+    variables = {
+        "date": now.strftime("%Y%m%d_%H%M%S"),
+        "time": now.strftime("%H%M%S"),
+        "streamer": safe(stream_info.streamer_name or "unknown"),
+        "title": safe(stream_info.title or "untitled"),
+    }
+    filename = "{date}_{category}_{title}"
+    if stream_info.category and stream_info.category.strip():
+        variables["category"] = safe(stream_info.category)
+    else:
+        filename = filename.replace("{category}_", "").replace("_{category}", "").replace("{category}", "")
+    filename = re.sub(r'_+', '_', filename.format(**variables)).strip('_')
+    return f"{filename}.mp4"
+
+
+def bench_filename_template(count: int = 100_000):
+    """아카이브 일괄 이름 변경 규모의 파일명 생성 속도 비교"""
+    print("\n=== 파일명 생성 벤치마크 ===\n")
+    
+    now = datetime(2025, 1, 2, 3, 4, 5)
+    infos = [
+        StreamInfo(
+            channel_id=f"ch{n}",
+            status=LiveStatus.ONLINE,
+            title=f"오늘도 솔랭 도전! <다이아> 가자 #{n}",
+            category="리그 오브 레전드" if n % 3 else None,
+            streamer_name="테스트스트리머"
+        )
+        for n in range(1000)
+    ]
+    template = compile_template("{date}_{category}_{title}")
+    
+    for name, render in [
+        ("이전 구현", lambda info: _legacy_generate_filename(info, now)),
+        ("템플릿 엔진", lambda info: template.render(info, now=now)),
+        ("generate_filename", lambda info: config.recording.generate_filename(info, now=now)),
+    ]:
+        begin = time.perf_counter()
+        for n in range(count):
+            render(infos[n % len(infos)])
+        elapsed = time.perf_counter() - begin
+        print(f"   {name:<18} {count / elapsed:>10,.0f}개/초 ({elapsed * 1e6 / count:.2f}µs/개)")
+
+
 if __name__ == "__main__":
-    test_filename_generation() 
\ No newline at end of file
+    test_filename_generation()
+    test_filename_template()
+    bench_filename_template()
@@ -5,59 +5,43 @@
 
 import asyncio
 import logging
-import logging.handlers
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
 from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder, AutoRecorderError
+from src.chzzk_recorder.channel_manager import ChannelManager
+from src.chzzk_recorder.notification import NotificationDispatcher, NotificationEvent
+from src.chzzk_recorder.storage import close_tiering_movers
+from src.chzzk_recorder.monitor import close_http_pools, http_pool_stats
+from src.chzzk_recorder.upload import close_upload_managers
+from src.chzzk_recorder.diagnostics import LoopMonitor
+from src.chzzk_recorder.log_pipeline import LogPipeline, configure_logging
+from src.chzzk_recorder.shutdown import ShutdownCoordinator
+from src.chzzk_recorder.handoff import HandoffServer, HandoffError, take_over
+from src.chzzk_recorder.health import HealthMonitor
+from src.chzzk_recorder.web import DashboardServer
 from src.chzzk_recorder import RecordingInfo, LiveStatus, StreamInfo
 from src.config import config
 
 
-def setup_logging():
-    """로깅 설정"""
-    # 로그 디렉터리 생성
-    log_dir = config.logging.file_path.parent
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 로깅 설정
-    handlers = []
-    
-    # 콘솔 핸들러
-    if config.logging.console_output:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(config.logging.level)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
-        handlers.append(console_handler)
-    
-    # 파일 핸들러
-    file_handler = logging.handlers.RotatingFileHandler(
-        config.logging.file_path,
-        maxBytes=config.logging.max_file_size_mb * 1024 * 1024,
-        backupCount=config.logging.backup_count,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(config.logging.level)
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
-    handlers.append(file_handler)
-    
-    # 루트 로거 설정
-    logging.basicConfig(
-        level=config.logging.level,
-        handlers=handlers,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+# 알림 디스패처 (main에서 생성, 콜백에서는 notify만 호출하므로 대기하지 않음)
+notifier: NotificationDispatcher = None
+
+
+def notify(kind: str, channel_id: str, message: str, title: str = None):
+    """알림 이벤트 전달"""
+    if notifier:
+        notifier.notify(NotificationEvent(kind=kind, channel_id=channel_id, message=message, title=title))
 
 
-async def on_recording_start(recording_info: RecordingInfo):
+def setup_logging() -> LogPipeline:
+    """로깅 설정 (파일/콘솔 출력은 큐 리스너 스레드에서)"""
+    return configure_logging(config.logging)
+
+
+def on_recording_start(recording_info: RecordingInfo):
     """녹화 시작 콜백"""
     logger = logging.getLogger(__name__)
     logger.info("🎬 자동 녹화 시작!")
@@ -65,9 +49,14 @@ async def on_recording_start(recording_info: RecordingInfo):
     logger.info(f"📺 제목: {recording_info.stream_info.title}")
     logger.info(f"🏷️  카테고리: {recording_info.stream_info.category or '없음'}")
     logger.info(f"👤 스트리머: {recording_info.stream_info.streamer_name}")
+    
+    stream_info = recording_info.stream_info
+    notify("start", stream_info.streamer_name or stream_info.channel_id,
+           f"{stream_info.title} ({stream_info.category or '카테고리 없음'})",
+           title=stream_info.title)
 
 
-async def on_recording_stop(recording_info: RecordingInfo):
+def on_recording_stop(recording_info: RecordingInfo):
     """녹화 종료 콜백"""
     logger = logging.getLogger(__name__)
     duration_str = str(recording_info.duration) if recording_info.duration else "알 수 없음"
@@ -77,9 +66,14 @@ async def on_recording_stop(recording_info: RecordingInfo):
     logger.info(f"📁 파일: {recording_info.file_path.name}")
     logger.info(f"📊 크기: {size_mb:.1f}MB")
     logger.info(f"⏱️  시간: {duration_str}")
+    
+    stream_info = recording_info.stream_info
+    notify("stop", stream_info.streamer_name or stream_info.channel_id,
+           f"{recording_info.file_path.name} ({size_mb:.1f}MB, {duration_str})",
+           title=recording_info.file_path.name)
 
 
-async def on_status_change(old_status: LiveStatus, new_status: LiveStatus, stream_info: StreamInfo):
+def on_status_change(old_status: LiveStatus, new_status: LiveStatus, stream_info: StreamInfo):
     """방송 상태 변경 콜백"""
     logger = logging.getLogger(__name__)
     logger.info(f"🔄 방송 상태 변경: {old_status.value} → {new_status.value}")
@@ -89,10 +83,11 @@ async def on_status_change(old_status: LiveStatus, new_status: LiveStatus, strea
         logger.info(f"👀 시청자: {stream_info.viewer_count}명")
 
 
-async def on_error(error: Exception):
+def on_error(error: Exception):
     """오류 발생 콜백"""
     logger = logging.getLogger(__name__)
     logger.error(f"❌ 시스템 오류: {error}")
+    notify("error", os.getenv('CHZZK_CHANNEL_ID') or "system", str(error))
 
 
 def load_environment():
@@ -102,8 +97,19 @@ def load_environment():
     # .env 파일 로드
     load_dotenv()
     
-    # 필수 환경변수 확인
-    required_vars = ['CHZZK_CHANNEL_ID', 'NID_AUT', 'NID_SES']
+    # 알림 설정 (선택사항)
+    config.notification.discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL') or None
+    config.notification.telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN') or None
+    config.notification.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID') or None
+    
+    # 오브젝트 스토리지 인증 정보 (선택사항)
+    config.upload.access_key = os.getenv('S3_ACCESS_KEY_ID') or config.upload.access_key
+    config.upload.secret_key = os.getenv('S3_SECRET_ACCESS_KEY') or config.upload.secret_key
+    
+    # 필수 환경변수 확인 (채널 목록 파일이 있으면 CHZZK_CHANNEL_ID는 선택)
+    required_vars = ['NID_AUT', 'NID_SES']
+    if not config.channels.file_path.exists():
+        required_vars.insert(0, 'CHZZK_CHANNEL_ID')
     missing_vars = []
     
     for var in required_vars:
@@ -135,8 +141,16 @@ def print_startup_info(env_vars: dict):
     logger.info("=" * 60)
     logger.info("🚀 치지직 자동 녹화 시스템 시작")
     logger.info("=" * 60)
-    logger.info(f"📺 모니터링 채널: {env_vars['channel_id']}")
+    if env_vars['channel_id']:
+        logger.info(f"📺 모니터링 채널: {env_vars['channel_id']}")
+    else:
+        logger.info(f"📺 채널 목록 파일: {config.channels.file_path} (변경 시 자동 반영)")
     logger.info(f"📁 녹화 저장 경로: {config.recording.recording_path}")
+    if config.storage.archive_path:
+        logger.info(f"📦 아카이브 경로: {config.storage.archive_path} "
+                    f"(최대 {config.storage.archive_bandwidth_mb:g}MB/s)")
+    if config.upload.enabled:
+        logger.info(f"☁️ 업로드 대상: {config.upload.endpoint_url}/{config.upload.bucket}/{config.upload.key_prefix}")
     logger.info(f"🎬 녹화 품질: {config.recording.quality}")
     logger.info(f"⏰ 폴링 간격: {config.recording.polling_interval}초")
     logger.info(f"🔧 FFmpeg 경로: {config.system.ffmpeg_path}")
@@ -153,11 +167,86 @@ def print_startup_info(env_vars: dict):
     logger.info("=" * 60)
 
 
+async def start_handoff(shutdown: ShutdownCoordinator) -> tuple[list, HandoffServer]:
+    """
+    이전 버전 프로세스의 녹화를 넘겨받고, 다음 버전에 넘겨줄 소켓 열기 (무중단 업그레이드)
+    
+    Returns:
+        (넘겨받은 녹화 목록, 핸드오프 서버)
+    """
+    logger = logging.getLogger(__name__)
+    if not config.system.handoff_socket:
+        return [], None
+    
+    try:
+        adopted = await take_over(config.system.handoff_socket, config.system.handoff_timeout)
+    except HandoffError as e:
+        # 이전 프로세스가 녹화를 계속하므로 같은 채널을 두 번 녹화하지 않도록 시작하지 않음
+        logger.error(f"❌ 이전 프로세스가 실행 중이지만 녹화를 넘겨받지 못했습니다: {e}")
+        sys.exit(1)
+    
+    handoff = HandoffServer(config.system.handoff_socket, shutdown, config.system.handoff_timeout)
+    await handoff.start()
+    return adopted, handoff
+
+
+def start_loop_monitor() -> LoopMonitor:
+    """이벤트 루프 지연 감시 시작 (진단 설정이 켜진 경우)"""
+    if not config.diagnostics.enabled:
+        return None
+    
+    diagnostics = config.diagnostics
+    monitor = LoopMonitor(
+        interval=diagnostics.lag_interval,
+        lag_threshold=diagnostics.lag_threshold_ms / 1000,
+        stall_threshold=diagnostics.stall_threshold_ms / 1000,
+        stall_log_path=diagnostics.stall_log_path,
+        asyncio_debug=diagnostics.asyncio_debug
+    )
+    monitor.start()
+    return monitor
+
+
+async def start_dashboard(provider, shutdown: ShutdownCoordinator, loop_monitor: LoopMonitor = None,
+                          metrics=None) -> DashboardServer:
+    """웹 대시보드와 헬스체크 시작 (실패해도 녹화는 계속)"""
+    logger = logging.getLogger(__name__)
+    if not config.web.enabled:
+        return None
+    
+    dashboard = DashboardServer(
+        provider,
+        recording_path=config.recording.recording_path,
+        host=config.web.host,
+        port=config.web.port,
+        update_interval=config.web.update_interval,
+        loop_monitor=loop_monitor,
+        max_profile_seconds=config.diagnostics.max_profile_seconds,
+        metrics=metrics or (lambda: {"http": http_pool_stats()}),
+        health=HealthMonitor(config.health, config.recording.recording_path, shutdown)
+    )
+    try:
+        await dashboard.start()
+    except OSError as e:
+        logger.error(f"대시보드 시작 실패: {e}")
+        return None
+    return dashboard
+
+
 async def main():
     """메인 함수"""
+    global notifier
+    
     # 로깅 설정
-    setup_logging()
+    log_pipeline = setup_logging()
     logger = logging.getLogger(__name__)
+    dashboard = None
+    loop_monitor = None
+    handoff = None
+    
+    # 종료 신호 시 모든 녹화를 동시에 마무리 (docker stop 유예 시간 안에)
+    shutdown = ShutdownCoordinator(config.system.shutdown_timeout, config.system.shutdown_report_path)
+    shutdown.add_flush(lambda: asyncio.to_thread(log_pipeline.flush))
     
     try:
         # 환경변수 로드
@@ -166,6 +255,39 @@ async def main():
         # 시작 정보 출력
         print_startup_info(env_vars)
         
+        # 실행 중인 이전 버전이 있으면 녹화를 넘겨받음 (대시보드 포트도 이전 프로세스 종료 후 사용)
+        adopted, handoff = await start_handoff(shutdown)
+        
+        # 이벤트 루프 감시 (선택사항)
+        loop_monitor = start_loop_monitor()
+        
+        # 알림 디스패처 시작
+        notifier = NotificationDispatcher(config.notification)
+        notifier.start()
+        if notifier.is_enabled:
+            logger.info(f"🔔 알림 대상: {', '.join(t.name for t in notifier.targets)}")
+        
+        # 채널 목록 파일이 있으면 다중 채널 모드 (재시작 없이 채널/설정 변경 반영)
+        if config.channels.file_path.exists():
+            manager = ChannelManager(
+                nid_aut=env_vars['nid_aut'],
+                nid_ses=env_vars['nid_ses'],
+                config=config
+            )
+            manager.set_callbacks(
+                on_recording_start=on_recording_start,
+                on_recording_stop=on_recording_stop,
+                on_status_change=on_status_change,
+                on_error=on_error
+            )
+            dashboard = await start_dashboard(
+                lambda: manager.get_status_summary()["channels"], shutdown, loop_monitor,
+                metrics=lambda: {"http": http_pool_stats(), **manager.metrics()}
+            )
+            manager.adopt(adopted)
+            await manager.run(shutdown=shutdown)
+            return
+        
         # 자동 녹화 시스템 초기화
         auto_recorder = ChzzkAutoRecorder(
             channel_id=env_vars['channel_id'],
@@ -181,6 +303,15 @@ async def main():
             on_status_change=on_status_change,
             on_error=on_error
         )
+        for detached in adopted:
+            if detached.channel_id == env_vars['channel_id']:
+                auto_recorder.queue_adoption(detached)
+            else:
+                logger.warning(f"다른 채널의 넘겨받은 녹화 종료: {detached.file_name}")
+                detached.abandon()
+        
+        # 대시보드 (재시작 시 새 인스턴스를 가리키도록 변수를 참조)
+        dashboard = await start_dashboard(lambda: [auto_recorder.get_status_summary()], shutdown, loop_monitor)
         
         # 시스템 시작
         logger.info("🔄 시스템 시작 중...")
@@ -191,7 +322,7 @@ async def main():
         
         while restart_count < max_restart_count:
             try:
-                await auto_recorder.start()
+                await auto_recorder.start(shutdown=shutdown)
                 break  # 정상 종료시 루프 탈출
                 
             except KeyboardInterrupt:
@@ -239,7 +370,23 @@ async def main():
         logger.exception("상세한 오류 정보:")
         sys.exit(1)
     finally:
+        # 녹화 마무리가 끝난 뒤 나머지 정리
+        if shutdown.requested:
+            await shutdown.wait()
+        if handoff:
+            await handoff.close()
+        if dashboard:
+            await dashboard.close()
+        if notifier:
+            await notifier.close()
+        await close_http_pools()
+        await close_tiering_movers()
+        await close_upload_managers()
+        if loop_monitor:
+            await loop_monitor.close()
         logger.info("🏁 시스템 종료")
+        # 큐에 남은 로그 출력
+        log_pipeline.close()
 
 
 if __name__ == "__main__":
@@ -4,11 +4,16 @@
 
 from .monitor import LiveMonitor, LiveStatus, StreamInfo
 from .recorder import StreamRecorder, RecordingStatus, RecordingInfo
+from .chat import ChatRecorder, ChatRecordingInfo
 from .auto_recorder import ChzzkAutoRecorder, AutoRecorderError
+from .channel_manager import ChannelManager
+from .config_watcher import ConfigWatcher, ChannelsDiff, ChannelsState
 
 __version__ = "0.1.0"
 __all__ = [
     "LiveMonitor", "LiveStatus", "StreamInfo",
     "StreamRecorder", "RecordingStatus", "RecordingInfo",
-    "ChzzkAutoRecorder", "AutoRecorderError"
+    "ChatRecorder", "ChatRecordingInfo",
+    "ChzzkAutoRecorder", "AutoRecorderError",
+    "ChannelManager", "ConfigWatcher", "ChannelsDiff", "ChannelsState"
 ] 
\ No newline at end of file
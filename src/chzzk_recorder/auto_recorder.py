@@ -4,14 +4,28 @@
 
 import asyncio
 import logging
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Callable
-import signal
-import sys
+import time
 
-from .monitor import LiveMonitor, StreamInfo, LiveStatus
+from .monitor import LiveMonitor, StreamInfo, LiveStatus, ChannelState, HttpPool, get_http_pool
+from .monitor.scheduler import PollScheduler
+from .monitor.golive_model import GoLivePredictor, get_golive_predictor
+from .shutdown import ShutdownCoordinator
 from .recorder import StreamRecorder, RecordingInfo, RecordingStatus
+from .recorder.stream_recorder import StreamRecorderError, invoke_callback
+from .recorder.adoption import DetachedRecording
+from .recorder.ffmpeg_probe import get_ffmpeg_capabilities
+from .recorder.chapters import category_boundaries, split_at_boundaries
+from .recorder.integrity import build_manifest, manifest_path
+from .recorder.continuity import gaps_path
+from .chat import ChatRecorder
+from .storage import TieringMover, get_tiering_mover
+from .storage.tiering import related_files
+from .upload import UploadManager, get_upload_manager
+from .log_pipeline import bind_channel
 from ..config import Config
 
 logger = logging.getLogger(__name__)
@@ -22,6 +36,27 @@ class AutoRecorderError(Exception):
     pass
 
 
+def _pool_options(config: Config) -> dict:
+    return dict(
+        http2=config.http.http2,
+        max_connections=config.http.max_connections,
+        max_keepalive_connections=config.http.max_keepalive_connections,
+        keepalive_expiry=config.http.keepalive_expiry,
+        dns_ttl=config.http.dns_ttl,
+        timeout=config.system.request_timeout
+    )
+
+
+def get_api_pool(config: Config, nid_aut: str, nid_ses: str) -> HttpPool:
+    """치지직 API 공유 연결 풀 (같은 쿠키를 쓰는 모든 채널이 공유, main에서 close_http_pools로 종료)"""
+    return get_http_pool(nid_aut, nid_ses, **_pool_options(config))
+
+
+def get_media_pool(config: Config) -> HttpPool:
+    """HLS 플레이리스트 확인용 공유 연결 풀 (API 쿠키를 보내지 않음, 모든 녹화가 공유)"""
+    return get_http_pool(None, None, follow_redirects=True, **_pool_options(config))
+
+
 class ChzzkAutoRecorder:
     """치지직 자동 녹화 시스템"""
     
@@ -29,7 +64,10 @@ class ChzzkAutoRecorder:
                  channel_id: str,
                  nid_aut: str,
                  nid_ses: str,
-                 config: Config):
+                 config: Config,
+                 polling_interval: Optional[int] = None,
+                 quality: Optional[str] = None,
+                 state: Optional[ChannelState] = None):
         """
         초기화
         
@@ -38,24 +76,75 @@ class ChzzkAutoRecorder:
             nid_aut: 네이버 인증 쿠키
             nid_ses: 네이버 세션 쿠키
             config: 설정 객체
+            polling_interval: 채널별 폴링 간격 (None이면 config 값 사용)
+            quality: 채널별 녹화 품질 (None이면 config 값 사용)
+            state: 채널 상태 레코드 (ChannelManager의 상태 테이블 항목, None이면 새로 생성)
         """
         self.channel_id = channel_id
         self.config = config
+        self._polling_interval = polling_interval
+        self._quality = quality
         
         # 모니터링 및 녹화 컴포넌트
-        self.monitor = LiveMonitor(channel_id, nid_aut, nid_ses)
+        self.http_pool = get_api_pool(config, nid_aut, nid_ses)
+        self.monitor = LiveMonitor(channel_id, nid_aut, nid_ses, decoder=config.system.json_decoder,
+                                   client=self.http_pool.client)
+        # 방송 시작 기록으로 방송 중이 아닐 때의 폴링 간격 예측 (채널들이 기록 파일 공유)
+        self.predictor: Optional[GoLivePredictor] = None
+        if config.prediction.enabled:
+            self.predictor = get_golive_predictor(
+                config.prediction.history_path,
+                min_events=config.prediction.min_events,
+                min_interval=config.prediction.min_interval,
+                max_interval=config.prediction.max_interval,
+                half_life_days=config.prediction.half_life_days
+            )
         self.recorder = StreamRecorder(
             output_directory=config.recording.recording_path,
             ffmpeg_path=config.system.ffmpeg_path,
-            quality=config.recording.quality,
-            timeout=config.system.request_timeout
+            quality=quality or config.recording.quality,
+            timeout=config.system.request_timeout,
+            write_chapters=config.recording.write_chapters,
+            # "auto"는 prepare()에서 FFmpeg 기능을 확인한 뒤 결정
+            pipe_output=config.recording.output_mode == "pipe",
+            expected_bitrate_kbps=config.recording.expected_bitrate_kbps,
+            write_buffer_size=config.recording.write_buffer_mb * 1024 * 1024,
+            write_manifest=config.recording.write_manifest,
+            track_continuity=config.recording.track_continuity,
+            reconnect_gap_seconds=config.recording.reconnect_gap_seconds,
+            http_client=get_media_pool(config).client
         )
+        self.chat_recorder = ChatRecorder(self.monitor)
+        self.archiver: Optional[TieringMover] = None
+        if config.storage.archive_path:
+            self.archiver = get_tiering_mover(
+                config.recording.recording_path,
+                config.storage.archive_path,
+                bandwidth_bytes=config.storage.archive_bandwidth_mb * 1024 * 1024,
+                verify=config.storage.verify_archive
+            )
+        self.uploader: Optional[UploadManager] = None
+        if config.upload.enabled:
+            self.uploader = get_upload_manager(config.upload, config.recording.recording_path)
+            if self.archiver:
+                # 아카이브를 쓰면 이동이 끝난 파일을 올림
+                self.archiver.add_listener(self.uploader.enqueue_archived)
         
         # 상태 관리
         self._running = False
-        self._last_status = LiveStatus.UNKNOWN
+        self.state = state or ChannelState(channel_id)
         self._current_recording: Optional[RecordingInfo] = None
+        # 방송 중일 때만 보관 (방송 중이 아닌 채널은 state만 유지)
+        self._last_stream_info: Optional[StreamInfo] = None
         self._monitor_task: Optional[asyncio.Task] = None
+        self._background_tasks: set[asyncio.Task] = set()
+        self._retiring = False
+        self._wake_event = asyncio.Event()
+        self._scheduler: Optional[PollScheduler] = None
+        # 이전 프로세스에서 넘겨받아 prepare()에서 이어서 맡을 녹화
+        self._adoption: Optional[DetachedRecording] = None
+        # 방송이 끝난 시각 (재시작 대비 짧은 간격으로 확인하는 동안)
+        self._offline_since: Optional[float] = None
         
         # 콜백 함수들
         self._on_recording_start: Optional[Callable[[RecordingInfo], None]] = None
@@ -83,8 +172,68 @@ class ChzzkAutoRecorder:
         self._on_status_change = on_status_change
         self._on_error = on_error
     
-    async def start(self):
-        """자동 녹화 시스템 시작"""
+    @property
+    def polling_interval(self) -> int:
+        """현재 적용 중인 폴링 간격 (초)"""
+        return self._polling_interval or self.config.recording.polling_interval
+    
+    @property
+    def quality(self) -> str:
+        """다음 녹화에 적용될 품질"""
+        return self._quality or self.config.recording.quality
+    
+    def update_settings(self, polling_interval: Optional[int] = None, quality: Optional[str] = None):
+        """
+        실행 중 채널 설정 변경 (진행 중인 녹화에는 영향 없음)
+        
+        폴링 간격은 현재 대기 중인 sleep을 깨워 즉시 반영하고,
+        품질은 다음 녹화부터 적용됩니다.
+        """
+        self._polling_interval = polling_interval
+        self._quality = quality
+        self.recorder.quality = self.quality
+        if self._scheduler:
+            self._scheduler.set_interval(self.channel_id, self.polling_interval)
+        else:
+            self._wake_event.set()
+        logger.info(f"⚙️  채널 설정 변경: {self.channel_id} "
+                    f"(폴링 간격: {self.polling_interval}초, 품질: {self.quality})")
+    
+    async def retire(self):
+        """
+        채널 모니터링 종료 요청
+        
+        녹화 중이면 방송이 끝나 녹화가 정상 종료된 뒤에 멈추고,
+        아니면 즉시 중지합니다.
+        """
+        if self._current_recording and self._current_recording.is_active:
+            logger.info(f"📤 녹화 종료 후 채널 모니터링을 중지합니다: {self.channel_id}")
+            self._retiring = True
+            return
+        if self._scheduler:
+            # 진행 중인 폴링이 끝난 뒤 중지
+            await self._scheduler.remove(self.channel_id)
+        await self.stop()
+    
+    def cancel_retire(self):
+        """retire() 요청 취소 (녹화 종료 후에도 계속 모니터링)"""
+        self._retiring = False
+    
+    async def _sleep_until_next_poll(self, seconds: float):
+        """다음 폴링까지 대기 (설정 변경 시 즉시 깨어남)"""
+        self._wake_event.clear()
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def prepare(self):
+        """
+        폴링 전 준비 (디렉터리 생성, 중단된 아카이브 이동/업로드 재개, FFmpeg 기능 확인과 출력 방식 결정)
+        
+        Raises:
+            AutoRecorderError: 이미 실행 중이거나 FFmpeg가 없거나 녹화에 필요한 기능이 없는 경우
+        """
         if self._running:
             raise AutoRecorderError("이미 실행 중입니다")
         
@@ -93,16 +242,106 @@ class ChzzkAutoRecorder:
         # 필요한 디렉터리 생성
         self.config.create_directories()
         
-        # FFmpeg 설치 확인
-        if not StreamRecorder.check_ffmpeg(self.config.system.ffmpeg_path):
+        # 중단된 아카이브 이동/업로드 재개
+        if self.archiver:
+            self.archiver.start()
+        if self.uploader:
+            self.uploader.start()
+        
+        # FFmpeg 기능 확인 (실행 파일마다 한 번, 결과는 파일에 캐시)
+        capabilities = await get_ffmpeg_capabilities(self.config.system.ffmpeg_path,
+                                                     self.config.system.ffmpeg_probe_cache)
+        missing = capabilities.missing() if capabilities else []
+        if not capabilities or missing:
+            if self._adoption:
+                self._adoption.abandon()
+                self._adoption = None
+            if missing:
+                raise AutoRecorderError(f"FFmpeg에 녹화에 필요한 기능이 없습니다: {', '.join(missing)}")
             raise AutoRecorderError(f"FFmpeg를 찾을 수 없습니다: {self.config.system.ffmpeg_path}")
         
+        # 출력 방식 결정 (넘겨받은 녹화는 녹화 중인 방식을 그대로 이어감)
+        output_mode = capabilities.output_mode(self.config.recording.output_mode)
+        if self.config.recording.output_mode not in ("auto", output_mode):
+            logger.warning(f"FFmpeg이 {self.config.recording.output_mode} 출력을 지원하지 않아 "
+                           f"{output_mode} 출력을 사용합니다")
+        self.recorder.pipe_output = output_mode == "pipe"
+        
         self._running = True
         
+        # 이전 프로세스에서 넘겨받은 녹화 이어서 맡기
+        detached, self._adoption = self._adoption, None
+        if detached:
+            try:
+                await self.adopt_recording(detached)
+            except (StreamRecorderError, OSError) as e:
+                logger.error(f"넘겨받은 녹화를 맡지 못했습니다: {e}")
+    
+    def queue_adoption(self, detached: DetachedRecording):
+        """이전 프로세스에서 넘겨받은 녹화 (prepare()에서 이어서 맡음)"""
+        self._adoption = detached
+    
+    async def detach_recording(self) -> Optional[DetachedRecording]:
+        """
+        진행 중인 녹화를 FFmpeg을 멈추지 않고 떼어 냄 (무중단 업그레이드, HandoffServer)
+        
+        채팅 녹화는 여기서 마치고, 넘겨받은 쪽이 같은 파일에 이어서 기록합니다.
+        """
+        if not self._current_recording or not self._current_recording.is_recording:
+            return None
+        detached = await self.recorder.detach()
+        if detached:
+            self._current_recording = None
+            await self.chat_recorder.stop()
+        return detached
+    
+    async def adopt_recording(self, detached: DetachedRecording) -> RecordingInfo:
+        """
+        떼어 낸 녹화를 이어서 맡음 (방송 중으로 보고, 다음 폴링에서 종료 여부 확인)
+        
+        Raises:
+            StreamRecorderError: 녹화를 맡을 수 없는 경우
+        """
+        recording = await self.recorder.adopt(detached)
+        self._current_recording = recording
+        self._last_stream_info = recording.stream_info
+        self.state.status = LiveStatus.ONLINE
+        await self._start_chat_recording(recording.stream_info)
+        return recording
+    
+    def attach_scheduler(self, scheduler: PollScheduler):
+        """
+        공용 폴링 스케줄러 사용 (ChannelManager)
+        
+        자체 모니터링 루프 대신 스케줄러가 poll_once()를 호출하고,
+        설정 변경/우선 확인 요청은 스케줄러로 전달됩니다.
+        """
+        self._scheduler = scheduler
+    
+    async def start(self, install_signal_handlers: bool = True,
+                    shutdown: Optional[ShutdownCoordinator] = None):
+        """
+        자동 녹화 시스템 시작 (중지될 때까지 자체 루프로 폴링)
+        
+        여러 채널을 함께 관리할 때는 ChannelManager가 prepare() 후
+        공용 스케줄러로 poll_once()를 호출합니다.
+        
+        Args:
+            install_signal_handlers: SIGTERM/SIGINT 처리 여부
+            shutdown: 종료 처리기 (없으면 시그널 처리 시 새로 만듦)
+        """
+        # 이 태스크와 여기서 만드는 태스크의 로그에 채널 ID 표시
+        bind_channel(self.channel_id)
+        await self.prepare()
+        
         # 시그널 핸들러 설정 (graceful shutdown)
-        if sys.platform != "win32":
-            signal.signal(signal.SIGTERM, self._signal_handler)
-            signal.signal(signal.SIGINT, self._signal_handler)
+        if install_signal_handlers and not shutdown:
+            shutdown = ShutdownCoordinator(self.config.system.shutdown_timeout,
+                                           self.config.system.shutdown_report_path)
+        if shutdown:
+            shutdown.manage(lambda: [self], self.stop)
+            if install_signal_handlers:
+                shutdown.install()
         
         # 모니터링 태스크 시작
         self._monitor_task = asyncio.create_task(self._monitor_loop())
@@ -148,64 +387,119 @@ class ChzzkAutoRecorder:
         await self._cleanup()
         logger.info("✅ 자동 녹화 시스템 중지 완료")
     
+    @property
+    def retired(self) -> bool:
+        """retire() 요청 후 녹화가 끝나 더 이상 폴링할 필요가 없는지"""
+        return self._retiring and not self.recorder.is_recording()
+    
     async def _monitor_loop(self):
-        """방송 상태 모니터링 루프"""
-        logger.info(f"📡 방송 모니터링 시작 (폴링 간격: {self.config.recording.polling_interval}초)")
+        """방송 상태 모니터링 루프 (스케줄러 없이 단독 실행할 때)"""
+        logger.info(f"📡 방송 모니터링 시작 (폴링 간격: {self.polling_interval}초)")
         
         while self._running:
-            try:
-                # 방송 상태 확인
-                stream_info = await self.monitor.check_live_status()
-                
-                # 상태 변경 감지
-                if stream_info.status != self._last_status:
-                    logger.info(f"🔄 상태 변경: {self._last_status.value} → {stream_info.status.value}")
-                    
-                    # 콜백 호출
-                    if self._on_status_change:
-                        self._on_status_change(self._last_status, stream_info.status, stream_info)
-                    
-                    # 방송 시작 처리
-                    if stream_info.status == LiveStatus.ONLINE and self._last_status != LiveStatus.ONLINE:
-                        await self._handle_stream_start(stream_info)
-                    
-                    # 방송 종료 처리
-                    elif stream_info.status == LiveStatus.OFFLINE and self._last_status == LiveStatus.ONLINE:
-                        await self._handle_stream_stop(stream_info)
-                    
-                    self._last_status = stream_info.status
+            delay = await self.poll_once()
+            if self.retired:
+                self._running = False
+                break
+            await self._sleep_until_next_poll(delay)
+    
+    async def poll_once(self) -> float:
+        """
+        방송 상태를 한 번 확인하고 녹화 시작/종료 처리
+        
+        Returns:
+            다음 폴링까지 대기 시간 (초)
+        """
+        bind_channel(self.channel_id)
+        try:
+            # 방송 상태 확인
+            stream_info = await self.monitor.check_live_status()
+            self._last_stream_info = stream_info if stream_info.is_live else None
+            previous = self.state.status
+            delay = self.polling_interval
+            if self.predictor and stream_info.status == LiveStatus.OFFLINE:
+                # 방송을 시작할 가능성이 높은 시간대는 자주, 낮은 시간대는 드물게
+                delay = self.predictor.interval(self.channel_id, self.polling_interval)
+            
+            # 상태 변경 감지
+            if stream_info.status != previous:
+                logger.info(f"🔄 상태 변경: {previous.value} → {stream_info.status.value}")
                 
-                # 녹화 상태 로깅 (디버그용)
-                if self._current_recording:
-                    recording = self._current_recording
-                    if recording.is_recording:
-                        size_mb = recording.file_size / 1024 / 1024 if recording.file_size > 0 else 0
-                        logger.debug(f"📹 녹화 중: {recording.file_path.name} ({size_mb:.1f}MB)")
+                # 콜백 호출
+                if self._on_status_change:
+                    await invoke_callback(self._on_status_change, previous, stream_info.status, stream_info)
                 
-                # 다음 확인까지 대기
-                await asyncio.sleep(self.config.recording.polling_interval)
+                # 방송 시작 처리
+                if stream_info.status == LiveStatus.ONLINE and previous != LiveStatus.ONLINE:
+                    await self._handle_stream_start(stream_info)
+                    await self._record_go_live(stream_info, previous)
                 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"모니터링 루프 오류: {e}")
-                logger.debug(f"오류 상세 정보: {e.__class__.__name__}")
+                # 방송 종료 처리
+                elif stream_info.status == LiveStatus.OFFLINE and previous == LiveStatus.ONLINE:
+                    await self._handle_stream_stop(stream_info)
+                    self._offline_since = time.monotonic()
                 
-                # 심각한 에러가 아닌 경우 계속 실행
-                if not isinstance(e, (KeyboardInterrupt, SystemExit)):
-                    if self._on_error:
-                        try:
-                            self._on_error(e)
-                        except Exception as callback_error:
-                            logger.error(f"Error callback 실행 중 오류: {callback_error}")
-                    
-                    # 오류 시 짧은 대기 후 재시도 (30초 -> 10초로 단축)
-                    logger.info("10초 후 모니터링을 재시도합니다...")
-                    await asyncio.sleep(10)
+                # 처리가 끝난 뒤 반영 (실패하면 다음 폴링에서 다시 처리)
+                self.state.record_success(stream_info, time.monotonic() + delay)
+            
+            # 녹화 중 제목/카테고리 변경 추적 (상세 정보가 바뀐 경우만)
+            elif self.state.record_success(stream_info, time.monotonic() + delay) and self.recorder.is_recording():
+                self.recorder.update_stream_info(stream_info)
+            
+            # 방송이 막 끝났으면 끊김 후 재시작에 대비해 한동안 자주 확인
+            if stream_info.status == LiveStatus.OFFLINE and self._offline_since is not None:
+                if time.monotonic() - self._offline_since < self.config.recording.reconnect_check_seconds:
+                    delay = min(delay, self.config.recording.reconnect_check_interval)
+                    self.state.next_due = time.monotonic() + delay
                 else:
-                    # 심각한 에러의 경우 루프 종료
-                    logger.info("심각한 에러로 인해 모니터링을 중단합니다")
-                    break
+                    self._offline_since = None
+            elif stream_info.is_live:
+                self._offline_since = None
+            
+            # 녹화 상태 로깅 (디버그용)
+            if self._current_recording:
+                recording = self._current_recording
+                if recording.is_recording:
+                    size_mb = recording.file_size / 1024 / 1024 if recording.file_size > 0 else 0
+                    logger.debug("📹 녹화 중: %s (%.1fMB)", recording.file_path.name, size_mb)
+            
+            # 채널 제거 요청 후 녹화가 끝났으면 폴링 종료
+            if self.retired:
+                logger.info(f"📤 채널 모니터링 종료: {self.channel_id}")
+            
+            return delay
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"모니터링 루프 오류: {e}")
+            logger.debug(f"오류 상세 정보: {e.__class__.__name__}")
+            
+            if self._on_error:
+                await invoke_callback(self._on_error, e)
+            
+            # 오류가 이어지면 대기 시간을 늘려 재시도 (10초부터 두 배씩, 최대 5분)
+            delay = self.state.record_failure(time.monotonic())
+            logger.info(f"{delay:.0f}초 후 모니터링을 재시도합니다...")
+            return delay
+    
+    async def _record_go_live(self, stream_info: StreamInfo, previous: LiveStatus):
+        """방송 시작 시각 기록 (예측 폴링용)"""
+        if not self.predictor:
+            return
+        started_at = stream_info.started_at
+        if started_at is None and previous == LiveStatus.OFFLINE:
+            # 시작 시각이 없으면 감지 시각으로 (실행 직후 이미 방송 중이던 경우는 제외)
+            started_at = datetime.now().astimezone()
+        if started_at:
+            await self.predictor.record(self.channel_id, started_at)
+    
+    def _request_poll(self):
+        """다음 폴링을 바로 실행 (녹화 오류 후 재시작 등)"""
+        if self._scheduler:
+            self._scheduler.bump(self.channel_id)
+        else:
+            self._wake_event.set()
     
     async def _handle_stream_start(self, stream_info: StreamInfo):
         """방송 시작 처리"""
@@ -228,22 +522,56 @@ class ChzzkAutoRecorder:
         
         try:
             # 파일명 생성
-            filename = self.config.recording.generate_filename(stream_info)
+            filename = self.config.recording.generate_filename(
+                stream_info, directory=self.config.recording.recording_path
+            )
             logger.info(f"📁 파일명: {filename}")
             
             # 녹화 시작
             self._current_recording = await self.recorder.start_recording(stream_info, filename)
             logger.info("🎬 녹화 시작됨")
+            self._start_live_upload(self._current_recording)
             
         except Exception as e:
             logger.error(f"녹화 시작 실패: {e}")
             if self._on_error:
-                self._on_error(e)
+                await invoke_callback(self._on_error, e)
+            return
+        
+        await self._start_chat_recording(stream_info)
+    
+    def _start_live_upload(self, recording: RecordingInfo):
+        """pipe 출력 모드 녹화를 녹화 중에 업로드 (분할 시에는 파트가 바뀌므로 사용하지 않음)"""
+        if (not self.uploader or not self.config.upload.upload_while_recording
+                or not self.recorder.pipe_output or self.config.recording.split_on_category_change):
+            return
+        self.uploader.enqueue(
+            recording.file_path,
+            self.uploader.object_key(self.channel_id, recording.file_path.name),
+            live=lambda: self.recorder.live_output(recording)
+        )
+    
+    async def _start_chat_recording(self, stream_info: StreamInfo):
+        """영상과 같은 시간축으로 채팅 녹화 시작 (실패해도 영상 녹화는 유지)"""
+        recording = self._current_recording
+        if not self.config.recording.record_chat or not recording:
+            return
+        
+        if not stream_info.chat_channel_id:
+            logger.warning("채팅 채널 ID가 없어 채팅 녹화를 건너뜁니다")
+            return
+        
+        try:
+            await self.chat_recorder.start(stream_info, recording.file_path, recording.started_at)
+        except Exception as e:
+            logger.error(f"채팅 녹화 시작 실패: {e}")
     
     async def _handle_stream_stop(self, stream_info: StreamInfo):
         """방송 종료 처리"""
         logger.info("⏹️  방송 종료 감지!")
         
+        await self.chat_recorder.stop()
+        
         if not self._current_recording or not self._current_recording.is_active:
             logger.info("진행 중인 녹화가 없습니다")
             return
@@ -255,18 +583,107 @@ class ChzzkAutoRecorder:
             if final_recording:
                 logger.info("🛑 녹화 중지됨")
                 self._current_recording = None
+                
+                # 분할은 파일 전체를 복사하므로 모니터링 루프를 막지 않도록 백그라운드 실행
+                task = asyncio.create_task(self._finish_recording(final_recording))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
             
         except Exception as e:
             logger.error(f"녹화 중지 실패: {e}")
             if self._on_error:
-                self._on_error(e)
+                await invoke_callback(self._on_error, e)
+    
+    async def _finish_recording(self, recording_info: RecordingInfo, split: bool = True):
+        """녹화 후처리: 카테고리별 분할 → 아카이브 이동/업로드 예약"""
+        if split and self.config.recording.split_on_category_change:
+            await self._split_recording(recording_info)
+        if self.uploader and split and not recording_info.partial_path:
+            # 녹화 중 업로드가 남은 부분을 올릴 때까지 파일을 옮기지 않음
+            # (종료 중에는 기다리지 않음, 업로드 상태가 남아 다음 실행 때 이어서 진행)
+            await self.uploader.wait_live(
+                self.uploader.object_key(self.channel_id, recording_info.file_path.name)
+            )
+        self._archive_recording(recording_info)
+        self._upload_recording(recording_info)
+    
+    def _archive_recording(self, recording_info: RecordingInfo):
+        """완료된 녹화 파일(분할 시 각 파트)을 아카이브로 이동 예약"""
+        if not self.archiver or recording_info.partial_path:
+            return
+        for path in recording_info.parts or [recording_info.file_path]:
+            try:
+                self.archiver.enqueue(path, tag=self.channel_id)
+            except OSError as e:
+                logger.error(f"아카이브 이동 예약 실패 ({path.name}): {e}")
+    
+    def _upload_recording(self, recording_info: RecordingInfo):
+        """완료된 녹화 파일과 사이드카 업로드 예약 (아카이브를 쓰면 이동 후 예약됨)"""
+        if not self.uploader or self.archiver or recording_info.partial_path:
+            return
+        for video in recording_info.parts or [recording_info.file_path]:
+            for path in related_files(video):
+                try:
+                    self.uploader.enqueue(path, self.uploader.object_key(self.channel_id, path.name))
+                except OSError as e:
+                    logger.error(f"업로드 예약 실패 ({path.name}): {e}")
+    
+    async def _split_recording(self, recording_info: RecordingInfo):
+        """카테고리가 바뀐 지점에서 녹화 파일 분할 (성공 시 원본 삭제)"""
+        chapters = recording_info.chapters
+        boundaries = category_boundaries(chapters)
+        if not boundaries or not recording_info.file_path.exists():
+            return
+        
+        # 파트별 첫 챕터 정보로 파일명 생성
+        starts = [0.0] + boundaries
+        part_chapters = [
+            next(c for c in chapters if c.start >= start) for start in starts
+        ]
+        
+        def name_for_part(index: int) -> str:
+            chapter = part_chapters[index]
+            part_info = replace(recording_info.stream_info,
+                                title=chapter.title, category=chapter.category)
+            part_time = recording_info.started_at + timedelta(seconds=chapter.start)
+            extension = recording_info.file_path.suffix.lstrip(".")
+            filename = self.config.recording.generate_filename(part_info, extension, part_time)
+            if filename == recording_info.file_path.name:
+                # 첫 파트는 원본 파일 자리를 그대로 사용
+                return filename
+            return self.config.recording.generate_filename(
+                part_info, extension, part_time, directory=recording_info.file_path.parent
+            )
+        
+        parts = await split_at_boundaries(
+            self.config.system.ffmpeg_path, recording_info.file_path, boundaries, name_for_part
+        )
+        if not parts:
+            return
+        if recording_info.file_path not in parts:
+            recording_info.file_path.unlink(missing_ok=True)
+            # 끊김 보고서(원본 기준 시각)는 첫 파트 옆으로
+            report = gaps_path(recording_info.file_path)
+            if report.exists():
+                report.replace(gaps_path(parts[0]))
+        recording_info.parts = parts
+        
+        # 원본 기준 매니페스트는 더 이상 맞지 않으므로 파트별로 다시 작성
+        if self.config.recording.write_manifest:
+            manifest_path(recording_info.file_path).unlink(missing_ok=True)
+            for part in parts:
+                try:
+                    manifest = await asyncio.to_thread(build_manifest, part)
+                    manifest.save(manifest_path(part))
+                except OSError as e:
+                    logger.error(f"무결성 매니페스트 작성 실패 ({part.name}): {e}")
     
     async def _on_recorder_start(self, recording_info: RecordingInfo):
         """녹화 시작 콜백"""
         logger.info(f"🎬 녹화 시작: {recording_info.file_path.name}")
         
         if self._on_recording_start:
-            self._on_recording_start(recording_info)
+            await invoke_callback(self._on_recording_start, recording_info)
     
     async def _on_recorder_stop(self, recording_info: RecordingInfo):
         """녹화 종료 콜백"""
@@ -278,7 +695,7 @@ class ChzzkAutoRecorder:
         logger.info(f"⏱️  녹화 시간: {duration_str}")
         
         if self._on_recording_stop:
-            self._on_recording_stop(recording_info)
+            await invoke_callback(self._on_recording_stop, recording_info)
     
     async def _on_recorder_error(self, recording_info: RecordingInfo, error: Exception):
         """녹화 오류 콜백"""
@@ -287,16 +704,18 @@ class ChzzkAutoRecorder:
         
         self._current_recording = None
         
-        if self._on_error:
-            self._on_error(error)
-    
-    def _signal_handler(self, signum, frame):
-        """시그널 핸들러 (graceful shutdown)"""
-        logger.info(f"시그널 수신: {signum}")
+        # 방송이 계속 중이면 다음 폴링에서 녹화를 다시 시작하도록 상태 초기화 후 바로 확인
+        if self.state.status == LiveStatus.ONLINE and self._running and not self._retiring:
+            self.state.status = LiveStatus.UNKNOWN
+            self._request_poll()
         
-        # 비동기 컨텍스트에서 실행
-        if self._running:
-            asyncio.create_task(self.stop())
+        # 중단 전까지 녹화된 파일은 그대로 아카이브
+        if recording_info.file_path.exists():
+            self._archive_recording(recording_info)
+            self._upload_recording(recording_info)
+        
+        if self._on_error:
+            await invoke_callback(self._on_error, error)
     
     async def _cleanup(self):
         """정리 작업"""
@@ -304,7 +723,12 @@ class ChzzkAutoRecorder:
             # 진행 중인 녹화 중지
             if self._current_recording and self._current_recording.is_active:
                 logger.info("진행 중인 녹화를 중지합니다...")
+                recording_info = self._current_recording
+                await self.chat_recorder.stop()
                 await self.recorder.cleanup()
+                # 종료 중에는 분할 없이 이동 예약만 (저널에 남아 다음 실행 때 이어서 진행)
+                await self._finish_recording(recording_info, split=False)
+            await self.chat_recorder.stop()
             
             # 모니터 정리
             await self.monitor.close()
@@ -320,7 +744,7 @@ class ChzzkAutoRecorder:
     @property
     def current_status(self) -> LiveStatus:
         """현재 방송 상태"""
-        return self._last_status
+        return self.state.status
     
     @property
     def current_recording(self) -> Optional[RecordingInfo]:
@@ -334,18 +758,33 @@ class ChzzkAutoRecorder:
             recording_info = {
                 "file_name": self._current_recording.file_path.name,
                 "status": self._current_recording.status.value,
+                "file_size": self._current_recording.file_size,
                 "file_size_mb": self._current_recording.file_size / 1024 / 1024,
+                "missing_seconds": self._current_recording.missing_seconds,
                 "started_at": self._current_recording.started_at.isoformat() if self._current_recording.started_at else None
             }
         
+        stream_info = None
+        if self._last_stream_info and self._last_stream_info.is_live:
+            live = self._last_stream_info
+            stream_info = {
+                "title": live.title,
+                "category": live.category,
+                "streamer_name": live.streamer_name,
+                "viewer_count": live.viewer_count,
+                "thumbnail_url": live.thumbnail_url,
+                "started_at": live.started_at.isoformat() if live.started_at else None
+            }
+        
         return {
             "channel_id": self.channel_id,
             "is_running": self._running,
-            "stream_status": self._last_status.value,
+            "stream_status": self.state.status.value,
+            "stream_info": stream_info,
             "recording_info": recording_info,
             "config": {
-                "polling_interval": self.config.recording.polling_interval,
+                "polling_interval": self.polling_interval,
                 "recording_path": str(self.config.recording.recording_path),
-                "quality": self.config.recording.quality
+                "quality": self.quality
             }
         } 
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+다중 채널 자동 녹화 관리
+
+채널 목록 파일의 변경분을 받아 실행 중인 채널별 ChzzkAutoRecorder를 추가/제거하고
+설정을 바꿉니다. 진행 중인 녹화(ffmpeg 프로세스)는 건드리지 않습니다.
+
+채널마다 폴링 루프 태스크를 두지 않고, 공용 PollScheduler가 때가 된 채널의
+poll_once()를 고정된 수의 작업자로 호출합니다. 팔로우 채널 목록 일괄 조회를 쓰면
+팔로우한 채널은 방송 상태가 바뀐 것이 보일 때만 채널별로 폴링합니다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Callable, Any
+
+from .auto_recorder import ChzzkAutoRecorder, get_api_pool
+from .monitor import ChannelStateTable, LiveStatus, BatchStatusProvider, BatchResult
+from .monitor.scheduler import PollScheduler
+from .config_watcher import ConfigWatcher, ChannelsDiff, ChannelsState
+from .shutdown import ShutdownCoordinator
+from .recorder.adoption import DetachedRecording
+from ..config import Config, ChannelConfig
+
+logger = logging.getLogger(__name__)
+
+# 일괄 조회를 쓸 수 없을 때 다시 시도하는 주기 (초)
+BATCH_RETRY_INTERVAL = 600
+
+
+class ChannelManager:
+    """채널별 자동 녹화기 관리자"""
+
+    def __init__(self, nid_aut: str, nid_ses: str, config: Config):
+        """
+        초기화
+
+        Args:
+            nid_aut: 네이버 인증 쿠키
+            nid_ses: 네이버 세션 쿠키
+            config: 설정 객체 (recording 값은 채널 목록 파일의 공통 설정으로 갱신될 수 있음)
+        """
+        self.nid_aut = nid_aut
+        self.nid_ses = nid_ses
+        self.config = config
+
+        self.recorders: dict[str, ChzzkAutoRecorder] = {}
+        # 채널별 폴링 상태 (방송 중이 아닌 채널은 이 레코드만 유지)
+        self.states = ChannelStateTable()
+        self.scheduler = PollScheduler(
+            workers=config.channels.poll_workers,
+            jitter=config.channels.poll_jitter
+        )
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._callbacks: dict[str, Optional[Callable]] = {}
+        self._defaults = (config.recording.polling_interval, config.recording.quality)
+        self._stop_event = asyncio.Event()
+        # 이전 프로세스에서 넘겨받아 채널 녹화기가 이어서 맡을 녹화
+        self._adoptions: dict[str, DetachedRecording] = {}
+
+        # 팔로우 채널 목록 일괄 조회 (팔로우하지 않은 채널은 채널별 폴링)
+        self.batch: Optional[BatchStatusProvider] = None
+        if config.channels.batch_status:
+            self.batch = BatchStatusProvider(
+                get_api_pool(config, nid_aut, nid_ses).client,
+                decoder=config.system.json_decoder,
+                max_age=config.channels.batch_status_interval * 2
+            )
+        self.batch_skipped = 0
+
+        self.watcher = ConfigWatcher(
+            config.channels.file_path,
+            on_change=self.apply,
+            interval=config.channels.reload_interval
+        )
+
+    def set_callbacks(self, **callbacks: Optional[Callable]):
+        """모든 채널 녹화기에 적용할 콜백 설정 (ChzzkAutoRecorder.set_callbacks와 동일한 인자)"""
+        self._callbacks = callbacks
+        for recorder in self.recorders.values():
+            recorder.set_callbacks(**callbacks)
+
+    async def apply(self, diff: ChannelsDiff, state: ChannelsState):
+        """설정 변경분 적용"""
+        if diff.settings_changed:
+            self._apply_common_settings(state)
+
+        for channel in diff.added:
+            existing = self.recorders.get(channel.channel_id)
+            if existing:
+                # 제거 대기(녹화 마무리 중)였던 채널이 다시 추가된 경우
+                existing.cancel_retire()
+                existing.update_settings(channel.polling_interval, channel.quality)
+            else:
+                self._add_channel(channel)
+
+        for channel_id in diff.removed:
+            recorder = self.recorders.get(channel_id)
+            if recorder:
+                await recorder.retire()
+                if not recorder.is_running:
+                    self._forget(recorder)
+
+        # 공통 설정이 바뀌면 채널별 값이 없는 녹화기도 다시 계산해야 함
+        changed = {c.channel_id: c for c in diff.changed}
+        if diff.settings_changed:
+            changed.update({cid: state.channels[cid] for cid in self.recorders if cid in state.channels})
+
+        for channel in changed.values():
+            recorder = self.recorders.get(channel.channel_id)
+            if recorder:
+                recorder.update_settings(channel.polling_interval, channel.quality)
+
+    def adopt(self, recordings: list[DetachedRecording]):
+        """이전 프로세스에서 넘겨받은 녹화 (run() 전에 호출, 채널 녹화기 준비 후 이어서 맡음)"""
+        self._adoptions.update((recording.channel_id, recording) for recording in recordings)
+
+    def _apply_common_settings(self, state: ChannelsState):
+        """파일의 공통 polling_interval/quality를 RecordingConfig에 반영 (없으면 초기값 복원)"""
+        default_interval, default_quality = self._defaults
+        self.config.recording.polling_interval = state.polling_interval or default_interval
+        self.config.recording.quality = state.quality or default_quality
+
+    def _add_channel(self, channel: ChannelConfig):
+        """채널 녹화기 생성 및 시작"""
+        recorder = ChzzkAutoRecorder(
+            channel_id=channel.channel_id,
+            nid_aut=self.nid_aut,
+            nid_ses=self.nid_ses,
+            config=self.config,
+            polling_interval=channel.polling_interval,
+            quality=channel.quality,
+            state=self.states.get(channel.channel_id)
+        )
+        if self._callbacks:
+            recorder.set_callbacks(**self._callbacks)
+        recorder.attach_scheduler(self.scheduler)
+        detached = self._adoptions.pop(channel.channel_id, None)
+        if detached:
+            recorder.queue_adoption(detached)
+
+        self.recorders[channel.channel_id] = recorder
+        self._spawn(recorder, self._start_channel(recorder))
+        logger.info(f"➕ 채널 추가: {channel.channel_id}")
+
+    def _spawn(self, recorder: ChzzkAutoRecorder, coro):
+        """채널 준비/제거 태스크 실행 (끝나면 목록에서 제거)"""
+        task = asyncio.create_task(coro)
+        self._tasks[recorder.channel_id] = task
+        task.add_done_callback(lambda t, cid=recorder.channel_id: self._tasks.pop(cid, None)
+                               if self._tasks.get(cid) is t else None)
+
+    async def _start_channel(self, recorder: ChzzkAutoRecorder):
+        """녹화기 준비 후 스케줄러에 등록"""
+        try:
+            await recorder.prepare()
+        except Exception as e:
+            logger.error(f"채널 녹화기 오류로 종료: {recorder.channel_id} ({e})")
+            self._forget(recorder)
+            return
+        if self.recorders.get(recorder.channel_id) is recorder and not self._stop_event.is_set():
+            self.scheduler.add(recorder.channel_id, lambda: self._poll(recorder), recorder.polling_interval)
+
+    async def _poll(self, recorder: ChzzkAutoRecorder) -> Optional[float]:
+        """채널 한 번 폴링 (스케줄러 작업자에서 호출)"""
+        if (self.batch and recorder.current_status == LiveStatus.OFFLINE
+                and self.batch.is_offline(recorder.channel_id)):
+            # 일괄 조회로 방송 중이 아닌 것이 확인됨 (바뀌면 _reconcile이 바로 폴링 요청)
+            self.batch_skipped += 1
+            recorder.state.checked_at = time.monotonic()
+            return None
+        delay = await recorder.poll_once()
+        if recorder.retired:
+            # 폴링이 끝난 뒤 스케줄러에서 빼야 하므로 별도 태스크로 제거
+            self._spawn(recorder, self._retire_channel(recorder))
+        return delay
+
+    async def _retire_channel(self, recorder: ChzzkAutoRecorder):
+        """녹화를 마친 제거 대기 채널 중지"""
+        await self.scheduler.remove(recorder.channel_id)
+        await recorder.stop()
+        self._forget(recorder)
+
+    def _forget(self, recorder: ChzzkAutoRecorder):
+        """중지된 녹화기를 목록에서 제거"""
+        channel_id = recorder.channel_id
+        if self.recorders.get(channel_id) is not recorder:
+            return
+        self.recorders.pop(channel_id, None)
+        self.states.remove(channel_id)
+        if not self._stop_event.is_set():
+            logger.info(f"➖ 채널 제거됨: {channel_id}")
+
+    async def run(self, install_signal_handlers: bool = True,
+                  shutdown: Optional[ShutdownCoordinator] = None):
+        """
+        채널 목록을 불러와 모든 채널을 실행하고, 중지될 때까지 파일 변경을 감시
+
+        Args:
+            install_signal_handlers: SIGTERM/SIGINT 처리 여부
+            shutdown: 종료 처리기 (없으면 시그널 처리 시 새로 만듦)
+        """
+        self.config.create_directories()
+
+        # 종료 신호 시 모든 녹화를 동시에 마무리
+        if install_signal_handlers and not shutdown:
+            shutdown = ShutdownCoordinator(self.config.system.shutdown_timeout,
+                                           self.config.system.shutdown_report_path)
+        if shutdown:
+            shutdown.manage(lambda: list(self.recorders.values()), self.stop)
+            if install_signal_handlers:
+                shutdown.install()
+
+        self.scheduler.start()
+        await self.watcher.check()
+        if not self.recorders:
+            logger.warning(f"채널 목록이 비어 있습니다: {self.watcher.file_path}")
+        for detached in self._adoptions.values():
+            logger.warning(f"채널 목록에 없는 채널의 넘겨받은 녹화 종료: {detached.file_name}")
+            detached.abandon()
+        self._adoptions.clear()
+
+        watcher_task = asyncio.create_task(self.watcher.run())
+        batch_task = asyncio.create_task(self._batch_loop()) if self.batch else None
+        try:
+            await self._stop_event.wait()
+        finally:
+            self.watcher.stop()
+            watcher_task.cancel()
+            if batch_task:
+                batch_task.cancel()
+            await self.scheduler.close()
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _batch_loop(self):
+        """주기적으로 팔로우 채널 목록을 받아 상태가 바뀐 채널만 폴링 요청"""
+        interval = self.config.channels.batch_status_interval
+        reported = False
+        while True:
+            # 예상하지 못한 오류로 태스크가 끝나면 종료 때까지 아무도 모르므로 여기서 기록하고 계속
+            try:
+                result = await self.batch.fetch()
+                if result:
+                    if not reported:
+                        covered = sum(1 for channel_id in self.recorders if channel_id in result.live)
+                        logger.info(f"📋 팔로우 채널 목록으로 일괄 조회: {covered}/{len(self.recorders)}개 채널 "
+                                    f"(요청 {result.requests}개)")
+                        reported = True
+                    self._reconcile(result)
+            except Exception as e:
+                logger.exception(f"팔로우 채널 목록 일괄 조회 오류: {e}")
+            await asyncio.sleep(interval if self.batch.available else BATCH_RETRY_INTERVAL)
+
+    def _reconcile(self, result: BatchResult) -> list[str]:
+        """
+        일괄 조회 결과와 채널 상태 비교
+
+        방송이 시작됐거나 끝난 것으로 보이는 채널은 바로 채널별 폴링을 요청합니다
+        (녹화 시작/종료는 채널별 폴링 결과로 처리).
+
+        Returns:
+            폴링을 요청한 채널 ID 목록
+        """
+        bumped = []
+        for channel_id, recorder in self.recorders.items():
+            live = result.live.get(channel_id)
+            if live is None:
+                continue
+            online = recorder.current_status == LiveStatus.ONLINE
+            if live != online and (live or recorder.current_status != LiveStatus.UNKNOWN):
+                self.scheduler.bump(channel_id)
+                bumped.append(channel_id)
+        if bumped:
+            logger.debug("일괄 조회로 상태 변경 감지: %s", bumped)
+        return bumped
+
+    async def stop(self):
+        """모든 채널 중지"""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        logger.info(f"🛑 전체 채널 중지 중... ({len(self.recorders)}개)")
+        # 진행 중인 폴링 취소 후 녹화기 정리
+        await self.scheduler.close()
+        await asyncio.gather(
+            *(recorder.stop() for recorder in list(self.recorders.values()) if recorder.is_running),
+            return_exceptions=True
+        )
+
+    def get_status_summary(self) -> dict[str, Any]:
+        """채널별 상태 요약"""
+        return {
+            "channel_count": len(self.recorders),
+            "live_count": self.states.live_count(),
+            **self.metrics(),
+            "channels": [recorder.get_status_summary() for recorder in self.recorders.values()],
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        """폴링 스케줄러/일괄 조회 지표"""
+        return {
+            "scheduler": self.scheduler.stats(),
+            "batch": dict(self.batch.stats(), skipped_polls=self.batch_skipped) if self.batch else None,
+        }
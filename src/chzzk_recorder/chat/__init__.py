@@ -0,0 +1,7 @@
+"""
+치지직 채팅 녹화 모듈
+"""
+
+from .chat_recorder import ChatRecorder, ChatRecordingInfo, ChatLogWriter, ChatRecorderError
+
+__all__ = ["ChatRecorder", "ChatRecordingInfo", "ChatLogWriter", "ChatRecorderError"]
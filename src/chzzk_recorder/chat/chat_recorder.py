@@ -0,0 +1,367 @@
+"""
+치지직 채팅 녹화 엔진
+
+방송 영상과 같은 시간축(녹화 시작 기준 ms 오프셋)으로 채팅을 저장합니다.
+
+저장 형식:
+    - {영상파일}.chat.jsonl.gz: 한 줄에 메시지 하나(JSON). 플러시할 때마다 독립된
+      gzip 멤버로 덧붙이므로 `zcat` 등으로 그대로 읽을 수 있고, 중간에 프로세스가
+      죽어도 이미 기록된 멤버는 온전합니다.
+    - {영상파일}.chat.idx: 멤버별 `첫 메시지 오프셋(ms)\\t바이트 위치\\t메시지 수`.
+      특정 재생 시점의 채팅을 찾을 때 해당 멤버만 읽으면 됩니다.
+"""
+
+import asyncio
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..monitor import LiveMonitor, StreamInfo
+from . import websocket
+
+logger = logging.getLogger(__name__)
+
+
+# 채팅 서버 명령 코드
+CMD_PING = 0
+CMD_PONG = 10000
+CMD_CONNECT = 100
+CMD_CONNECTED = 10100
+CMD_CHAT = 93101
+CMD_DONATION = 93102
+
+MESSAGE_KINDS = {
+    CMD_CHAT: "chat",
+    CMD_DONATION: "donation",
+}
+
+
+class ChatRecorderError(Exception):
+    """채팅 녹화 오류"""
+    pass
+
+
+@dataclass
+class ChatRecordingInfo:
+    """채팅 녹화 정보"""
+    channel_id: str
+    file_path: Path
+    index_path: Path
+    started_at: datetime
+    stopped_at: Optional[datetime] = None
+    message_count: int = 0
+    bytes_written: int = 0
+
+
+class ChatLogWriter:
+    """gzip 멤버 단위로 덧붙이는 채팅 로그 기록기"""
+
+    def __init__(self, file_path: Path, index_path: Path, compress_level: int = 6):
+        self.file_path = file_path
+        self.index_path = index_path
+        self.compress_level = compress_level
+        self.message_count = 0
+        self.bytes_written = 0
+
+        self._pending: list[str] = []
+        self._first_offset: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending_count(self) -> int:
+        """플러시 대기 중인 메시지 수"""
+        return len(self._pending)
+
+    def append(self, offset_ms: int, record: dict):
+        """메시지 추가 (메모리 버퍼에만 쌓음)"""
+        if self._first_offset is None:
+            self._first_offset = offset_ms
+        record["t"] = offset_ms
+        self._pending.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+
+    async def flush(self):
+        """버퍼를 gzip 멤버 하나로 압축해 파일에 덧붙임 (압축/쓰기는 스레드에서 수행)"""
+        async with self._lock:
+            if not self._pending:
+                return
+
+            lines, self._pending = self._pending, []
+            first_offset, self._first_offset = self._first_offset, None
+
+            written = await asyncio.to_thread(self._write_block, lines, first_offset)
+            self.message_count += len(lines)
+            self.bytes_written += written
+
+    def _write_block(self, lines: list[str], first_offset: int) -> int:
+        """블록 압축 및 기록 (워커 스레드)"""
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, 31)
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        block = compressor.compress(data) + compressor.flush()
+
+        with open(self.file_path, "ab") as f:
+            position = f.tell()
+            f.write(block)
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(f"{first_offset}\t{position}\t{len(lines)}\n")
+
+        return len(block)
+
+
+class ChatRecorder:
+    """치지직 채팅 녹화기"""
+
+    CHAT_SERVER_URL = "wss://kr-ss{server_id}.chat.naver.com/chat"
+
+    def __init__(self,
+                 monitor: LiveMonitor,
+                 flush_interval: float = 2.0,
+                 flush_size: int = 5000,
+                 ping_interval: float = 20.0,
+                 server_url: Optional[str] = None):
+        """
+        초기화
+
+        Args:
+            monitor: 채팅 액세스 토큰 발급에 사용할 모니터 (HTTP 클라이언트 공유)
+            flush_interval: 버퍼를 디스크에 기록하는 주기 (초)
+            flush_size: 이 개수 이상 쌓이면 주기와 관계없이 기록
+            ping_interval: 클라이언트 ping 전송 주기 (초)
+            server_url: 채팅 서버 URL (테스트용, 기본값은 채널별 치지직 서버)
+        """
+        self.monitor = monitor
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.ping_interval = ping_interval
+        self.server_url = server_url
+
+        self._info: Optional[ChatRecordingInfo] = None
+        self._writer: Optional[ChatLogWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        # 버퍼가 flush_size를 넘어 바로 시작한 기록 (stop()에서 완료를 기다림)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._connection: Optional[websocket.WebSocketConnection] = None
+        self._base_ms = 0
+        self._running = False
+
+    @staticmethod
+    def chat_paths(video_path: Path) -> tuple[Path, Path]:
+        """영상 파일 경로에 대응하는 채팅 로그/인덱스 경로"""
+        stem = video_path.with_suffix("")
+        return (stem.with_name(stem.name + ".chat.jsonl.gz"),
+                stem.with_name(stem.name + ".chat.idx"))
+
+    def _resolve_server_url(self, chat_channel_id: str) -> str:
+        """채팅 채널 ID로 접속할 서버 결정"""
+        if self.server_url:
+            return self.server_url
+        server_id = sum(ord(c) for c in chat_channel_id) % 9 + 1
+        return self.CHAT_SERVER_URL.format(server_id=server_id)
+
+    def is_recording(self) -> bool:
+        """채팅 녹화 중인지 확인"""
+        return self._running
+
+    def get_current_recording(self) -> Optional[ChatRecordingInfo]:
+        """현재 채팅 녹화 정보 반환"""
+        return self._info
+
+    async def start(self, stream_info: StreamInfo, video_path: Path,
+                    started_at: datetime) -> ChatRecordingInfo:
+        """
+        채팅 녹화 시작
+
+        Args:
+            stream_info: 방송 정보 (chat_channel_id 필요)
+            video_path: 함께 녹화 중인 영상 파일 경로
+            started_at: 영상 녹화 시작 시각 (채팅 오프셋의 기준)
+
+        Raises:
+            ChatRecorderError: 이미 녹화 중이거나 채팅 채널 정보가 없는 경우
+        """
+        if self._running:
+            raise ChatRecorderError("이미 채팅 녹화가 진행 중입니다")
+        if not stream_info.chat_channel_id:
+            raise ChatRecorderError("채팅 채널 ID가 없습니다")
+
+        file_path, index_path = self.chat_paths(video_path)
+        self._info = ChatRecordingInfo(
+            channel_id=stream_info.channel_id,
+            file_path=file_path,
+            index_path=index_path,
+            started_at=started_at
+        )
+        self._writer = ChatLogWriter(file_path, index_path)
+        self._base_ms = int(started_at.timestamp() * 1000)
+        self._running = True
+        self._task = asyncio.create_task(self._run(stream_info.chat_channel_id))
+
+        logger.info(f"채팅 녹화 시작: {file_path.name}")
+        return self._info
+
+    async def stop(self) -> Optional[ChatRecordingInfo]:
+        """채팅 녹화 중지 및 남은 버퍼 기록"""
+        if not self._running:
+            return None
+
+        self._running = False
+        if self._connection:
+            await self._connection.close()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._flush_task:
+            await self._flush_task
+            self._flush_task = None
+
+        info = self._info
+        if self._writer and info:
+            await self._writer.flush()
+            info.message_count = self._writer.message_count
+            info.bytes_written = self._writer.bytes_written
+            info.stopped_at = datetime.now()
+            logger.info(f"채팅 녹화 완료: {info.file_path.name} "
+                        f"({info.message_count}개, {info.bytes_written / 1024:.1f}KB)")
+
+        self._task = None
+        self._connection = None
+        self._info = None
+        self._writer = None
+        return info
+
+    async def _run(self, chat_channel_id: str):
+        """연결 유지 루프 (끊기면 지수 백오프로 재접속)"""
+        backoff = 1.0
+        flusher = asyncio.create_task(self._flush_loop())
+
+        try:
+            while self._running:
+                try:
+                    await self._session(chat_channel_id)
+                    backoff = 1.0
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"채팅 연결 오류: {e} ({backoff:.0f}초 후 재접속)")
+
+                if self._running:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 60.0)
+        finally:
+            flusher.cancel()
+
+    async def _session(self, chat_channel_id: str):
+        """채팅 서버 접속 후 메시지 수신"""
+        access_token = await self.monitor.get_chat_access_token(chat_channel_id)
+
+        connection = await websocket.connect(self._resolve_server_url(chat_channel_id))
+        self._connection = connection
+        pinger: Optional[asyncio.Task] = None
+        try:
+            await connection.send(json.dumps({
+                "ver": "2",
+                "cmd": CMD_CONNECT,
+                "svcid": "game",
+                "cid": chat_channel_id,
+                "bdy": {"uid": None, "devType": 2001, "accTkn": access_token, "auth": "READ"},
+                "tid": 1,
+            }))
+
+            pinger = asyncio.create_task(self._ping_loop(connection))
+            while self._running:
+                message = json.loads(await connection.recv())
+                cmd = message.get("cmd")
+
+                if cmd == CMD_PING:
+                    await connection.send('{"ver":"2","cmd":10000}')
+                elif cmd in MESSAGE_KINDS:
+                    self._handle_messages(MESSAGE_KINDS[cmd], message.get("bdy") or [])
+                elif cmd == CMD_CONNECTED:
+                    logger.info(f"채팅 서버 접속 완료: {chat_channel_id}")
+        except websocket.WebSocketClosed:
+            if self._running:
+                raise
+        finally:
+            # 어떤 이유로 끝나든 재접속 전에 이 연결을 닫음
+            if pinger:
+                pinger.cancel()
+            await connection.close()
+            if self._connection is connection:
+                self._connection = None
+
+    def _handle_messages(self, kind: str, messages: list):
+        """수신한 메시지 묶음을 버퍼에 추가"""
+        writer = self._writer
+        if writer is None:
+            return
+
+        for message in messages:
+            msg_time = message.get("msgTime") or message.get("messageTime") or 0
+            record = {
+                "k": kind,
+                "u": message.get("uid") or message.get("userId"),
+                "n": _nickname(message.get("profile")),
+                "m": message.get("msg") if "msg" in message else message.get("content"),
+            }
+            if kind == "donation":
+                record["a"] = _pay_amount(message.get("extras"))
+            writer.append(msg_time - self._base_ms, record)
+
+        if writer.pending_count >= self.flush_size and (not self._flush_task or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush(writer))
+
+    async def _flush_loop(self):
+        """주기적으로 버퍼 기록"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._writer:
+                await self._flush(self._writer)
+
+    @staticmethod
+    async def _flush(writer: ChatLogWriter):
+        """버퍼 기록 (실패는 로그만 남김)"""
+        try:
+            await writer.flush()
+        except OSError as e:
+            logger.error(f"채팅 로그 기록 실패: {e}")
+
+    async def _ping_loop(self, connection: websocket.WebSocketConnection):
+        """서버 연결 유지용 ping"""
+        while not connection.closed:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await connection.send('{"ver":"2","cmd":0}')
+            except (websocket.WebSocketError, ConnectionError):
+                return
+
+
+def _nickname(profile) -> Optional[str]:
+    """profile(JSON 문자열)에서 닉네임 추출"""
+    if isinstance(profile, str):
+        try:
+            profile = json.loads(profile)
+        except ValueError:
+            return None
+    if isinstance(profile, dict):
+        return profile.get("nickname")
+    return None
+
+
+def _pay_amount(extras) -> Optional[int]:
+    """extras(JSON 문자열)에서 후원 금액 추출"""
+    if isinstance(extras, str):
+        try:
+            extras = json.loads(extras)
+        except ValueError:
+            return None
+    if isinstance(extras, dict):
+        return extras.get("payAmount")
+    return None
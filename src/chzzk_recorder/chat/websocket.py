@@ -0,0 +1,228 @@
+"""
+채팅 수집용 최소 WebSocket(RFC 6455) 클라이언트
+
+채팅 서버와 텍스트 프레임만 주고받으면 되므로 외부 의존성 없이
+asyncio 스트림 위에 필요한 부분만 구현합니다.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import ssl
+import struct
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class WebSocketError(Exception):
+    """WebSocket 통신 오류"""
+    pass
+
+
+class WebSocketClosed(WebSocketError):
+    """상대방이 연결을 종료함"""
+    pass
+
+
+def accept_key(key: str) -> str:
+    """Sec-WebSocket-Key에 대한 Sec-WebSocket-Accept 값 계산"""
+    digest = hashlib.sha1((key + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    """단일(FIN) 프레임 인코딩 (클라이언트는 mask=True)"""
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+
+    if not mask:
+        return bytes(header) + payload
+
+    mask_key = os.urandom(4)
+    return bytes(header) + mask_key + _apply_mask(payload, mask_key)
+
+
+def _apply_mask(payload: bytes, mask_key: bytes) -> bytes:
+    """XOR 마스킹 (int 연산으로 한 번에 처리)"""
+    if not payload:
+        return payload
+    length = len(payload)
+    repeated = (mask_key * (length // 4 + 1))[:length]
+    masked = int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")
+    return masked.to_bytes(length, "big")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[bool, int, bytes]:
+    """
+    프레임 하나 읽기
+
+    Returns:
+        (fin, opcode, payload)
+    """
+    head = await reader.readexactly(2)
+    fin = bool(head[0] & 0x80)
+    opcode = head[0] & 0x0F
+    masked = bool(head[1] & 0x80)
+    length = head[1] & 0x7F
+
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+
+    mask_key = await reader.readexactly(4) if masked else b""
+    payload = await reader.readexactly(length) if length else b""
+
+    if masked:
+        payload = _apply_mask(payload, mask_key)
+
+    return fin, opcode, payload
+
+
+class WebSocketConnection:
+    """클라이언트 측 WebSocket 연결"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """연결 종료 여부"""
+        return self._closed
+
+    async def send(self, text: str):
+        """텍스트 메시지 전송"""
+        if self._closed:
+            raise WebSocketClosed("연결이 종료되었습니다")
+        self._writer.write(encode_frame(OP_TEXT, text.encode("utf-8"), mask=True))
+        await self._writer.drain()
+
+    async def recv(self) -> str:
+        """
+        텍스트 메시지 수신 (ping/pong/조각 프레임은 내부에서 처리)
+
+        Raises:
+            WebSocketClosed: 연결이 종료된 경우
+        """
+        fragments: list[bytes] = []
+
+        while True:
+            try:
+                fin, opcode, payload = await read_frame(self._reader)
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                self._closed = True
+                raise WebSocketClosed(f"연결이 끊어졌습니다: {e}")
+
+            if opcode == OP_PING:
+                self._writer.write(encode_frame(OP_PONG, payload, mask=True))
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                await self.close()
+                raise WebSocketClosed("서버가 연결을 종료했습니다")
+
+            fragments.append(payload)
+            if fin:
+                return b"".join(fragments).decode("utf-8", errors="replace")
+
+    async def close(self):
+        """연결 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._writer.write(encode_frame(OP_CLOSE, b"", mask=True))
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writer.close()
+
+
+async def connect(url: str,
+                  headers: Optional[dict[str, str]] = None,
+                  timeout: float = 10) -> WebSocketConnection:
+    """
+    WebSocket 서버에 연결
+
+    Args:
+        url: ws:// 또는 wss:// URL
+        headers: 추가 핸드셰이크 헤더
+        timeout: 연결/핸드셰이크 타임아웃 (초)
+
+    Raises:
+        WebSocketError: 핸드셰이크 실패
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == "wss"
+    host = parts.hostname or ""
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ssl.create_default_context() if secure else None),
+        timeout
+    )
+
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    lines = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {host}:{port}",
+        "Upgrade: websocket",
+        "Connection: Upgrade",
+        f"Sec-WebSocket-Key: {key}",
+        "Sec-WebSocket-Version: 13",
+    ]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8"))
+    await writer.drain()
+
+    try:
+        response = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+        writer.close()
+        raise WebSocketError(f"핸드셰이크 응답을 읽을 수 없습니다: {e}")
+
+    status_line, *header_lines = response.decode("latin-1").split("\r\n")
+    if " 101 " not in f"{status_line} ":
+        writer.close()
+        raise WebSocketError(f"핸드셰이크 실패: {status_line}")
+
+    response_headers = {}
+    for line in header_lines:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            response_headers[name.strip().lower()] = value.strip()
+
+    if response_headers.get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise WebSocketError("Sec-WebSocket-Accept 값이 일치하지 않습니다")
+
+    return WebSocketConnection(reader, writer)
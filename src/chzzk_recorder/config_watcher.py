@@ -0,0 +1,198 @@
+"""
+채널 목록/설정 파일 감시
+
+채널 목록 파일을 주기적으로 확인해 바뀐 내용을 이전 상태와 비교(diff)하고,
+변경분만 콜백으로 전달합니다. 파일 형식 (JSON):
+
+    {
+        "polling_interval": 60,
+        "quality": "1080p",
+        "channels": [
+            "채널ID",
+            {"channel_id": "채널ID", "polling_interval": 30, "quality": "720p"}
+        ]
+    }
+
+최상위 polling_interval/quality는 RecordingConfig 값을 덮어쓰며, 채널별 값이
+없으면 이 값을 따릅니다.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Callable, Any
+
+from ..config import ChannelConfig, VALID_QUALITIES, MIN_POLLING_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcherError(Exception):
+    """설정 파일 오류"""
+    pass
+
+
+@dataclass
+class ChannelsState:
+    """채널 목록 파일의 내용"""
+    channels: dict[str, ChannelConfig] = field(default_factory=dict)
+    polling_interval: Optional[int] = None
+    quality: Optional[str] = None
+
+
+@dataclass
+class ChannelsDiff:
+    """이전 상태와의 차이"""
+    added: list[ChannelConfig] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[ChannelConfig] = field(default_factory=list)
+    settings_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        """변경 사항이 없는지 확인"""
+        return not (self.added or self.removed or self.changed or self.settings_changed)
+
+
+def parse_channels(data: Any) -> ChannelsState:
+    """
+    채널 목록 파일 내용 파싱 및 검증
+
+    Raises:
+        ConfigWatcherError: 형식 또는 값이 잘못된 경우
+    """
+    if isinstance(data, list):
+        data = {"channels": data}
+    if not isinstance(data, dict):
+        raise ConfigWatcherError("최상위 값은 객체 또는 배열이어야 합니다")
+
+    state = ChannelsState(
+        polling_interval=_validate_interval(data.get("polling_interval")),
+        quality=_validate_quality(data.get("quality")),
+    )
+
+    for entry in data.get("channels", []):
+        if isinstance(entry, str):
+            entry = {"channel_id": entry}
+        if not isinstance(entry, dict) or not entry.get("channel_id"):
+            raise ConfigWatcherError(f"잘못된 채널 항목: {entry!r}")
+
+        channel = ChannelConfig(
+            channel_id=str(entry["channel_id"]).strip(),
+            polling_interval=_validate_interval(entry.get("polling_interval")),
+            quality=_validate_quality(entry.get("quality")),
+        )
+        if channel.channel_id in state.channels:
+            raise ConfigWatcherError(f"중복된 채널: {channel.channel_id}")
+        state.channels[channel.channel_id] = channel
+
+    return state
+
+
+def diff_channels(old: ChannelsState, new: ChannelsState) -> ChannelsDiff:
+    """두 상태 비교"""
+    return ChannelsDiff(
+        added=[c for cid, c in new.channels.items() if cid not in old.channels],
+        removed=[cid for cid in old.channels if cid not in new.channels],
+        changed=[c for cid, c in new.channels.items()
+                 if cid in old.channels and old.channels[cid] != c],
+        settings_changed=(old.polling_interval, old.quality) != (new.polling_interval, new.quality),
+    )
+
+
+def _validate_interval(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if not isinstance(value, int) or value < MIN_POLLING_INTERVAL:
+        raise ConfigWatcherError(f"polling_interval은 {MIN_POLLING_INTERVAL} 이상의 정수여야 합니다: {value!r}")
+    return value
+
+
+def _validate_quality(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if value not in VALID_QUALITIES:
+        raise ConfigWatcherError(f"잘못된 quality: {value!r} (가능한 값: {VALID_QUALITIES})")
+    return value
+
+
+class ConfigWatcher:
+    """채널 목록 파일 감시기"""
+
+    def __init__(self,
+                 file_path: Path,
+                 on_change: Callable[[ChannelsDiff, ChannelsState], Any],
+                 interval: float = 5.0):
+        """
+        초기화
+
+        Args:
+            file_path: 채널 목록 파일 경로
+            on_change: 변경 시 콜백 (diff, 새 상태)
+            interval: 변경 확인 주기 (초)
+        """
+        self.file_path = Path(file_path)
+        self.on_change = on_change
+        self.interval = interval
+
+        self.state = ChannelsState()
+        self._signature: Optional[tuple[int, int]] = None
+        self._running = False
+
+    def _current_signature(self) -> Optional[tuple[int, int]]:
+        """변경 감지용 (mtime, size)"""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def check(self) -> Optional[ChannelsDiff]:
+        """
+        파일을 한 번 확인하고 바뀌었으면 콜백 호출
+
+        잘못된 내용이면 이전 상태를 유지하고 경고만 남깁니다.
+
+        Returns:
+            적용된 diff (변경 없으면 None)
+        """
+        signature = self._current_signature()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+
+        try:
+            text = await asyncio.to_thread(self.file_path.read_text, encoding="utf-8")
+            new_state = parse_channels(json.loads(text))
+        except (OSError, ValueError, ConfigWatcherError) as e:
+            logger.warning(f"채널 목록 파일을 적용하지 않음 ({self.file_path}): {e}")
+            return None
+
+        diff = diff_channels(self.state, new_state)
+        self.state = new_state
+        if diff.is_empty:
+            return None
+
+        logger.info(f"🔁 채널 설정 변경: 추가 {len(diff.added)}, 제거 {len(diff.removed)}, "
+                    f"변경 {len(diff.changed)}, 공통 설정 변경={diff.settings_changed}")
+
+        result = self.on_change(diff, new_state)
+        if asyncio.iscoroutine(result):
+            await result
+        return diff
+
+    async def run(self):
+        """감시 루프"""
+        self._running = True
+        while self._running:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"설정 변경 적용 중 오류: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        """감시 중지"""
+        self._running = False
@@ -0,0 +1,8 @@
+"""
+런타임 진단 모듈 (이벤트 루프 지연 감시, 샘플링 프로파일러)
+"""
+
+from .loop_monitor import LoopMonitor, StallReport
+from .profiler import SamplingProfiler, ProfilerBusyError
+
+__all__ = ["LoopMonitor", "StallReport", "SamplingProfiler", "ProfilerBusyError"]
@@ -0,0 +1,227 @@
+"""
+이벤트 루프 지연 감시
+
+- 지연 측정: 루프에서 interval마다 깨어나는 태스크가 예정 시각보다 얼마나 늦게
+  실행됐는지 기록합니다 (최근 값으로 p50/p99/최대 계산).
+- 멈춤 감지: 감시 스레드가 루프의 마지막 응답 시각을 확인하다가 threshold 이상
+  응답이 없으면 그 순간의 루프 스레드 스택을 잡아 둡니다. 루프를 막고 있는 콜백이나
+  태스크(동기 콜백, Popen.wait, 파일 I/O 등)가 스택 맨 끝에 나타납니다.
+
+잡은 스택은 로그에 남기고, stall_log_path를 주면 folded 형식으로 이어 씁니다
+(flamegraph.pl 등으로 어디서 자주 멈추는지 볼 수 있음).
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+from collections import deque, Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .profiler import stack_labels, fold
+
+logger = logging.getLogger(__name__)
+
+
+# 최근 지연 측정값 개수 (통계용)
+LAG_HISTORY = 1200
+
+# 보관할 멈춤 기록 수
+STALL_HISTORY = 50
+
+
+@dataclass
+class StallReport:
+    """루프 멈춤 기록"""
+    started_at: datetime
+    duration: float
+    stack: list[str]
+    ended: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration * 1000, 1),
+            "ended": self.ended,
+            "stack": self.stack,
+        }
+
+
+@dataclass
+class LagStats:
+    """지연 통계"""
+    samples: int = 0
+    over_threshold: int = 0
+    max_lag: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=LAG_HISTORY))
+
+    def to_dict(self) -> dict:
+        recent = sorted(self.recent)
+        if recent:
+            p50 = statistics.median(recent)
+            p99 = recent[min(len(recent) - 1, int(len(recent) * 0.99))]
+        else:
+            p50 = p99 = 0.0
+        return {
+            "samples": self.samples,
+            "over_threshold": self.over_threshold,
+            "max_ms": round(self.max_lag * 1000, 1),
+            "p50_ms": round(p50 * 1000, 1),
+            "p99_ms": round(p99 * 1000, 1),
+        }
+
+
+class LoopMonitor:
+    """이벤트 루프 지연/멈춤 감시기"""
+
+    def __init__(self,
+                 interval: float = 0.25,
+                 lag_threshold: float = 0.1,
+                 stall_threshold: float = 0.5,
+                 stall_log_path: Optional[Path] = None,
+                 asyncio_debug: bool = False):
+        """
+        초기화
+
+        Args:
+            interval: 지연 측정 간격 (초)
+            lag_threshold: 이 이상 늦으면 경고 (초)
+            stall_threshold: 이 이상 응답이 없으면 루프 스레드 스택 기록 (초)
+            stall_log_path: 멈춤 스택을 folded 형식으로 이어 쓸 파일
+            asyncio_debug: asyncio 디버그 모드로 lag_threshold보다 오래 걸린 콜백/태스크
+                           단계를 asyncio 로거에 기록 (부담이 있어 문제 추적 중에만 사용)
+        """
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.stall_threshold = stall_threshold
+        self.stall_log_path = Path(stall_log_path) if stall_log_path else None
+        self.asyncio_debug = asyncio_debug
+
+        self.stats = LagStats()
+        self.stalls: deque[StallReport] = deque(maxlen=STALL_HISTORY)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = time.monotonic()
+        self._current_stall: Optional[StallReport] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop_thread_id(self) -> Optional[int]:
+        """이벤트 루프 스레드 ID (프로파일링 대상)"""
+        return self._loop_thread_id
+
+    def start(self):
+        """감시 시작 (이벤트 루프 안에서 호출)"""
+        if self._task:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if self.asyncio_debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.lag_threshold
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"🩺 이벤트 루프 감시 시작 (경고 {self.lag_threshold * 1000:.0f}ms, "
+                    f"스택 기록 {self.stall_threshold * 1000:.0f}ms)")
+
+    async def close(self):
+        """감시 중지"""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join, 2)
+            self._watchdog = None
+
+    def snapshot(self) -> dict:
+        """상태 API용 요약"""
+        with self._lock:
+            stalls = [s.to_dict() for s in self.stalls]
+        return {
+            "lag": self.stats.to_dict(),
+            "lag_threshold_ms": self.lag_threshold * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "stalls": stalls,
+        }
+
+    def folded_stalls(self) -> str:
+        """보관 중인 멈춤 스택 (folded 형식, 멈춘 시간 ms를 가중치로)"""
+        counts: Counter = Counter()
+        with self._lock:
+            for stall in self.stalls:
+                counts[tuple(stall.stack)] += max(1, round(stall.duration * 1000))
+        return fold(counts)
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, loop.time() - expected)
+            self._last_beat = now
+            self._record_lag(lag)
+
+    def _record_lag(self, lag: float):
+        stats = self.stats
+        stats.samples += 1
+        stats.recent.append(lag)
+        stats.max_lag = max(stats.max_lag, lag)
+        if lag >= self.lag_threshold:
+            stats.over_threshold += 1
+            logger.warning("이벤트 루프 지연 %.0fms", lag * 1000)
+
+        with self._lock:
+            stall, self._current_stall = self._current_stall, None
+        if stall:
+            stall.duration = max(stall.duration, lag)
+            stall.ended = True
+            logger.warning("이벤트 루프가 %.0fms 동안 멈췄습니다. 멈춘 위치:\n  %s",
+                           stall.duration * 1000, "\n  ".join(stall.stack[-12:]))
+            self._append_stall_log(stall)
+
+    def _watch(self):
+        """감시 스레드: 루프가 응답하지 않으면 루프 스레드 스택 기록"""
+        check = min(self.interval, self.stall_threshold) / 2
+        while not self._stop.wait(check):
+            silent = time.monotonic() - self._last_beat - self.interval
+            if silent < self.stall_threshold:
+                continue
+            with self._lock:
+                if self._current_stall:
+                    self._current_stall.duration = silent
+                    continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stall = StallReport(started_at=datetime.now(), duration=silent, stack=stack_labels(frame))
+            frame = None
+            with self._lock:
+                self._current_stall = stall
+                self.stalls.append(stall)
+
+    def _append_stall_log(self, stall: StallReport):
+        if not self.stall_log_path:
+            return
+        try:
+            with open(self.stall_log_path, "a", encoding="utf-8") as f:
+                f.write(f"{';'.join(stall.stack)} {max(1, round(stall.duration * 1000))}\n")
+        except OSError as e:
+            logger.debug(f"멈춤 기록 저장 실패: {e}")
@@ -0,0 +1,151 @@
+"""
+샘플링 프로파일러
+
+일정 간격으로 호출 스택을 읽어 스택별 횟수를 셉니다. 대상 코드를 계측하지 않으므로
+실행 중인 녹화 프로세스에 붙여도 부담이 적습니다.
+
+- 이벤트 루프 스레드(메인 스레드): SIGALRM 타이머로 샘플링합니다. 별도 스레드에서
+  읽으면 루프가 select()로 GIL을 놓는 순간에만 샘플이 잡혀 실제로 시간을 쓰는 코드가
+  보이지 않기 때문입니다. 벽시계 기준이라 루프를 막는 sleep/wait도 잡힙니다.
+- 전체 스레드: 별도 스레드가 sys._current_frames()를 주기적으로 읽습니다.
+
+결과는 flamegraph.pl, speedscope, inferno 등이 읽는 folded 형식입니다.
+
+    MainThread;_run_once (base_events.py:1922);_monitor_loop (auto_recorder.py:260) 42
+"""
+
+import asyncio
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+# 샘플링 간격 (초)
+DEFAULT_INTERVAL = 0.005
+
+# 스택 최대 깊이 (깊은 재귀에서 한 줄이 지나치게 길어지지 않도록)
+MAX_DEPTH = 128
+
+
+class ProfilerBusyError(Exception):
+    """이미 프로파일링 중"""
+    pass
+
+
+def frame_label(frame: FrameType) -> str:
+    """프레임 하나의 표시 이름 (folded 형식 구분자는 제거)"""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({Path(code.co_filename).name}:{frame.f_lineno})".replace(";", ":")
+
+
+def stack_labels(frame: Optional[FrameType], limit: int = MAX_DEPTH) -> list[str]:
+    """프레임부터 바깥쪽으로 올라간 스택 (바깥쪽이 앞)"""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def fold(counts: Counter) -> str:
+    """스택별 횟수를 folded 형식 텍스트로 (많은 순)"""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common())
+
+
+class SamplingProfiler:
+    """스택 샘플링 프로파일러 (한 번에 하나만 실행)"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        """프로파일링 중인지"""
+        return self._lock.locked()
+
+    def sample(self, seconds: float, thread_id: Optional[int] = None) -> tuple[str, int]:
+        """
+        seconds초 동안 샘플링 (호출한 스레드는 제외)
+
+        Args:
+            seconds: 샘플링 시간
+            thread_id: 이 스레드만 샘플링 (None이면 전체)
+
+        Returns:
+            (folded 형식 텍스트, 샘플 수)
+
+        Raises:
+            ProfilerBusyError: 이미 프로파일링 중인 경우
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("이미 프로파일링 중입니다")
+        try:
+            return self._sample(seconds, thread_id)
+        finally:
+            self._lock.release()
+
+    async def profile(self, seconds: float, thread_id: Optional[int] = None) -> tuple[str, int]:
+        """
+        이벤트 루프를 막지 않고 샘플링
+
+        thread_id가 루프가 도는 메인 스레드이면 타이머 시그널로, 아니면 별도 스레드에서
+        샘플링합니다.
+        """
+        if self.busy:
+            raise ProfilerBusyError("이미 프로파일링 중입니다")
+        if thread_id is not None and thread_id == threading.get_ident() and self._can_use_timer():
+            return await self._profile_with_timer(seconds)
+        return await asyncio.to_thread(self.sample, seconds, thread_id)
+
+    @staticmethod
+    def _can_use_timer() -> bool:
+        return (hasattr(signal, "setitimer")
+                and threading.current_thread() is threading.main_thread()
+                and signal.getsignal(signal.SIGALRM) in (signal.SIG_DFL, None))
+
+    async def _profile_with_timer(self, seconds: float) -> tuple[str, int]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("이미 프로파일링 중입니다")
+        counts: Counter = Counter()
+        samples = 0
+        thread_name = threading.current_thread().name
+
+        def on_timer(signum, frame):
+            nonlocal samples
+            counts[(thread_name, *stack_labels(frame))] += 1
+            samples += 1
+
+        previous = signal.signal(signal.SIGALRM, on_timer)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+            await asyncio.sleep(seconds)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+            self._lock.release()
+        return fold(counts), samples
+
+    def _sample(self, seconds: float, thread_id: Optional[int]) -> tuple[str, int]:
+        me = threading.get_ident()
+        counts: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == me or (thread_id is not None and ident != thread_id):
+                    continue
+                counts[(names.get(ident, f"thread-{ident}"), *stack_labels(frame))] += 1
+            # 프레임 참조를 오래 잡고 있지 않도록
+            frames = frame = None
+            samples += 1
+            time.sleep(self.interval)
+        return fold(counts), samples
@@ -0,0 +1,300 @@
+"""
+무중단 업그레이드: 녹화 중인 FFmpeg을 새 프로세스에 넘기기
+
+새 버전을 실행하면 먼저 이전 프로세스의 핸드오프 소켓(유닉스 도메인 소켓)에 접속해
+녹화를 넘겨받습니다. 이전 프로세스는
+
+1. 채널별로 모니터링을 멈추고 기록/stderr 스레드를 읽은 데이터까지 파일에 기록한
+   경계에서 멈춘 뒤 (읽지 않은 출력은 파이프에 그대로 남음)
+2. 녹화 상태(JSON)와 FFmpeg의 pidfd, stdout/stderr 파이프(SCM_RIGHTS)를 보내고
+3. 새 프로세스의 확인을 받으면 녹화를 건드리지 않고 종료합니다.
+
+새 프로세스는 넘겨받은 파이프에서 이어서 기록하고 pidfd로 FFmpeg을 감시하므로
+FFmpeg은 재시작되지 않고 녹화 파일도 끊기지 않습니다 (채팅 녹화만 잠깐 끊겼다 같은
+파일에 이어서 기록). 확인이 오지 않으면 이전 프로세스가 녹화를 다시 맡습니다.
+
+FFmpeg을 넘길 수 있는 것은 같은 호스트, 같은 PID 네임스페이스 안에서 새 프로세스를
+실행한 경우입니다 (컨테이너 이미지를 바꾸면 새 컨테이너는 이전 FFmpeg을 볼 수 없음).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+
+from .recorder.adoption import DetachedRecording, adoption_supported
+from .shutdown import ShutdownCoordinator
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+
+# 메시지 길이 헤더
+_HEADER = struct.Struct("!I")
+# 녹화 하나에 붙는 파일 디스크립터 수 (pidfd, stdout, stderr)
+_FDS_PER_RECORDING = 3
+
+
+class HandoffError(Exception):
+    """녹화 넘기기 오류"""
+    pass
+
+
+def _send(sock: socket.socket, message: dict, fds: Optional[list[int]] = None):
+    """메시지 하나 보내기 (파일 디스크립터는 첫 바이트와 함께 전달)"""
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    data = _HEADER.pack(len(payload)) + payload
+    sent = socket.send_fds(sock, [data], fds) if fds else 0
+    sock.sendall(data[sent:])
+
+
+def _recv(sock: socket.socket) -> tuple[dict, list[int]]:
+    """메시지 하나 받기"""
+    data = b""
+    fds: list[int] = []
+    while len(data) < _HEADER.size:
+        chunk, received, _, _ = socket.recv_fds(sock, _HEADER.size - len(data), _FDS_PER_RECORDING)
+        fds += received
+        if not chunk:
+            _close_fds(fds)
+            raise HandoffError("연결이 끊어졌습니다")
+        data += chunk
+    (length,) = _HEADER.unpack(data)
+    payload = bytearray()
+    while len(payload) < length:
+        chunk = sock.recv(length - len(payload))
+        if not chunk:
+            _close_fds(fds)
+            raise HandoffError("연결이 끊어졌습니다")
+        payload += chunk
+    try:
+        return json.loads(payload), fds
+    except ValueError as e:
+        _close_fds(fds)
+        raise HandoffError(f"잘못된 메시지: {e}")
+
+
+def _close_fds(fds: list[int]):
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _receive_recordings(path: Path, timeout: float) -> Optional[tuple[list[DetachedRecording], int]]:
+    """
+    이전 프로세스에 접속해 녹화를 넘겨받음 (스레드에서 실행)
+
+    Returns:
+        (넘겨받은 녹화 목록, 이전 프로세스 PID), 이전 프로세스가 없으면 None
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            # 이전 프로세스가 없음 (정상 종료되지 않아 남은 소켓 파일이면 지움)
+            path.unlink(missing_ok=True)
+            return None
+
+        _send(sock, {"type": "hello", "version": PROTOCOL_VERSION, "pid": os.getpid()})
+        recordings: list[DetachedRecording] = []
+        try:
+            while True:
+                message, fds = _recv(sock)
+                if message.get("type") == "capture":
+                    if len(fds) != _FDS_PER_RECORDING:
+                        _close_fds(fds)
+                        raise HandoffError(f"파일 디스크립터가 부족합니다: {len(fds)}개")
+                    recordings.append(DetachedRecording(state=message["state"], fds=fds))
+                elif message.get("type") == "done":
+                    _send(sock, {"type": "ack", "count": len(recordings)})
+                    return recordings, message["pid"]
+                else:
+                    _close_fds(fds)
+                    raise HandoffError(message.get("message") or f"알 수 없는 메시지: {message.get('type')}")
+        except BaseException:
+            # 확인을 보내지 않았으므로 이전 프로세스가 녹화를 다시 맡음
+            for recording in recordings:
+                recording.close()
+            raise
+    except OSError as e:
+        raise HandoffError(f"녹화 넘겨받기 실패: {e}")
+    finally:
+        sock.close()
+
+
+async def take_over(path: Path, timeout: float = 10.0,
+                    wait_previous: bool = True) -> list[DetachedRecording]:
+    """
+    이전 프로세스의 녹화를 넘겨받음 (시작 시 호출)
+
+    이전 프로세스가 없으면 바로 빈 목록을 돌려줍니다. wait_previous면 대시보드 포트
+    등을 이어서 쓰도록 이전 프로세스가 끝날 때까지 (최대 timeout초) 기다립니다.
+
+    Raises:
+        HandoffError: 이전 프로세스가 실행 중인데 넘겨받지 못한 경우 (같은 채널을 두 번
+                      녹화하지 않도록 시작하지 않아야 함)
+    """
+    path = Path(path)
+    if not adoption_supported() or not path.exists():
+        return []
+    result = await asyncio.to_thread(_receive_recordings, path, timeout)
+    if result is None:
+        return []
+    recordings, previous_pid = result
+    logger.info(f"🔀 이전 프로세스(PID {previous_pid})에서 녹화 {len(recordings)}개 넘겨받음")
+
+    if not wait_previous:
+        return recordings
+    deadline = time.monotonic() + timeout
+    while _alive(previous_pid) and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    if _alive(previous_pid):
+        logger.warning(f"이전 프로세스(PID {previous_pid})가 아직 종료되지 않았습니다")
+    return recordings
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class HandoffServer:
+    """새 버전 프로세스에 녹화를 넘기는 소켓 서버 (넘긴 뒤 이 프로세스는 종료)"""
+
+    def __init__(self, path: Path, shutdown: ShutdownCoordinator, timeout: float = 10.0):
+        """
+        초기화
+
+        Args:
+            path: 유닉스 도메인 소켓 경로
+            shutdown: 종료 처리기 (manage()로 지정한 녹화기를 넘기고, 넘긴 뒤 종료 요청)
+            timeout: 새 프로세스의 응답을 기다리는 시간 (초)
+        """
+        self.path = Path(path)
+        self.shutdown = shutdown
+        self.timeout = timeout
+        self.handed_over = 0
+        self._sock: Optional[socket.socket] = None
+        self._inode = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> bool:
+        """소켓 열기 (지원하지 않는 환경이거나 열 수 없으면 False)"""
+        if not adoption_supported():
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(str(self.path))
+            os.chmod(self.path, 0o600)
+            self._inode = os.stat(self.path).st_ino
+            sock.listen(1)
+        except OSError as e:
+            sock.close()
+            logger.error(f"핸드오프 소켓을 열 수 없습니다 ({self.path}): {e}")
+            return False
+        sock.setblocking(False)
+        self._sock = sock
+        self._task = asyncio.create_task(self._serve())
+        logger.debug(f"핸드오프 소켓: {self.path}")
+        return True
+
+    async def close(self):
+        """소켓 닫기"""
+        task, self._task = self._task, None
+        if task and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._close_socket()
+
+    def _close_socket(self):
+        sock, self._sock = self._sock, None
+        if not sock:
+            return
+        try:
+            # 새 프로세스가 같은 경로에 소켓을 이미 만들었으면 지우지 않음
+            if os.stat(self.path).st_ino == self._inode:
+                self.path.unlink()
+        except OSError:
+            pass
+        sock.close()
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        while self._sock:
+            conn, _ = await loop.sock_accept(self._sock)
+            conn.setblocking(True)
+            conn.settimeout(self.timeout)
+            try:
+                if await self._handle(conn):
+                    return
+            except Exception as e:
+                logger.error(f"녹화 넘기기 실패: {e}")
+            finally:
+                conn.close()
+
+    async def _handle(self, conn: socket.socket) -> bool:
+        """새 프로세스 요청 처리 (넘겼으면 True)"""
+        hello, fds = await asyncio.to_thread(_recv, conn)
+        _close_fds(fds)
+        if hello.get("type") != "hello" or hello.get("version") != PROTOCOL_VERSION:
+            await asyncio.to_thread(_send, conn, {
+                "type": "error", "message": f"지원하지 않는 핸드오프 프로토콜: {hello.get('version')}"
+            })
+            return False
+        if self.shutdown.requested:
+            await asyncio.to_thread(_send, conn, {"type": "error", "message": "종료 중입니다"})
+            return False
+        logger.info(f"🔀 새 프로세스(PID {hello.get('pid')})에 녹화 넘기기 시작")
+
+        detached: list[tuple[object, DetachedRecording]] = []
+        for recorder in self.shutdown.recorders():
+            recording = await recorder.detach_recording()
+            if recording:
+                detached.append((recorder, recording))
+
+        try:
+            for _, recording in detached:
+                await asyncio.to_thread(_send, conn, {"type": "capture", "state": recording.state},
+                                        recording.fds)
+            await asyncio.to_thread(_send, conn, {"type": "done", "pid": os.getpid()})
+            reply, fds = await asyncio.to_thread(_recv, conn)
+            _close_fds(fds)
+            if reply.get("type") != "ack" or reply.get("count") != len(detached):
+                raise HandoffError(f"새 프로세스가 넘겨받지 못했습니다: {reply}")
+        except (OSError, HandoffError) as e:
+            logger.error(f"녹화 넘기기 실패, 녹화를 계속합니다: {e}")
+            for recorder, recording in detached:
+                try:
+                    await recorder.adopt_recording(recording)
+                except Exception as adopt_error:
+                    logger.error(f"녹화를 다시 맡지 못했습니다 ({recording.file_name}): {adopt_error}")
+                    recording.abandon()
+            return False
+
+        for _, recording in detached:
+            logger.info(f"  ➡️  넘김: {recording.file_name}")
+            recording.close()
+        self.handed_over = len(detached)
+        logger.info(f"🔀 녹화 {len(detached)}개를 새 프로세스에 넘겼습니다. 종료합니다")
+        self._close_socket()
+        self.shutdown.request()
+        return True
@@ -0,0 +1,186 @@
+"""
+헬스체크 (/healthz, /readyz)
+
+Docker HEALTHCHECK가 30초마다 프로세스를 띄워 pgrep/supervisorctl/df를 실행하고 로그
+파일 수정 시각을 보던 방식 대신, 녹화 프로세스가 이미 메모리에 가진 상태로 판단합니다.
+요청마다 하는 일은 statvfs 한 번과 채널 상태 순회뿐입니다.
+
+    /healthz   동작 상태: 이벤트 루프 지연, 채널별 마지막 폴링 성공, 녹화 파일 증가, 디스크 여유
+    /readyz    준비 상태: 녹화기 준비 완료, 종료(녹화 넘기기) 중이 아님 + /healthz 항목
+
+실패 항목이 있으면 503, 없으면 200으로 응답합니다. 본문은 항목별 결과 JSON입니다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from .shutdown import ShutdownCoordinator
+from ..config import HealthConfig
+
+logger = logging.getLogger(__name__)
+
+
+# 이벤트 루프 지연 측정 간격 (초)
+LAG_INTERVAL = 1.0
+# 지연 최대값을 볼 최근 측정 수 (LAG_INTERVAL 단위)
+LAG_WINDOW = 30
+# 설명에 이름을 적을 최대 채널 수
+MAX_LISTED = 5
+
+PASS, WARN, FAIL = "pass", "warn", "fail"
+
+
+def _check(status: str, description: str, **details: Any) -> dict[str, Any]:
+    return {"status": status, "description": description, **details}
+
+
+def _listed(names: list[str]) -> str:
+    shown = ", ".join(names[:MAX_LISTED])
+    return shown + (f" 외 {len(names) - MAX_LISTED}개" if len(names) > MAX_LISTED else "")
+
+
+class HealthMonitor:
+    """녹화 프로세스 상태로 헬스체크 응답 생성"""
+
+    def __init__(self, config: HealthConfig, recording_path: Path, shutdown: ShutdownCoordinator):
+        """
+        초기화
+
+        Args:
+            config: 헬스체크 설정
+            recording_path: 녹화 디렉터리 (디스크 여유 공간 확인)
+            shutdown: 종료 처리기 (manage()로 지정한 녹화기 목록과 종료 여부)
+        """
+        self.config = config
+        self.recording_path = Path(recording_path)
+        self.shutdown = shutdown
+        self._started = time.monotonic()
+        self._lags: deque[float] = deque(maxlen=LAG_WINDOW)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """이벤트 루프 지연 측정 시작 (이벤트 루프 안에서 호출)"""
+        if not self._task:
+            self._started = time.monotonic()
+            self._task = asyncio.create_task(self._heartbeat())
+
+    async def close(self):
+        """측정 중지"""
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def liveness(self) -> dict[str, Any]:
+        """/healthz 응답 본문"""
+        now = time.monotonic()
+        return self._report({
+            "event_loop": self._check_loop(),
+            "polling": self._check_polling(now),
+            "recordings": self._check_recordings(now),
+            "disk_space": self._check_disk(),
+        })
+
+    def readiness(self) -> dict[str, Any]:
+        """/readyz 응답 본문"""
+        report = self.liveness()
+        checks = {"recorders": self._check_ready(), **report["checks"]}
+        return self._report(checks)
+
+    @staticmethod
+    def _report(checks: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        failed = [name for name, check in checks.items() if check["status"] == FAIL]
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "healthy": not failed,
+            "checks": checks,
+        }
+        if failed:
+            report["failed_checks"] = failed
+        return report
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            self._lags.append(max(0.0, loop.time() - expected))
+
+    def _check_loop(self) -> dict[str, Any]:
+        lag_ms = round(max(self._lags, default=0.0) * 1000, 1)
+        status = FAIL if lag_ms >= self.config.max_loop_lag_ms else PASS
+        return _check(status, f"최근 최대 지연 {lag_ms:g}ms", max_lag_ms=lag_ms)
+
+    def _check_polling(self, now: float) -> dict[str, Any]:
+        """채널별 마지막 폴링 성공 이후 시간 (예정된 간격 + poll_stale_seconds까지 허용)"""
+        stale_after = self.config.poll_stale_seconds
+        channels = 0
+        stale = []
+        for recorder in self.shutdown.recorders():
+            state = recorder.state
+            channels += 1
+            if not state.checked_at:
+                # 아직 한 번도 성공하지 못함 (시작 직후는 허용)
+                if now - self._started > stale_after:
+                    stale.append(state.channel_id)
+                continue
+            allowed = stale_after
+            if not state.failures:
+                # 예측 폴링으로 간격이 긴 채널은 다음 예정 시각까지 기다림
+                allowed += max(0.0, state.next_due - state.checked_at)
+            if now - state.checked_at > allowed:
+                stale.append(state.channel_id)
+        if stale:
+            return _check(FAIL, f"폴링이 멈춘 채널 {len(stale)}/{channels}개: {_listed(stale)}",
+                          stale_channels=stale)
+        return _check(PASS, f"채널 {channels}개 폴링 정상")
+
+    def _check_recordings(self, now: float) -> dict[str, Any]:
+        """녹화 중인 파일이 최근에 커졌는지"""
+        stall_after = self.config.recording_stall_seconds
+        recording = 0
+        stalled = []
+        for recorder in self.shutdown.recorders():
+            info = recorder.current_recording
+            if not info or not info.is_recording:
+                continue
+            recording += 1
+            if info.progress_at and now - info.progress_at > stall_after:
+                stalled.append(info.file_path.name)
+        if stalled:
+            return _check(FAIL, f"{stall_after:g}초 이상 커지지 않는 녹화 {len(stalled)}개: {_listed(stalled)}",
+                          stalled_recordings=stalled)
+        return _check(PASS, f"녹화 {recording}개 진행 중")
+
+    def _check_disk(self) -> dict[str, Any]:
+        try:
+            stat = os.statvfs(self.recording_path)
+        except OSError as e:
+            return _check(FAIL, f"녹화 디렉터리를 확인할 수 없습니다: {e}")
+        free_mb = stat.f_bavail * stat.f_frsize / 1024 / 1024
+        used_percent = 100.0 * (1 - stat.f_bavail / stat.f_blocks) if stat.f_blocks else 0.0
+        details = {"free_mb": round(free_mb), "used_percent": round(used_percent, 1)}
+        if free_mb < self.config.disk_min_free_mb:
+            return _check(FAIL, f"여유 공간 부족: {free_mb:.0f}MB", **details)
+        if used_percent >= self.config.disk_warn_percent:
+            return _check(WARN, f"사용률 {used_percent:.0f}%", **details)
+        return _check(PASS, f"여유 {free_mb / 1024:.1f}GB ({used_percent:.0f}% 사용)", **details)
+
+    def _check_ready(self) -> dict[str, Any]:
+        if self.shutdown.requested:
+            return _check(FAIL, "종료 중")
+        if not self.shutdown.managed:
+            return _check(FAIL, "녹화기 시작 중")
+        waiting = [r.channel_id for r in self.shutdown.recorders() if not r.is_running]
+        if waiting:
+            return _check(FAIL, f"준비 중인 채널 {len(waiting)}개: {_listed(waiting)}")
+        return _check(PASS, "준비 완료")
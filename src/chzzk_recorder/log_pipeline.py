@@ -0,0 +1,247 @@
+"""
+구조화 로깅 파이프라인
+
+이벤트 루프에서 호출하는 logger.info/debug가 디스크/콘솔 I/O를 하지 않도록
+로그 레코드를 큐에 넣기만 하고, 포맷과 출력은 리스너 스레드가 맡습니다.
+
+- 호출 스레드: 레벨 확인 → 샘플링 → 채널 컨텍스트(contextvars)를 레코드에 붙여 큐에 넣음
+  (메시지 % 포맷도 하지 않음 - 지연 포맷)
+- 리스너 스레드: structlog ProcessorFormatter로 시각/레벨/컨텍스트를 붙여 출력
+  (기본은 기존과 같은 "시각 - 로거 - 레벨 - 메시지 key=value" 형식, json_format이면 JSON 한 줄)
+- 샘플링: 같은 위치(로거, 줄 번호)에서 반복되는 DEBUG 로그(채널별 폴링 로그 등)는
+  구간마다 burst개까지만 남기고, 생략한 개수는 다음에 남기는 로그에 sampled_skipped로 표시
+
+기존 모듈의 logging.getLogger(__name__) 로그와 structlog.get_logger() 로그가
+같은 경로로 출력됩니다. 채널 컨텍스트는 bind_channel()로 태스크마다 붙입니다.
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import structlog
+
+from ..config import LoggingConfig
+
+
+def bind_channel(channel_id: str):
+    """
+    현재 태스크(컨텍스트)의 로그에 채널 ID 붙이기
+
+    asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로, 채널별 태스크 안에서
+    호출하면 그 태스크와 거기서 만든 태스크의 로그에만 적용됩니다.
+    """
+    structlog.contextvars.bind_contextvars(channel=channel_id)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """컨텍스트만 붙여 큐에 넣는 핸들러 (포맷은 리스너 스레드에서)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = structlog.contextvars.get_contextvars()
+        if context:
+            record.context = context
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """같은 위치에서 반복되는 로그를 구간마다 일정 개수만 통과"""
+
+    def __init__(self, burst: int = 20, window: float = 10.0, max_level: int = logging.DEBUG):
+        """
+        Args:
+            burst: 구간마다 위치별로 남길 로그 수
+            window: 구간 길이 (초)
+            max_level: 이 레벨 이하만 샘플링 (경고/오류는 항상 통과)
+        """
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_level = max_level
+        self.dropped = 0
+        self._sites: dict[tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window:
+            # [구간 시작, 통과 수, 생략 수]
+            self._sites[key] = [now, 1, 0]
+            if site and site[2]:
+                record.sampled_skipped = site[2]
+            return True
+        if site[1] < self.burst:
+            site[1] += 1
+            return True
+        site[2] += 1
+        self.dropped += 1
+        return False
+
+
+def _add_record_fields(logger, method_name: str, event_dict: dict) -> dict:
+    """표준 logging 레코드의 시각/컨텍스트/샘플링 정보를 이벤트에 추가"""
+    record: Optional[logging.LogRecord] = event_dict.get("_record")
+    if record is None:
+        return event_dict
+    event_dict.setdefault("timestamp", record.created)
+    for key, value in getattr(record, "context", {}).items():
+        event_dict.setdefault(key, value)
+    skipped = getattr(record, "sampled_skipped", 0)
+    if skipped:
+        event_dict["sampled_skipped"] = skipped
+    return event_dict
+
+
+def _format_timestamp(logger, method_name: str, event_dict: dict) -> dict:
+    timestamp = event_dict.get("timestamp")
+    if isinstance(timestamp, float):
+        moment = datetime.fromtimestamp(timestamp)
+        event_dict["timestamp"] = moment.strftime("%Y-%m-%d %H:%M:%S,") + f"{moment.microsecond // 1000:03d}"
+    return event_dict
+
+
+def _plain_renderer(logger, method_name: str, event_dict: dict) -> str:
+    """기존 로그와 같은 형식 + 컨텍스트 key=value"""
+    timestamp = event_dict.pop("timestamp", "")
+    name = event_dict.pop("logger", "")
+    level = event_dict.pop("level", method_name).upper()
+    message = event_dict.pop("event", "")
+    exception = event_dict.pop("exception", None)
+    line = f"{timestamp} - {name} - {level} - {message}"
+    if event_dict:
+        line += " " + " ".join(f"{key}={value}" for key, value in event_dict.items())
+    if exception:
+        line += "\n" + exception
+    return line
+
+
+class LogPipeline:
+    """큐 기반 로깅 파이프라인 (리스너 스레드 소유)"""
+
+    def __init__(self, handlers: list[logging.Handler], level: int,
+                 sampling: Optional[SamplingFilter] = None):
+        """
+        Args:
+            handlers: 실제 출력 핸들러 (리스너 스레드에서 실행)
+            level: 루트 로그 레벨
+            sampling: 반복 로그 샘플링 필터
+        """
+        self.handlers = handlers
+        self.sampling = sampling
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = ContextQueueHandler(self.queue)
+        if sampling:
+            self.handler.addFilter(sampling)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.level = level
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """루트 로거를 큐 핸들러로 교체하고 리스너 시작"""
+        with self._lock:
+            if self._started:
+                return
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(self.handler)
+            root.setLevel(self.level)
+            self.listener.start()
+            self._started = True
+
+    def flush(self, timeout: float = 1.0):
+        """큐에 쌓인 로그가 출력될 때까지 대기 (리스너는 계속 실행)"""
+        deadline = time.monotonic() + timeout
+        while not self.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        """남은 로그를 모두 출력하고 리스너 종료"""
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            logging.getLogger().removeHandler(self.handler)
+            self.listener.stop()
+            for handler in self.handlers:
+                handler.close()
+
+
+def build_formatter(json_format: bool = False) -> structlog.stdlib.ProcessorFormatter:
+    """리스너 스레드에서 쓰는 포맷터"""
+    renderer = structlog.processors.JSONRenderer(ensure_ascii=False) if json_format else _plain_renderer
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            _add_record_fields,
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            _format_timestamp,
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+    )
+
+
+def configure_logging(config: LoggingConfig) -> LogPipeline:
+    """
+    로깅 설정 (파일/콘솔 출력은 리스너 스레드로)
+
+    Returns:
+        시작된 파이프라인 (종료 시 close() 호출)
+    """
+    config.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    handlers: list[logging.Handler] = []
+    if config.console_output:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(build_formatter())
+        handlers.append(console_handler)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        config.file_path,
+        maxBytes=config.max_file_size_mb * 1024 * 1024,
+        backupCount=config.backup_count,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(build_formatter(config.json_format))
+    handlers.append(file_handler)
+
+    sampling = None
+    if config.sample_burst > 0:
+        sampling = SamplingFilter(config.sample_burst, config.sample_window_seconds, config.sample_max_level)
+
+    # structlog.get_logger()로 남기는 로그도 같은 큐로
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt=None),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    # 요청마다 INFO 로그를 남기는 라이브러리
+    for name in config.quiet_loggers:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    pipeline = LogPipeline(handlers, config.level, sampling)
+    pipeline.start()
+    return pipeline
@@ -3,5 +3,10 @@
 """
 
 from .live_monitor import LiveMonitor, LiveStatus, StreamInfo
+from .channel_state import ChannelState, ChannelStateTable
+from .http_pool import HttpPool, get_http_pool, close_http_pools, http_pool_stats
+from .batch_status import BatchStatusProvider, BatchResult
 
-__all__ = ["LiveMonitor", "LiveStatus", "StreamInfo"] 
\ No newline at end of file
+__all__ = ["LiveMonitor", "LiveStatus", "StreamInfo", "ChannelState", "ChannelStateTable",
+           "HttpPool", "get_http_pool", "close_http_pools", "http_pool_stats",
+           "BatchStatusProvider", "BatchResult"] 
\ No newline at end of file
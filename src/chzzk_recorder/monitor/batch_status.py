@@ -0,0 +1,140 @@
+"""
+여러 채널 방송 상태 일괄 조회
+
+live-status는 채널 하나씩만 조회할 수 있어 채널 300개면 주기마다 요청 300개가
+필요합니다. NID 쿠키 계정이 팔로우한 채널 목록(followings)은 채널마다 방송 중 여부를
+함께 돌려주므로, 페이지 몇 개로 팔로우한 채널 전체의 상태를 알 수 있습니다.
+
+- 팔로우한 채널 중 방송 중이 아닌 채널은 채널별 live-status 폴링을 건너뜀
+- 방송이 시작됐거나(꺼짐 → 켜짐) 끝난(켜짐 → 꺼짐) 채널만 채널별 폴링으로 확인
+- 팔로우하지 않은 채널, 목록이 오래됐거나 조회에 실패한 경우는 채널별 폴링을 그대로 사용
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import httpx
+
+from .decoders import JsonDecoder, get_decoder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """일괄 조회 결과"""
+    # 채널 ID → 방송 중 여부
+    live: dict[str, bool]
+    # 요청한 페이지 수
+    requests: int
+    fetched_at: float
+
+
+class BatchStatusProvider:
+    """팔로우 채널 목록 기반 방송 상태 일괄 조회"""
+
+    FOLLOWINGS_URL = "https://api.chzzk.naver.com/service/v1/channels/followings"
+
+    def __init__(self,
+                 client: httpx.AsyncClient,
+                 decoder: Union[JsonDecoder, str] = "auto",
+                 page_size: int = 505,
+                 max_age: float = 60.0):
+        """
+        초기화
+
+        Args:
+            client: 인증 쿠키가 있는 HTTP 클라이언트 (HttpPool.client)
+            decoder: 응답 디코더 또는 이름
+            page_size: 페이지당 채널 수 (치지직 웹과 같은 값)
+            max_age: 이 시간(초)보다 오래된 결과는 쓰지 않음 (채널별 폴링으로 대체)
+        """
+        self._client = client
+        self._decoder = get_decoder(decoder) if isinstance(decoder, str) else decoder
+        self.page_size = page_size
+        self.max_age = max_age
+        # 인증 실패 등으로 이 계정에서 쓸 수 없으면 False
+        self.available = True
+        self.requests = 0
+        self.failures = 0
+        self._result: Optional[BatchResult] = None
+
+    async def fetch(self) -> Optional[BatchResult]:
+        """
+        팔로우 채널 목록을 모두 받아 상태 갱신
+
+        Returns:
+            조회 결과 (실패하면 None, 이전 결과는 max_age가 지나면 버려짐)
+        """
+        live: dict[str, bool] = {}
+        page, pages, requests = 0, 1, 0
+        try:
+            while page < pages:
+                response = await self._client.get(self.FOLLOWINGS_URL, params={
+                    "page": page, "size": self.page_size, "sortType": "FOLLOW"
+                })
+                requests += 1
+                if response.status_code in (401, 403):
+                    self._disable(f"인증 실패 ({response.status_code})")
+                    return None
+                response.raise_for_status()
+
+                data = self._decoder.loads(response.content)
+                content = data.get("content") if isinstance(data, dict) else None
+                if data.get("code") != 200 or not isinstance(content, dict):
+                    self._disable(f"응답 코드 {data.get('code')}")
+                    return None
+                for item in content.get("followingList") or ():
+                    channel_id = item.get("channelId") or (item.get("channel") or {}).get("channelId")
+                    if channel_id:
+                        live[channel_id] = bool((item.get("streamer") or {}).get("openLive"))
+                pages = content.get("totalPage") or 1
+                page += 1
+        except (httpx.HTTPError, ValueError, AttributeError, TypeError) as e:
+            self.failures += 1
+            logger.warning(f"팔로우 채널 목록 조회 실패: {e}")
+            return None
+        finally:
+            self.requests += requests
+
+        if not self.available:
+            logger.info("팔로우 채널 목록 일괄 조회 다시 사용")
+        self.available = True
+        self._result = BatchResult(live, requests, time.monotonic())
+        return self._result
+
+    def _disable(self, reason: str):
+        if self.available:
+            logger.warning(f"팔로우 채널 목록을 사용할 수 없어 채널별로 폴링합니다: {reason}")
+        self.available = False
+        self._result = None
+
+    @property
+    def result(self) -> Optional[BatchResult]:
+        """max_age 안의 최근 결과"""
+        result = self._result
+        if result and time.monotonic() - result.fetched_at <= self.max_age:
+            return result
+        return None
+
+    def covers(self, channel_id: str) -> bool:
+        """최근 결과에 이 채널이 있는지 (팔로우 중인지)"""
+        result = self.result
+        return bool(result) and channel_id in result.live
+
+    def is_offline(self, channel_id: str) -> bool:
+        """최근 결과에서 방송 중이 아닌 것이 확인된 채널"""
+        result = self.result
+        return bool(result) and result.live.get(channel_id) is False
+
+    def stats(self) -> dict:
+        result = self.result
+        return {
+            "available": self.available,
+            "requests": self.requests,
+            "failures": self.failures,
+            "followed": len(result.live) if result else 0,
+            "live": sum(result.live.values()) if result else 0,
+        }
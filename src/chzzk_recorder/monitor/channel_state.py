@@ -0,0 +1,111 @@
+"""
+채널별 폴링 상태 테이블
+
+채널 수천 개를 감시해도 대부분은 방송 중이 아닙니다. 방송 중이 아닌 채널은
+StreamInfo를 들고 있지 않고, 이 테이블의 작은 레코드(__slots__)만 유지합니다.
+
+    상태, 다음 폴링 시각, 오류 대기 시간, 마지막 방송 ID, 상세 정보 해시
+
+상세 정보 해시(제목/카테고리/HLS URL)로 폴링 결과가 바뀌었는지만 비교하므로
+이전 StreamInfo를 보관할 필요가 없습니다.
+"""
+
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from .live_monitor import LiveStatus, StreamInfo
+
+
+# 오류 시 대기 시간 (초): 실패할 때마다 두 배, 최대값까지
+BACKOFF_BASE = 10.0
+BACKOFF_MAX = 300.0
+
+
+def detail_hash(stream_info: StreamInfo) -> int:
+    """녹화에 영향을 주는 상세 정보의 해시 (바뀌었는지 비교용)"""
+    key = "\x1f".join((stream_info.title or "", stream_info.category or "", stream_info.hls_url or ""))
+    return zlib.crc32(key.encode("utf-8"))
+
+
+@dataclass(slots=True)
+class ChannelState:
+    """채널 하나의 폴링 상태"""
+    channel_id: str
+    status: LiveStatus = LiveStatus.UNKNOWN
+    # 다음 폴링 시각 (time.monotonic 기준)
+    next_due: float = 0.0
+    # 연속 오류 시 대기 시간 (초, 0이면 정상)
+    backoff: float = 0.0
+    failures: int = 0
+    # 마지막으로 본 방송 ID와 상세 정보 해시
+    live_id: Optional[int] = None
+    detail_hash: int = 0
+    # 마지막 폴링 성공 시각 (time.monotonic 기준, 0이면 아직 없음)
+    checked_at: float = 0.0
+
+    @property
+    def is_live(self) -> bool:
+        return self.status == LiveStatus.ONLINE
+
+    def record_success(self, stream_info: StreamInfo, next_due: float) -> bool:
+        """
+        폴링 결과 반영
+
+        Returns:
+            방송 중이고 상세 정보(제목/카테고리/HLS URL)가 바뀌었으면 True
+        """
+        self.status = stream_info.status
+        self.next_due = next_due
+        self.checked_at = time.monotonic()
+        self.backoff = 0.0
+        self.failures = 0
+        if not stream_info.is_live:
+            self.detail_hash = 0
+            return False
+        if stream_info.live_id is not None:
+            self.live_id = stream_info.live_id
+        digest = detail_hash(stream_info)
+        changed = digest != self.detail_hash
+        self.detail_hash = digest
+        return changed
+
+    def record_failure(self, now: float) -> float:
+        """
+        폴링 오류 반영
+
+        Returns:
+            다음 폴링까지 대기할 시간 (초)
+        """
+        self.failures += 1
+        self.backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.failures - 1))
+        self.next_due = now + self.backoff
+        return self.backoff
+
+
+class ChannelStateTable:
+    """채널 ID → ChannelState"""
+
+    def __init__(self):
+        self._states: dict[str, ChannelState] = {}
+
+    def get(self, channel_id: str) -> ChannelState:
+        """채널 상태 (없으면 생성)"""
+        state = self._states.get(channel_id)
+        if state is None:
+            state = self._states[channel_id] = ChannelState(channel_id)
+        return state
+
+    def remove(self, channel_id: str):
+        self._states.pop(channel_id, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __iter__(self) -> Iterator[ChannelState]:
+        return iter(self._states.values())
+
+    def live_count(self) -> int:
+        """방송 중인 채널 수"""
+        return sum(1 for state in self._states.values() if state.status == LiveStatus.ONLINE)
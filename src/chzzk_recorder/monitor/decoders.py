@@ -0,0 +1,211 @@
+"""
+치지직 API 응답 디코더
+
+채널 수백 개가 몇 초마다 폴링하면 JSON 디코딩이 CPU를 가장 많이 씁니다.
+응답 본문(bytes)을 StreamInfo에 필요한 필드만 담은 구조로 바로 디코딩합니다.
+
+- msgspec: live-status/live-detail을 필요한 필드만 있는 Struct로 디코딩
+  (나머지 필드는 값을 만들지 않고 건너뜀)
+- orjson: 전체를 빠르게 디코딩한 뒤 필요한 필드만 꺼냄
+- json: 표준 라이브러리 (항상 사용 가능)
+
+get_decoder("auto")는 설치된 것 중 가장 빠른 디코더를 고릅니다.
+livePlaybackJson 문자열도 같은 디코더의 loads()로 디코딩합니다.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# get_decoder("auto")의 우선순위
+DECODER_PRIORITY = ("msgspec", "orjson", "json")
+
+
+@dataclass
+class LiveStatusPayload:
+    """live-status 응답에서 쓰는 필드"""
+    status: Optional[str] = None
+
+
+@dataclass
+class LiveDetailPayload:
+    """live-detail 응답에서 쓰는 필드"""
+    live_id: Optional[int] = None
+    live_title: Optional[str] = None
+    category_value: Optional[str] = None
+    channel_name: Optional[str] = None
+    concurrent_user_count: Optional[int] = None
+    live_image_url: Optional[str] = None
+    chat_channel_id: Optional[str] = None
+    open_date: Optional[str] = None
+    # 재생 정보 (보통 JSON 문자열, PlaybackParser가 디코딩)
+    live_playback_json: Any = None
+    live_playback: Any = None
+
+
+def _detail_from_dict(content: dict) -> LiveDetailPayload:
+    channel = content.get("channel")
+    live_id = content.get("liveId")
+    return LiveDetailPayload(
+        live_id=live_id if isinstance(live_id, int) else None,
+        live_title=content.get("liveTitle"),
+        category_value=content.get("categoryValue"),
+        channel_name=channel.get("channelName") if isinstance(channel, dict) else None,
+        concurrent_user_count=content.get("concurrentUserCount"),
+        live_image_url=content.get("liveImageUrl"),
+        chat_channel_id=content.get("chatChannelId"),
+        open_date=content.get("openDate"),
+        live_playback_json=content.get("livePlaybackJson"),
+        live_playback=content.get("livePlayback"),
+    )
+
+
+class JsonDecoder:
+    """표준 라이브러리 json 디코더 (디코딩 오류는 ValueError)"""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def live_status(self, data: bytes) -> Optional[LiveStatusPayload]:
+        """live-status 응답 (content가 없으면 None)"""
+        content = self.loads(data).get("content")
+        if not content:
+            return None
+        return LiveStatusPayload(status=content.get("status"))
+
+    def live_detail(self, data: bytes) -> Optional[LiveDetailPayload]:
+        """live-detail 응답 (content가 없으면 None)"""
+        content = self.loads(data).get("content")
+        if not content:
+            return None
+        return _detail_from_dict(content)
+
+
+class OrjsonDecoder(JsonDecoder):
+    """orjson 디코더"""
+
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+if msgspec:
+    class _StatusContent(msgspec.Struct):
+        status: Optional[str] = None
+
+    class _StatusResponse(msgspec.Struct):
+        content: Optional[_StatusContent] = None
+
+    class _Channel(msgspec.Struct, rename="camel"):
+        channel_name: Optional[str] = None
+
+    class _DetailContent(msgspec.Struct, rename="camel"):
+        live_id: Optional[int] = None
+        live_title: Optional[str] = None
+        category_value: Optional[str] = None
+        channel: Optional[_Channel] = None
+        concurrent_user_count: Optional[int] = None
+        live_image_url: Optional[str] = None
+        chat_channel_id: Optional[str] = None
+        open_date: Optional[str] = None
+        live_playback_json: Any = None
+        live_playback: Any = None
+
+    class _DetailResponse(msgspec.Struct):
+        content: Optional[_DetailContent] = None
+
+
+class MsgspecDecoder(JsonDecoder):
+    """msgspec 디코더 (필요한 필드만 Struct로)"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._decoder = msgspec.json.Decoder()
+        self._status_decoder = msgspec.json.Decoder(_StatusResponse)
+        self._detail_decoder = msgspec.json.Decoder(_DetailResponse)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+    def live_status(self, data: bytes) -> Optional[LiveStatusPayload]:
+        try:
+            content = self._status_decoder.decode(data).content
+        except msgspec.ValidationError:
+            # 필드 타입이 예상과 다르면 일반 디코딩으로
+            return super().live_status(data)
+        if content is None:
+            return None
+        return LiveStatusPayload(status=content.status)
+
+    def live_detail(self, data: bytes) -> Optional[LiveDetailPayload]:
+        try:
+            content = self._detail_decoder.decode(data).content
+        except msgspec.ValidationError as e:
+            logger.debug("live-detail 필드 타입 불일치, 일반 디코딩 사용: %s", e)
+            return super().live_detail(data)
+        if content is None:
+            return None
+        return LiveDetailPayload(
+            live_id=content.live_id,
+            live_title=content.live_title,
+            category_value=content.category_value,
+            channel_name=content.channel.channel_name if content.channel else None,
+            concurrent_user_count=content.concurrent_user_count,
+            live_image_url=content.live_image_url,
+            chat_channel_id=content.chat_channel_id,
+            open_date=content.open_date,
+            live_playback_json=content.live_playback_json,
+            live_playback=content.live_playback,
+        )
+
+
+_DECODERS = {
+    "msgspec": (MsgspecDecoder, msgspec),
+    "orjson": (OrjsonDecoder, orjson),
+    "json": (JsonDecoder, json),
+}
+
+
+def available_decoders() -> list[str]:
+    """설치되어 사용할 수 있는 디코더 이름 (빠른 순)"""
+    return [name for name in DECODER_PRIORITY if _DECODERS[name][1] is not None]
+
+
+def get_decoder(name: str = "auto") -> JsonDecoder:
+    """
+    디코더 생성
+
+    Args:
+        name: "auto", "msgspec", "orjson", "json"
+            (지정한 라이브러리가 설치되어 있지 않으면 경고 후 표준 json 사용)
+
+    Raises:
+        ValueError: 알 수 없는 이름
+    """
+    if name == "auto":
+        name = available_decoders()[0]
+    if name not in _DECODERS:
+        raise ValueError(f"알 수 없는 JSON 디코더: {name}")
+    decoder_class, module = _DECODERS[name]
+    if module is None:
+        logger.warning(f"{name}이(가) 설치되어 있지 않아 표준 json 디코더를 사용합니다")
+        return JsonDecoder()
+    return decoder_class()
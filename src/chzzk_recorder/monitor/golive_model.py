@@ -0,0 +1,331 @@
+"""
+방송 시작 예측 폴링 간격
+
+대부분의 스트리머는 요일/시간대별로 방송을 시작하는 시각이 일정합니다. 같은 간격으로
+하루 종일 폴링하면 새벽 4시와 저녁 8시에 같은 요청을 쓰게 됩니다.
+
+채널별 과거 방송 시작 시각으로 요일 x 시간(168칸)별 방송 시작 확률(시간당 hazard)을
+추정하고, 같은 요청 수(기본 폴링 간격 기준 예산) 안에서 예상 감지 지연이 가장 작도록
+칸별 폴링 간격을 나눕니다.
+
+    칸 s에서 간격 τ_s로 폴링하면 방송 시작부터 감지까지 평균 τ_s / 2,
+    요청 수는 칸마다 3600 / τ_s. Σ λ_s·τ_s/2 를 Σ 3600/τ_s = 예산 조건에서
+    최소화하면 τ_s ∝ 1/√λ_s (최소/최대 간격으로 제한)
+
+- 최근 기록일수록 가중치가 큼 (half_life_days마다 절반)
+- 기록이 적은 칸은 같은 시간대(요일 무관), 채널 평균 순으로 당겨 추정. 당기는 강도는
+  기록이 우연보다 얼마나 몰려 있는지로 정하므로, 불규칙한 채널은 고정 간격에 가까워짐
+- 방송 시작 기록이 min_events개 미만이면 기본 간격 사용
+
+시각은 치지직 기준(KST)의 요일/시간으로 나눕니다 (컨테이너 시간대와 무관).
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+KST = timezone(timedelta(hours=9))
+SLOTS = 7 * 24
+WEEK_SECONDS = 7 * 24 * 3600
+
+
+def to_kst(when: datetime) -> datetime:
+    """KST 시각 (시간대가 없으면 치지직 API와 같은 KST로 간주)"""
+    if when.tzinfo is None:
+        return when.replace(tzinfo=KST)
+    return when.astimezone(KST)
+
+
+def slot_of(when: datetime) -> int:
+    """요일 x 시간 칸 번호 (월요일 0시 = 0)"""
+    when = to_kst(when)
+    return when.weekday() * 24 + when.hour
+
+
+def allocate_intervals(rates: list[float], requests_per_week: float,
+                       min_interval: float, max_interval: float) -> list[float]:
+    """
+    칸별 폴링 간격 (예상 감지 지연 최소화, 주당 요청 수 예산)
+
+    Args:
+        rates: 칸별 방송 시작 hazard (시간당)
+        requests_per_week: 주당 요청 수 예산
+        min_interval: 최소 간격 (초)
+        max_interval: 최대 간격 (초)
+    """
+    def intervals(scale: float) -> list[float]:
+        return [min(max_interval, max(min_interval, scale / math.sqrt(rate))) if rate > 0 else max_interval
+                for rate in rates]
+
+    def cost(scale: float) -> float:
+        return sum(3600 / interval for interval in intervals(scale))
+
+    # 간격 배율을 이분 탐색 (배율이 클수록 요청 수가 줄어듦)
+    low, high = 1e-6, 1e9
+    if cost(high) >= requests_per_week:
+        return intervals(high)
+    if cost(low) <= requests_per_week:
+        return intervals(low)
+    for _ in range(100):
+        middle = math.sqrt(low * high)
+        if cost(middle) > requests_per_week:
+            low = middle
+        else:
+            high = middle
+    return intervals(high)
+
+
+def shrink(counts: list[float], exposure: float, targets: list[float]) -> list[float]:
+    """
+    칸별 hazard 추정 (감마-푸아송 경험적 베이즈)
+
+    칸별 관측 수가 우연히 생기는 정도(푸아송)보다 얼마나 더 흩어져 있는지로 당기는
+    강도를 정합니다. 불규칙한 채널은 targets에 가깝게, 규칙적인 채널은 관측에 가깝게.
+
+    Args:
+        counts: 칸별 (가중) 방송 시작 수
+        exposure: 칸별 관측 시간 (시간)
+        targets: 칸별로 당길 hazard (상위 단계 추정값)
+    """
+    excess = sum((count - exposure * target) ** 2 - exposure * target
+                 for count, target in zip(counts, targets)) / len(counts)
+    variance = max(0.0, excess) / exposure ** 2
+    if variance <= 0:
+        return list(targets)
+    return [(count + target * target / variance) / (exposure + target / variance) if target > 0
+            else count / exposure for count, target in zip(counts, targets)]
+
+
+@dataclass
+class HazardModel:
+    """채널 하나의 요일 x 시간별 방송 시작 hazard와 폴링 간격"""
+    rates: list[float]
+    intervals: list[float]
+    events: int
+
+    @classmethod
+    def fit(cls, starts: list[datetime], now: datetime, base_interval: float,
+            min_interval: float = 30.0, max_interval: float = 900.0,
+            half_life_days: float = 56.0) -> "HazardModel":
+        """
+        과거 방송 시작 시각으로 모델 생성
+
+        Args:
+            starts: 방송 시작 시각 목록 (now 이전)
+            now: 기준 시각
+            base_interval: 기본 폴링 간격 (요청 수 예산 = 이 간격으로 계속 폴링할 때)
+            min_interval: 최소 간격 (초)
+            max_interval: 최대 간격 (초)
+            half_life_days: 기록 가중치가 절반이 되는 기간 (일)
+        """
+        now = to_kst(now)
+        weights = [0.0] * SLOTS
+        first = now
+        for start in starts:
+            start = to_kst(start)
+            age_days = (now - start).total_seconds() / 86400
+            if age_days < 0:
+                continue
+            weights[slot_of(start)] += 0.5 ** (age_days / half_life_days)
+            first = min(first, start)
+
+        # 관측 기간(주)의 가중 합: 각 칸은 한 주에 한 번 (1시간) 관측됨
+        span_days = max(7.0, (now - first).total_seconds() / 86400)
+        half_life = half_life_days / math.log(2)
+        exposure = half_life * (1 - math.exp(-span_days / half_life)) / 7
+
+        # 요일 x 시간 → 시간대(요일 무관) → 채널 전체 평균 순으로 당겨 추정
+        overall = sum(weights) / SLOTS / exposure
+        hourly = shrink([sum(weights[day * 24 + hour] for day in range(7)) for hour in range(24)],
+                        7 * exposure, [overall] * 24)
+        rates = shrink(weights, exposure, [hourly[slot % 24] for slot in range(SLOTS)])
+
+        budget = WEEK_SECONDS / base_interval
+        intervals = allocate_intervals(rates, budget, min_interval, max_interval)
+        return cls(rates, intervals, len(starts))
+
+    def interval_at(self, when: datetime) -> float:
+        """이 시각의 폴링 간격 (초)"""
+        return self.intervals[slot_of(when)]
+
+    def expected_delay(self) -> float:
+        """방송 시작부터 감지까지 예상 지연 (초, hazard 가중 평균)"""
+        total = sum(self.rates)
+        if not total:
+            return 0.0
+        return sum(rate * interval / 2 for rate, interval in zip(self.rates, self.intervals)) / total
+
+    def requests_per_day(self) -> float:
+        return sum(3600 / interval for interval in self.intervals) / 7
+
+
+class GoLivePredictor:
+    """방송 시작 기록 저장 + 채널별 예측 폴링 간격"""
+
+    # 모델을 다시 계산하는 주기 (가중치가 시간에 따라 바뀜)
+    REFIT_INTERVAL = timedelta(hours=1)
+
+    def __init__(self,
+                 history_path: Optional[Path],
+                 min_events: int = 5,
+                 min_interval: float = 30.0,
+                 max_interval: float = 900.0,
+                 half_life_days: float = 56.0):
+        """
+        초기화
+
+        Args:
+            history_path: 방송 시작 기록 파일 (JSONL, None이면 메모리에만)
+            min_events: 예측을 쓰기 시작하는 최소 방송 시작 기록 수
+            min_interval: 최소 폴링 간격 (초)
+            max_interval: 최대 폴링 간격 (초)
+            half_life_days: 기록 가중치가 절반이 되는 기간 (일)
+        """
+        self.history_path = Path(history_path) if history_path else None
+        self.min_events = min_events
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.half_life_days = half_life_days
+        self.history: dict[str, list[datetime]] = {}
+        self._models: dict[str, tuple[datetime, float, HazardModel]] = {}
+        # 여러 채널이 같은 파일에 덧붙이므로 스레드 간 순서 보장
+        self._write_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.history_path or not self.history_path.exists():
+            return
+        try:
+            with open(self.history_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._add(entry["channel_id"], datetime.fromisoformat(entry["started_at"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError as e:
+            logger.warning(f"방송 시작 기록을 읽을 수 없습니다: {e}")
+            return
+        logger.info(f"방송 시작 기록 로드: 채널 {len(self.history)}개, "
+                    f"{sum(len(starts) for starts in self.history.values())}건")
+
+    def _add(self, channel_id: str, started_at: datetime) -> bool:
+        started_at = to_kst(started_at).replace(microsecond=0)
+        starts = self.history.setdefault(channel_id, [])
+        if started_at in starts:
+            return False
+        starts.append(started_at)
+        starts.sort()
+        return True
+
+    async def record(self, channel_id: str, started_at: datetime):
+        """
+        방송 시작 기록 추가 (같은 시각은 한 번만)
+
+        메모리에는 바로 반영하고, 파일 기록(fsync 포함)은 스레드에서 실행해
+        방송 시작 처리 중인 이벤트 루프를 막지 않습니다.
+        """
+        if not self._add(channel_id, started_at):
+            return
+        self._models.pop(channel_id, None)
+        if not self.history_path:
+            return
+        line = json.dumps({"channel_id": channel_id,
+                           "started_at": to_kst(started_at).replace(microsecond=0).isoformat()})
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str):
+        """기록 파일에 한 줄 덧붙임 (워커 스레드)"""
+        try:
+            with self._write_lock:
+                self.history_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.history_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"방송 시작 기록 저장 실패: {e}")
+
+    def model(self, channel_id: str, base_interval: float,
+              now: Optional[datetime] = None) -> Optional[HazardModel]:
+        """채널 모델 (기록이 부족하면 None)"""
+        starts = self.history.get(channel_id, ())
+        if len(starts) < self.min_events:
+            return None
+        now = to_kst(now or datetime.now(KST))
+        cached = self._models.get(channel_id)
+        if cached and cached[1] == base_interval and now - cached[0] < self.REFIT_INTERVAL:
+            return cached[2]
+        model = HazardModel.fit(list(starts), now, base_interval, self.min_interval,
+                                self.max_interval, self.half_life_days)
+        self._models[channel_id] = (now, base_interval, model)
+        return model
+
+    def interval(self, channel_id: str, base_interval: float, now: Optional[datetime] = None) -> float:
+        """방송 중이 아닐 때 다음 폴링까지 간격 (초)"""
+        now = now or datetime.now(KST)
+        model = self.model(channel_id, base_interval, now)
+        return model.interval_at(now) if model else base_interval
+
+
+@dataclass
+class Evaluation:
+    """기록 재생 평가 결과 (채널 하나)"""
+    channel_id: str
+    events: int
+    # 평가한 방송 시작 수 (앞의 min_events개는 학습용)
+    evaluated: int
+    baseline_delay: float
+    model_delay: float
+    baseline_requests_per_day: float
+    model_requests_per_day: float
+
+
+def evaluate_history(channel_id: str, starts: list[datetime], base_interval: float,
+                     min_events: int = 5, **options) -> Optional[Evaluation]:
+    """
+    기록 재생 평가
+
+    각 방송 시작 직전까지의 기록으로 모델을 만들고, 그 시각의 폴링 간격으로
+    예상 감지 지연(간격/2)과 하루 요청 수를 기본 간격과 비교합니다.
+    """
+    starts = sorted(to_kst(start) for start in starts)
+    delays, requests = [], []
+    for index in range(min_events, len(starts)):
+        now = starts[index] - timedelta(seconds=1)
+        model = HazardModel.fit(starts[:index], now, base_interval, **options)
+        delays.append(model.interval_at(starts[index]) / 2)
+        requests.append(model.requests_per_day())
+    if not delays:
+        return None
+    return Evaluation(
+        channel_id=channel_id,
+        events=len(starts),
+        evaluated=len(delays),
+        baseline_delay=base_interval / 2,
+        model_delay=sum(delays) / len(delays),
+        baseline_requests_per_day=86400 / base_interval,
+        model_requests_per_day=sum(requests) / len(requests),
+    )
+
+
+_predictors: dict[tuple, GoLivePredictor] = {}
+
+
+def get_golive_predictor(history_path: Optional[Path], **options) -> GoLivePredictor:
+    """기록 파일별 공유 GoLivePredictor (여러 채널이 같은 파일을 사용)"""
+    key = (os.path.abspath(history_path) if history_path else None, tuple(sorted(options.items())))
+    predictor = _predictors.get(key)
+    if predictor is None:
+        predictor = _predictors[key] = GoLivePredictor(history_path, **options)
+    return predictor
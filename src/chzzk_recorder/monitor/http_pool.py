@@ -0,0 +1,367 @@
+"""
+치지직 API 공용 HTTP 연결 풀
+
+채널마다 AsyncClient를 만들면 채널 수만큼 TLS 핸드셰이크와 연결이 생기고,
+폴링이 몰리면 연결이 한꺼번에 열립니다. 모든 LiveMonitor가 클라이언트 하나를
+공유해 api.chzzk.naver.com 연결을 재사용합니다.
+
+- HTTP/2 (h2 패키지가 설치된 경우): 연결 하나에 요청 여러 개를 동시에 보냄
+- 연결 수 상한과 keepalive 유지 시간
+- DNS 캐시: 새 연결마다 이름을 다시 조회하지 않음 (TTL 동안 재사용)
+- 통계: 요청 수, 새 연결 수, 연결당 요청 수, HTTP/2 비율, 응답 지연 p50/p99
+
+get_http_pool()은 같은 설정/인증 쿠키에 대해 하나의 풀을 돌려주고,
+close_http_pools()로 종료 시 모두 닫습니다.
+"""
+
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import socket
+import time
+from collections import deque
+from typing import Optional
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+# 치지직 API 요청 공통 헤더
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Referer": "https://chzzk.naver.com/",
+}
+
+# 지연 백분위 계산에 쓰는 최근 요청 수
+LATENCY_WINDOW = 1024
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 가능 여부 (httpx[http2]의 h2 패키지)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class DnsCache:
+    """호스트 이름 → 주소 목록 캐시"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._lookups: dict[tuple[str, int], asyncio.Task] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """주소 목록 (TTL 안이면 캐시, 같은 이름을 동시에 조회하면 한 번만 조회)"""
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        lookup = self._lookups.get(key)
+        if lookup:
+            self.hits += 1
+        else:
+            self.misses += 1
+            lookup = self._lookups[key] = asyncio.create_task(self._lookup(host, port))
+            lookup.add_done_callback(lambda _: self._lookups.pop(key, None))
+        return await asyncio.shield(lookup)
+
+    async def _lookup(self, host: str, port: int) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        self._entries.pop((host, port), None)
+
+
+class _CountedStream(httpcore.AsyncNetworkStream):
+    """닫힐 때 백엔드의 열린 연결 수를 줄이는 스트림"""
+
+    def __init__(self, stream: httpcore.AsyncNetworkStream, backend: "_CachingBackend"):
+        self._stream = stream
+        self._backend = backend
+        self._closed = False
+
+    async def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        return await self._stream.read(max_bytes, timeout)
+
+    async def write(self, buffer: bytes, timeout: Optional[float] = None):
+        await self._stream.write(buffer, timeout)
+
+    async def aclose(self):
+        self._release()
+        await self._stream.aclose()
+
+    async def start_tls(self, ssl_context, server_hostname: Optional[str] = None,
+                        timeout: Optional[float] = None) -> httpcore.AsyncNetworkStream:
+        try:
+            self._stream = await self._stream.start_tls(ssl_context, server_hostname, timeout)
+        except Exception:
+            # 핸드셰이크 실패 시 원래 스트림은 백엔드가 닫음
+            self._release()
+            raise
+        return self
+
+    def get_extra_info(self, info: str):
+        return self._stream.get_extra_info(info)
+
+    def _release(self):
+        if not self._closed:
+            self._closed = True
+            self._backend.open_connections -= 1
+
+
+class _CachingBackend(httpcore.AsyncNetworkBackend):
+    """DNS 캐시를 거쳐 연결하고 새 연결 수/열린 연결 수를 세는 네트워크 백엔드"""
+
+    def __init__(self, dns: DnsCache):
+        self.dns = dns
+        self.connections = 0
+        self.open_connections = 0
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            try:
+                addresses = await self.dns.resolve(host, port)
+            except OSError as e:
+                raise httpcore.ConnectError(f"이름 조회 실패: {host} ({e})") from e
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                # TLS SNI/인증서 확인은 httpcore가 원래 호스트 이름으로 수행
+                stream = await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+                self.connections += 1
+                self.open_connections += 1
+                return _CountedStream(stream, self)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # 주소가 모두 실패하면 다음 연결 때 다시 조회
+        self.dns.invalidate(host, port)
+        raise error or httpcore.ConnectError(f"주소를 찾을 수 없습니다: {host}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+# httpcore 예외 → httpx 예외 (가장 구체적인 것부터 MRO 순서로 찾음)
+_EXCEPTIONS: dict[type, type] = {
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.ProxyError: httpx.ProxyError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.ProtocolError: httpx.ProtocolError,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+}
+
+
+def _to_httpx_error(error: Exception, request: httpx.Request) -> Optional[Exception]:
+    """httpcore 예외를 같은 의미의 httpx 예외로 (httpcore 예외가 아니면 None)"""
+    for cls in type(error).__mro__:
+        mapped = _EXCEPTIONS.get(cls)
+        if mapped:
+            return mapped(str(error), request=request)
+    return None
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """httpcore 응답 본문을 httpx 스트림으로 (읽기 중 예외도 httpx 예외로)"""
+
+    def __init__(self, stream, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except Exception as e:
+            mapped = _to_httpx_error(e, self._request)
+            if mapped is None:
+                raise
+            raise mapped from e
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+class _PoolTransport(httpx.AsyncBaseTransport):
+    """httpcore 연결 풀로 요청을 보내고 요청 수/지연/HTTP 버전을 기록하는 전송 계층"""
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self.pool = pool
+        self.requests = 0
+        self.errors = 0
+        self.http2_responses = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            response = await self._send(request)
+        except Exception:
+            self.errors += 1
+            raise
+        self.latencies.append(time.perf_counter() - started)
+        if response.extensions.get("http_version") == b"HTTP/2":
+            self.http2_responses += 1
+        return response
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            core_response = await self.pool.handle_async_request(core_request)
+        except Exception as e:
+            mapped = _to_httpx_error(e, request)
+            if mapped is None:
+                raise
+            raise mapped from e
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_ResponseStream(core_response.stream, request),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
+
+
+def _percentile(values: list[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+class HttpPool:
+    """공유 AsyncClient와 연결 풀 통계"""
+
+    def __init__(self,
+                 http2: bool = True,
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 90.0,
+                 dns_ttl: float = 300.0,
+                 timeout: float = 10.0,
+                 headers: Optional[dict[str, str]] = None,
+                 cookies: Optional[dict[str, str]] = None,
+                 follow_redirects: bool = False):
+        """
+        초기화
+
+        Args:
+            http2: HTTP/2 사용 (h2가 없으면 경고 후 HTTP/1.1)
+            max_connections: 최대 연결 수 (넘으면 연결이 빌 때까지 대기)
+            max_keepalive_connections: 유휴 상태로 유지할 최대 연결 수
+            keepalive_expiry: 유휴 연결 유지 시간 (초)
+            dns_ttl: DNS 캐시 유지 시간 (초)
+            timeout: 요청 타임아웃 (초)
+            headers: 기본 헤더 (None이면 DEFAULT_HEADERS)
+            cookies: 인증 쿠키
+            follow_redirects: 리다이렉트 따라가기 (HLS CDN)
+        """
+        if http2 and not http2_available():
+            logger.warning("h2 패키지가 없어 HTTP/1.1 keepalive로 연결합니다 (pip install 'httpx[http2]')")
+            http2 = False
+        self.http2 = http2
+        self.dns = DnsCache(dns_ttl)
+        self._backend = _CachingBackend(self.dns)
+        self._transport = _PoolTransport(httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=self._backend,
+        ))
+        self.client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(timeout),
+            headers=headers if headers is not None else DEFAULT_HEADERS,
+            cookies=cookies,
+            follow_redirects=follow_redirects,
+        )
+
+    async def aclose(self):
+        """클라이언트와 모든 연결 종료"""
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        """연결 재사용/지연 통계"""
+        transport = self._transport
+        latencies = sorted(transport.latencies)
+        connections = self._backend.connections
+        return {
+            "http2": self.http2,
+            "requests": transport.requests,
+            "errors": transport.errors,
+            "http2_responses": transport.http2_responses,
+            "connections_opened": connections,
+            "open_connections": self._backend.open_connections,
+            "requests_per_connection": round(transport.requests / connections, 1) if connections else 0.0,
+            "dns_hits": self.dns.hits,
+            "dns_misses": self.dns.misses,
+            "latency_p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+            "latency_p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        }
+
+
+_pools: dict[tuple, HttpPool] = {}
+
+
+def get_http_pool(nid_aut: Optional[str], nid_ses: Optional[str], **options) -> HttpPool:
+    """인증 쿠키/설정별 공유 HttpPool (여러 채널이 같은 연결을 사용, 쿠키가 None이면 쿠키 없이)"""
+    key = (nid_aut, nid_ses, tuple(sorted(options.items())))
+    pool = _pools.get(key)
+    if pool is None:
+        cookies = {"NID_AUT": nid_aut, "NID_SES": nid_ses} if nid_aut is not None else None
+        pool = _pools[key] = HttpPool(cookies=cookies, **options)
+    return pool
+
+
+def http_pool_stats() -> list[dict]:
+    """모든 공유 풀의 통계"""
+    return [pool.stats() for pool in _pools.values()]
+
+
+async def close_http_pools():
+    """모든 공유 풀 종료"""
+    for pool in list(_pools.values()):
+        await pool.aclose()
+    _pools.clear()
@@ -7,16 +7,26 @@ import logging
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Callable, Any
-import re
+from typing import Optional, Callable, Any, Union
 
 import httpx
 from httpx import AsyncClient
 
+from .decoders import JsonDecoder, get_decoder
+from .http_pool import DEFAULT_HEADERS
+from .playback_parser import PlaybackParser
+
 
 logger = logging.getLogger(__name__)
 
 
+def _clean_text(text: Any) -> Optional[str]:
+    """API 문자열 값 정리 (파일명용 정리는 RecordingConfig.generate_filename에서 수행)"""
+    if not isinstance(text, str):
+        return None
+    return text.strip() or None
+
+
 class LiveStatus(Enum):
     """방송 상태"""
     OFFLINE = "offline"
@@ -24,9 +34,9 @@ class LiveStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamInfo:
-    """방송 정보"""
+    """방송 정보 (방송 중인 채널만 보관, 방송 중이 아닌 채널은 ChannelState만 유지)"""
     channel_id: str
     status: LiveStatus
     title: Optional[str] = None
@@ -36,6 +46,8 @@ class StreamInfo:
     thumbnail_url: Optional[str] = None
     hls_url: Optional[str] = None
     started_at: Optional[datetime] = None
+    chat_channel_id: Optional[str] = None
+    live_id: Optional[int] = None
     
     @property
     def is_live(self) -> bool:
@@ -56,8 +68,10 @@ class LiveMonitor:
     LIVE_STATUS_URL = BASE_URL + "/polling/v2/channels/{channel_id}/live-status"
     LIVE_DETAIL_URL = BASE_URL + "/service/v2/channels/{channel_id}/live-detail"
     CHANNEL_INFO_URL = BASE_URL + "/service/v1/channels/{channel_id}"
+    CHAT_ACCESS_TOKEN_URL = "https://comm-api.game.naver.com/nng_main/v1/chats/access-token"
     
-    def __init__(self, channel_id: str, nid_aut: str, nid_ses: str, timeout: int = 10):
+    def __init__(self, channel_id: str, nid_aut: str, nid_ses: str, timeout: int = 10,
+                 decoder: Union[JsonDecoder, str] = "auto", client: Optional[AsyncClient] = None):
         """
         초기화
         
@@ -66,19 +80,22 @@ class LiveMonitor:
             nid_aut: 네이버 인증 쿠키
             nid_ses: 네이버 세션 쿠키  
             timeout: 요청 타임아웃 (초)
+            decoder: API 응답 디코더 또는 이름 ("auto", "msgspec", "orjson", "json")
+            client: 공유 HTTP 클라이언트 (HttpPool.client, 인증 쿠키 포함). 지정하면
+                close()에서 닫지 않고, None이면 이 모니터 전용 클라이언트를 만듦
         """
         self.channel_id = channel_id
         self.timeout = timeout
         self._last_status = LiveStatus.UNKNOWN
         self._running = False
+        self._decoder = get_decoder(decoder) if isinstance(decoder, str) else decoder
+        self._playback_parser = PlaybackParser(self._decoder.loads)
         
         # HTTP 클라이언트 설정
-        self._client = AsyncClient(
+        self._owns_client = client is None
+        self._client = client or AsyncClient(
             timeout=httpx.Timeout(timeout),
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Referer": "https://chzzk.naver.com/",
-            },
+            headers=DEFAULT_HEADERS,
             cookies={
                 "NID_AUT": nid_aut,
                 "NID_SES": nid_ses,
@@ -94,25 +111,11 @@ class LiveMonitor:
         await self.close()
     
     async def close(self):
-        """리소스 정리"""
-        await self._client.aclose()
+        """리소스 정리 (공유 클라이언트는 HttpPool이 닫음)"""
+        if self._owns_client:
+            await self._client.aclose()
         logger.info("LiveMonitor 종료")
     
-    def _sanitize_filename(self, text: str) -> str:
-        """파일명에 사용 불가능한 문자 제거/치환"""
-        if not text:
-            return "Unknown"
-        
-        # 특수문자 제거 및 공백을 언더스코어로 치환
-        text = re.sub(r'[<>:"/\\|?*]', '', text)
-        text = re.sub(r'\s+', '_', text.strip())
-        
-        # 길이 제한 (Windows 파일명 길이 제한 고려)
-        if len(text) > 100:
-            text = text[:100]
-            
-        return text or "Unknown"
-    
     async def check_live_status(self) -> StreamInfo:
         """
         현재 방송 상태 확인
@@ -126,23 +129,16 @@ class LiveMonitor:
         try:
             # 1. 방송 상태 확인
             status_url = self.LIVE_STATUS_URL.format(channel_id=self.channel_id)
-            logger.debug(f"방송 상태 확인: {status_url}")
+            logger.debug("방송 상태 확인: %s", status_url)
             
             response = await self._client.get(status_url)
             response.raise_for_status()
             
-            status_data = response.json()
-            logger.debug(f"상태 응답: {status_data}")
+            status_data = self._decoder.live_status(response.content)
+            logger.debug("상태 응답: %s", status_data)
             
             # 방송 상태 판단
-            if not status_data.get("content"):
-                return StreamInfo(
-                    channel_id=self.channel_id,
-                    status=LiveStatus.OFFLINE
-                )
-            
-            live_status = status_data["content"].get("status")
-            if live_status != "OPEN":
+            if status_data is None or status_data.status != "OPEN":
                 return StreamInfo(
                     channel_id=self.channel_id, 
                     status=LiveStatus.OFFLINE
@@ -164,145 +160,29 @@ class LiveMonitor:
     async def _get_live_details(self) -> StreamInfo:
         """방송 상세 정보 가져오기"""
         detail_url = self.LIVE_DETAIL_URL.format(channel_id=self.channel_id)
-        logger.debug(f"방송 상세 정보 확인: {detail_url}")
+        logger.debug("방송 상세 정보 확인: %s", detail_url)
         
         response = await self._client.get(detail_url)
         response.raise_for_status()
         
-        detail_data = response.json()
-        content = detail_data.get("content", {})
+        # StreamInfo에 필요한 필드만 디코딩
+        content = self._decoder.live_detail(response.content)
         
-        # 디버그: API 응답 구조 로깅
-        logger.debug(f"Live detail response keys: {list(content.keys())}")
-        
-        if not content:
+        if content is None:
             return StreamInfo(
                 channel_id=self.channel_id,
                 status=LiveStatus.OFFLINE
             )
         
-        # 방송 정보 추출
-        live_title = content.get("liveTitle", "")
-        category_value = content.get("categoryValue", "")
-        channel_name = content.get("channel", {}).get("channelName", "")
-        concurrent_user_count = content.get("concurrentUserCount", 0)
-        live_image_url = content.get("liveImageUrl", "")
-        
-        # HLS URL 추출 (여러 방법으로 시도)
-        hls_url = None
-        
-        # livePlayback 또는 livePlaybackJson 확인
-        live_playback = content.get("livePlayback", {})
-        live_playback_json = content.get("livePlaybackJson")
-        
-        logger.debug(f"livePlayback keys: {list(live_playback.keys())}")
-        logger.debug(f"livePlaybackJson type: {type(live_playback_json)}")
-        
-        # livePlaybackJson이 문자열이면 JSON 파싱
-        if live_playback_json and isinstance(live_playback_json, str):
-            try:
-                import json
-                live_playback_json_parsed = json.loads(live_playback_json)
-                logger.debug(f"Parsed livePlaybackJson keys: {list(live_playback_json_parsed.keys())}")
-                live_playback = live_playback_json_parsed
-            except json.JSONDecodeError as e:
-                logger.warning(f"livePlaybackJson 파싱 실패: {e}")
-                logger.debug(f"Raw livePlaybackJson: {live_playback_json}")
-        elif live_playback_json and isinstance(live_playback_json, dict):
-            logger.debug(f"livePlaybackJson is dict: {list(live_playback_json.keys())}")
-            live_playback = live_playback_json
-        
-        # Method 1: livePlayback.media
-        if "media" in live_playback:
-            media_list = live_playback["media"]
-            logger.debug(f"Found media count: {len(media_list)}")
-            
-            for media in media_list:
-                logger.debug(f"Media item: {media}")
-                if media.get("mediaId") == "HLS":
-                    hls_url = media.get("path")
-                    logger.info(f"HLS URL 발견 (Method 1): {hls_url}")
-                    break
-        else:
-            logger.debug("Found media count: 0")
-        
-        # Method 2: livePlayback.json.media (기존 방법)
-        if not hls_url and "json" in live_playback:
-            json_data = live_playback["json"]
-            logger.debug(f"Method 2 - json keys: {list(json_data.keys()) if isinstance(json_data, dict) else 'not dict'}")
-            
-            if isinstance(json_data, dict) and "media" in json_data:
-                media_list = json_data["media"]
-                for media in media_list:
-                    if media.get("mediaId") == "HLS":
-                        hls_url = media.get("path")
-                        logger.info(f"HLS URL 발견 (Method 2): {hls_url}")
-                        break
-        
-        # Method 3: 재귀적으로 .m3u8 URL 찾기
-        if not hls_url:
-            logger.debug("Method 3 - 재귀적 HLS URL 검색 시작")
-            
-            def find_hls_url(obj, path=""):
-                nonlocal hls_url
-                if hls_url:  # 이미 찾았으면 중단
-                    return
-                    
-                if isinstance(obj, dict):
-                    for key, value in obj.items():
-                        current_path = f"{path}.{key}" if path else key
-                        if isinstance(value, str) and ".m3u8" in value:
-                            logger.info(f"HLS URL 발견 (Method 3) at {current_path}: {value}")
-                            hls_url = value
-                            return
-                        elif "hls" in key.lower():
-                            logger.debug(f"HLS 관련 키 at {current_path}: {value}")
-                        find_hls_url(value, current_path)
-                elif isinstance(obj, list):
-                    for i, item in enumerate(obj):
-                        find_hls_url(item, f"{path}[{i}]")
-            
-            find_hls_url(live_playback)
-        
+        # HLS URL 추출 (livePlaybackJson 한 번 디코딩, 채널별로 찾은 경로 재사용)
+        hls_url = self._playback_parser.extract_from(content.live_playback_json, content.live_playback)
         if not hls_url:
             logger.warning("HLS URL을 찾을 수 없습니다")
-            logger.debug(f"Full livePlayback content: {live_playback}")
-            logger.debug(f"Raw livePlaybackJson: {content.get('livePlaybackJson', 'Not found')}")
-            
-            # 추가 시도: livePlaybackJson을 직접 파싱해서 재시도
-            live_playback_json_raw = content.get('livePlaybackJson')
-            if live_playback_json_raw and isinstance(live_playback_json_raw, str):
-                try:
-                    import json
-                    parsed_data = json.loads(live_playback_json_raw)
-                    logger.debug(f"Additional parsing attempt: {list(parsed_data.keys())}")
-                    
-                    # 파싱된 데이터에서 다시 시도
-                    def find_m3u8_in_parsed(obj):
-                        nonlocal hls_url
-                        if isinstance(obj, dict):
-                            for key, value in obj.items():
-                                if isinstance(value, str) and ".m3u8" in value:
-                                    logger.info(f"HLS URL 발견 (추가 파싱): {value}")
-                                    hls_url = value
-                                    return
-                                find_m3u8_in_parsed(value)
-                        elif isinstance(obj, list):
-                            for item in obj:
-                                find_m3u8_in_parsed(item)
-                    
-                    find_m3u8_in_parsed(parsed_data)
-                except Exception as parse_error:
-                    logger.debug(f"추가 파싱 실패: {parse_error}")
-            
-            if not hls_url:
-                logger.warning("모든 방법으로 HLS URL 추출에 실패했습니다")
-        else:
-            logger.info(f"최종 HLS URL: {hls_url}")
+            logger.debug("Raw livePlaybackJson: %s", content.live_playback_json)
         
         # 시작 시간 (ISO 형식)
         started_at = None
-        open_date = content.get("openDate")
+        open_date = content.open_date
         if open_date:
             try:
                 started_at = datetime.fromisoformat(open_date.replace('Z', '+00:00'))
@@ -312,15 +192,42 @@ class LiveMonitor:
         return StreamInfo(
             channel_id=self.channel_id,
             status=LiveStatus.ONLINE,
-            title=self._sanitize_filename(live_title),
-            category=self._sanitize_filename(category_value),
-            streamer_name=self._sanitize_filename(channel_name),
-            viewer_count=concurrent_user_count,
-            thumbnail_url=live_image_url,
+            title=_clean_text(content.live_title),
+            category=_clean_text(content.category_value),
+            streamer_name=_clean_text(content.channel_name),
+            viewer_count=content.concurrent_user_count or 0,
+            thumbnail_url=content.live_image_url or "",
             hls_url=hls_url,
-            started_at=started_at
+            started_at=started_at,
+            chat_channel_id=content.chat_channel_id,
+            live_id=content.live_id
         )
     
+    async def get_chat_access_token(self, chat_channel_id: str) -> str:
+        """
+        채팅 서버 접속용 액세스 토큰 발급
+        
+        Args:
+            chat_channel_id: 방송 상세 정보의 채팅 채널 ID
+            
+        Raises:
+            ChzzkApiError: 토큰 발급 실패
+        """
+        try:
+            response = await self._client.get(
+                self.CHAT_ACCESS_TOKEN_URL,
+                params={"channelId": chat_channel_id, "chatType": "STREAMING"}
+            )
+            response.raise_for_status()
+            content = response.json().get("content") or {}
+        except httpx.HTTPError as e:
+            raise ChzzkApiError(f"채팅 토큰 발급 실패: {e}")
+        
+        access_token = content.get("accessToken")
+        if not access_token:
+            raise ChzzkApiError("채팅 토큰 응답에 accessToken이 없습니다")
+        return access_token
+    
     async def start_monitoring(
         self, 
         interval: int,
@@ -371,7 +278,7 @@ class LiveMonitor:
                 
                 else:
                     if current_status == LiveStatus.ONLINE:
-                        logger.debug(f"방송 중: {stream_info.title} (시청자: {stream_info.viewer_count}명)")
+                        logger.debug("방송 중: %s (시청자: %s명)", stream_info.title, stream_info.viewer_count)
                     else:
                         logger.debug("방송 오프라인")
                 
@@ -0,0 +1,166 @@
+"""
+방송 재생 정보(livePlaybackJson)에서 HLS URL 추출
+
+live-detail 응답의 livePlaybackJson은 JSON 문자열로 오며 보통 다음 모양입니다.
+
+    {"meta": {...}, "live": {...}, "api": [...],
+     "media": [{"mediaId": "HLS", "protocol": "HLS", "path": "https://.../playlist.m3u8", "encodingTrack": [...]},
+               {"mediaId": "LLHLS", ...}],
+     "thumbnail": {...}, "multiview": [...]}
+
+한 번만 디코딩한 뒤 알려진 모양(media, json.media)의 HLS 항목을 먼저 보고, 없으면
+.m3u8 문자열을 반복문으로 한 번 훑습니다. 찾은 위치(경로)는 채널별로 기억해 두었다가
+다음 폴링에서 그 위치부터 확인하므로 같은 모양이 계속 오면 탐색을 건너뜁니다.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+# 경로: 딕셔너리 키 또는 리스트 인덱스의 나열
+JsonPath = tuple[Union[str, int], ...]
+
+# HLS 항목 목록이 있는 알려진 위치 (앞에 있을수록 먼저 확인)
+KNOWN_MEDIA_PATHS: tuple[JsonPath, ...] = (("media",), ("json", "media"))
+
+HLS_MEDIA_ID = "HLS"
+PLAYLIST_SUFFIX = ".m3u8"
+
+
+def decode_playback(raw: Any, fallback: Any = None, loads: Callable[[str], Any] = json.loads) -> Any:
+    """
+    재생 정보 객체 꺼내기 (livePlaybackJson은 한 번만 디코딩)
+
+    Args:
+        raw: livePlaybackJson 값 (JSON 문자열 또는 이미 디코딩된 객체)
+        fallback: livePlaybackJson이 없거나 깨졌을 때 쓸 livePlayback 값
+        loads: JSON 디코딩 함수 (API 디코더와 같은 것)
+    """
+    if isinstance(raw, str) and raw:
+        try:
+            return loads(raw)
+        except ValueError as e:
+            logger.warning(f"livePlaybackJson 파싱 실패: {e}")
+    elif isinstance(raw, (dict, list)):
+        return raw
+    return fallback or {}
+
+
+def format_path(path: JsonPath) -> str:
+    """로그용 경로 표시 (media[0].path)"""
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else part)
+    return text
+
+
+def follow_path(obj: Any, path: JsonPath) -> Any:
+    """경로를 따라간 값 (중간에 없으면 None)"""
+    for part in path:
+        if isinstance(part, int):
+            if not isinstance(obj, list) or part >= len(obj):
+                return None
+        elif not isinstance(obj, dict) or part not in obj:
+            return None
+        obj = obj[part]
+    return obj
+
+
+def _is_playlist(value: Any) -> bool:
+    return isinstance(value, str) and PLAYLIST_SUFFIX in value
+
+
+def find_hls_url(playback: Any) -> tuple[Optional[JsonPath], Optional[str]]:
+    """
+    재생 정보에서 HLS URL 찾기
+
+    알려진 media 목록의 HLS 항목을 먼저 보고, 없으면 전체를 한 번 훑어
+    처음 나오는 .m3u8 문자열을 사용합니다 (재귀 없이 스택으로 순회).
+
+    Returns:
+        (경로, URL) - 못 찾으면 (None, None)
+    """
+    for prefix in KNOWN_MEDIA_PATHS:
+        media_list = follow_path(playback, prefix)
+        if not isinstance(media_list, list):
+            continue
+        for index, media in enumerate(media_list):
+            if isinstance(media, dict) and media.get("mediaId") == HLS_MEDIA_ID and media.get("path"):
+                return (*prefix, index, "path"), media["path"]
+
+    if not isinstance(playback, (dict, list)):
+        return None, None
+
+    # 경로는 찾았을 때만 만들도록 (부모 노드 번호, 키)만 기록
+    nodes: list[tuple[int, Union[str, int]]] = []
+    stack: list[tuple[Any, int]] = [(playback, -1)]
+    while stack:
+        obj, node = stack.pop()
+        children = []
+        for key, value in (obj.items() if isinstance(obj, dict) else enumerate(obj)):
+            if isinstance(value, str):
+                if PLAYLIST_SUFFIX in value:
+                    return _node_path(nodes, node) + (key,), value
+            elif isinstance(value, (dict, list)):
+                nodes.append((node, key))
+                children.append((value, len(nodes) - 1))
+        # 문서 순서대로 보기 위해 역순으로 쌓음
+        stack.extend(reversed(children))
+    return None, None
+
+
+def _node_path(nodes: list[tuple[int, Union[str, int]]], node: int) -> JsonPath:
+    path = []
+    while node >= 0:
+        node, key = nodes[node]
+        path.append(key)
+    return tuple(reversed(path))
+
+
+class PlaybackParser:
+    """채널별 HLS URL 추출기 (마지막으로 찾은 경로를 기억)"""
+
+    def __init__(self, loads: Callable[[str], Any] = json.loads):
+        """
+        Args:
+            loads: livePlaybackJson 디코딩 함수
+        """
+        self.loads = loads
+        self.path: Optional[JsonPath] = None
+        self.hits = 0
+        self.misses = 0
+
+    def extract(self, content: dict) -> Optional[str]:
+        """live-detail content에서 HLS URL 추출 (못 찾으면 None)"""
+        return self.extract_from(content.get("livePlaybackJson"), content.get("livePlayback"))
+
+    def extract_from(self, live_playback_json: Any, live_playback: Any = None) -> Optional[str]:
+        """livePlaybackJson/livePlayback 값에서 HLS URL 추출 (못 찾으면 None)"""
+        playback = decode_playback(live_playback_json, live_playback, self.loads)
+
+        if self.path:
+            url = self._from_cached_path(playback)
+            if url:
+                self.hits += 1
+                return url
+
+        self.misses += 1
+        path, url = find_hls_url(playback)
+        if path != self.path:
+            if path:
+                logger.info(f"HLS URL 발견 ({format_path(path)}): {url}")
+            self.path = path
+        return url
+
+    def _from_cached_path(self, playback: Any) -> Optional[str]:
+        url = follow_path(playback, self.path)
+        if not _is_playlist(url):
+            return None
+        # media 목록 항목이면 순서가 바뀌어 다른 항목(LLHLS 등)을 가리키는지 확인
+        parent = follow_path(playback, self.path[:-1])
+        if isinstance(parent, dict) and parent.get("mediaId", HLS_MEDIA_ID) != HLS_MEDIA_ID:
+            return None
+        return url
@@ -0,0 +1,229 @@
+"""
+채널 폴링 스케줄러
+
+채널마다 `while True: 폴링; sleep(간격)` 태스크를 두면 채널 수만큼 태스크와 타이머가
+생깁니다. 스케줄러는 채널별 다음 폴링 시각을 최소 힙 하나에 모아 두고, 가장 이른
+시각에 맞춘 타이머 하나로 깨어나 때가 된 채널을 고정된 수의 작업자에게 넘깁니다.
+채널이 늘어도 태스크 수(작업자 + 디스패처)와 타이머 수(1)는 그대로입니다.
+
+- 채널별 간격: 폴링 함수가 다음 대기 시간을 반환하면 그 값을, None이면 등록한 간격을 사용
+- 지터: 대기 시간에 ±jitter 비율을 더해 같은 시각에 몰리지 않도록 분산
+- 우선 확인(bump): 방송이 막 끝난 채널 등을 정해진 시간 안에 다시 확인
+  (폴링 중이면 끝난 뒤에 반영)
+
+힙 항목은 지우지 않고 세대 번호로 무효화합니다 (다시 예약하면 이전 항목은 꺼낼 때 버림).
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 폴링 함수: 다음 폴링까지 대기 시간(초)을 반환 (None이면 등록한 간격)
+PollFunc = Callable[[], Awaitable[Optional[float]]]
+
+
+@dataclass(slots=True)
+class _Entry:
+    channel_id: str
+    poll: PollFunc
+    interval: float
+    due: float = 0.0
+    generation: int = 0
+    # 작업자 대기열에 있거나 폴링 중
+    busy: bool = False
+    # 폴링 중에 요청된 우선 확인 (대기 시간)
+    bump: Optional[float] = None
+    # 폴링이 끝나면 완료되는 future (remove가 기다림)
+    idle: Optional[asyncio.Future] = None
+
+
+class PollScheduler:
+    """최소 힙 + 고정 작업자 풀 폴링 스케줄러"""
+
+    def __init__(self, workers: int = 16, jitter: float = 0.1):
+        """
+        초기화
+
+        Args:
+            workers: 동시에 폴링하는 최대 채널 수 (작업자 태스크 수)
+            jitter: 대기 시간에 더하는 무작위 비율 (0.1이면 ±10%)
+        """
+        self.workers = workers
+        self.jitter = jitter
+        self.polls = 0
+
+        self._entries: dict[str, _Entry] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._generations = itertools.count(1)
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._next_wake: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._entries
+
+    def start(self):
+        """디스패처와 작업자 시작 (이벤트 루프 안에서 호출)"""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Queue()
+        self._tasks.append(asyncio.create_task(self._dispatch(), name="poll-dispatcher"))
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work(), name=f"poll-worker-{index}"))
+
+    async def close(self):
+        """모든 폴링 중지"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._entries.clear()
+        self._heap.clear()
+
+    def add(self, channel_id: str, poll: PollFunc, interval: float, delay: float = 0.0):
+        """
+        채널 등록 (이미 있으면 폴링 함수/간격 교체)
+
+        Args:
+            channel_id: 채널 ID
+            poll: 폴링 함수
+            interval: 기본 폴링 간격 (초)
+            delay: 첫 폴링까지 대기 시간 (초)
+        """
+        entry = self._entries.get(channel_id)
+        if entry:
+            entry.poll = poll
+            entry.interval = interval
+            self.bump(channel_id, delay)
+            return
+        entry = self._entries[channel_id] = _Entry(channel_id, poll, interval)
+        self._schedule(entry, delay)
+
+    async def remove(self, channel_id: str):
+        """채널 제거 (폴링 중이면 끝날 때까지 대기, 폴링 함수 안에서는 호출하지 말 것)"""
+        entry = self._entries.pop(channel_id, None)
+        if entry and entry.idle and not entry.idle.done():
+            await asyncio.shield(entry.idle)
+
+    def set_interval(self, channel_id: str, interval: float):
+        """채널 폴링 간격 변경 (바로 한 번 폴링한 뒤 새 간격 적용)"""
+        entry = self._entries.get(channel_id)
+        if entry:
+            entry.interval = interval
+            self.bump(channel_id)
+
+    def bump(self, channel_id: str, delay: float = 0.0):
+        """늦어도 delay초 안에 폴링 (이미 더 이르게 예약되어 있으면 그대로)"""
+        entry = self._entries.get(channel_id)
+        if entry is None:
+            return
+        if entry.busy:
+            entry.bump = delay if entry.bump is None else min(entry.bump, delay)
+        elif self._loop.time() + delay < entry.due:
+            self._schedule(entry, delay)
+
+    def next_due(self, channel_id: str) -> Optional[float]:
+        """다음 폴링 예정 시각 (loop.time() 기준, 폴링 중이면 None)"""
+        entry = self._entries.get(channel_id)
+        if entry is None or entry.busy:
+            return None
+        return entry.due
+
+    def stats(self) -> dict:
+        """상태 요약"""
+        busy = sum(1 for entry in self._entries.values() if entry.busy)
+        return {
+            "channels": len(self._entries),
+            "busy": busy,
+            "queued": self._ready.qsize() if self._ready else 0,
+            "workers": self.workers,
+            "polls": self.polls,
+            "heap_size": len(self._heap),
+        }
+
+    def _schedule(self, entry: _Entry, delay: float):
+        entry.generation = next(self._generations)
+        entry.due = self._loop.time() + max(0.0, delay)
+        heapq.heappush(self._heap, (entry.due, entry.generation, entry.channel_id))
+        if self._next_wake is None or entry.due < self._next_wake:
+            self._wake()
+
+    def _wake(self):
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _compact(self):
+        """무효화된 항목이 너무 많으면 힙 재구성"""
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.due, e.generation, e.channel_id) for e in self._entries.values() if not e.busy]
+            heapq.heapify(self._heap)
+
+    async def _dispatch(self):
+        loop = self._loop
+        while True:
+            now = loop.time()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, generation, channel_id = heapq.heappop(heap)
+                entry = self._entries.get(channel_id)
+                if entry is None or entry.generation != generation or entry.busy:
+                    continue
+                entry.busy = True
+                entry.idle = loop.create_future()
+                self._ready.put_nowait(entry)
+            self._compact()
+
+            # 가장 이른 예정 시각까지 대기 (새로 더 이른 예약이 생기면 깨어남)
+            self._waiter = loop.create_future()
+            handle = None
+            if self._heap:
+                self._next_wake = self._heap[0][0]
+                handle = loop.call_at(self._next_wake, self._wake)
+            else:
+                self._next_wake = None
+            try:
+                await self._waiter
+            finally:
+                if handle:
+                    handle.cancel()
+                self._waiter = None
+
+    async def _work(self):
+        while True:
+            entry: _Entry = await self._ready.get()
+            delay = None
+            try:
+                if self._entries.get(entry.channel_id) is entry:
+                    delay = await entry.poll()
+                    self.polls += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"채널 폴링 오류 ({entry.channel_id}): {e}")
+            finally:
+                entry.busy = False
+                if entry.idle and not entry.idle.done():
+                    entry.idle.set_result(None)
+
+            if self._entries.get(entry.channel_id) is not entry:
+                continue
+            wait = entry.interval if delay is None else delay
+            if self.jitter:
+                wait *= 1 + random.uniform(-self.jitter, self.jitter)
+            if entry.bump is not None:
+                wait = min(wait, entry.bump)
+                entry.bump = None
+            self._schedule(entry, wait)
@@ -0,0 +1,7 @@
+"""
+디스코드/텔레그램 알림 모듈
+"""
+
+from .dispatcher import NotificationDispatcher, NotificationEvent
+
+__all__ = ["NotificationDispatcher", "NotificationEvent"]
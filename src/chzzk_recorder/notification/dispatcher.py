@@ -0,0 +1,342 @@
+"""
+디스코드/텔레그램 알림 발송
+
+녹화 콜백에서 notify()로 이벤트를 넣으면 즉시 반환하고, 백그라운드 태스크가
+짧은 구간 동안 모인 이벤트를 묶어(예: 20시에 40개 채널 동시 방송 시작 → 요약 1건)
+대상별로 전송합니다. 대상마다 별도 발송 큐와 속도 제한을 두므로 한쪽이 느리거나
+장애가 나도 다른 쪽과 모니터링 루프에는 영향이 없습니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import httpx
+
+from ...config import NotificationConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NotificationEvent:
+    """알림 이벤트"""
+    kind: str                       # start, stop, error
+    channel_id: str
+    message: str
+    title: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+EVENT_LABELS = {
+    "start": "🔴 녹화 시작",
+    "stop": "✅ 녹화 완료",
+    "error": "❌ 오류",
+}
+
+
+class RateLimiter:
+    """토큰 버킷 속도 제한"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 연속 허용 요청 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def block_for(self, seconds: float):
+        """서버가 알려준 대기 시간 동안 전송 중지"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class NotificationTarget:
+    """알림 대상 (대상별 발송 큐와 재시도 루프)"""
+
+    name = "target"
+    max_length = 2000
+
+    def __init__(self,
+                 client: httpx.AsyncClient,
+                 rate_limiter: RateLimiter,
+                 queue_size: int = 100,
+                 max_backoff: float = 300.0):
+        self._client = client
+        self._rate_limiter = rate_limiter
+        self._outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.max_backoff = max_backoff
+
+        self.sent_count = 0
+        self.dropped_count = 0
+
+    def build_request(self, text: str) -> tuple[str, dict]:
+        """(URL, JSON 본문) 생성"""
+        raise NotImplementedError
+
+    def enqueue(self, text: str):
+        """메시지를 발송 큐에 추가 (가득 차면 가장 오래된 메시지 버림)"""
+        if len(text) > self.max_length:
+            text = text[:self.max_length - 1] + "…"
+        _put_dropping_oldest(self._outbox, text, self)
+
+    def start(self):
+        """발송 태스크 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self, timeout: float):
+        """남은 메시지를 최대 timeout초 동안 보내고 종료"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._outbox.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} 알림 {self._outbox.qsize()}건을 보내지 못했습니다")
+        self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        while True:
+            text = await self._outbox.get()
+            try:
+                await self._deliver(text)
+            finally:
+                self._outbox.task_done()
+
+    async def _deliver(self, text: str):
+        """성공하거나 재시도할 수 없는 오류가 날 때까지 재시도"""
+        url, payload = self.build_request(text)
+        backoff = 1.0
+
+        while True:
+            await self._rate_limiter.acquire()
+            try:
+                response = await self._client.post(url, json=payload)
+            except httpx.HTTPError as e:
+                logger.warning(f"{self.name} 알림 전송 실패: {e} ({backoff:.0f}초 후 재시도)")
+            else:
+                if response.status_code < 300:
+                    self.sent_count += 1
+                    return
+                if response.status_code == 429:
+                    self._rate_limiter.block_for(_retry_after(response))
+                    continue
+                if response.status_code < 500:
+                    logger.error(f"{self.name} 알림 거부됨 ({response.status_code}): {response.text[:200]}")
+                    self.dropped_count += 1
+                    return
+                logger.warning(f"{self.name} 서버 오류 {response.status_code} ({backoff:.0f}초 후 재시도)")
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+class DiscordTarget(NotificationTarget):
+    """디스코드 웹훅 (웹훅당 약 2초에 5건)"""
+
+    name = "Discord"
+    max_length = 2000
+
+    def __init__(self, client: httpx.AsyncClient, webhook_url: str, **kwargs):
+        super().__init__(client, RateLimiter(rate=2.5, burst=5), **kwargs)
+        self.webhook_url = webhook_url
+
+    def build_request(self, text: str) -> tuple[str, dict]:
+        return self.webhook_url, {"content": text}
+
+
+class TelegramTarget(NotificationTarget):
+    """텔레그램 봇 (채팅당 초당 1건)"""
+
+    name = "Telegram"
+    max_length = 4096
+    API_URL = "https://api.telegram.org"
+
+    def __init__(self, client: httpx.AsyncClient, bot_token: str, chat_id: str,
+                 api_url: Optional[str] = None, **kwargs):
+        super().__init__(client, RateLimiter(rate=1.0, burst=1), **kwargs)
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.api_url = api_url or self.API_URL
+
+    def build_request(self, text: str) -> tuple[str, dict]:
+        return (f"{self.api_url}/bot{self.bot_token}/sendMessage",
+                {"chat_id": self.chat_id, "text": text, "disable_web_page_preview": True})
+
+
+class NotificationDispatcher:
+    """비차단 알림 디스패처"""
+
+    def __init__(self,
+                 config: NotificationConfig,
+                 queue_size: int = 1000,
+                 telegram_api_url: Optional[str] = None):
+        """
+        초기화
+
+        Args:
+            config: 알림 설정
+            queue_size: 이벤트 큐 크기 (가득 차면 가장 오래된 이벤트부터 버림)
+            telegram_api_url: 텔레그램 API 주소 (테스트용)
+        """
+        self.config = config
+        self._queue: asyncio.Queue[NotificationEvent] = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_count = 0
+
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=60)
+        )
+
+        self.targets: list[NotificationTarget] = []
+        if config.discord_webhook_url:
+            self.targets.append(DiscordTarget(self._client, config.discord_webhook_url))
+        if config.telegram_bot_token and config.telegram_chat_id:
+            self.targets.append(TelegramTarget(
+                self._client, config.telegram_bot_token, config.telegram_chat_id,
+                api_url=telegram_api_url
+            ))
+
+    @property
+    def is_enabled(self) -> bool:
+        """알림을 보낼 대상이 있는지 확인"""
+        return self.config.enabled and bool(self.targets)
+
+    def _kind_enabled(self, kind: str) -> bool:
+        return {
+            "start": self.config.notify_start,
+            "stop": self.config.notify_end,
+            "error": self.config.notify_error,
+        }.get(kind, True)
+
+    def notify(self, event: NotificationEvent):
+        """이벤트 추가 (절대 대기하지 않음)"""
+        if not self.is_enabled or not self._kind_enabled(event.kind):
+            return
+        _put_dropping_oldest(self._queue, event, self)
+
+    def start(self):
+        """디스패처 시작"""
+        if self._task is None and self.is_enabled:
+            for target in self.targets:
+                target.start()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self, timeout: float = 10.0):
+        """대기 중인 알림을 최대 timeout초 동안 보내고 종료"""
+        if self._task:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._task.cancel()
+            self._task = None
+        await asyncio.gather(*(target.close(timeout) for target in self.targets))
+        await self._client.aclose()
+
+    async def _run(self):
+        """이벤트를 coalesce_window 동안 모아 한 번에 발송"""
+        window = self.config.coalesce_window_seconds
+
+        while True:
+            events = [await self._queue.get()]
+            deadline = time.monotonic() + window
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    events.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                for text in self.format_batch(events):
+                    for target in self.targets:
+                        target.enqueue(text)
+            except Exception as e:
+                logger.error(f"알림 메시지 생성 실패: {e}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+
+    def format_batch(self, events: list[NotificationEvent]) -> list[str]:
+        """
+        이벤트 묶음을 메시지로 변환
+
+        같은 종류가 digest_threshold개 이상이면 요약 메시지 하나로 합칩니다.
+        """
+        messages = []
+        counts = Counter(event.kind for event in events)
+
+        for kind in EVENT_LABELS:
+            group = [event for event in events if event.kind == kind]
+            if not group:
+                continue
+
+            label = EVENT_LABELS[kind]
+            if counts[kind] >= self.config.digest_threshold:
+                lines = [f"{label} {len(group)}건"]
+                lines += [f"• {event.channel_id}: {event.title or event.message}" for event in group]
+                messages.append("\n".join(lines))
+            else:
+                messages += [f"{label} [{event.channel_id}] {event.message}" for event in group]
+
+        return messages
+
+
+def _put_dropping_oldest(queue: asyncio.Queue, item, owner):
+    """큐가 가득 차면 가장 오래된 항목을 버리고 추가"""
+    while True:
+        try:
+            queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+                queue.task_done()
+                owner.dropped_count += 1
+            except asyncio.QueueEmpty:
+                pass
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """429 응답의 재시도 대기 시간 (Retry-After 헤더 또는 JSON 본문)"""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        body = response.json()
+    except ValueError:
+        return 1.0
+    if isinstance(body, dict):
+        value = body.get("retry_after") or (body.get("parameters") or {}).get("retry_after")
+        if isinstance(value, (int, float)):
+            return float(value)
+    return 1.0
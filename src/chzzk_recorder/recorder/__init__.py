@@ -3,5 +3,11 @@
 """
 
 from .stream_recorder import StreamRecorder, RecordingStatus, RecordingInfo
+from .chapters import Chapter, ChapterTracker
+from .output_manager import OutputManager, OutputReservation, get_output_manager
+from .integrity import IntegrityManifest, build_manifest
+from .continuity import ContinuityTracker, gaps_path
 
-__all__ = ["StreamRecorder", "RecordingStatus", "RecordingInfo"] 
\ No newline at end of file
+__all__ = ["StreamRecorder", "RecordingStatus", "RecordingInfo", "Chapter", "ChapterTracker",
+           "OutputManager", "OutputReservation", "get_output_manager",
+           "IntegrityManifest", "build_manifest", "ContinuityTracker", "gaps_path"] 
\ No newline at end of file
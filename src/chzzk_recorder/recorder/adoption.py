@@ -0,0 +1,128 @@
+"""
+다른 프로세스에서 넘겨받은 FFmpeg 감시 (무중단 업그레이드)
+
+녹화기를 새 버전 프로세스로 바꿀 때 FFmpeg을 재시작하지 않고 넘깁니다. 넘기는 쪽은
+녹화 상태(JSON)와 함께 FFmpeg의 pidfd, stdout/stderr 파이프를 DetachedRecording으로
+떼어 내고, 받는 쪽은 AdoptedProcess로 감싸 subprocess.Popen처럼 사용합니다.
+
+넘겨받은 FFmpeg은 이 프로세스의 자식이 아니므로 waitpid를 쓸 수 없습니다. 대신
+pidfd(Linux 5.3+)로 종료를 확인하고 신호를 보내므로, PID가 재사용되어도 다른
+프로세스에 신호를 보내지 않습니다. 종료 코드는 알 수 없어 0으로 봅니다.
+"""
+
+import logging
+import os
+import select
+import signal
+import socket
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def adoption_supported() -> bool:
+    """pidfd와 파일 디스크립터 전달(SCM_RIGHTS)을 쓸 수 있는지"""
+    return (hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal")
+            and hasattr(socket, "send_fds"))
+
+
+@dataclass
+class DetachedRecording:
+    """녹화기에서 떼어 낸 녹화 (FFmpeg은 계속 실행 중)"""
+    # StreamRecorder.detach()가 만든 녹화 상태 (JSON으로 보낼 수 있는 값만)
+    state: dict
+    # [pidfd, stdout, stderr]
+    fds: list[int]
+
+    @property
+    def channel_id(self) -> str:
+        return self.state["stream_info"]["channel_id"]
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.state["file_path"])
+
+    def close(self):
+        """이 프로세스의 파일 디스크립터 닫기 (다른 프로세스에 넘긴 뒤, FFmpeg은 그대로)"""
+        fds, self.fds = self.fds, []
+        for fd in fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def abandon(self):
+        """맡을 녹화기가 없는 녹화 정리: FFmpeg 종료 (partial 파일은 다음 실행 때 복구)"""
+        if self.fds:
+            try:
+                signal.pidfd_send_signal(self.fds[0], signal.SIGTERM)
+            except OSError:
+                pass
+        self.close()
+
+
+class AdoptedProcess:
+    """넘겨받은 FFmpeg (녹화기가 쓰는 subprocess.Popen 기능만)"""
+
+    def __init__(self, pid: int, pidfd: int, stdout: int, stderr: int):
+        """
+        초기화 (파일 디스크립터는 이 객체가 소유)
+
+        Args:
+            pid: FFmpeg PID
+            pidfd: FFmpeg pidfd
+            stdout: FFmpeg stdout 파이프 (pipe 출력 모드의 영상 데이터)
+            stderr: FFmpeg stderr 파이프
+        """
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self.stdout = os.fdopen(stdout, "rb", buffering=0)
+        self.stderr = os.fdopen(stderr, "rb", buffering=0)
+        self._pidfd: Optional[int] = pidfd
+
+    def pidfd(self) -> int:
+        """다른 프로세스에 넘길 pidfd 사본"""
+        if self._pidfd is None:
+            raise ProcessLookupError(self.pid)
+        return os.dup(self._pidfd)
+
+    def poll(self) -> Optional[int]:
+        """종료되었으면 종료 코드 (실행 중이면 None)"""
+        if self.returncode is None and self._pidfd is not None:
+            readable, _, _ = select.select([self._pidfd], [], [], 0)
+            if readable:
+                self.returncode = self._reap()
+                os.close(self._pidfd)
+                self._pidfd = None
+        return self.returncode
+
+    def _reap(self) -> int:
+        # 넘기기에 실패해 원래 프로세스가 다시 맡은 경우만 자식 프로세스
+        try:
+            _, status = os.waitpid(self.pid, os.WNOHANG)
+            return os.waitstatus_to_exitcode(status)
+        except (ChildProcessError, ValueError):
+            return 0
+
+    def send_signal(self, sig: int):
+        if self.poll() is not None:
+            return
+        try:
+            signal.pidfd_send_signal(self._pidfd, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def close(self):
+        """파일 디스크립터 닫기"""
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
+        self.stdout.close()
+        self.stderr.close()
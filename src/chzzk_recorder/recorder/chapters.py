@@ -0,0 +1,193 @@
+"""
+방송 제목/카테고리 변경에 따른 챕터 관리
+
+녹화 중 주기적인 상세 정보 폴링 결과를 받아 제목이나 카테고리가 바뀐 시점을
+챕터로 기록하고, ffmetadata 사이드카 파일로 저장합니다. 필요하면 카테고리가
+바뀐 지점에서 재인코딩 없이 파일을 나눕니다.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Callable
+
+from ..monitor import StreamInfo
+
+logger = logging.getLogger(__name__)
+
+# 파일 확장자 → segment 먹서의 출력 형식 (없는 확장자는 FFmpeg이 패턴에서 추정)
+SEGMENT_FORMATS = {
+    ".mp4": "mp4",
+    ".m4v": "mp4",
+    ".mov": "mov",
+    ".ts": "mpegts",
+    ".mkv": "matroska",
+    ".flv": "flv",
+}
+
+
+@dataclass
+class Chapter:
+    """녹화 내 챕터 (start는 녹화 시작 기준 초)"""
+    start: float
+    title: Optional[str]
+    category: Optional[str]
+
+    @property
+    def label(self) -> str:
+        """챕터 표시 이름"""
+        if self.category:
+            return f"[{self.category}] {self.title or ''}".strip()
+        return self.title or "untitled"
+
+
+class ChapterTracker:
+    """제목/카테고리 변경 추적기"""
+
+    def __init__(self, started_at: datetime, stream_info: StreamInfo):
+        """
+        초기화
+
+        Args:
+            started_at: 녹화 시작 시각 (챕터 오프셋 기준)
+            stream_info: 녹화 시작 시점의 방송 정보
+        """
+        self.started_at = started_at
+        self.chapters: list[Chapter] = [
+            Chapter(start=0.0, title=stream_info.title, category=stream_info.category)
+        ]
+
+    @property
+    def current(self) -> Chapter:
+        """현재 챕터"""
+        return self.chapters[-1]
+
+    def update(self, stream_info: StreamInfo, at: Optional[datetime] = None) -> Optional[Chapter]:
+        """
+        폴링 결과 반영
+
+        Returns:
+            새 챕터가 시작되었으면 해당 챕터, 아니면 None
+        """
+        title = stream_info.title or self.current.title
+        category = stream_info.category or self.current.category
+        if title == self.current.title and category == self.current.category:
+            return None
+
+        offset = ((at or datetime.now()) - self.started_at).total_seconds()
+        chapter = Chapter(start=max(offset, self.current.start), title=title, category=category)
+        self.chapters.append(chapter)
+        logger.info(f"📑 챕터 추가 ({offset:.0f}초): {chapter.label}")
+        return chapter
+
+    def write_ffmetadata(self, path: Path, duration: float, title: Optional[str] = None):
+        """
+        ffmetadata 사이드카 작성
+
+        `ffmpeg -i video.mp4 -i video.ffmeta -map_metadata 1 -c copy out.mp4`로
+        챕터를 영상에 넣을 수 있습니다.
+
+        Args:
+            path: 저장 경로
+            duration: 녹화 길이 (초, 마지막 챕터의 끝)
+            title: 전체 제목
+        """
+        lines = [";FFMETADATA1"]
+        if title:
+            lines.append(f"title={_escape(title)}")
+
+        ends = [chapter.start for chapter in self.chapters[1:]] + [max(duration, self.current.start)]
+        for chapter, end in zip(self.chapters, ends):
+            lines += [
+                "",
+                "[CHAPTER]",
+                "TIMEBASE=1/1000",
+                f"START={int(chapter.start * 1000)}",
+                f"END={int(end * 1000)}",
+                f"title={_escape(chapter.label)}",
+            ]
+
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def category_boundaries(chapters: list[Chapter]) -> list[float]:
+    """카테고리가 바뀐 지점 (초)"""
+    return [
+        chapter.start
+        for previous, chapter in zip(chapters, chapters[1:])
+        if chapter.category != previous.category
+    ]
+
+
+def _escape(value: str) -> str:
+    """ffmetadata 특수문자 이스케이프"""
+    for char in ("\\", "=", ";", "#", "\n"):
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+async def split_at_boundaries(ffmpeg_path: str,
+                              video_path: Path,
+                              boundaries: list[float],
+                              name_for_part: Callable[[int], str]) -> list[Path]:
+    """
+    재인코딩 없이 지정 지점에서 녹화 파일 분할
+
+    segment 먹서는 지정 시각 이후 첫 키프레임에서 자르므로 모든 파트가 키프레임으로
+    시작하고, 패킷은 전부 어느 한 파트에 들어가 빠지는 구간이 없습니다.
+
+    Args:
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        video_path: 원본 녹화 파일
+        boundaries: 분할 지점 (초)
+        name_for_part: 파트 번호 -> 파일명
+
+    Returns:
+        생성된 파트 파일 경로 목록 (실패 시 빈 목록)
+    """
+    if not boundaries:
+        return []
+
+    prefix = f".{video_path.stem}.part"
+    pattern = video_path.with_name(f"{prefix}%03d{video_path.suffix}")
+    cmd = [
+        ffmpeg_path,
+        "-hide_banner", "-loglevel", "error",
+        "-i", str(video_path),
+        "-map", "0",
+        "-c", "copy",
+        "-f", "segment",
+        "-segment_times", ",".join(f"{t:.3f}" for t in boundaries),
+        "-reset_timestamps", "1",
+    ]
+    segment_format = SEGMENT_FORMATS.get(video_path.suffix.lower())
+    if segment_format:
+        cmd += ["-segment_format", segment_format]
+    cmd.append(str(pattern))
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+
+    temp_parts = sorted(
+        path for path in video_path.parent.iterdir()
+        if path.name.startswith(prefix) and path.suffix == video_path.suffix
+    )
+    if process.returncode != 0 or len(temp_parts) != len(boundaries) + 1:
+        logger.error(f"녹화 분할 실패 (파트 {len(temp_parts)}개): "
+                     f"{stderr.decode('utf-8', errors='ignore').strip()}")
+        for part in temp_parts:
+            part.unlink(missing_ok=True)
+        return []
+
+    parts = []
+    for index, temp_part in enumerate(temp_parts):
+        target = video_path.with_name(name_for_part(index))
+        temp_part.rename(target)
+        parts.append(target)
+
+    logger.info(f"✂️  녹화 분할 완료: {video_path.name} -> {len(parts)}개 파트")
+    return parts
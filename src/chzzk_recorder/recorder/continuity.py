@@ -0,0 +1,410 @@
+"""
+HLS 미디어 시퀀스 연속성 검사
+
+녹화 중 상태 확인은 파일 크기 증가뿐이라, 세그먼트가 빠지거나 중복되거나 타임스탬프가
+튀어도 VOD를 직접 보기 전에는 알 수 없습니다. 녹화하는 동안 미디어 플레이리스트를
+따로 받아 세그먼트 번호(EXT-X-MEDIA-SEQUENCE), 길이(EXTINF), EXT-X-DISCONTINUITY,
+EXT-X-PROGRAM-DATE-TIME을 추적하고, FFmpeg 로그의 세그먼트 건너뜀 경고를 함께 모아
+"{파일명}.gaps.json" 사이드카로 저장합니다.
+
+- skipped: 세그먼트 번호가 건너뜀 (PROGRAM-DATE-TIME이 있으면 빠진 시간이 정확함)
+- timestamp_jump: 번호는 이어지는데 PROGRAM-DATE-TIME이 앞 세그먼트 끝과 어긋남
+- duplicate: 이미 받은 세그먼트(같은 URI)가 다른 번호로 다시 나옴
+- discontinuity: EXT-X-DISCONTINUITY (빠진 시간 없음, 인코더 재시작 등)
+- capture_skip: FFmpeg이 플레이리스트를 따라가지 못해 세그먼트를 건너뜀
+- reset: 세그먼트 번호가 되돌아감 (송출 재시작)
+- unobserved: 플레이리스트를 받지 못한 사이 번호가 건너뜀 (녹화 누락인지 알 수 없음)
+
+빠진 시간이 reconnect_gap_seconds 이상이면 녹화기가 FFmpeg을 다시 연결합니다.
+FFmpeg stderr는 StderrDrain이 계속 읽어 파이프가 차서 FFmpeg이 멈추지 않게 합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import select
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, IO, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GAPS_SUFFIX = ".gaps.json"
+
+# 빠진 시간에 포함되는 종류 (다시 연결 판단 기준)
+MISSING_KINDS = ("skipped", "timestamp_jump", "capture_skip")
+
+_SKIP_LINE = re.compile(r"skipping (\d+) segments ahead, expired from playlists")
+
+
+def gaps_path(video_path: Path) -> Path:
+    """녹화 파일의 끊김 보고서 경로"""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.stem + GAPS_SUFFIX)
+
+
+@dataclass(slots=True)
+class Segment:
+    """미디어 플레이리스트의 세그먼트"""
+    sequence: int
+    duration: float
+    uri: str
+    discontinuity: bool = False
+    # EXT-X-PROGRAM-DATE-TIME (epoch 초)
+    program_time: Optional[float] = None
+
+
+@dataclass
+class MediaPlaylist:
+    """미디어 플레이리스트 파싱 결과"""
+    target_duration: float
+    media_sequence: int
+    segments: list[Segment]
+    ended: bool = False
+
+    @property
+    def window(self) -> float:
+        """플레이리스트에 남아 있는 구간 길이 (초)"""
+        return sum(segment.duration for segment in self.segments)
+
+
+def parse_media_playlist(text: str) -> MediaPlaylist:
+    """미디어 플레이리스트 파싱 (LL-HLS 파트는 무시)"""
+    target_duration = 0.0
+    sequence = 0
+    segments: list[Segment] = []
+    ended = False
+    duration: Optional[float] = None
+    discontinuity = False
+    program_time: Optional[float] = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#EXT-X-TARGETDURATION:"):
+            target_duration = float(line.split(":", 1)[1])
+        elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            sequence = int(line.split(":", 1)[1])
+        elif line.startswith("#EXTINF:"):
+            duration = float(line.split(":", 1)[1].split(",", 1)[0])
+        elif line == "#EXT-X-DISCONTINUITY":
+            discontinuity = True
+        elif line.startswith("#EXT-X-PROGRAM-DATE-TIME:"):
+            try:
+                value = line.split(":", 1)[1].replace("Z", "+00:00")
+                program_time = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                program_time = None
+        elif line == "#EXT-X-ENDLIST":
+            ended = True
+        elif not line.startswith("#") and duration is not None:
+            segments.append(Segment(sequence, duration, line, discontinuity, program_time))
+            sequence += 1
+            duration, discontinuity, program_time = None, False, None
+
+    if not target_duration and segments:
+        target_duration = max(segment.duration for segment in segments)
+    return MediaPlaylist(target_duration, segments[0].sequence if segments else sequence, segments, ended)
+
+
+def select_variant(text: str, base_url: str) -> Optional[str]:
+    """마스터 플레이리스트면 대역폭이 가장 큰 variant URL (FFmpeg 기본 선택과 같음)"""
+    best: Optional[tuple[int, str]] = None
+    bandwidth: Optional[int] = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXT-X-STREAM-INF:"):
+            match = re.search(r"(?:^|[:,])BANDWIDTH=(\d+)", line)
+            bandwidth = int(match.group(1)) if match else 0
+        elif line and not line.startswith("#") and bandwidth is not None:
+            if best is None or bandwidth > best[0]:
+                best = (bandwidth, urljoin(base_url, line))
+            bandwidth = None
+    return best[1] if best else None
+
+
+@dataclass
+class Gap:
+    """연속성 문제 하나"""
+    kind: str
+    # 녹화 시작 기준 감지 시각 (초)
+    at: float
+    # 문제가 시작된 세그먼트 번호 (FFmpeg 로그 기준이면 None)
+    sequence: Optional[int]
+    # 빠진 시간 (초, duplicate는 중복된 시간, timestamp_jump에서 음수면 겹침)
+    seconds: float = 0.0
+    segments: int = 0
+    # PROGRAM-DATE-TIME 없이 세그먼트 길이로 추정한 값
+    estimated: bool = False
+
+    @property
+    def missing(self) -> float:
+        """녹화에서 빠진 시간 (초)"""
+        return max(0.0, self.seconds) if self.kind in MISSING_KINDS else 0.0
+
+
+class ContinuityTracker:
+    """녹화 하나의 세그먼트 연속성 추적"""
+
+    # 중복 확인용으로 기억하는 최근 세그먼트 수
+    RECENT_SEGMENTS = 256
+    # FFmpeg이 라이브 플레이리스트에서 처음 받는 세그먼트 수 (live_start_index 기본값 -3)
+    LIVE_START_SEGMENTS = 3
+
+    def __init__(self, jump_tolerance: float = 1.0):
+        """
+        초기화
+
+        Args:
+            jump_tolerance: PROGRAM-DATE-TIME 차이를 타임스탬프 점프로 보는 기준 (초)
+        """
+        self.jump_tolerance = jump_tolerance
+        self.gaps: list[Gap] = []
+        self.segments = 0
+        self.captured_seconds = 0.0
+        self._last: Optional[Segment] = None
+        self._recent: dict[str, int] = {}
+        self._last_fed: Optional[float] = None
+        self._last_window = 0.0
+        self._lock = threading.Lock()
+
+    def feed_playlist(self, playlist: MediaPlaylist, at: float) -> list[Gap]:
+        """
+        새로 받은 플레이리스트 반영
+
+        Args:
+            playlist: 미디어 플레이리스트
+            at: 녹화 시작 기준 받은 시각 (초)
+
+        Returns:
+            새로 발견한 문제 목록
+        """
+        with self._lock:
+            found: list[Gap] = []
+            # 앞 플레이리스트에 있던 구간이 모두 지나간 뒤에 받았으면 건너뜀을 확인할 수 없음
+            late = self._last_fed is not None and at - self._last_fed > self._last_window
+            self._last_fed, self._last_window = at, playlist.window
+
+            segments = playlist.segments
+            if self._last and segments and segments[-1].sequence < self._last.sequence - len(segments):
+                found.append(Gap("reset", at, segments[0].sequence))
+                self._last = None
+            elif not self._last and not playlist.ended:
+                segments = segments[-self.LIVE_START_SEGMENTS:]
+
+            for segment in segments:
+                last = self._last
+                if last and segment.sequence <= last.sequence:
+                    continue
+                found.extend(self._check(segment, last, at, late))
+                self._last = segment
+                self.segments += 1
+                self.captured_seconds += segment.duration
+                self._recent[segment.uri] = segment.sequence
+                if len(self._recent) > self.RECENT_SEGMENTS:
+                    del self._recent[next(iter(self._recent))]
+
+            self.gaps.extend(found)
+            return found
+
+    def _check(self, segment: Segment, last: Optional[Segment], at: float, late: bool) -> list[Gap]:
+        found: list[Gap] = []
+        if segment.discontinuity:
+            found.append(Gap("discontinuity", at, segment.sequence))
+        if segment.uri in self._recent:
+            found.append(Gap("duplicate", at, segment.sequence, segment.duration, 1))
+        if not last:
+            return found
+
+        expected_time = last.program_time + last.duration if last.program_time is not None else None
+        exact = expected_time is not None and segment.program_time is not None
+        skipped = segment.sequence - last.sequence - 1
+        if skipped > 0:
+            if exact:
+                seconds, estimated = segment.program_time - expected_time, False
+            else:
+                seconds, estimated = skipped * self.average_duration(last.duration), True
+            found.append(Gap("unobserved" if late else "skipped", at, last.sequence + 1,
+                             round(seconds, 3), skipped, estimated))
+        elif exact and abs(segment.program_time - expected_time) > self.jump_tolerance:
+            found.append(Gap("timestamp_jump", at, segment.sequence,
+                             round(segment.program_time - expected_time, 3)))
+        return found
+
+    def feed_ffmpeg_line(self, line: str, at: float) -> Optional[Gap]:
+        """FFmpeg 로그 한 줄 반영 (세그먼트 건너뜀 경고)"""
+        match = _SKIP_LINE.search(line)
+        if not match:
+            return None
+        with self._lock:
+            count = int(match.group(1))
+            gap = Gap("capture_skip", at, None, round(count * self.average_duration(), 3), count, True)
+            self.gaps.append(gap)
+            return gap
+
+    def average_duration(self, default: float = 2.0) -> float:
+        """지금까지 받은 세그먼트 평균 길이 (초)"""
+        return self.captured_seconds / self.segments if self.segments else default
+
+    @property
+    def missing_seconds(self) -> float:
+        """녹화에서 빠진 시간 합계 (초)"""
+        return sum(gap.missing for gap in self.gaps)
+
+    def report(self, file: str) -> dict:
+        """끊김 보고서"""
+        with self._lock:
+            kinds: dict[str, int] = {}
+            for gap in self.gaps:
+                kinds[gap.kind] = kinds.get(gap.kind, 0) + 1
+            return {
+                "file": file,
+                "segments": self.segments,
+                "captured_seconds": round(self.captured_seconds, 3),
+                "missing_seconds": round(self.missing_seconds, 3),
+                "duplicate_seconds": round(sum(g.seconds for g in self.gaps if g.kind == "duplicate"), 3),
+                "estimated": any(gap.estimated for gap in self.gaps if gap.missing),
+                "counts": kinds,
+                "gaps": [asdict(gap) for gap in self.gaps],
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def save(self, path: Path, file: str):
+        """끊김 보고서 저장 (임시 파일 → 교체)"""
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(json.dumps(self.report(file), ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temp, path)
+
+
+class PlaylistWatcher:
+    """녹화 중 미디어 플레이리스트를 받아 ContinuityTracker에 전달"""
+
+    def __init__(self,
+                 url: str,
+                 tracker: ContinuityTracker,
+                 started: float,
+                 on_gaps: Optional[Callable[[list[Gap]], None]] = None,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        초기화
+
+        Args:
+            url: HLS URL (마스터면 가장 높은 화질의 미디어 플레이리스트를 사용)
+            tracker: 연속성 추적기
+            started: 녹화 시작 시각 (time.monotonic)
+            on_gaps: 새 문제를 찾았을 때 호출
+            client: HTTP 클라이언트 (없으면 만들어서 닫음)
+        """
+        self.url = url
+        self.tracker = tracker
+        self.started = started
+        self.on_gaps = on_gaps
+        self.failures = 0
+        self._client = client
+
+    async def run(self, is_active: Callable[[], bool]):
+        """is_active()가 False가 되거나 방송이 끝날 때까지 플레이리스트 확인"""
+        client = self._client or httpx.AsyncClient(timeout=10.0, follow_redirects=True)
+        url = self.url
+        try:
+            while is_active():
+                delay = 2.0
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    text = response.text
+                    variant = select_variant(text, str(response.url))
+                    if variant:
+                        if url != self.url:
+                            # 변형을 따라갔는데 또 마스터면 계속 따라가지 않고 실패로 셈
+                            raise ValueError(f"미디어 플레이리스트가 아닙니다: {url}")
+                        url = variant
+                        continue
+                    playlist = parse_media_playlist(text)
+                    gaps = self.tracker.feed_playlist(playlist, time.monotonic() - self.started)
+                    if gaps and self.on_gaps:
+                        self.on_gaps(gaps)
+                    if playlist.ended:
+                        return
+                    # HLS 규칙대로 target duration마다 다시 받음
+                    delay = playlist.target_duration or delay
+                except (httpx.HTTPError, ValueError) as e:
+                    self.failures += 1
+                    logger.debug(f"플레이리스트 확인 실패: {e}")
+                await asyncio.sleep(delay)
+        finally:
+            if client is not self._client:
+                await client.aclose()
+
+
+class StderrDrain:
+    """FFmpeg stderr를 계속 읽는 스레드 (최근 줄은 오류 메시지용으로 보관)"""
+
+    def __init__(self, stream: IO, on_line: Optional[Callable[[str], None]] = None, tail: int = 50):
+        self.stream = stream
+        self.on_line = on_line
+        self.lines = 0
+        self._tail: deque[str] = deque(maxlen=tail)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ffmpeg-stderr", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """스레드 종료 대기 (종료되었으면 True)"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """읽기 중지 (읽지 않은 출력은 파이프에 남음, 녹화를 다른 프로세스에 넘길 때)"""
+        self._stop.set()
+        return self.join(timeout)
+
+    def text(self) -> str:
+        """최근 stderr"""
+        return "\n".join(self._tail)
+
+    def _run(self):
+        # 파일 객체의 버퍼를 거치지 않고 읽어야 멈춘 뒤 남은 출력을 다른 프로세스가 이어서 읽음
+        pending = b""
+        try:
+            fd = self.stream.fileno()
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.2)
+                if not ready:
+                    continue
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                *lines, pending = (pending + data).split(b"\n")
+                for raw in lines:
+                    self._feed(raw)
+            else:
+                return
+            if pending:
+                self._feed(pending)
+        except (OSError, ValueError):
+            pass
+
+    def _feed(self, raw: bytes):
+        line = raw.decode("utf-8", errors="ignore").rstrip()
+        if not line:
+            return
+        self.lines += 1
+        self._tail.append(line)
+        if self.on_line:
+            try:
+                self.on_line(line)
+            except Exception as e:
+                logger.debug(f"FFmpeg 로그 처리 실패: {e}")
@@ -0,0 +1,242 @@
+"""
+FFmpeg 기능 확인 (실행 파일마다 한 번, 결과는 파일에 캐시)
+
+녹화기를 시작/재시작할 때마다 `ffmpeg -version`을 실행하던 대신, 실행 파일(실제 경로,
+수정 시각, 크기)마다 한 번만 `-version`, `-muxers`, `-bsfs`, `-protocols`를 실행해
+지원하는 muxer/비트스트림 필터/프로토콜 목록을 JSON 파일에 저장합니다. FFmpeg을
+업데이트하면 수정 시각이나 크기가 바뀌므로 다시 확인합니다. 확인은 스레드에서
+실행하므로 이벤트 루프를 막지 않고, 동시에 요청한 녹화기들은 결과 하나를 같이 씁니다.
+
+확인한 기능으로 녹화에 필요한 기능이 빠졌는지 시작할 때 알려 주고, 출력 방식을
+고릅니다 (RecordingConfig.output_mode="auto": 파일에 직접 기록할 수 있으면 direct,
+아니면 pipe). 목록을 얻지 못한 항목은 확인하지 않고 사용합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 명령 하나당 제한 시간 (초)
+PROBE_TIMEOUT = 10
+CACHE_VERSION = 1
+
+# 녹화 명령(StreamRecorder._build_ffmpeg_command)에 필요한 기능
+REQUIRED_MUXERS = ("mp4",)
+REQUIRED_BSFS = ("aac_adtstoasc",)
+REQUIRED_INPUT_PROTOCOLS = ("https",)
+
+
+@dataclass(frozen=True)
+class FfmpegCapabilities:
+    """FFmpeg 실행 파일이 지원하는 기능 (None이면 목록을 얻지 못함)"""
+    path: str
+    version: str
+    muxers: Optional[frozenset[str]] = None
+    bsfs: Optional[frozenset[str]] = None
+    input_protocols: Optional[frozenset[str]] = None
+    output_protocols: Optional[frozenset[str]] = None
+
+    def missing(self) -> list[str]:
+        """녹화에 필요하지만 지원하지 않는 기능"""
+        missing = [f"muxer {name}" for name in REQUIRED_MUXERS if not _has(self.muxers, name)]
+        missing += [f"bsf {name}" for name in REQUIRED_BSFS if not _has(self.bsfs, name)]
+        missing += [f"protocol {name}" for name in REQUIRED_INPUT_PROTOCOLS
+                    if not _has(self.input_protocols, name)]
+        return missing
+
+    def output_mode(self, preferred: str) -> str:
+        """
+        실제로 쓸 출력 방식
+
+        "auto"는 기존 방식(direct, 일반 MP4)을 쓰고, 파일 출력이 없는 빌드에서만 pipe.
+        pipe(fragmented MP4)는 명시적으로 지정한 경우에만 씁니다.
+        지정한 방식을 지원하지 않으면 다른 방식을 씁니다.
+        """
+        if preferred == "auto":
+            return "direct" if _has(self.output_protocols, "file") else "pipe"
+        if preferred == "pipe" and not _has(self.output_protocols, "pipe"):
+            return "direct"
+        if preferred == "direct" and not _has(self.output_protocols, "file"):
+            return "pipe"
+        return preferred
+
+    def to_dict(self) -> dict:
+        data = {"path": self.path, "version": self.version}
+        for name in ("muxers", "bsfs", "input_protocols", "output_protocols"):
+            value = getattr(self, name)
+            data[name] = sorted(value) if value is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FfmpegCapabilities":
+        lists = {name: frozenset(data[name]) if data.get(name) is not None else None
+                 for name in ("muxers", "bsfs", "input_protocols", "output_protocols")}
+        return cls(path=data["path"], version=data["version"], **lists)
+
+
+def _has(names: Optional[frozenset[str]], name: str) -> bool:
+    return names is None or name in names
+
+
+def parse_formats(text: str) -> Optional[frozenset[str]]:
+    """`-muxers`/`-formats` 출력의 이름 목록 ("--" 줄 다음, 쉼표로 구분된 별칭 포함)"""
+    names: set[str] = set()
+    started = False
+    for line in text.splitlines():
+        if not started:
+            started = line.strip() == "--"
+            continue
+        fields = line.split(None, 2)
+        if len(fields) >= 2:
+            names.update(fields[1].split(","))
+    return frozenset(names) or None
+
+
+def parse_bsfs(text: str) -> Optional[frozenset[str]]:
+    """`-bsfs` 출력의 필터 목록"""
+    lines = [line.strip() for line in text.splitlines()]
+    if "Bitstream filters:" not in lines:
+        return None
+    names = lines[lines.index("Bitstream filters:") + 1:]
+    return frozenset(name for name in names if name) or None
+
+
+def parse_protocols(text: str) -> tuple[Optional[frozenset[str]], Optional[frozenset[str]]]:
+    """`-protocols` 출력의 (입력, 출력) 프로토콜 목록"""
+    sections: dict[str, set[str]] = {}
+    current: Optional[set[str]] = None
+    for line in text.splitlines():
+        name = line.strip()
+        if name in ("Input:", "Output:"):
+            current = sections.setdefault(name, set())
+        elif name and current is not None:
+            current.add(name)
+    return (frozenset(sections["Input:"]) if sections.get("Input:") else None,
+            frozenset(sections["Output:"]) if sections.get("Output:") else None)
+
+
+def _run(path: str, *args: str) -> Optional[str]:
+    """FFmpeg 실행 결과 (실패하면 None)"""
+    try:
+        result = subprocess.run([path, "-hide_banner", *args], capture_output=True, text=True,
+                                errors="replace", timeout=PROBE_TIMEOUT)
+    except (subprocess.TimeoutExpired, OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"FFmpeg {' '.join(args)} 실행 실패: {e}")
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _run_probe(path: str) -> Optional[FfmpegCapabilities]:
+    """FFmpeg을 실행해 기능 확인 (실행할 수 없으면 None)"""
+    version = _run(path, "-version")
+    if version is None:
+        return None
+    protocols = _run(path, "-protocols")
+    input_protocols, output_protocols = parse_protocols(protocols) if protocols else (None, None)
+    muxers = _run(path, "-muxers")
+    bsfs = _run(path, "-bsfs")
+    return FfmpegCapabilities(
+        path=path,
+        version=version.strip().splitlines()[0].split(" Copyright")[0] if version.strip() else "",
+        muxers=parse_formats(muxers) if muxers else None,
+        bsfs=parse_bsfs(bsfs) if bsfs else None,
+        input_protocols=input_protocols,
+        output_protocols=output_protocols
+    )
+
+
+def _load_cached(cache_path: Path, path: str, stat: os.stat_result) -> Optional[FfmpegCapabilities]:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        entry = data["binaries"][path] if data.get("version") == CACHE_VERSION else None
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return FfmpegCapabilities.from_dict(entry["capabilities"])
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug(f"FFmpeg 기능 캐시를 읽을 수 없습니다: {e}")
+    return None
+
+
+def _save_cached(cache_path: Path, capabilities: FfmpegCapabilities, stat: os.stat_result):
+    """캐시 파일에 실행 파일 하나의 결과 저장 (임시 파일 → 교체)"""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION or not isinstance(data.get("binaries"), dict):
+            raise ValueError
+    except (OSError, ValueError):
+        data = {"version": CACHE_VERSION, "binaries": {}}
+    data["binaries"][capabilities.path] = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "capabilities": capabilities.to_dict(),
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temp, cache_path)
+    except OSError as e:
+        logger.warning(f"FFmpeg 기능 캐시 저장 실패: {e}")
+
+
+# (실제 경로, 수정 시각, 크기) → 확인 결과
+_probed: dict[tuple[str, int, int], FfmpegCapabilities] = {}
+_lock = threading.Lock()
+
+
+def probe_ffmpeg(ffmpeg_path: str = "ffmpeg",
+                 cache_path: Optional[Path] = None) -> Optional[FfmpegCapabilities]:
+    """
+    FFmpeg 기능 확인 (실행 파일이 바뀌지 않았으면 메모리/파일 캐시 사용, 블로킹)
+
+    Args:
+        ffmpeg_path: FFmpeg 실행 파일 경로 또는 PATH에서 찾을 이름
+        cache_path: 결과를 저장할 JSON 파일 (None이면 메모리에만)
+
+    Returns:
+        FfmpegCapabilities, FFmpeg을 찾거나 실행할 수 없으면 None
+    """
+    found = shutil.which(ffmpeg_path)
+    if not found:
+        return None
+    path = os.path.realpath(found)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    # 동시에 요청한 녹화기들은 먼저 시작한 확인 결과를 기다림
+    with _lock:
+        capabilities = _probed.get(key)
+        if capabilities:
+            return capabilities
+        capabilities = _load_cached(Path(cache_path), path, stat) if cache_path else None
+        if capabilities is None:
+            capabilities = _run_probe(path)
+            if capabilities is None:
+                return None
+            logger.info(f"🔧 FFmpeg 기능 확인: {capabilities.version or path} "
+                        f"(muxer {len(capabilities.muxers or ())}개, bsf {len(capabilities.bsfs or ())}개, "
+                        f"출력 프로토콜 {len(capabilities.output_protocols or ())}개)")
+            if cache_path:
+                _save_cached(Path(cache_path), capabilities, stat)
+        _probed[key] = capabilities
+        return capabilities
+
+
+async def get_ffmpeg_capabilities(ffmpeg_path: str = "ffmpeg",
+                                  cache_path: Optional[Path] = None) -> Optional[FfmpegCapabilities]:
+    """probe_ffmpeg를 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+    return await asyncio.to_thread(probe_ffmpeg, ffmpeg_path, cache_path)
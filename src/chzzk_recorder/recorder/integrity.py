@@ -0,0 +1,188 @@
+"""
+녹화 파일 무결성 매니페스트
+
+녹화 중에 파일을 고정 크기 청크로 나눠 BLAKE2b 해시를 계산하고, 녹화가 끝나면
+"{파일명}.manifest.json" 사이드카로 저장합니다. 이후 복사/업로드/비트 손상 검사는
+원본을 다시 읽지 않고 매니페스트와 청크 단위로 비교할 수 있으며, 어긋난 청크만
+다시 전송하면 됩니다.
+
+- pipe 출력 모드: 기록기가 디스크에 쓰는 데이터를 그대로 해시 (추가 읽기 없음)
+- direct 모드: 녹화 중 주기적으로 새로 추가된 부분만 읽어 해시하고 (방금 기록한
+  데이터라 대부분 페이지 캐시에서 읽힘), 종료 시 FFmpeg이 다시 쓰는 파일 앞부분
+  (mdat 크기) 청크만 다시 계산합니다.
+
+전체 파일 값(root)은 청크 해시들을 이어 붙인 값의 BLAKE2b입니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# 청크 크기
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# 청크 해시 크기 (바이트)
+DIGEST_SIZE = 16
+
+ALGORITHM = "blake2b-128"
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(video_path: Path) -> Path:
+    """녹화 파일의 매니페스트 경로"""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.stem + MANIFEST_SUFFIX)
+
+
+def _chunk_digest(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def root_digest(chunks: list[bytes]) -> str:
+    """청크 해시 목록으로 전체 파일 값 계산"""
+    return hashlib.blake2b(b"".join(chunks)).hexdigest()
+
+
+@dataclass
+class IntegrityManifest:
+    """무결성 매니페스트"""
+    file: str
+    size: int
+    chunk_size: int
+    chunks: list[str]
+    root: str
+    algorithm: str = ALGORITHM
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def save(self, path: Path):
+        """매니페스트 저장 (임시 파일 → 교체)"""
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(json.dumps(asdict(self), ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "IntegrityManifest":
+        """매니페스트 읽기"""
+        return cls(**json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def chunk_range(self, index: int) -> tuple[int, int]:
+        """청크의 (시작 위치, 길이)"""
+        start = index * self.chunk_size
+        return start, min(self.chunk_size, self.size - start)
+
+    def verify(self, path: Path, indices: Optional[list[int]] = None, read_hook=None) -> list[int]:
+        """
+        파일을 매니페스트와 비교
+
+        Args:
+            path: 검사할 파일
+            indices: 검사할 청크 번호 (기본값: 전체)
+            read_hook: 청크를 읽을 때마다 읽은 바이트 수로 호출 (속도 제한 등)
+
+        Returns:
+            일치하지 않는 청크 번호 목록 (크기가 다르면 범위를 벗어난 청크 포함)
+        """
+        indices = range(len(self.chunks)) if indices is None else indices
+        bad = []
+        with open(path, "rb", buffering=0) as f:
+            actual_size = os.fstat(f.fileno()).st_size
+            for index in indices:
+                start, length = self.chunk_range(index)
+                if start + length > actual_size:
+                    bad.append(index)
+                    continue
+                data = os.pread(f.fileno(), length, start)
+                if read_hook:
+                    read_hook(len(data))
+                if _chunk_digest(data).hex() != self.chunks[index]:
+                    bad.append(index)
+        if actual_size != self.size and not bad:
+            bad.append(len(self.chunks))
+        return bad
+
+
+class ChunkHasher:
+    """순서대로 들어오는 데이터의 청크별 해시 (스레드 안전)"""
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self._current = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        self._filled = 0
+        self._lock = threading.RLock()
+
+    def update(self, data):
+        """데이터 추가"""
+        with self._lock:
+            self._update(data)
+
+    def _update(self, data):
+        view = memoryview(data)
+        self.size += len(view)
+        while view:
+            n = min(len(view), self.chunk_size - self._filled)
+            self._current.update(view[:n])
+            self._filled += n
+            view = view[n:]
+            if self._filled == self.chunk_size:
+                self.chunks.append(self._current.digest())
+                self._current = hashlib.blake2b(digest_size=DIGEST_SIZE)
+                self._filled = 0
+
+    def update_from_file(self, path: Path, limit: Optional[int] = None) -> int:
+        """
+        파일에서 아직 해시하지 않은 부분(self.size 이후)을 읽어 추가 (direct 모드)
+
+        Returns:
+            새로 읽은 바이트 수
+        """
+        total = 0
+        with self._lock, open(path, "rb", buffering=0) as f:
+            end = os.fstat(f.fileno()).st_size if limit is None else limit
+            while self.size < end:
+                data = os.pread(f.fileno(), min(self.chunk_size, end - self.size), self.size)
+                if not data:
+                    break
+                self._update(data)
+                total += len(data)
+        return total
+
+    def finish(self, file_name: str, rehash_head_from: Optional[Path] = None) -> IntegrityManifest:
+        """
+        매니페스트 생성
+
+        Args:
+            file_name: 매니페스트에 기록할 파일명
+            rehash_head_from: 첫 청크를 이 파일에서 다시 계산 (녹화 종료 시 앞부분이
+                              다시 기록되는 direct 모드)
+        """
+        with self._lock:
+            chunks = list(self.chunks)
+            if self._filled:
+                chunks.append(self._current.copy().digest())
+
+        if rehash_head_from and chunks:
+            with open(rehash_head_from, "rb", buffering=0) as f:
+                chunks[0] = _chunk_digest(os.pread(f.fileno(), min(self.chunk_size, self.size), 0))
+
+        return IntegrityManifest(
+            file=file_name,
+            size=self.size,
+            chunk_size=self.chunk_size,
+            chunks=[c.hex() for c in chunks],
+            root=root_digest(chunks),
+        )
+
+
+def build_manifest(path: Path, chunk_size: int = CHUNK_SIZE) -> IntegrityManifest:
+    """완성된 파일을 읽어 매니페스트 생성 (분할 파트 등 녹화 후 만든 파일용)"""
+    path = Path(path)
+    hasher = ChunkHasher(chunk_size)
+    hasher.update_from_file(path)
+    return hasher.finish(path.name)
@@ -0,0 +1,269 @@
+"""
+녹화 출력 파일 관리
+
+녹화 중인 파일은 같은 디렉터리의 "{파일명}.partial"에 기록하고, 녹화가 끝나면
+최종 파일명으로 원자적으로 옮깁니다. NAS 동기화 도구는 *.partial만 제외하면
+커지는 중인 파일을 반복해서 업로드하지 않습니다.
+
+- 이름 예약: partial 파일을 O_CREAT | O_EXCL로 만들어 같은 이름을 동시에
+  쓰는 녹화(같은 초, 같은 제목, 재시작)가 서로 덮어쓰지 않도록 합니다.
+- 최종화: link + unlink로 이미 있는 파일을 덮어쓰지 않고 이름을 바꿉니다.
+  하드 링크를 지원하지 않는 파일시스템에서는 존재 확인 후 rename합니다.
+"""
+
+import errno
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from ...filename_template import truncate_bytes
+
+logger = logging.getLogger(__name__)
+
+
+PARTIAL_SUFFIX = ".partial"
+
+# 파일명 최대 바이트 수 (partial 이름이 넘치면 원래 이름을 잘라서 사용)
+MAX_NAME_BYTES = 255
+
+# 이름 충돌 시 시도할 최대 접미사 번호
+MAX_SUFFIX_INDEX = 999
+
+
+class OutputManagerError(Exception):
+    """출력 파일 관리 오류"""
+    pass
+
+
+@dataclass
+class OutputReservation:
+    """예약된 출력 파일"""
+    final_path: Path
+    partial_path: Path
+    reserved_at: datetime = field(default_factory=datetime.now)
+
+
+def is_partial(path: Path) -> bool:
+    """녹화 중인 파일인지 확인"""
+    return path.name.endswith(PARTIAL_SUFFIX)
+
+
+def partial_name(final_name: str) -> str:
+    """최종 파일명에 대응하는 partial 파일명"""
+    budget = MAX_NAME_BYTES - len(PARTIAL_SUFFIX)
+    return truncate_bytes(final_name, budget) + PARTIAL_SUFFIX
+
+
+def move_no_replace(source: Path, target: Path) -> bool:
+    """
+    target이 없을 때만 source를 target으로 이동 (같은 파일시스템)
+
+    Returns:
+        이동했으면 True, target이 이미 있으면 False
+    """
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        return False
+    except OSError as e:
+        if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EXDEV, errno.EMLINK):
+            raise
+        # 하드 링크 미지원 파일시스템
+        if target.exists():
+            return False
+        os.rename(source, target)
+        return True
+    source.unlink()
+    return True
+
+
+def _with_index(path: Path, index: int) -> Path:
+    return path if index == 0 else path.with_name(f"{path.stem}_{index}{path.suffix}")
+
+
+class OutputManager:
+    """디렉터리 단위 출력 파일 예약/최종화"""
+
+    def __init__(self, directory: Path):
+        """
+        초기화
+
+        Args:
+            directory: 녹화 파일 디렉터리
+        """
+        self.directory = Path(directory)
+        self._reservations: dict[Path, OutputReservation] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_progress(self) -> frozenset[Path]:
+        """이 프로세스에서 녹화 중인 최종 파일 경로 목록"""
+        with self._lock:
+            return frozenset(self._reservations)
+
+    def reservations(self) -> list[OutputReservation]:
+        """이 프로세스의 예약 목록"""
+        with self._lock:
+            return list(self._reservations.values())
+
+    def reserve(self, filename: str) -> OutputReservation:
+        """
+        출력 파일 예약
+
+        최종 파일이나 다른 녹화의 partial 파일과 겹치면 "_1", "_2" ... 접미사를 붙입니다.
+
+        Args:
+            filename: 원하는 최종 파일명
+
+        Returns:
+            OutputReservation: partial 파일은 빈 파일로 생성된 상태
+
+        Raises:
+            OutputManagerError: 예약 실패
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / filename
+
+        for index in range(MAX_SUFFIX_INDEX + 1):
+            final_path = _with_index(base, index)
+            if final_path.exists():
+                continue
+            partial_path = final_path.with_name(partial_name(final_path.name))
+            try:
+                fd = os.open(partial_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            except OSError as e:
+                raise OutputManagerError(f"출력 파일 생성 실패: {partial_path} ({e})") from e
+            os.close(fd)
+
+            reservation = OutputReservation(final_path=final_path, partial_path=partial_path)
+            with self._lock:
+                self._reservations[final_path] = reservation
+            if index:
+                logger.info(f"파일명 충돌로 다른 이름 사용: {final_path.name}")
+            return reservation
+
+        raise OutputManagerError(f"사용 가능한 파일명이 없습니다: {filename}")
+
+    def adopt(self, final_path: Path, partial_path: Path) -> OutputReservation:
+        """
+        다른 프로세스가 예약해 기록 중인 partial 파일을 이 프로세스의 예약으로 등록
+        (무중단 업그레이드로 넘겨받은 녹화)
+
+        Raises:
+            OutputManagerError: partial 파일이 없는 경우
+        """
+        if not partial_path.exists():
+            raise OutputManagerError(f"녹화 중 파일이 없습니다: {partial_path}")
+        reservation = OutputReservation(final_path=final_path, partial_path=partial_path)
+        with self._lock:
+            self._reservations[final_path] = reservation
+        return reservation
+
+    def finalize(self, reservation: OutputReservation) -> Optional[Path]:
+        """
+        partial 파일을 최종 파일명으로 이동
+
+        최종 파일명이 그사이 생겼으면 접미사를 붙인 이름으로 옮깁니다.
+        내용이 없는 partial 파일은 삭제합니다.
+
+        Returns:
+            최종 파일 경로 (내용이 없으면 None)
+        """
+        try:
+            partial = reservation.partial_path
+            try:
+                size = partial.stat().st_size
+            except FileNotFoundError:
+                logger.warning(f"녹화 중 파일이 없습니다: {partial}")
+                return None
+
+            if size == 0:
+                partial.unlink(missing_ok=True)
+                return None
+
+            for index in range(MAX_SUFFIX_INDEX + 1):
+                target = _with_index(reservation.final_path, index)
+                if index and self._is_reserved(target):
+                    continue
+                if move_no_replace(partial, target):
+                    if index:
+                        logger.warning(f"최종 파일명이 이미 있어 다른 이름으로 저장: {target.name}")
+                    return target
+
+            raise OutputManagerError(f"최종 파일명을 정할 수 없습니다: {reservation.final_path}")
+        finally:
+            self.release(reservation)
+
+    def discard(self, reservation: OutputReservation):
+        """예약 취소 (내용이 있으면 최종화해서 보존)"""
+        try:
+            if reservation.partial_path.exists() and reservation.partial_path.stat().st_size > 0:
+                self.finalize(reservation)
+            else:
+                reservation.partial_path.unlink(missing_ok=True)
+        finally:
+            self.release(reservation)
+
+    def release(self, reservation: OutputReservation):
+        """예약 목록에서 제거"""
+        with self._lock:
+            if self._reservations.get(reservation.final_path) is reservation:
+                del self._reservations[reservation.final_path]
+
+    def recover_stale(self, min_age: float = 300.0) -> list[Path]:
+        """
+        이전 실행에서 남은 partial 파일 최종화
+
+        이 프로세스가 예약한 파일과 최근(min_age초 이내)에 수정된 파일은 다른
+        녹화가 쓰는 중일 수 있으므로 건드리지 않습니다.
+
+        Returns:
+            최종화된 파일 경로 목록
+        """
+        with self._lock:
+            owned = {r.partial_path for r in self._reservations.values()}
+
+        recovered = []
+        now = time.time()
+        try:
+            candidates = [p for p in self.directory.iterdir() if is_partial(p) and p not in owned]
+        except FileNotFoundError:
+            return []
+
+        for partial in candidates:
+            try:
+                if now - partial.stat().st_mtime < min_age:
+                    continue
+            except FileNotFoundError:
+                continue
+            final_path = partial.with_name(partial.name[:-len(PARTIAL_SUFFIX)])
+            path = self.finalize(OutputReservation(final_path=final_path, partial_path=partial))
+            if path:
+                logger.info(f"중단된 녹화 파일 복구: {path.name}")
+                recovered.append(path)
+        return recovered
+
+    def _is_reserved(self, final_path: Path) -> bool:
+        """다른 녹화가 예약한 이름인지 (partial 파일 존재 포함)"""
+        with self._lock:
+            if final_path in self._reservations:
+                return True
+        return final_path.with_name(partial_name(final_path.name)).exists()
+
+
+@lru_cache(maxsize=None)
+def _manager_for(directory: Path) -> OutputManager:
+    return OutputManager(directory)
+
+
+def get_output_manager(directory: Path) -> OutputManager:
+    """디렉터리별 공유 OutputManager (같은 디렉터리를 쓰는 녹화기끼리 예약 목록 공유)"""
+    return _manager_for(Path(os.path.abspath(directory)))
@@ -0,0 +1,258 @@
+"""
+녹화 파일 기록기 (pipe 출력 모드)
+
+FFmpeg이 직접 파일에 쓰면 작은 append가 반복되고, 여러 채널을 동시에 녹화하면
+파일 조각이 서로 섞여 (특히 btrfs) 단편화가 심해집니다. pipe 모드에서는 FFmpeg이
+fragmented MP4를 stdout으로 내보내고, 이 모듈이
+
+- 예상 비트레이트로 계산한 큰 단위(extent)로 미리 공간을 할당하고 (posix_fallocate)
+- 큰 버퍼를 가득 채운 뒤 정렬된 크기로 한 번에 기록하며
+- 종료 시 실제 기록한 크기로 잘라냅니다 (ftruncate).
+"""
+
+import fcntl
+import logging
+import os
+import select
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 블록 정렬 단위
+BLOCK_SIZE = 4096
+
+# 기본 기록 버퍼 크기
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 기록 중지 요청을 확인하는 주기 (초)
+STOP_POLL_INTERVAL = 0.2
+
+# 최소/최대 사전 할당 단위
+MIN_EXTENT_SIZE = 16 * 1024 * 1024
+MAX_EXTENT_SIZE = 1024 * 1024 * 1024
+
+# FIEMAP ioctl (linux/fiemap.h)
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_HEADER = struct.Struct("=QQLLLL")
+
+
+@dataclass
+class WriterStats:
+    """기록 통계"""
+    bytes_written: int = 0
+    write_calls: int = 0
+    fallocate_calls: int = 0
+    allocated: int = 0
+
+
+def extent_size_for(bitrate_kbps: int, seconds: int = 60) -> int:
+    """예상 비트레이트로 사전 할당 단위 계산 (BLOCK_SIZE 배수)"""
+    size = bitrate_kbps * 1000 // 8 * seconds
+    size = max(MIN_EXTENT_SIZE, min(size, MAX_EXTENT_SIZE))
+    return size - size % BLOCK_SIZE
+
+
+def count_extents(path: Path) -> Optional[int]:
+    """
+    파일의 물리 extent 수 (FIEMAP, 지원하지 않는 파일시스템이면 None)
+
+    extent 수가 적을수록 단편화가 적습니다.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        # fm_extent_count=0이면 extent 수만 반환 (fm_mapped_extents)
+        request = bytearray(_FIEMAP_HEADER.pack(0, 0xFFFFFFFFFFFFFFFF, 0, 0, 0, 0))
+        fcntl.ioctl(fd, _FS_IOC_FIEMAP, request)
+        return _FIEMAP_HEADER.unpack(request)[3]
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+class PreallocatingWriter:
+    """사전 할당 + 큰 버퍼 파일 기록기"""
+
+    def __init__(self,
+                 path: Path,
+                 extent_size: int = MIN_EXTENT_SIZE,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 on_chunk: Optional[Callable[[memoryview], None]] = None,
+                 offset: int = 0):
+        """
+        초기화
+
+        Args:
+            path: 기록할 파일 (이미 있으면 offset부터 덮어씀)
+            extent_size: 사전 할당 단위 (바이트)
+            buffer_size: 기록 버퍼 크기 (BLOCK_SIZE 배수로 내림)
+            on_chunk: 파일에 기록한 데이터를 순서대로 받는 함수
+            offset: 이어서 기록할 위치 (넘겨받은 녹화, 앞부분은 그대로 둠)
+        """
+        self.path = Path(path)
+        self.extent_size = max(extent_size - extent_size % BLOCK_SIZE, BLOCK_SIZE)
+        self.buffer_size = max(buffer_size - buffer_size % BLOCK_SIZE, BLOCK_SIZE)
+        self.on_chunk = on_chunk
+        self.stats = WriterStats(bytes_written=offset, allocated=offset)
+
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+        self._buffer = bytearray(self.buffer_size)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+        self._preallocate_supported = hasattr(os, "posix_fallocate")
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """지금까지 받은 데이터 크기 (버퍼 포함)"""
+        return self.stats.bytes_written + self._filled
+
+    def write(self, data: bytes):
+        """데이터 추가 (버퍼가 가득 찰 때만 실제 기록)"""
+        data = memoryview(data)
+        while data:
+            n = min(len(data), self.buffer_size - self._filled)
+            self._view[self._filled:self._filled + n] = data[:n]
+            self._filled += n
+            data = data[n:]
+            if self._filled == self.buffer_size:
+                self._flush_buffer()
+
+    def write_from(self, stream: BinaryIO) -> int:
+        """
+        스트림이 끝날 때까지 읽어서 기록 (버퍼에 바로 읽어 복사 없음)
+
+        Returns:
+            읽은 바이트 수
+        """
+        total = 0
+        while True:
+            n = stream.readinto(self._view[self._filled:])
+            if not n:
+                return total
+            total += n
+            self._filled += n
+            if self._filled == self.buffer_size:
+                self._flush_buffer()
+
+    def write_from_fd(self, fd: int, stop: Optional[threading.Event] = None) -> int:
+        """
+        파일 디스크립터에서 끝(EOF)까지 읽어서 기록
+
+        stop이 설정되면 읽기를 멈추고 돌아옵니다. 버퍼가 있는 파일 객체를 거치지 않으므로
+        읽지 않은 데이터는 파이프에 그대로 남아, 같은 파이프를 넘겨받은 쪽이 이어서 읽을
+        수 있습니다.
+
+        Returns:
+            읽은 바이트 수
+        """
+        total = 0
+        while not (stop and stop.is_set()):
+            if stop:
+                ready, _, _ = select.select([fd], [], [], STOP_POLL_INTERVAL)
+                if not ready:
+                    continue
+            n = os.readv(fd, [self._view[self._filled:]])
+            if not n:
+                break
+            total += n
+            self._filled += n
+            if self._filled == self.buffer_size:
+                self._flush_buffer()
+        return total
+
+    def close(self):
+        """남은 데이터 기록 후 실제 크기로 잘라내고 닫기"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._filled:
+                self._flush_buffer()
+            os.ftruncate(self._fd, self.stats.bytes_written)
+        finally:
+            os.close(self._fd)
+
+    def _flush_buffer(self):
+        end = self.stats.bytes_written + self._filled
+        if end > self.stats.allocated:
+            self._preallocate(end)
+
+        chunk = self._view[:self._filled]
+        offset = 0
+        while offset < self._filled:
+            offset += os.pwrite(self._fd, chunk[offset:], self.stats.bytes_written + offset)
+            self.stats.write_calls += 1
+
+        if self.on_chunk:
+            self.on_chunk(chunk)
+        self.stats.bytes_written = end
+        self._filled = 0
+
+    def _preallocate(self, needed: int):
+        if not self._preallocate_supported:
+            self.stats.allocated = needed
+            return
+        start = self.stats.allocated
+        length = max(self.extent_size, needed - start)
+        length += -length % self.extent_size
+        try:
+            os.posix_fallocate(self._fd, start, length)
+            self.stats.fallocate_calls += 1
+            self.stats.allocated = start + length
+        except OSError as e:
+            # 미지원 파일시스템(일부 네트워크 공유 등)에서는 일반 기록으로 진행
+            logger.debug(f"사전 할당 미지원, 일반 기록으로 전환: {e}")
+            self._preallocate_supported = False
+            self.stats.allocated = needed
+
+
+class PipeOutputPump:
+    """FFmpeg stdout -> PreallocatingWriter 전송 스레드"""
+
+    def __init__(self, stream: BinaryIO, writer: PreallocatingWriter):
+        self.stream = stream
+        self.writer = writer
+        self.error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"pipe-writer-{writer.path.name}",
+                                        daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """스레드 종료 대기 (종료되었으면 True)"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def detach(self, timeout: Optional[float] = None) -> bool:
+        """
+        읽기를 멈추고 받은 데이터까지 기록한 뒤 파일 닫기 (FFmpeg은 계속 실행)
+
+        Returns:
+            스레드가 종료되었으면 True (writer.stats.bytes_written이 파일 끝)
+        """
+        self._stop.set()
+        return self.join(timeout)
+
+    def _run(self):
+        try:
+            self.writer.write_from_fd(self.stream.fileno(), self._stop)
+        except Exception as e:
+            self.error = e
+            logger.error(f"녹화 파일 기록 실패 ({self.writer.path.name}): {e}")
+        finally:
+            try:
+                self.writer.close()
+            except OSError as e:
+                self.error = self.error or e
+                logger.error(f"녹화 파일 닫기 실패 ({self.writer.path.name}): {e}")
@@ -7,7 +7,7 @@ import logging
 import subprocess
 import signal
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Callable, Any
@@ -15,11 +15,30 @@ import time
 import os
 import shutil
 
-from ..monitor import StreamInfo
+import httpx
+
+from ..monitor import StreamInfo, LiveStatus, get_http_pool
+from .chapters import Chapter, ChapterTracker
+from .output_manager import OutputReservation, OutputManagerError, get_output_manager
+from .output_writer import PreallocatingWriter, PipeOutputPump, extent_size_for, DEFAULT_BUFFER_SIZE
+from .integrity import ChunkHasher, manifest_path
+from .continuity import ContinuityTracker, Gap, PlaylistWatcher, StderrDrain, gaps_path
+from .adoption import AdoptedProcess, DetachedRecording
+from .ffmpeg_probe import probe_ffmpeg
 
 logger = logging.getLogger(__name__)
 
 
+async def invoke_callback(callback: Callable, *args):
+    """콜백 호출 (코루틴 함수면 완료까지 대기, 콜백 오류는 로그만 남김)"""
+    try:
+        result = callback(*args)
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception as e:
+        logger.error(f"콜백 실행 중 오류 ({getattr(callback, '__name__', callback)}): {e}")
+
+
 class RecordingStatus(Enum):
     """녹화 상태"""
     IDLE = "idle"           # 대기 중
@@ -30,7 +49,7 @@ class RecordingStatus(Enum):
     ERROR = "error"         # 오류 발생
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordingInfo:
     """녹화 정보"""
     stream_info: StreamInfo
@@ -41,6 +60,18 @@ class RecordingInfo:
     file_size: int = 0
     duration: Optional[timedelta] = None
     error_message: Optional[str] = None
+    chapters: list[Chapter] = field(default_factory=list)
+    parts: list[Path] = field(default_factory=list)
+    partial_path: Optional[Path] = None
+    # HLS 세그먼트 연속성 검사로 찾은 빠진 시간 (초)
+    missing_seconds: float = 0.0
+    # 마지막으로 파일이 커진 시각 (time.monotonic 기준, 헬스체크용)
+    progress_at: float = 0.0
+    
+    @property
+    def output_path(self) -> Path:
+        """현재 기록 중인 경로 (녹화 중에는 .partial, 최종화 후에는 file_path)"""
+        return self.partial_path or self.file_path
     
     @property
     def is_recording(self) -> bool:
@@ -65,7 +96,15 @@ class StreamRecorder:
                  output_directory: Path,
                  ffmpeg_path: str = "ffmpeg",
                  quality: str = "best",
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 write_chapters: bool = True,
+                 pipe_output: bool = False,
+                 expected_bitrate_kbps: int = 8000,
+                 write_buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 write_manifest: bool = True,
+                 track_continuity: bool = True,
+                 reconnect_gap_seconds: float = 10.0,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         초기화
         
@@ -74,15 +113,46 @@ class StreamRecorder:
             ffmpeg_path: FFmpeg 실행 파일 경로
             quality: 녹화 품질 (best, worst, 1080p, 720p 등)
             timeout: FFmpeg 명령 타임아웃 (초)
+            write_chapters: 녹화 종료 시 챕터 사이드카(.ffmeta) 작성 여부
+            pipe_output: FFmpeg 출력을 stdout으로 받아 사전 할당/큰 버퍼로 직접 기록
+            expected_bitrate_kbps: 사전 할당 크기 계산용 예상 비트레이트 (pipe_output)
+            write_buffer_size: 기록 버퍼 크기 (pipe_output)
+            write_manifest: 녹화 중 청크 해시를 계산해 매니페스트(.manifest.json) 작성
+            track_continuity: HLS 세그먼트 연속성을 추적해 끊김 보고서(.gaps.json) 작성
+            reconnect_gap_seconds: 빠진 시간이 이 값(초) 이상이면 FFmpeg을 다시 연결 (0이면 사용 안 함)
+            http_client: 플레이리스트 확인용 HTTP 클라이언트 (없으면 쿠키 없는 공유 풀 사용)
         """
         self.output_directory = Path(output_directory)
         self.ffmpeg_path = ffmpeg_path
         self.quality = quality
         self.timeout = timeout
+        self.write_chapters = write_chapters
+        self.pipe_output = pipe_output
+        self.expected_bitrate_kbps = expected_bitrate_kbps
+        self.write_buffer_size = write_buffer_size
+        self.write_manifest = write_manifest
+        self.track_continuity = track_continuity
+        self.reconnect_gap_seconds = reconnect_gap_seconds
+        self.http_client = http_client
         
         # 상태 관리
         self._current_recording: Optional[RecordingInfo] = None
-        self._ffmpeg_process: Optional[subprocess.Popen] = None
+        self._chapter_tracker: Optional[ChapterTracker] = None
+        self._reservation: Optional[OutputReservation] = None
+        self._ffmpeg_process: Optional[subprocess.Popen | AdoptedProcess] = None
+        self._pipe_pump: Optional[PipeOutputPump] = None
+        self._hasher: Optional[ChunkHasher] = None
+        # 청크 해시를 파일에서 읽어 계산 (direct 모드, 넘겨받은 녹화)
+        self._hash_from_file = False
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._tracker: Optional[ContinuityTracker] = None
+        self._stderr_drain: Optional[StderrDrain] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._started_monotonic = 0.0
+        # 다시 연결하려고 FFmpeg을 종료한 이유 (모니터링이 오류로 처리)
+        self._reconnect_reason: Optional[str] = None
+        # request_stop()으로 종료를 요청함 (stop_recording 전에 FFmpeg이 끝나도 정상 중지)
+        self._stop_requested = False
         self._stop_event = asyncio.Event()
         
         # 콜백 함수들
@@ -92,6 +162,8 @@ class StreamRecorder:
         
         # 출력 디렉터리 생성
         self.output_directory.mkdir(parents=True, exist_ok=True)
+        self.outputs = get_output_manager(self.output_directory)
+        self.outputs.recover_stale()
         
         logger.info(f"StreamRecorder 초기화: 저장 경로={self.output_directory}")
     
@@ -124,39 +196,69 @@ class StreamRecorder:
         if not stream_info.hls_url:
             raise StreamRecorderError("HLS URL이 없습니다")
         
+        # 출력 파일 예약 (같은 이름의 녹화가 있으면 접미사가 붙음)
+        try:
+            reservation = self.outputs.reserve(filename)
+        except OutputManagerError as e:
+            raise StreamRecorderError(str(e))
+        
         # 녹화 정보 생성
-        file_path = self.output_directory / filename
         recording_info = RecordingInfo(
             stream_info=stream_info,
-            file_path=file_path,
+            file_path=reservation.final_path,
             status=RecordingStatus.STARTING,
-            started_at=datetime.now()
+            started_at=datetime.now(),
+            partial_path=reservation.partial_path
         )
         
         self._current_recording = recording_info
+        self._reservation = reservation
+        self._hasher = ChunkHasher() if self.write_manifest else None
+        self._hash_from_file = not self.pipe_output
+        self._tracker = ContinuityTracker() if self.track_continuity else None
+        self._reconnect_reason = None
+        self._stop_requested = False
+        self._started_monotonic = time.monotonic()
+        self._chapter_tracker = ChapterTracker(recording_info.started_at, stream_info)
+        recording_info.chapters = self._chapter_tracker.chapters
         logger.info(f"녹화 시작: {filename}")
         
         try:
             # FFmpeg 명령 생성
-            ffmpeg_cmd = self._build_ffmpeg_command(stream_info.hls_url, file_path)
+            ffmpeg_cmd = self._build_ffmpeg_command(stream_info.hls_url, reservation.partial_path)
             logger.debug(f"FFmpeg 명령: {' '.join(ffmpeg_cmd)}")
             
             # FFmpeg 프로세스 시작
-            self._ffmpeg_process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1
-            )
+            if self.pipe_output:
+                self._ffmpeg_process = subprocess.Popen(
+                    ffmpeg_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                writer = PreallocatingWriter(
+                    reservation.partial_path,
+                    extent_size=extent_size_for(self.expected_bitrate_kbps),
+                    buffer_size=self.write_buffer_size,
+                    on_chunk=self._hasher.update if self._hasher else None
+                )
+                self._pipe_pump = PipeOutputPump(self._ffmpeg_process.stdout, writer)
+                self._pipe_pump.start()
+            else:
+                self._ffmpeg_process = subprocess.Popen(
+                    ffmpeg_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    universal_newlines=True,
+                    bufsize=1
+                )
+            self._start_stderr_drain()
             
             # 프로세스가 정상적으로 시작되었는지 확인
             await asyncio.sleep(2)  # 잠시 대기
             
             if self._ffmpeg_process.poll() is not None:
                 # 프로세스가 이미 종료됨
-                _, stderr = self._ffmpeg_process.communicate()
-                raise StreamRecorderError(f"FFmpeg 시작 실패: {stderr}")
+                raise StreamRecorderError(f"FFmpeg 시작 실패: {self._read_stderr()}")
             
             # 상태 업데이트
             recording_info.status = RecordingStatus.RECORDING
@@ -164,10 +266,10 @@ class StreamRecorder:
             
             # 콜백 호출
             if self._on_recording_start:
-                self._on_recording_start(recording_info)
+                await invoke_callback(self._on_recording_start, recording_info)
             
             # 백그라운드에서 모니터링 시작
-            asyncio.create_task(self._monitor_recording(recording_info))
+            self._start_monitoring(recording_info)
             
             return recording_info
             
@@ -175,6 +277,7 @@ class StreamRecorder:
             recording_info.status = RecordingStatus.ERROR
             recording_info.error_message = str(e)
             self._current_recording = None
+            await self._finalize_output(recording_info)
             
             # 녹화 시작 실패 시 콜백 호출
             if self._on_recording_error:
@@ -188,10 +291,239 @@ class StreamRecorder:
             
             raise StreamRecorderError(f"녹화 시작 실패: {e}")
     
-    async def stop_recording(self) -> Optional[RecordingInfo]:
+    def _start_stderr_drain(self):
+        """stderr를 읽지 않으면 파이프가 가득 찼을 때 FFmpeg이 멈춤"""
+        loop = asyncio.get_running_loop()
+        self._stderr_drain = StderrDrain(
+            self._ffmpeg_process.stderr,
+            on_line=lambda line: loop.call_soon_threadsafe(self._on_ffmpeg_line, line)
+        )
+        self._stderr_drain.start()
+    
+    def _start_monitoring(self, recording_info: RecordingInfo):
+        """프로세스/파일 크기 모니터링과 플레이리스트 확인 시작"""
+        self._monitor_task = asyncio.create_task(self._monitor_recording(recording_info))
+        if self._tracker:
+            # 녹화마다 클라이언트를 만들지 않고 공유 풀의 연결을 재사용 (API 쿠키는 보내지 않음)
+            client = self.http_client or get_http_pool(None, None, follow_redirects=True).client
+            watcher = PlaylistWatcher(recording_info.stream_info.hls_url, self._tracker,
+                                      self._started_monotonic, on_gaps=self._on_gaps, client=client)
+            self._watch_task = asyncio.create_task(watcher.run(lambda: recording_info.is_active))
+    
+    async def detach(self) -> Optional[DetachedRecording]:
+        """
+        FFmpeg을 멈추지 않고 녹화를 떼어 냄 (무중단 업그레이드, 새 프로세스가 adopt)
+        
+        모니터링과 플레이리스트 확인을 멈추고, 기록/stderr 스레드는 읽은 데이터를 파일에
+        모두 기록한 경계에서 멈춥니다. 아직 읽지 않은 출력은 파이프에 남아 넘겨받은 쪽이
+        이어서 읽습니다. 떼어 낸 뒤 이 녹화기는 녹화 중이 아닌 상태가 됩니다.
+        
+        Returns:
+            떼어 낸 녹화 (녹화 중이 아니거나 떼어 낼 수 없으면 None)
+        """
+        recording_info = self._current_recording
+        process = self._ffmpeg_process
+        if (not recording_info or recording_info.status != RecordingStatus.RECORDING
+                or not process or process.poll() is not None):
+            return None
+        
+        for task in (self._monitor_task, self._watch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._monitor_task = self._watch_task = None
+        
+        drain, self._stderr_drain = self._stderr_drain, None
+        if drain:
+            await asyncio.to_thread(drain.stop, 5)
+        pump = self._pipe_pump
+        if pump and not await asyncio.to_thread(pump.detach, 30):
+            # 기록 스레드가 멈추지 않으면 넘길 수 없으므로 다시 연결해 새로 녹화
+            logger.error(f"녹화 파일 기록 스레드가 멈추지 않아 넘길 수 없습니다: {pump.writer.path.name}")
+            self._start_stderr_drain()
+            self._start_monitoring(recording_info)
+            self._request_reconnect("녹화 넘기기 실패, 다시 연결")
+            return None
+        self._pipe_pump = None
+        
+        try:
+            pidfd = process.pidfd() if isinstance(process, AdoptedProcess) else os.pidfd_open(process.pid)
+            fds = [pidfd, os.dup(process.stdout.fileno()), os.dup(process.stderr.fileno())]
+        except OSError as e:
+            # FFmpeg이 그사이 종료됨 → 모니터링이 평소처럼 처리
+            logger.error(f"녹화를 넘길 수 없습니다 ({recording_info.file_path.name}): {e}")
+            self._start_monitoring(recording_info)
+            return None
+        
+        stream_info = recording_info.stream_info
+        tracker = self._tracker
+        state = {
+            "pid": process.pid,
+            "file_path": str(recording_info.file_path),
+            "partial_path": str(recording_info.partial_path),
+            "started_at": recording_info.started_at.isoformat(),
+            "elapsed": time.monotonic() - self._started_monotonic,
+            "file_size": recording_info.file_size,
+            # pipe 모드: 파일에 기록을 마친 위치 (이어서 기록)
+            "bytes_written": pump.writer.stats.bytes_written if pump else None,
+            "stream_info": {
+                **asdict(stream_info),
+                "status": stream_info.status.value,
+                "started_at": stream_info.started_at.isoformat() if stream_info.started_at else None,
+            },
+            "chapters": [asdict(chapter) for chapter in recording_info.chapters],
+            "continuity": {
+                "gaps": [asdict(gap) for gap in tracker.gaps],
+                "segments": tracker.segments,
+                "captured_seconds": tracker.captured_seconds,
+            } if tracker else None,
+        }
+        
+        # 파이프는 넘길 사본(fds)으로 유지, FFmpeg은 그대로 실행
+        process.stdout.close()
+        process.stderr.close()
+        if self._reservation:
+            self.outputs.release(self._reservation)
+        self._reservation = None
+        self._current_recording = None
+        self._ffmpeg_process = None
+        self._chapter_tracker = None
+        self._hasher = None
+        self._tracker = None
+        logger.info(f"녹화 넘기기 준비: {recording_info.file_path.name} (FFmpeg PID {process.pid})")
+        return DetachedRecording(state=state, fds=fds)
+    
+    async def adopt(self, detached: DetachedRecording) -> RecordingInfo:
+        """
+        다른 프로세스에서 떼어 낸 녹화를 이어서 맡음 (FFmpeg은 재시작하지 않음)
+        
+        파일 디스크립터는 이 녹화기가 가져갑니다 (실패해도 닫음).
+        
+        Returns:
+            RecordingInfo: 녹화 정보
+        
+        Raises:
+            StreamRecorderError: 이미 녹화 중이거나 FFmpeg이 이미 종료된 경우
+        """
+        if self._current_recording and self._current_recording.is_active:
+            detached.abandon()
+            raise StreamRecorderError("이미 녹화가 진행 중입니다")
+        
+        state = detached.state
+        pidfd, stdout, stderr = detached.fds
+        detached.fds = []
+        process = AdoptedProcess(state["pid"], pidfd, stdout, stderr)
+        if process.poll() is not None:
+            process.close()
+            raise StreamRecorderError(f"넘겨받은 FFmpeg이 이미 종료되었습니다: {detached.file_name}")
+        
+        try:
+            reservation = self.outputs.adopt(Path(state["file_path"]), Path(state["partial_path"]))
+        except OutputManagerError as e:
+            process.terminate()
+            process.close()
+            raise StreamRecorderError(str(e))
+        
+        info = state["stream_info"]
+        stream_info = StreamInfo(**{
+            **info,
+            "status": LiveStatus(info["status"]),
+            "started_at": datetime.fromisoformat(info["started_at"]) if info["started_at"] else None,
+        })
+        recording_info = RecordingInfo(
+            stream_info=stream_info,
+            file_path=reservation.final_path,
+            status=RecordingStatus.RECORDING,
+            started_at=datetime.fromisoformat(state["started_at"]),
+            file_size=state["file_size"],
+            partial_path=reservation.partial_path
+        )
+        
+        self._current_recording = recording_info
+        self._reservation = reservation
+        self._ffmpeg_process = process
+        self._reconnect_reason = None
+        self._stop_requested = False
+        self._started_monotonic = time.monotonic() - state["elapsed"]
+        self._chapter_tracker = ChapterTracker(recording_info.started_at, stream_info)
+        self._chapter_tracker.chapters[:] = [Chapter(**chapter) for chapter in state["chapters"]]
+        recording_info.chapters = self._chapter_tracker.chapters
+        # 앞부분 해시는 넘겨받지 않으므로 파일에서 처음부터 다시 계산
+        self._hasher = ChunkHasher() if self.write_manifest else None
+        self._hash_from_file = True
+        self._tracker = None
+        if self.track_continuity:
+            self._tracker = ContinuityTracker()
+            continuity = state["continuity"]
+            if continuity:
+                self._tracker.gaps.extend(Gap(**gap) for gap in continuity["gaps"])
+                self._tracker.segments = continuity["segments"]
+                self._tracker.captured_seconds = continuity["captured_seconds"]
+                recording_info.missing_seconds = self._tracker.missing_seconds
+        
+        if state["bytes_written"] is not None:
+            writer = PreallocatingWriter(
+                reservation.partial_path,
+                extent_size=extent_size_for(self.expected_bitrate_kbps),
+                buffer_size=self.write_buffer_size,
+                offset=state["bytes_written"]
+            )
+            self._pipe_pump = PipeOutputPump(process.stdout, writer)
+            self._pipe_pump.start()
+        self._start_stderr_drain()
+        self._start_monitoring(recording_info)
+        logger.info(f"녹화 넘겨받음: {recording_info.file_path.name} (FFmpeg PID {process.pid})")
+        return recording_info
+    
+    def request_stop(self) -> bool:
+        """
+        FFmpeg에 종료 신호만 보냄 (기다리지 않음, 이어서 stop_recording으로 마무리)
+        
+        Returns:
+            신호를 보냈으면 True
+        """
+        # 모니터링이 FFmpeg 종료를 오류로 처리하지 않도록
+        self._stop_requested = True
+        return self._terminate()
+    
+    def _terminate(self) -> bool:
+        process = self._ffmpeg_process
+        if not process or process.poll() is not None:
+            return False
+        # SIGTERM이면 FFmpeg이 파일을 정상적으로 마무리
+        process.terminate()
+        return True
+    
+    def kill(self) -> bool:
+        """FFmpeg 강제 종료 (마무리를 기다릴 수 없을 때)"""
+        process = self._ffmpeg_process
+        if not process or process.poll() is not None:
+            return False
+        process.kill()
+        return True
+    
+    async def _wait_process(self, timeout: float) -> bool:
+        """FFmpeg 종료 대기 (이벤트 루프를 막지 않음, 종료되었으면 True)"""
+        process = self._ffmpeg_process
+        deadline = time.monotonic() + timeout
+        while process and process.poll() is None:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+    
+    async def stop_recording(self, timeout: float = 5.0) -> Optional[RecordingInfo]:
         """
         녹화 중지
         
+        여러 녹화를 동시에 중지할 수 있도록 FFmpeg 종료를 이벤트 루프를 막지 않고 기다립니다.
+        
+        Args:
+            timeout: FFmpeg이 파일을 마무리하기를 기다리는 시간 (초, 지나면 강제 종료)
+        
         Returns:
             RecordingInfo: 녹화 정보 (녹화 중이 아니면 None)
         """
@@ -205,19 +537,12 @@ class StreamRecorder:
         logger.info(f"녹화 중지 중: {recording_info.file_path.name}")
         
         try:
-            # FFmpeg 프로세스 종료
-            if self._ffmpeg_process and self._ffmpeg_process.poll() is None:
-                # SIGTERM 전송
-                self._ffmpeg_process.terminate()
-                
-                # 정상 종료 대기 (최대 5초)
-                try:
-                    self._ffmpeg_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # 강제 종료
-                    logger.warning("FFmpeg 프로세스 강제 종료")
-                    self._ffmpeg_process.kill()
-                    self._ffmpeg_process.wait()
+            # FFmpeg 프로세스 종료 (SIGTERM → 정상 종료 대기 → 강제 종료)
+            self.request_stop()
+            if not await self._wait_process(timeout):
+                logger.warning("FFmpeg 프로세스 강제 종료")
+                self.kill()
+                await self._wait_process(timeout)
             
             # 녹화 완료 처리
             recording_info.stopped_at = datetime.now()
@@ -226,6 +551,9 @@ class StreamRecorder:
             if recording_info.started_at:
                 recording_info.duration = recording_info.stopped_at - recording_info.started_at
             
+            # .partial -> 최종 파일명
+            await self._finalize_output(recording_info)
+            
             # 파일 크기 확인
             if recording_info.file_path.exists():
                 recording_info.file_size = recording_info.file_path.stat().st_size
@@ -234,9 +562,13 @@ class StreamRecorder:
             else:
                 logger.warning(f"녹화 파일이 생성되지 않음: {recording_info.file_path}")
             
+            # 챕터 사이드카 작성
+            if self.write_chapters and recording_info.file_size > 0 and recording_info.duration:
+                self._write_chapter_sidecar(recording_info)
+            
             # 콜백 호출
             if self._on_recording_stop:
-                self._on_recording_stop(recording_info)
+                await invoke_callback(self._on_recording_stop, recording_info)
             
             return recording_info
             
@@ -245,46 +577,221 @@ class StreamRecorder:
             recording_info.error_message = str(e)
             
             if self._on_recording_error:
-                self._on_recording_error(recording_info, e)
+                await invoke_callback(self._on_recording_error, recording_info, e)
             
             logger.error(f"녹화 중지 중 오류: {e}")
             return recording_info
         
         finally:
+            self._release_output(recording_info)
             self._current_recording = None
             self._ffmpeg_process = None
+            self._chapter_tracker = None
+    
+    def update_stream_info(self, stream_info: StreamInfo) -> Optional[Chapter]:
+        """
+        녹화 중 폴링된 방송 정보 반영 (제목/카테고리 변경 시 챕터 추가)
+        
+        Returns:
+            새 챕터가 시작되었으면 해당 챕터
+        """
+        if not self._chapter_tracker or not self.is_recording():
+            return None
+        return self._chapter_tracker.update(stream_info)
+    
+    async def _finalize_output(self, recording_info: RecordingInfo):
+        """기록 마무리 → 최종 파일명으로 이동 → 무결성 매니페스트/끊김 보고서 작성"""
+        from_file = self._hash_from_file
+        await self._finish_pipe_output()
+        self._release_output(recording_info)
+        await self._finish_continuity(recording_info)
+        
+        hasher, self._hasher = self._hasher, None
+        if not hasher or recording_info.partial_path or not recording_info.file_path.exists():
+            return
+        try:
+            await asyncio.to_thread(self._write_manifest, hasher, recording_info.file_path, from_file)
+        except (OSError, ValueError) as e:
+            logger.error(f"무결성 매니페스트 작성 실패: {e}")
+    
+    @staticmethod
+    def _write_manifest(hasher: ChunkHasher, file_path: Path, from_file: bool):
+        if not from_file:
+            manifest = hasher.finish(file_path.name)
+        else:
+            # 남은 부분을 읽고, FFmpeg이 종료 시 다시 쓰는 앞부분 청크는 새로 계산
+            hasher.update_from_file(file_path)
+            manifest = hasher.finish(file_path.name, rehash_head_from=file_path)
+        if manifest.size != file_path.stat().st_size:
+            raise ValueError(f"해시한 크기가 파일 크기와 다릅니다: {manifest.size} != {file_path.stat().st_size}")
+        manifest.save(manifest_path(file_path))
+        logger.debug(f"무결성 매니페스트: {file_path.name} (청크 {len(manifest.chunks)}개)")
+    
+    async def _finish_continuity(self, recording_info: RecordingInfo):
+        """플레이리스트 확인 중지, 끊김 보고서 저장"""
+        task, self._watch_task = self._watch_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        drain, self._stderr_drain = self._stderr_drain, None
+        if drain:
+            await asyncio.to_thread(drain.join, 2)
+        
+        tracker, self._tracker = self._tracker, None
+        if not tracker or recording_info.partial_path or not recording_info.file_path.exists():
+            return
+        recording_info.missing_seconds = tracker.missing_seconds
+        try:
+            tracker.save(gaps_path(recording_info.file_path), recording_info.file_path.name)
+        except OSError as e:
+            logger.error(f"끊김 보고서 작성 실패: {e}")
+            return
+        if tracker.gaps:
+            logger.info(f"끊김 보고서: {gaps_path(recording_info.file_path).name} "
+                        f"(문제 {len(tracker.gaps)}건, 빠진 시간 {tracker.missing_seconds:.1f}초)")
+    
+    def _on_ffmpeg_line(self, line: str):
+        """FFmpeg 로그 한 줄 (이벤트 루프에서 실행)"""
+        if not self._tracker:
+            return
+        gap = self._tracker.feed_ffmpeg_line(line, time.monotonic() - self._started_monotonic)
+        if gap:
+            self._on_gaps([gap])
+    
+    def _on_gaps(self, gaps: list[Gap]):
+        """새로 찾은 연속성 문제 처리 (빠진 시간이 크면 다시 연결)"""
+        recording_info = self._current_recording
+        if not recording_info or not self._tracker:
+            return
+        for gap in gaps:
+            if gap.missing:
+                logger.warning(f"⚠️  녹화 끊김 ({gap.kind}): 세그먼트 {gap.segments}개, "
+                               f"{gap.missing:.1f}초{' (추정)' if gap.estimated else ''}")
+            else:
+                logger.info(f"녹화 연속성: {gap.kind} (세그먼트 {gap.sequence})")
+        recording_info.missing_seconds = self._tracker.missing_seconds
+        
+        missing = sum(gap.missing for gap in gaps)
+        if (self.reconnect_gap_seconds and missing >= self.reconnect_gap_seconds
+                and recording_info.status == RecordingStatus.RECORDING and not self._reconnect_reason):
+            self._request_reconnect(f"녹화 끊김 {missing:.1f}초 감지, 다시 연결")
+    
+    def _request_reconnect(self, reason: str):
+        """FFmpeg 종료 → 모니터링이 오류로 처리해 녹화를 다시 시작"""
+        process = self._ffmpeg_process
+        if not process or process.poll() is not None:
+            return
+        logger.warning(f"🔄 {reason}")
+        self._reconnect_reason = reason
+        self._terminate()
+    
+    async def _finish_pipe_output(self):
+        """pipe 출력 모드: 남은 데이터 기록 및 파일 크기 정리 대기"""
+        pump, self._pipe_pump = self._pipe_pump, None
+        if not pump:
+            return
+        if not await asyncio.to_thread(pump.join, 30):
+            logger.error(f"녹화 파일 기록 스레드가 종료되지 않았습니다: {pump.writer.path.name}")
+            return
+        stats = pump.writer.stats
+        logger.debug(f"기록 통계: {stats.bytes_written / 1024 / 1024:.1f}MB, "
+                     f"write {stats.write_calls}회, fallocate {stats.fallocate_calls}회")
+    
+    def _read_stderr(self) -> str:
+        """종료된 FFmpeg 프로세스의 stderr 읽기"""
+        drain = self._stderr_drain
+        if drain:
+            # 종료된 프로세스라 남은 출력은 곧 끝남
+            drain.join(1)
+            return drain.text().strip() or "No error output"
+        process = self._ffmpeg_process
+        if not process or not process.stderr:
+            return "No error output"
+        try:
+            stderr = process.stderr.read()
+        except (OSError, ValueError):
+            return "No error output"
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', errors='ignore')
+        return stderr.strip() or "No error output"
+    
+    def _release_output(self, recording_info: RecordingInfo):
+        """예약한 출력 파일 최종화 (내용이 있으면 최종 파일명으로, 없으면 삭제)"""
+        reservation, self._reservation = self._reservation, None
+        if not reservation:
+            return
+        try:
+            final_path = self.outputs.finalize(reservation)
+        except (OSError, OutputManagerError) as e:
+            logger.error(f"녹화 파일 최종화 실패 ({reservation.partial_path.name}): {e}")
+            return
+        if final_path:
+            recording_info.file_path = final_path
+        recording_info.partial_path = None
+    
+    def _write_chapter_sidecar(self, recording_info: RecordingInfo):
+        """녹화 파일 옆에 ffmetadata 챕터 파일 작성"""
+        tracker = self._chapter_tracker
+        if not tracker:
+            return
+        
+        sidecar = recording_info.file_path.with_suffix(".ffmeta")
+        try:
+            tracker.write_ffmetadata(
+                sidecar,
+                duration=recording_info.duration.total_seconds(),
+                title=recording_info.stream_info.title
+            )
+            logger.info(f"📑 챕터 {len(tracker.chapters)}개 저장: {sidecar.name}")
+        except OSError as e:
+            logger.error(f"챕터 파일 저장 실패: {e}")
     
     async def _monitor_recording(self, recording_info: RecordingInfo):
         """녹화 모니터링"""
         last_file_size = 0
         no_progress_count = 0
         max_no_progress = 12  # 60초 동안 진행 없으면 문제로 판단 (5초 * 12)
+        recording_info.progress_at = time.monotonic()
         
         while recording_info.is_active and self._ffmpeg_process:
             await asyncio.sleep(5)  # 5초마다 확인
+            if not recording_info.is_active or not self._ffmpeg_process:
+                # 대기하는 사이 중지됨
+                break
+            
+            # pipe 모드 기록 스레드가 실패하면(ENOSPC, EIO 등) FFmpeg은 가득 찬 stdout에서
+            # 멈춰 끝나지 않으므로 직접 종료해 아래 예상치 못한 종료로 처리 (다시 연결)
+            pump = self._pipe_pump
+            if pump and pump.error and self._ffmpeg_process.poll() is None:
+                self._request_reconnect(f"녹화 파일 기록 실패: {pump.error}")
+                if not await self._wait_process(5):
+                    self.kill()
+                    await self._wait_process(5)
             
             # 프로세스 상태 확인
             if self._ffmpeg_process.poll() is not None:
                 # 프로세스가 종료됨
-                try:
-                    _, stderr = self._ffmpeg_process.communicate(timeout=5)
-                    stderr_text = stderr.decode('utf-8', errors='ignore') if stderr else "No error output"
-                except subprocess.TimeoutExpired:
-                    stderr_text = "Communication timeout"
+                stderr_text = self._read_stderr()
                 
-                if recording_info.status == RecordingStatus.STOPPING:
+                if recording_info.status == RecordingStatus.STOPPING or self._stop_requested:
                     # 정상적인 중지
                     logger.info("녹화 프로세스 정상 종료")
                     break
                 else:
-                    # 예상치 못한 종료
-                    error_msg = f"FFmpeg 프로세스 예상치 못한 종료: {stderr_text}"
+                    # 예상치 못한 종료 (또는 끊김 감지로 다시 연결)
+                    error_msg = self._reconnect_reason or f"FFmpeg 프로세스 예상치 못한 종료: {stderr_text}"
                     recording_info.status = RecordingStatus.ERROR
                     recording_info.error_message = error_msg
                     
                     logger.error(error_msg)
                     logger.info(f"마지막 파일 크기: {recording_info.file_size / 1024 / 1024:.1f}MB")
                     
+                    # 여기까지 녹화된 내용은 최종 파일로 보존
+                    await self._finalize_output(recording_info)
+                    
                     if self._on_recording_error:
                         try:
                             if asyncio.iscoroutinefunction(self._on_recording_error):
@@ -296,14 +803,29 @@ class StreamRecorder:
                     
                     break
             
-            # 파일 크기 진행 상황 확인
-            if recording_info.file_path.exists():
-                current_size = recording_info.file_path.stat().st_size
+            # 파일 크기 진행 상황 확인 (pipe 모드는 사전 할당 때문에 기록량 기준)
+            if self._pipe_pump:
+                current_size = self._pipe_pump.writer.size
+            elif recording_info.output_path.exists():
+                current_size = recording_info.output_path.stat().st_size
+            else:
+                current_size = None
+            if current_size is not None:
                 recording_info.file_size = current_size
                 
+                # direct 모드/넘겨받은 녹화: 새로 기록된 부분 해시 (방금 쓴 데이터라 페이지 캐시에서 읽힘)
+                if self._hasher and self._hash_from_file and recording_info.partial_path:
+                    try:
+                        # pipe 모드 파일은 사전 할당한 부분까지 커져 있으므로 기록한 곳까지만
+                        limit = self._pipe_pump.writer.stats.bytes_written if self._pipe_pump else None
+                        await asyncio.to_thread(self._hasher.update_from_file, recording_info.partial_path, limit)
+                    except OSError as e:
+                        logger.debug(f"청크 해시 갱신 실패: {e}")
+                
                 # 파일 크기 변화 확인 (진행 상황 모니터링)
                 if current_size > last_file_size:
                     no_progress_count = 0  # 진행이 있으면 카운터 리셋
+                    recording_info.progress_at = time.monotonic()
                     logger.debug(f"녹화 진행 중: {current_size / 1024 / 1024:.1f}MB (+{(current_size - last_file_size) / 1024:.1f}KB)")
                     last_file_size = current_size
                 else:
@@ -321,14 +843,20 @@ class StreamRecorder:
         """FFmpeg 명령 생성"""
         cmd = [
             self.ffmpeg_path,
-            "-y",  # 파일 덮어쓰기
+            "-nostats",  # 진행 상황 줄은 stderr 드레인에 필요 없음
+            "-y",  # OutputManager가 O_EXCL로 미리 만든 .partial 파일에 기록
             "-i", hls_url,
             "-c", "copy",  # 코덱 복사 (재인코딩 없음)
             "-bsf:a", "aac_adtstoasc",  # AAC 스트림 처리
             "-f", "mp4",
-            str(output_path)
         ]
         
+        if self.pipe_output:
+            # stdout은 되감을 수 없으므로 fragmented MP4로 출력
+            cmd += ["-movflags", "frag_keyframe+empty_moov+default_base_moof", "pipe:1"]
+        else:
+            cmd.append(str(output_path))
+        
         return cmd
     
     def get_current_recording(self) -> Optional[RecordingInfo]:
@@ -338,7 +866,23 @@ class StreamRecorder:
     def is_recording(self) -> bool:
         """녹화 중인지 확인"""
         return self._current_recording is not None and self._current_recording.is_active
-    
+
+    def live_output(self, recording_info: RecordingInfo) -> tuple[Path, int, bool]:
+        """
+        녹화 중 읽기용 진행 상황 (pipe 출력 모드는 이미 기록한 앞부분이 바뀌지 않음)
+
+        Returns:
+            (현재 경로, 디스크에 기록을 마친 크기, 최종화 완료 여부)
+        """
+        if recording_info.partial_path:
+            pump = self._pipe_pump
+            if pump and pump.writer.path == recording_info.partial_path:
+                return recording_info.partial_path, pump.writer.stats.bytes_written, False
+            # 마무리 중
+            return recording_info.partial_path, 0, False
+        path = recording_info.file_path
+        return path, path.stat().st_size if path.exists() else 0, True
+
     async def cleanup(self):
         """정리 작업"""
         if self.is_recording():
@@ -346,14 +890,5 @@ class StreamRecorder:
     
     @staticmethod
     def check_ffmpeg(ffmpeg_path: str = "ffmpeg") -> bool:
-        """FFmpeg 설치 확인"""
-        try:
-            result = subprocess.run(
-                [ffmpeg_path, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
-            return False 
\ No newline at end of file
+        """FFmpeg 설치 확인 (실행 파일마다 한 번만 실행, ffmpeg_probe)"""
+        return probe_ffmpeg(ffmpeg_path) is not None 
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+종료 시 녹화 마무리
+
+SIGTERM/SIGINT를 받으면 녹화 중인 모든 FFmpeg에 한꺼번에 종료 신호를 보내 파일을
+마무리하게 하고, 녹화기 정리를 동시에 기다립니다. 전체 시간은 deadline(초) 안으로
+제한되어 `docker stop`의 유예 시간(기본 10초) 안에 끝나고, 그때까지 끝나지 않은
+FFmpeg은 강제 종료합니다. 마지막으로 로그/상태를 flush하고, 파일별로 정상 마무리
+여부를 로그와 보고서(JSON)로 남깁니다.
+
+종료 신호를 한 번 더 받으면 기다리지 않고 바로 강제 종료합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from .recorder import RecordingStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ShutdownReport:
+    """종료 결과"""
+    # 정상적으로 마무리된 파일
+    clean: list[str] = field(default_factory=list)
+    # 마감 시간 안에 끝나지 않아 강제 종료된 녹화
+    killed: list[str] = field(default_factory=list)
+    # 마무리 중 오류가 나거나 최종 파일이 없는 녹화
+    failed: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    deadline: float = 0.0
+    signal: Optional[str] = None
+    finished_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def save(self, path: Path):
+        """보고서 저장 (임시 파일 → 교체)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temp, path)
+
+
+class ShutdownCoordinator:
+    """종료 신호 처리와 녹화 동시 마무리"""
+
+    # 로그/상태 flush에 남겨 두는 시간 (초)
+    FLUSH_RESERVE = 1.0
+
+    def __init__(self, deadline: float = 8.0, report_path: Optional[Path] = None):
+        """
+        초기화
+
+        Args:
+            deadline: 종료 신호부터 정리를 마칠 때까지 전체 제한 시간 (초)
+            report_path: 종료 보고서 파일 (None이면 로그만)
+        """
+        self.deadline = deadline
+        self.report_path = Path(report_path) if report_path else None
+        self.report: Optional[ShutdownReport] = None
+        self._recorders: Callable[[], list] = list
+        self._stop: Optional[Callable[[], Awaitable[Any]]] = None
+        self._flush: list[Callable[[], Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._active: list = []
+        # 강제 종료한 녹화기 (id)
+        self._killed: set[int] = set()
+        self._installed: set[int] = set()
+        self._done = asyncio.Event()
+
+    def manage(self, recorders: Callable[[], list], stop: Callable[[], Awaitable[Any]]):
+        """
+        종료할 대상 지정 (다시 호출하면 교체, 재시작한 녹화기 등)
+
+        Args:
+            recorders: 현재 ChzzkAutoRecorder 목록을 돌려주는 함수
+            stop: 전체 중지 코루틴 함수 (ChannelManager.stop, ChzzkAutoRecorder.stop)
+        """
+        self._recorders = recorders
+        self._stop = stop
+
+    def recorders(self) -> list:
+        """manage()로 지정한 현재 녹화기 목록"""
+        return self._recorders()
+
+    @property
+    def managed(self) -> bool:
+        """manage()로 종료할 대상이 지정되었는지 (녹화기 시작 완료)"""
+        return self._stop is not None
+
+    def add_flush(self, callback: Callable[[], Any]):
+        """녹화 마무리 후 호출할 flush 함수 (동기/비동기)"""
+        self._flush.append(callback)
+
+    def install(self, loop: Optional[asyncio.AbstractEventLoop] = None,
+                signals: tuple = (signal.SIGTERM, signal.SIGINT)):
+        """이벤트 루프에 시그널 핸들러 등록 (여러 번 호출해도 한 번만)"""
+        if sys.platform == "win32":
+            return
+        loop = loop or asyncio.get_running_loop()
+        for sig in signals:
+            if sig in self._installed:
+                continue
+            loop.add_signal_handler(sig, self.request, sig)
+            self._installed.add(sig)
+
+    @property
+    def requested(self) -> bool:
+        """종료가 요청되었는지"""
+        return self._task is not None
+
+    def request(self, signum: Optional[int] = None) -> asyncio.Task:
+        """종료 요청 (두 번째 요청은 기다리지 않고 강제 종료)"""
+        if self._task:
+            logger.warning("⚠️  종료 신호를 다시 받아 녹화를 강제 종료합니다")
+            self._kill_active()
+            return self._task
+        name = signal.Signals(signum).name if signum else None
+        logger.info(f"시그널 수신: {name or '종료 요청'}")
+        self._task = asyncio.create_task(self._shutdown(name))
+        return self._task
+
+    async def wait(self) -> ShutdownReport:
+        """종료 처리가 끝날 때까지 대기"""
+        await self._done.wait()
+        return self.report
+
+    async def _shutdown(self, signal_name: Optional[str]) -> ShutdownReport:
+        try:
+            return await self._finish_recordings(signal_name)
+        finally:
+            self._done.set()
+
+    async def _finish_recordings(self, signal_name: Optional[str]) -> ShutdownReport:
+        started = time.monotonic()
+        report = ShutdownReport(deadline=self.deadline, signal=signal_name)
+
+        # 녹화 정보는 중지 후 녹화기에서 지워지므로 미리 모아 둠
+        self._active = [(recorder, recorder.current_recording) for recorder in self._recorders()
+                        if recorder.current_recording and recorder.current_recording.is_active]
+        logger.info(f"🛑 종료 시작: 녹화 {len(self._active)}개 마무리 (제한 {self.deadline:g}초)")
+
+        # 모든 FFmpeg에 동시에 종료 신호 → 각자 파일 마무리 시작
+        for recorder, _ in self._active:
+            recorder.recorder.request_stop()
+
+        if self._stop:
+            budget = max(0.0, self.deadline - self.FLUSH_RESERVE)
+            stop_task = asyncio.ensure_future(self._stop())
+            done, _ = await asyncio.wait({stop_task}, timeout=budget)
+            if not done:
+                self._kill_active()
+                # 강제 종료 후 남은 정리 (파일 이동 등)는 잠깐만 더 기다림
+                await asyncio.wait({stop_task}, timeout=self.FLUSH_RESERVE / 2)
+            elif stop_task.exception():
+                logger.error(f"종료 중 오류: {stop_task.exception()}")
+
+        for recorder, info in self._active:
+            name = info.file_path.name
+            if id(recorder) in self._killed:
+                report.killed.append(name)
+            elif info.status == RecordingStatus.STOPPED and not info.partial_path and info.file_path.exists():
+                report.clean.append(name)
+            else:
+                report.failed.append(name)
+
+        report.elapsed = round(time.monotonic() - started, 3)
+        self.report = report
+        self._log(report)
+        await self._run_flush()
+        return report
+
+    def _kill_active(self):
+        """아직 끝나지 않은 FFmpeg 강제 종료"""
+        for recorder, info in self._active:
+            if recorder.recorder.kill():
+                logger.warning(f"FFmpeg 강제 종료: {info.file_path.name}")
+                self._killed.add(id(recorder))
+
+    def _log(self, report: ShutdownReport):
+        for name in report.clean:
+            logger.info(f"  ✅ 정상 마무리: {name}")
+        for name in report.killed:
+            logger.error(f"  ❌ 강제 종료 (파일이 불완전할 수 있음): {name}")
+        for name in report.failed:
+            logger.error(f"  ❌ 마무리 실패: {name}")
+        logger.info(f"🏁 종료 처리 완료 ({report.elapsed:.1f}초): 정상 {len(report.clean)}개, "
+                    f"강제 종료 {len(report.killed)}개, 실패 {len(report.failed)}개")
+        if self.report_path:
+            try:
+                report.save(self.report_path)
+            except OSError as e:
+                logger.error(f"종료 보고서 저장 실패: {e}")
+
+    async def _run_flush(self):
+        for callback in self._flush:
+            try:
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    await asyncio.wait_for(result, self.FLUSH_RESERVE)
+            except Exception as e:
+                logger.error(f"종료 중 flush 실패: {e}")
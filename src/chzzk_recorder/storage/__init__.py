@@ -0,0 +1,7 @@
+"""
+녹화 파일 저장소 관리 모듈
+"""
+
+from .tiering import TieringMover, MoveJob, TieringError, get_tiering_mover, close_tiering_movers
+
+__all__ = ["TieringMover", "MoveJob", "TieringError", "get_tiering_mover", "close_tiering_movers"]
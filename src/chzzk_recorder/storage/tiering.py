@@ -0,0 +1,520 @@
+"""
+녹화 파일 계층 저장 (로컬 스크래치 → NAS 아카이브)
+
+녹화는 빠른 로컬 디스크(recording_path)에 하고, 끝난 녹화와 사이드카 파일
+(챕터, 채팅 로그 등)을 아카이브 경로로 옮깁니다.
+
+- 전송: copy_file_range → sendfile → read/pwrite 순으로 시도 (가능하면 커널 내 복사)
+- 대역폭 제한: 초당 바이트 상한 (NAS와 녹화 스트림이 네트워크를 나눠 쓰도록)
+- 검증: 녹화 중 만든 무결성 매니페스트가 있으면 사본을 청크 단위로 비교하고
+  어긋난 청크만 다시 복사 (원본은 다시 읽지 않음), 없으면 원본/사본 BLAKE2b 비교
+- 재개: 작업마다 저널(.tiering/*.json)을 남기고, 복사한 위치부터 이어서 진행
+- 카탈로그: 아카이브 디렉터리의 catalog.jsonl에 파일별 한 줄씩 기록
+- 완료 알림: add_listener로 등록한 함수를 파일마다 호출 (업로드 연계 등)
+
+이동 작업은 한 번에 하나씩만 진행해, 아카이브 쪽 읽기/쓰기가 겹치지 않게 합니다.
+원본은 순차 읽기 힌트를 주고 읽은 구간은 페이지 캐시에서 바로 내보내 녹화 중인
+파일의 캐시를 밀어내지 않습니다.
+"""
+
+import asyncio
+import errno
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..recorder.output_manager import move_no_replace, is_partial
+from ..recorder.integrity import IntegrityManifest, manifest_path
+
+logger = logging.getLogger(__name__)
+
+
+CHUNK_SIZE = 8 * 1024 * 1024
+JOURNAL_DIR_NAME = ".tiering"
+TEMP_SUFFIX = ".tiering"
+CATALOG_NAME = "catalog.jsonl"
+
+# 저널 갱신 간격 (복사 바이트 기준)
+JOURNAL_INTERVAL = 256 * 1024 * 1024
+
+
+class TieringError(Exception):
+    """아카이브 이동 오류"""
+    pass
+
+
+@dataclass
+class MoveJob:
+    """파일 하나의 이동 작업 (저널에 그대로 저장)"""
+    source: str
+    target: str
+    group: str
+    size: int
+    mtime_ns: int
+    copied: int = 0
+    created_at: str = ""
+    tag: str = ""  # 예약한 쪽이 붙이는 값 (채널 ID 등), 이동 완료 알림에 그대로 전달
+
+    @property
+    def source_path(self) -> Path:
+        return Path(self.source)
+
+    @property
+    def target_path(self) -> Path:
+        return Path(self.target)
+
+    @property
+    def temp_path(self) -> Path:
+        return self.target_path.with_name(self.target_path.name + TEMP_SUFFIX)
+
+
+class Throttle:
+    """초당 바이트 제한 (복사 스레드에서 사용)"""
+
+    def __init__(self, bytes_per_second: float):
+        self.rate = bytes_per_second
+        self._start = time.monotonic()
+        self._consumed = 0
+
+    def consume(self, n: int):
+        """n바이트 처리 후 속도에 맞게 대기"""
+        if self.rate <= 0:
+            return
+        self._consumed += n
+        ahead = self._consumed / self.rate - (time.monotonic() - self._start)
+        if ahead > 0:
+            time.sleep(ahead)
+        elif ahead < -1.0:
+            # 쉬었다가 다시 시작할 때 밀린 만큼 몰아서 보내지 않도록
+            self._start = time.monotonic()
+            self._consumed = 0
+
+
+def related_files(video_path: Path) -> list[Path]:
+    """녹화 파일과 같은 이름으로 시작하는 사이드카 파일 목록 (녹화 파일이 맨 앞)"""
+    video_path = Path(video_path)
+    prefix = video_path.stem + "."
+    try:
+        sidecars = sorted(
+            p for p in video_path.parent.iterdir()
+            if p != video_path and p.name.startswith(prefix) and p.is_file() and not is_partial(p)
+        )
+    except FileNotFoundError:
+        return []
+    return ([video_path] if video_path.exists() else []) + sidecars
+
+
+_copy_file_range_supported = hasattr(os, "copy_file_range")
+_sendfile_supported = hasattr(os, "sendfile")
+
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, length: int) -> int:
+    """
+    offset부터 length바이트 복사 (커널 내 복사를 우선 사용)
+
+    Returns:
+        복사한 바이트 수 (0이면 원본 끝)
+    """
+    global _copy_file_range_supported, _sendfile_supported
+
+    if _copy_file_range_supported:
+        try:
+            return os.copy_file_range(src_fd, dst_fd, length, offset, offset)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+            _copy_file_range_supported = False
+
+    if _sendfile_supported:
+        try:
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            return os.sendfile(dst_fd, src_fd, offset, length)
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+            _sendfile_supported = False
+
+    data = os.pread(src_fd, length, offset)
+    written = 0
+    while written < len(data):
+        written += os.pwrite(dst_fd, data[written:], offset + written)
+    return len(data)
+
+
+def file_digest(path: Path, throttle: Optional[Throttle] = None, drop_cache: bool = False) -> str:
+    """BLAKE2b 해시 (drop_cache면 읽기 전후로 페이지 캐시를 비워 실제 디스크 내용을 확인)"""
+    digest = hashlib.blake2b()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if drop_cache:
+            _fadvise(fd, getattr(os, "POSIX_FADV_DONTNEED", None))
+        _fadvise(fd, getattr(os, "POSIX_FADV_SEQUENTIAL", None))
+        buffer = bytearray(CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = os.readv(fd, [buffer])
+            if not n:
+                break
+            digest.update(view[:n])
+            if throttle:
+                throttle.consume(n)
+        if drop_cache:
+            _fadvise(fd, getattr(os, "POSIX_FADV_DONTNEED", None))
+    finally:
+        os.close(fd)
+    return digest.hexdigest()
+
+
+def _fadvise(fd: int, advice: Optional[int], offset: int = 0, length: int = 0):
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, advice)
+    except OSError:
+        pass
+
+
+class TieringMover:
+    """스크래치 → 아카이브 이동기"""
+
+    def __init__(self,
+                 scratch_dir: Path,
+                 archive_dir: Path,
+                 bandwidth_bytes: float = 50 * 1024 * 1024,
+                 verify: bool = True,
+                 rename_on_same_device: bool = True):
+        """
+        초기화
+
+        Args:
+            scratch_dir: 녹화 디렉터리 (저널 위치)
+            archive_dir: 아카이브 디렉터리
+            bandwidth_bytes: 초당 전송 상한 (0이면 무제한)
+            verify: 원본 삭제 전 해시 비교 여부
+            rename_on_same_device: 두 경로가 같은 디스크면 복사 없이 이름만 변경
+        """
+        self.scratch_dir = Path(scratch_dir)
+        self.archive_dir = Path(archive_dir)
+        self.bandwidth_bytes = bandwidth_bytes
+        self.verify = verify
+        self.rename_on_same_device = rename_on_same_device
+        self.journal_dir = self.scratch_dir / JOURNAL_DIR_NAME
+        self.catalog_path = self.archive_dir / CATALOG_NAME
+
+        self.moved_files = 0
+        self.moved_bytes = 0
+        self.current: Optional[MoveJob] = None
+
+        self._queue: asyncio.Queue[MoveJob] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._job_future: Optional[asyncio.Future] = None
+        self._stop = threading.Event()
+        self._same_device = False
+        self._listeners: list[Callable[[MoveJob, Path], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def pending(self) -> int:
+        """대기 중인 작업 수"""
+        return self._queue.qsize() + (1 if self.current else 0)
+
+    def add_listener(self, listener: Callable[[MoveJob, Path], None]):
+        """이동 완료 시 (작업, 아카이브 경로)로 호출할 함수 등록 (이벤트 루프에서 호출)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def start(self):
+        """작업 스레드 시작 및 중단된 작업 재개 (여러 번 호출해도 한 번만 실행)"""
+        if self._worker:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.scratch_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._same_device = (self.rename_on_same_device and
+                             self.scratch_dir.stat().st_dev == self.archive_dir.stat().st_dev)
+        if self._same_device:
+            logger.warning("녹화 경로와 아카이브 경로가 같은 디스크입니다 (복사 없이 이름만 변경)")
+
+        for job in self._load_journal():
+            self._queue.put_nowait(job)
+        if not self._queue.empty():
+            logger.info(f"📦 중단된 아카이브 이동 재개: {self._queue.qsize()}개")
+
+        self._stop.clear()
+        self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, video_path: Path, tag: str = "") -> list[MoveJob]:
+        """
+        녹화 파일과 사이드카 파일 이동 예약 (저널에 먼저 기록)
+
+        Args:
+            video_path: 녹화 파일
+            tag: 이동 완료 알림에 전달할 값 (채널 ID 등)
+
+        Returns:
+            예약된 작업 목록
+        """
+        self.start()
+        video_path = Path(video_path)
+        jobs = []
+        for path in related_files(video_path):
+            stat = path.stat()
+            job = MoveJob(
+                source=str(path),
+                target=str(self.archive_dir / path.name),
+                group=video_path.stem,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                created_at=datetime.now().isoformat(timespec="seconds"),
+                tag=tag,
+            )
+            self._save_journal(job)
+            self._queue.put_nowait(job)
+            jobs.append(job)
+        if jobs:
+            logger.info(f"📦 아카이브 이동 예약: {video_path.name} 외 {len(jobs) - 1}개")
+        return jobs
+
+    async def join(self):
+        """대기 중인 작업이 모두 끝날 때까지 대기"""
+        await self._queue.join()
+
+    async def close(self):
+        """작업 중단 (진행 중인 복사는 저널에 위치를 남기고 멈춤)"""
+        self._stop.set()
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._job_future:
+            # 복사 스레드가 현재 위치를 저널에 남기고 멈출 때까지 대기
+            await asyncio.gather(self._job_future, return_exceptions=True)
+            self._job_future = None
+
+    async def _run(self):
+        while True:
+            job = await self._queue.get()
+            self.current = job
+            self._job_future = asyncio.ensure_future(asyncio.to_thread(self._process, job))
+            try:
+                await asyncio.shield(self._job_future)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"아카이브 이동 실패 ({job.source_path.name}): {e} (저널 유지, 재시작 시 재시도)")
+            finally:
+                self.current = None
+                self._queue.task_done()
+
+    def _process(self, job: MoveJob):
+        """작업 하나 처리 (스레드)"""
+        source = job.source_path
+        if not source.exists():
+            # 원본 삭제 직전에 중단된 경우
+            if job.target_path.exists():
+                self._remove_journal(job)
+                self._notify(job, job.target_path)
+                return
+            raise TieringError(f"원본 파일이 없습니다: {source}")
+
+        stat = source.stat()
+        if (stat.st_size, stat.st_mtime_ns) != (job.size, job.mtime_ns):
+            logger.warning(f"원본이 바뀌어 처음부터 다시 복사: {source.name}")
+            job.size, job.mtime_ns, job.copied = stat.st_size, stat.st_mtime_ns, 0
+
+        if self._same_device:
+            target = self._place(source, job.target_path)
+            digest = None
+        else:
+            self._copy(job)
+            if self._stop.is_set():
+                return
+            digest = self._verify(job)
+            target = self._place(job.temp_path, job.target_path)
+
+        self._append_catalog(job, target, digest)
+        source.unlink(missing_ok=True)
+        self._remove_journal(job)
+        self.moved_files += 1
+        self.moved_bytes += job.size
+        logger.info(f"📦 아카이브 이동 완료: {target.name} ({job.size / 1024 / 1024:.1f}MB)")
+        self._notify(job, target)
+
+    def _notify(self, job: MoveJob, target: Path):
+        """이동 완료 알림 (복사 스레드 → 이벤트 루프)"""
+        if not self._listeners or not self._loop:
+            return
+        for listener in self._listeners:
+            self._loop.call_soon_threadsafe(listener, job, target)
+
+    def _copy(self, job: MoveJob):
+        temp = job.temp_path
+        src_fd = os.open(job.source_path, os.O_RDONLY)
+        dst_fd = os.open(temp, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            # 저널 이후에 기록된 부분은 신뢰할 수 없으므로 잘라내고 이어서 복사
+            existing = os.fstat(dst_fd).st_size
+            job.copied = min(job.copied, existing)
+            os.ftruncate(dst_fd, job.copied)
+            if job.copied:
+                logger.info(f"이어서 복사: {job.source_path.name} ({job.copied / job.size:.0%})")
+
+            _fadvise(src_fd, getattr(os, "POSIX_FADV_SEQUENTIAL", None))
+            throttle = Throttle(self.bandwidth_bytes)
+            since_journal = 0
+
+            while job.copied < job.size and not self._stop.is_set():
+                n = copy_range(src_fd, dst_fd, job.copied, min(CHUNK_SIZE, job.size - job.copied))
+                if n == 0:
+                    raise TieringError(f"원본이 예상보다 짧습니다: {job.source_path}")
+                _fadvise(src_fd, getattr(os, "POSIX_FADV_DONTNEED", None), job.copied, n)
+                job.copied += n
+                since_journal += n
+                throttle.consume(n)
+
+                if since_journal >= JOURNAL_INTERVAL:
+                    os.fdatasync(dst_fd)
+                    self._save_journal(job)
+                    since_journal = 0
+
+            os.fsync(dst_fd)
+            self._save_journal(job)
+        finally:
+            os.close(src_fd)
+            os.close(dst_fd)
+
+    def _verify(self, job: MoveJob) -> Optional[str]:
+        """원본/사본 해시 비교 (사본은 캐시를 비우고 다시 읽음)"""
+        if not self.verify:
+            return None
+        manifest = self._load_manifest(job)
+        if manifest:
+            return self._verify_with_manifest(job, manifest)
+        source_digest = file_digest(job.source_path)
+        target_digest = file_digest(job.temp_path, Throttle(self.bandwidth_bytes), drop_cache=True)
+        if source_digest != target_digest:
+            job.copied = 0
+            self._save_journal(job)
+            job.temp_path.unlink(missing_ok=True)
+            raise TieringError(f"체크섬 불일치: {job.source_path.name}")
+        return source_digest
+
+    @staticmethod
+    def _load_manifest(job: MoveJob) -> Optional[IntegrityManifest]:
+        """녹화 파일의 무결성 매니페스트 (사이드카가 먼저 옮겨졌으면 아카이브 쪽)"""
+        for path in (manifest_path(job.source_path), manifest_path(job.target_path)):
+            if path.exists() and path != job.source_path:
+                try:
+                    manifest = IntegrityManifest.load(path)
+                except (OSError, ValueError, TypeError):
+                    return None
+                if manifest.file == job.source_path.name and manifest.size == job.size:
+                    return manifest
+        return None
+
+    def _verify_with_manifest(self, job: MoveJob, manifest: IntegrityManifest) -> str:
+        """매니페스트와 청크 단위 비교, 어긋난 청크만 다시 복사"""
+        temp = job.temp_path
+        throttle = Throttle(self.bandwidth_bytes)
+        fd = os.open(temp, os.O_RDONLY)
+        _fadvise(fd, getattr(os, "POSIX_FADV_DONTNEED", None))
+        os.close(fd)
+
+        bad = manifest.verify(temp, read_hook=throttle.consume)
+        if bad:
+            logger.warning(f"청크 {len(bad)}개 불일치, 해당 구간만 다시 복사: {job.source_path.name}")
+            # 원본이 매니페스트와 다르면 (녹화 후 손상) 다시 복사해도 소용없음
+            if manifest.verify(job.source_path, bad):
+                raise TieringError(f"원본이 매니페스트와 다릅니다: {job.source_path.name}")
+            src_fd = os.open(job.source_path, os.O_RDONLY)
+            dst_fd = os.open(temp, os.O_WRONLY)
+            try:
+                for index in bad:
+                    start, length = manifest.chunk_range(index)
+                    done = 0
+                    while done < length:
+                        done += copy_range(src_fd, dst_fd, start + done, length - done)
+                os.fsync(dst_fd)
+            finally:
+                os.close(src_fd)
+                os.close(dst_fd)
+            if manifest.verify(temp, bad):
+                raise TieringError(f"다시 복사한 청크도 일치하지 않습니다: {job.source_path.name}")
+        return manifest.root
+
+    @staticmethod
+    def _place(path: Path, target: Path) -> Path:
+        """아카이브에 같은 이름이 있으면 접미사를 붙여 배치"""
+        for index in range(1000):
+            candidate = target if index == 0 else target.with_name(f"{target.stem}_{index}{target.suffix}")
+            if move_no_replace(path, candidate):
+                return candidate
+        raise TieringError(f"아카이브 파일명을 정할 수 없습니다: {target}")
+
+    def _append_catalog(self, job: MoveJob, target: Path, digest: Optional[str]):
+        entry = {
+            "name": target.name,
+            "path": str(target),
+            "group": job.group,
+            "size": job.size,
+            "blake2b": digest,
+            "source": job.source,
+            "archived_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(self.catalog_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _journal_path(self, job: MoveJob) -> Path:
+        return self.journal_dir / (hashlib.blake2b(job.source.encode("utf-8"), digest_size=8).hexdigest() + ".json")
+
+    def _save_journal(self, job: MoveJob):
+        path = self._journal_path(job)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(asdict(job), ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, path)
+
+    def _remove_journal(self, job: MoveJob):
+        self._journal_path(job).unlink(missing_ok=True)
+
+    def _load_journal(self) -> list[MoveJob]:
+        jobs = []
+        for path in sorted(self.journal_dir.glob("*.json")):
+            try:
+                jobs.append(MoveJob(**json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"손상된 아카이브 저널 무시: {path.name} ({e})")
+        # 녹화 파일(그룹)별로 모이도록 생성 순서대로
+        jobs.sort(key=lambda job: (job.created_at, job.group))
+        return jobs
+
+
+_movers: dict[tuple, TieringMover] = {}
+
+
+def get_tiering_mover(scratch_dir: Path, archive_dir: Path,
+                      bandwidth_bytes: float = 50 * 1024 * 1024,
+                      verify: bool = True) -> TieringMover:
+    """경로별 공유 TieringMover (여러 채널이 같은 이동 큐를 사용)"""
+    key = (os.path.abspath(scratch_dir), os.path.abspath(archive_dir))
+    mover = _movers.get(key)
+    if mover is None:
+        mover = _movers[key] = TieringMover(scratch_dir, archive_dir, bandwidth_bytes, verify)
+    return mover
+
+
+async def close_tiering_movers():
+    """모든 이동기 종료"""
+    for mover in list(_movers.values()):
+        await mover.close()
+    _movers.clear()
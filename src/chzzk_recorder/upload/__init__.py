@@ -0,0 +1,12 @@
+"""
+오브젝트 스토리지(S3 호환) 업로드 모듈
+"""
+
+from .s3 import S3Client, S3Error
+from .bandwidth import BandwidthSchedule
+from .uploader import UploadManager, UploadJob, UploadError, get_upload_manager, close_upload_managers
+
+__all__ = [
+    "S3Client", "S3Error", "BandwidthSchedule",
+    "UploadManager", "UploadJob", "UploadError", "get_upload_manager", "close_upload_managers",
+]
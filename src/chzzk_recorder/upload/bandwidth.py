@@ -0,0 +1,109 @@
+"""
+시간대별 업로드 대역폭 제한
+
+업링크를 다른 용도와 나눠 쓰므로 시간대마다 상한을 다르게 둘 수 있습니다.
+설정 형식은 "시작-끝=MB/s" 문자열 목록이며, 자정을 넘는 구간도 가능합니다.
+
+    ["19:00-02:00=2", "02:00-09:00=0"]   # 저녁엔 2MB/s, 새벽엔 무제한
+
+어느 구간에도 속하지 않는 시간에는 기본 상한을 사용합니다 (0이면 무제한).
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+_WINDOW_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*([0-9.]+)\s*$")
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BandwidthWindow:
+    """시간대 하나 (분 단위, 끝은 포함하지 않음)"""
+    start: int
+    end: int
+    bytes_per_second: float
+
+    def contains(self, minute: int) -> bool:
+        if self.start <= self.end:
+            return self.start <= minute < self.end
+        return minute >= self.start or minute < self.end
+
+
+class BandwidthSchedule:
+    """시간대별 초당 바이트 상한"""
+
+    def __init__(self, default_bytes: float = 0, windows: Optional[list[BandwidthWindow]] = None):
+        self.default_bytes = default_bytes
+        self.windows = windows or []
+
+    @classmethod
+    def parse(cls, default_mb: float, specs: list[str]) -> "BandwidthSchedule":
+        """
+        설정 문자열에서 생성
+
+        Raises:
+            ValueError: 형식이 잘못된 경우
+        """
+        windows = []
+        for spec in specs:
+            match = _WINDOW_PATTERN.match(spec)
+            if not match:
+                raise ValueError(f"잘못된 대역폭 구간: {spec!r} (예: \"19:00-02:00=2\")")
+            h1, m1, h2, m2 = (int(g) for g in match.groups()[:4])
+            if h1 > 24 or h2 > 24 or m1 > 59 or m2 > 59:
+                raise ValueError(f"잘못된 시각: {spec!r}")
+            windows.append(BandwidthWindow((h1 * 60 + m1) % 1440, (h2 * 60 + m2) % 1440,
+                                           float(match.group(5)) * MB))
+        return cls(default_mb * MB, windows)
+
+    def rate_at(self, now: Optional[datetime] = None) -> float:
+        """해당 시각의 초당 바이트 상한 (0이면 무제한, 먼저 설정한 구간 우선)"""
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for window in self.windows:
+            if window.contains(minute):
+                return window.bytes_per_second
+        return self.default_bytes
+
+
+class BandwidthLimiter:
+    """
+    비동기 토큰 버킷 (동시에 올리는 모든 파트가 하나의 상한을 나눠 씀)
+
+    상한은 매번 스케줄에서 읽으므로 구간이 바뀌면 바로 반영됩니다.
+    """
+
+    def __init__(self, schedule: BandwidthSchedule, burst_seconds: float = 1.0):
+        self.schedule = schedule
+        self.burst_seconds = burst_seconds
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """현재 초당 바이트 상한"""
+        return self.schedule.rate_at()
+
+    async def acquire(self, n: int):
+        """n바이트를 보낼 수 있을 때까지 대기"""
+        async with self._lock:
+            rate = self.rate
+            now = time.monotonic()
+            if rate <= 0:
+                self._updated = now
+                return
+            capacity = rate * self.burst_seconds
+            self._tokens = min(capacity, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= n
+            if self._tokens < 0:
+                # 빚진 만큼 기다렸다가 보냄 (대기 중에는 다른 파트도 기다림)
+                await asyncio.sleep(-self._tokens / rate)
+                self._tokens = 0.0
+                self._updated = time.monotonic()
@@ -0,0 +1,244 @@
+"""
+S3 호환 오브젝트 스토리지 클라이언트 (AWS Signature V4)
+
+업로드에 필요한 요청만 구현합니다 (PutObject, 멀티파트 업로드, ListParts).
+MinIO, Cloudflare R2, Wasabi 등 S3 호환 서비스는 path-style 주소로 접근합니다.
+"""
+
+import hashlib
+import hmac
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import AsyncIterable, Optional, Union
+from urllib.parse import quote, unquote, urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+Body = Union[bytes, AsyncIterable[bytes]]
+
+
+class S3Error(Exception):
+    """S3 요청 오류"""
+
+    def __init__(self, message: str, status: int = 0, code: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+    @property
+    def retryable(self) -> bool:
+        """재시도하면 성공할 수 있는 오류인지"""
+        return self.status == 0 or self.status == 429 or self.status >= 500
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_v4(method: str, url: str, headers: dict[str, str], payload_hash: str,
+            access_key: str, secret_key: str, region: str,
+            service: str = "s3", now: Optional[datetime] = None) -> dict[str, str]:
+    """
+    AWS Signature V4 서명 헤더 생성
+
+    Returns:
+        Authorization, x-amz-date, x-amz-content-sha256가 추가된 헤더
+    """
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    parts = urlsplit(url)
+
+    headers = dict(headers)
+    headers["host"] = parts.netloc
+    headers["x-amz-date"] = amz_date
+    headers["x-amz-content-sha256"] = payload_hash
+
+    canonical_headers = {k.lower().strip(): " ".join(str(v).split()) for k, v in headers.items()}
+    signed_headers = ";".join(sorted(canonical_headers))
+
+    # URL에 이미 인코딩된 값(uploadId 등)이 있으므로 풀어서 한 번만 인코딩
+    query_items = []
+    for item in filter(None, parts.query.split("&")):
+        key, _, value = item.partition("=")
+        query_items.append((quote(unquote(key), safe="-_.~"), quote(unquote(value), safe="-_.~")))
+    canonical_query = "&".join(f"{k}={v}" for k, v in sorted(query_items))
+
+    canonical_request = "\n".join([
+        method,
+        parts.path or "/",
+        canonical_query,
+        "".join(f"{k}:{canonical_headers[k]}\n" for k in sorted(canonical_headers)),
+        signed_headers,
+        payload_hash,
+    ])
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope,
+        hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+
+    key = _hmac(("AWS4" + secret_key).encode("utf-8"), date)
+    for part in (region, service, "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    headers["Authorization"] = (f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+                                f"SignedHeaders={signed_headers}, Signature={signature}")
+    del headers["host"]
+    return headers
+
+
+def _strip_ns(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find_text(root: ET.Element, name: str) -> Optional[str]:
+    for element in root.iter():
+        if _strip_ns(element.tag) == name:
+            return element.text
+    return None
+
+
+class S3Client:
+    """S3 호환 스토리지 클라이언트"""
+
+    def __init__(self,
+                 endpoint_url: str,
+                 bucket: str,
+                 access_key: str,
+                 secret_key: str,
+                 region: str = "us-east-1",
+                 client: Optional[httpx.AsyncClient] = None,
+                 timeout: float = 300.0):
+        """
+        초기화
+
+        Args:
+            endpoint_url: 엔드포인트 (예: https://s3.ap-northeast-2.amazonaws.com)
+            bucket: 버킷 이름
+            access_key: 액세스 키
+            secret_key: 시크릿 키
+            region: 리전
+            client: 공유 HTTP 클라이언트 (없으면 생성)
+            timeout: 요청 타임아웃 (초)
+        """
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self._own_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+
+    async def close(self):
+        """리소스 정리"""
+        if self._own_client:
+            await self._client.aclose()
+
+    def object_url(self, key: str, query: str = "") -> str:
+        """오브젝트 URL (path-style)"""
+        url = f"{self.endpoint_url}/{quote(self.bucket)}/{quote(key, safe='/-_.~')}"
+        return f"{url}?{query}" if query else url
+
+    async def put_object(self, key: str, body: Body, length: int,
+                         content_md5: Optional[str] = None) -> str:
+        """단일 요청 업로드 (ETag 반환)"""
+        response = await self._request("PUT", self.object_url(key), body, length, content_md5)
+        return response.headers.get("etag", "").strip('"')
+
+    async def create_multipart_upload(self, key: str) -> str:
+        """멀티파트 업로드 시작 (UploadId 반환)"""
+        response = await self._request("POST", self.object_url(key, "uploads="))
+        upload_id = _find_text(ET.fromstring(response.content), "UploadId")
+        if not upload_id:
+            raise S3Error("UploadId가 없는 응답", response.status_code)
+        return upload_id
+
+    async def upload_part(self, key: str, upload_id: str, number: int, body: Body, length: int,
+                          content_md5: Optional[str] = None) -> str:
+        """파트 업로드 (ETag 반환)"""
+        query = f"partNumber={number}&uploadId={quote(upload_id, safe='')}"
+        response = await self._request("PUT", self.object_url(key, query), body, length, content_md5)
+        etag = response.headers.get("etag", "").strip('"')
+        if not etag:
+            raise S3Error(f"파트 {number} 응답에 ETag가 없습니다", response.status_code)
+        return etag
+
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: list[tuple[int, str]]):
+        """멀티파트 업로드 완료"""
+        body = "<CompleteMultipartUpload>" + "".join(
+            f"<Part><PartNumber>{n}</PartNumber><ETag>\"{etag}\"</ETag></Part>" for n, etag in sorted(parts)
+        ) + "</CompleteMultipartUpload>"
+        data = body.encode("utf-8")
+        response = await self._request("POST", self.object_url(key, f"uploadId={quote(upload_id, safe='')}"),
+                                       data, len(data))
+        # 200 응답 본문에 오류가 들어올 수 있음
+        if b"<Error>" in response.content:
+            root = ET.fromstring(response.content)
+            raise S3Error(_find_text(root, "Message") or "완료 실패", 500, _find_text(root, "Code") or "")
+
+    async def abort_multipart_upload(self, key: str, upload_id: str):
+        """멀티파트 업로드 취소"""
+        await self._request("DELETE", self.object_url(key, f"uploadId={quote(upload_id, safe='')}"))
+
+    async def list_parts(self, key: str, upload_id: str) -> dict[int, tuple[str, int]]:
+        """
+        업로드된 파트 목록
+
+        Returns:
+            {파트 번호: (ETag, 크기)}
+        """
+        parts: dict[int, tuple[str, int]] = {}
+        marker = 0
+        while True:
+            query = f"uploadId={quote(upload_id, safe='')}&part-number-marker={marker}"
+            response = await self._request("GET", self.object_url(key, query))
+            root = ET.fromstring(response.content)
+            for element in root.iter():
+                if _strip_ns(element.tag) != "Part":
+                    continue
+                fields = {_strip_ns(child.tag): child.text for child in element}
+                parts[int(fields["PartNumber"])] = (fields["ETag"].strip('"'), int(fields["Size"]))
+            if (_find_text(root, "IsTruncated") or "").lower() != "true":
+                return parts
+            marker = int(_find_text(root, "NextPartNumberMarker") or 0)
+
+    async def _request(self, method: str, url: str, body: Optional[Body] = None, length: int = 0,
+                       content_md5: Optional[str] = None) -> httpx.Response:
+        headers: dict[str, str] = {}
+        if body is not None:
+            headers["content-length"] = str(length)
+        if content_md5:
+            headers["content-md5"] = content_md5
+
+        # 본문은 Content-MD5로 검증하고 서명에는 포함하지 않음 (스트리밍 전송)
+        payload_hash = EMPTY_SHA256 if body is None else UNSIGNED_PAYLOAD
+        if isinstance(body, bytes) and not content_md5:
+            payload_hash = hashlib.sha256(body).hexdigest()
+        headers = sign_v4(method, url, headers, payload_hash,
+                          self.access_key, self.secret_key, self.region)
+
+        try:
+            response = await self._client.request(method, url, headers=headers, content=body)
+        except httpx.HTTPError as e:
+            raise S3Error(f"{method} 요청 실패: {e.__class__.__name__}: {e}") from e
+
+        if response.status_code >= 300:
+            code = message = ""
+            try:
+                root = ET.fromstring(response.content)
+                code = _find_text(root, "Code") or ""
+                message = _find_text(root, "Message") or ""
+            except ET.ParseError:
+                pass
+            raise S3Error(f"{method} {response.status_code} {code} {message}".strip(),
+                          response.status_code, code)
+        return response
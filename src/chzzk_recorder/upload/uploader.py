@@ -0,0 +1,531 @@
+"""
+오브젝트 스토리지 업로드 큐
+
+끝난 녹화(아카이브를 쓰면 아카이브로 옮긴 뒤)와 사이드카 파일을 S3 호환
+스토리지에 올립니다.
+
+- 큐: 작업마다 상태 파일(.uploads/*.json)을 남겨 재시작 후에도 이어서 진행
+- 멀티파트: 파트를 동시에 여러 개 올리되, 파일에서 읽은 파트는 업로드 슬롯을
+  얻은 뒤에만 메모리에 올려 사용량이 파트 크기 × 동시 업로드 수를 넘지 않음
+- 재개: 서버의 파트 목록(ListParts)과 로컬 파일 구간의 MD5를 비교해 맞는 파트는
+  다시 올리지 않음 (SSE-KMS 등으로 ETag가 MD5가 아니면 처음부터 다시 올림)
+- 대역폭: 시간대별 상한을 모든 파트가 나눠 씀 (업링크를 다른 용도와 공유)
+- 녹화 중 업로드: pipe 출력 모드(fragmented MP4)는 앞부분이 다시 기록되지
+  않으므로, 기록이 끝난 구간부터 파트 단위로 올림
+
+업로드를 마친 파일은 상태 디렉터리의 uploaded.jsonl에 기록하고, 같은 키와 크기의
+파일은 다시 올리지 않습니다.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from .bandwidth import BandwidthSchedule, BandwidthLimiter
+from .s3 import S3Client, S3Error
+from ..storage.tiering import MoveJob
+from ...config import UploadConfig
+
+logger = logging.getLogger(__name__)
+
+
+STATE_DIR_NAME = ".uploads"
+LEDGER_NAME = "uploaded.jsonl"
+
+MB = 1024 * 1024
+MIN_PART_SIZE = 5 * MB
+MAX_PARTS = 10000
+
+# 전송 단위 (대역폭 제한 간격)
+SEND_SLICE = 256 * 1024
+
+MAX_PART_ATTEMPTS = 5
+RETRY_DELAY = 60.0
+MAX_RETRY_DELAY = 1800.0
+
+# 녹화 중 업로드: 새로 기록된 구간 확인 간격 (초)
+LIVE_POLL_INTERVAL = 5.0
+
+# 녹화 중 업로드 진행 상황: (현재 경로, 읽어도 되는 크기, 녹화 종료 여부)
+LiveSource = Callable[[], tuple[Path, int, bool]]
+
+
+class UploadError(Exception):
+    """업로드 오류"""
+    pass
+
+
+@dataclass
+class UploadJob:
+    """파일 하나의 업로드 작업 (상태 파일에 그대로 저장)"""
+    path: str
+    key: str
+    size: int = 0
+    part_size: int = 0
+    upload_id: str = ""
+    parts: dict[str, str] = field(default_factory=dict)  # 파트 번호 → ETag
+    live: bool = False
+    attempts: int = 0
+    created_at: str = ""
+
+    @property
+    def file_path(self) -> Path:
+        return Path(self.path)
+
+
+def _read_range(path: Path, offset: int, length: int) -> tuple[bytes, str]:
+    """파일 구간 읽기 (데이터, MD5 hex)"""
+    with open(path, "rb", buffering=0) as f:
+        data = os.pread(f.fileno(), length, offset)
+    if len(data) != length:
+        raise UploadError(f"파일이 예상보다 짧습니다: {path.name} ({offset + len(data)} < {offset + length})")
+    return data, hashlib.md5(data).hexdigest()
+
+
+def _range_md5(path: Path, offset: int, length: int) -> Optional[str]:
+    """파일 구간 MD5 (구간이 파일을 벗어나면 None)"""
+    try:
+        return _read_range(path, offset, length)[1]
+    except (OSError, UploadError):
+        return None
+
+
+def part_size_for(size: int, part_size: int) -> int:
+    """파트 수가 상한(10,000)을 넘지 않는 파트 크기 (MB 단위로 올림)"""
+    part_size = max(part_size, MIN_PART_SIZE)
+    if size > part_size * MAX_PARTS:
+        part_size = -(-size // MAX_PARTS)
+        part_size += -part_size % MB
+    return part_size
+
+
+class UploadManager:
+    """S3 호환 스토리지 업로드 큐"""
+
+    def __init__(self, config: UploadConfig, state_dir: Path, client: Optional[S3Client] = None):
+        """
+        초기화
+
+        Args:
+            config: 업로드 설정
+            state_dir: 작업 상태/업로드 기록 디렉터리
+            client: S3 클라이언트 (없으면 설정으로 생성)
+        """
+        self.config = config
+        self.state_dir = Path(state_dir)
+        self.ledger_path = self.state_dir / LEDGER_NAME
+        self.client = client or S3Client(
+            config.endpoint_url, config.bucket, config.access_key or "", config.secret_key or "", config.region
+        )
+        self.part_size = max(config.part_size_mb * MB, MIN_PART_SIZE)
+        self.limiter = BandwidthLimiter(BandwidthSchedule.parse(config.bandwidth_mb, config.bandwidth_schedule))
+
+        self.uploaded_files = 0
+        self.uploaded_bytes = 0
+        self.current: Optional[UploadJob] = None
+
+        self._jobs: dict[str, UploadJob] = {}
+        self._done_events: dict[str, asyncio.Event] = {}
+        self._uploaded: dict[str, int] = {}
+        self._queue: asyncio.Queue[UploadJob] = asyncio.Queue()
+        self._slots = asyncio.Semaphore(max(1, config.max_concurrency))
+        self._worker: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._live_tasks: dict[str, asyncio.Task] = {}
+        self._retry_handles: set[asyncio.TimerHandle] = set()
+
+    @property
+    def pending(self) -> int:
+        """대기/진행 중인 작업 수"""
+        return len(self._jobs)
+
+    def object_key(self, channel_id: str, name: str) -> str:
+        """오브젝트 키"""
+        return f"{self.config.key_prefix}{channel_id}/{name}"
+
+    def start(self):
+        """작업 태스크 시작 및 중단된 업로드 재개 (여러 번 호출해도 한 번만 실행)"""
+        if self._worker:
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._uploaded = self._load_ledger()
+
+        resumed = 0
+        for job in self._load_states():
+            # 재시작 후에는 녹화 중 업로드도 완성된 파일 업로드로 이어감
+            job.live = False
+            self._register(job)
+            self._queue.put_nowait(job)
+            resumed += 1
+        if resumed:
+            logger.info(f"☁️ 중단된 업로드 재개: {resumed}개")
+
+        self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, path: Path, key: str, live: Optional[LiveSource] = None) -> Optional[UploadJob]:
+        """
+        업로드 예약 (상태 파일에 먼저 기록)
+
+        Args:
+            path: 올릴 파일 (녹화 중 업로드는 최종 파일 경로)
+            key: 오브젝트 키
+            live: 녹화 중 업로드 진행 상황 함수 (pipe 출력 모드 녹화)
+
+        Returns:
+            예약된 작업 (이미 올렸거나 진행 중이면 None)
+        """
+        self.start()
+        path = Path(path)
+        existing = self._jobs.get(key)
+        if existing:
+            # 재시도 대기 중에 파일이 옮겨진 경우 (아카이브 이동 등) 새 경로에서 이어서 올림
+            if not existing.live and existing.path != str(path):
+                existing.path = str(path)
+                self._save_state(existing)
+            return None
+        size = 0
+        if not live:
+            size = path.stat().st_size
+            if self._uploaded.get(key) == size:
+                logger.debug("이미 업로드한 파일: %s", key)
+                return None
+
+        job = UploadJob(
+            path=str(path),
+            key=key,
+            size=size,
+            part_size=self.part_size,
+            live=live is not None,
+            created_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._register(job)
+        self._save_state(job)
+        if live:
+            self._live_tasks[key] = self._spawn(self._run_live(job, live))
+            logger.info(f"☁️ 녹화 중 업로드 시작: {key}")
+        else:
+            self._queue.put_nowait(job)
+            logger.info(f"☁️ 업로드 예약: {key} ({size / MB:.1f}MB)")
+        return job
+
+    def enqueue_archived(self, job: MoveJob, target: Path):
+        """아카이브 이동 완료 알림 → 업로드 예약 (TieringMover 리스너, tag는 채널 ID)"""
+        if not job.tag:
+            return
+        try:
+            self.enqueue(target, self.object_key(job.tag, target.name))
+        except OSError as e:
+            logger.error(f"업로드 예약 실패 ({target.name}): {e}")
+
+    async def wait_live(self, key: str):
+        """
+        녹화 중 업로드가 끝날 때까지 대기 (없으면 바로 반환)
+
+        실패하면 일반 업로드 큐로 넘기고 바로 반환하므로, 이후 파일을 옮겨도
+        같은 키로 다시 예약하면 새 경로에서 이어서 올립니다.
+        """
+        task = self._live_tasks.get(key)
+        if task:
+            await asyncio.wait([task])
+
+    async def join(self):
+        """예약된 업로드가 모두 끝날 때까지 대기 (실패 후 재시도 대기 중인 작업 포함)"""
+        while self._jobs:
+            waiters = [asyncio.ensure_future(e.wait()) for e in self._done_events.values()]
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+
+    async def close(self):
+        """업로드 중단 (올린 파트는 상태 파일에 남아 다음 실행 때 이어서 진행)"""
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        tasks = [t for t in [self._worker, *self._tasks] if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        self._tasks.clear()
+        await self.client.close()
+
+    def _register(self, job: UploadJob):
+        self._jobs[job.key] = job
+        self._done_events[job.key] = asyncio.Event()
+
+    def _finish(self, job: UploadJob):
+        self._jobs.pop(job.key, None)
+        event = self._done_events.pop(job.key, None)
+        if event:
+            event.set()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self):
+        while True:
+            job = await self._queue.get()
+            self.current = job
+            try:
+                await self._upload(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._schedule_retry(job, e)
+            finally:
+                self.current = None
+                self._queue.task_done()
+
+    async def _run_live(self, job: UploadJob, live: LiveSource):
+        try:
+            await self._upload(job, live)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 녹화가 끝난 뒤 완성된 파일 업로드로 이어감
+            job.live = False
+            self._schedule_retry(job, e)
+        finally:
+            self._live_tasks.pop(job.key, None)
+
+    def _schedule_retry(self, job: UploadJob, error: Exception):
+        job.attempts += 1
+        delay = min(RETRY_DELAY * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+        logger.error(f"업로드 실패 ({job.key}): {error} ({delay:.0f}초 후 재시도)")
+        self._save_state(job)
+
+        def retry():
+            self._retry_handles.discard(handle)
+            self._queue.put_nowait(job)
+
+        handle = asyncio.get_running_loop().call_later(delay, retry)
+        self._retry_handles.add(handle)
+
+    async def _upload(self, job: UploadJob, live: Optional[LiveSource] = None):
+        """작업 하나 처리"""
+        started = time.monotonic()
+        if not live:
+            path = job.file_path
+            if not path.exists():
+                raise UploadError(f"파일이 없습니다: {path}")
+            job.size = path.stat().st_size
+            if job.size <= job.part_size and not job.upload_id:
+                await self._put_single(job)
+                self._complete(job, started)
+                return
+            job.part_size = part_size_for(job.size, job.part_size)
+            live = lambda: (path, job.size, True)
+
+        if job.upload_id:
+            await self._reconcile(job, live)
+        if not job.upload_id:
+            job.upload_id = await self.client.create_multipart_upload(job.key)
+            job.parts = {}
+            self._save_state(job)
+
+        size = await self._upload_parts(job, live)
+        if size == 0:
+            # 녹화 파일이 비어 있음 (녹화 실패 등)
+            await self.client.abort_multipart_upload(job.key, job.upload_id)
+            self._remove_state(job)
+            self._finish(job)
+            return
+
+        job.size = size
+        await self.client.complete_multipart_upload(
+            job.key, job.upload_id, [(int(n), etag) for n, etag in job.parts.items()]
+        )
+        self._complete(job, started)
+
+    async def _put_single(self, job: UploadJob):
+        async with self._slots:
+            data, md5 = await asyncio.to_thread(_read_range, job.file_path, 0, job.size)
+            await self.client.put_object(job.key, self._body(data), len(data), _b64(md5))
+        self.uploaded_bytes += job.size
+
+    async def _upload_parts(self, job: UploadJob, live: LiveSource) -> int:
+        """
+        파트 업로드 (녹화 중이면 기록이 끝난 파트부터 올리고 종료까지 대기)
+
+        Returns:
+            최종 파일 크기
+        """
+        tasks: set[asyncio.Task] = set()
+        number = 1
+        try:
+            while True:
+                path, available, finished = live()
+                ready = -(-available // job.part_size) if finished else available // job.part_size
+                while number <= ready:
+                    if str(number) not in job.parts:
+                        offset = (number - 1) * job.part_size
+                        length = min(job.part_size, available - offset)
+                        # 슬롯을 얻은 뒤에 읽으므로 메모리에 올라가는 파트 수가 제한됨
+                        # (시작 전에 취소돼도 슬롯을 돌려주도록 태스크 완료 시 반납)
+                        await self._slots.acquire()
+                        task = asyncio.create_task(self._upload_part(job, live, number, offset, length))
+                        task.add_done_callback(lambda _: self._slots.release())
+                        tasks.add(task)
+                    number += 1
+                    self._raise_failed(tasks)
+
+                if finished:
+                    break
+                await asyncio.sleep(LIVE_POLL_INTERVAL)
+                self._raise_failed(tasks)
+
+            await asyncio.gather(*tasks)
+            return available
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _raise_failed(tasks: set[asyncio.Task]):
+        for task in [t for t in tasks if t.done()]:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception():
+                raise task.exception()
+
+    async def _upload_part(self, job: UploadJob, live: LiveSource, number: int, offset: int, length: int):
+        """파트 하나 업로드 (슬롯은 _upload_parts에서 얻고 태스크가 끝나면 반납)"""
+        for attempt in range(1, MAX_PART_ATTEMPTS + 1):
+            try:
+                # 녹화 중 업로드는 최종화로 경로가 바뀔 수 있으므로 매번 확인
+                data, md5 = await asyncio.to_thread(_read_range, live()[0], offset, length)
+                etag = await self.client.upload_part(job.key, job.upload_id, number,
+                                                     self._body(data), length, _b64(md5))
+                break
+            except (S3Error, OSError) as e:
+                if attempt == MAX_PART_ATTEMPTS or (isinstance(e, S3Error) and not e.retryable):
+                    raise
+                logger.warning("파트 %d 업로드 재시도 (%s, %d/%d): %s",
+                               number, job.key, attempt, MAX_PART_ATTEMPTS, e)
+                await asyncio.sleep(min(2 ** attempt, 30))
+        job.parts[str(number)] = etag
+        self.uploaded_bytes += length
+        self._save_state(job)
+
+    async def _body(self, data: bytes):
+        """대역폭 제한을 지키며 보내는 요청 본문"""
+        view = memoryview(data)
+        for offset in range(0, len(view), SEND_SLICE):
+            chunk = view[offset:offset + SEND_SLICE]
+            await self.limiter.acquire(len(chunk))
+            yield bytes(chunk)
+
+    async def _reconcile(self, job: UploadJob, live: LiveSource):
+        """서버에 있는 파트 중 로컬 파일과 같은 것만 유지"""
+        try:
+            listed = await self.client.list_parts(job.key, job.upload_id)
+        except S3Error as e:
+            if e.status != 404:
+                raise
+            logger.warning(f"멀티파트 업로드가 서버에 없어 처음부터 다시 올립니다: {job.key}")
+            job.upload_id, job.parts = "", {}
+            return
+
+        path, available, finished = live()
+        kept = {}
+        for number, (etag, size) in sorted(listed.items()):
+            offset = (number - 1) * job.part_size
+            expected = min(job.part_size, available - offset) if finished else job.part_size
+            if size != expected:
+                continue
+            if await asyncio.to_thread(_range_md5, path, offset, size) == etag:
+                kept[str(number)] = etag
+
+        if len(kept) != len(job.parts) or kept != job.parts:
+            logger.info(f"☁️ 업로드 재개: {job.key} (서버 파트 {len(listed)}개 중 {len(kept)}개 유지)")
+        job.parts = kept
+        self._save_state(job)
+
+    def _complete(self, job: UploadJob, started: float):
+        entry = {
+            "key": job.key,
+            "size": job.size,
+            "path": job.path,
+            "uploaded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(self.ledger_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._uploaded[job.key] = job.size
+        self._remove_state(job)
+        self._finish(job)
+        self.uploaded_files += 1
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        logger.info(f"☁️ 업로드 완료: {job.key} ({job.size / MB:.1f}MB, {job.size / MB / elapsed:.1f}MB/s)")
+
+    def _state_path(self, job: UploadJob) -> Path:
+        return self.state_dir / (hashlib.blake2b(job.key.encode("utf-8"), digest_size=8).hexdigest() + ".json")
+
+    def _save_state(self, job: UploadJob):
+        path = self._state_path(job)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(asdict(job), ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, path)
+
+    def _remove_state(self, job: UploadJob):
+        self._state_path(job).unlink(missing_ok=True)
+
+    def _load_states(self) -> list[UploadJob]:
+        jobs = []
+        for path in sorted(self.state_dir.glob("*.json")):
+            try:
+                jobs.append(UploadJob(**json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"손상된 업로드 상태 파일 무시: {path.name} ({e})")
+        jobs.sort(key=lambda job: job.created_at)
+        return jobs
+
+    def _load_ledger(self) -> dict[str, int]:
+        uploaded = {}
+        try:
+            with open(self.ledger_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        uploaded[entry["key"]] = entry["size"]
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return uploaded
+
+
+def _b64(md5_hex: str) -> str:
+    return base64.b64encode(bytes.fromhex(md5_hex)).decode("ascii")
+
+
+_managers: dict[str, UploadManager] = {}
+
+
+def get_upload_manager(config: UploadConfig, recording_path: Path) -> UploadManager:
+    """녹화 경로별 공유 UploadManager (여러 채널이 같은 업로드 큐와 대역폭 상한을 사용)"""
+    key = os.path.abspath(recording_path)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = _managers[key] = UploadManager(config, Path(recording_path) / STATE_DIR_NAME)
+    return manager
+
+
+async def close_upload_managers():
+    """모든 업로드 큐 종료"""
+    for manager in list(_managers.values()):
+        await manager.close()
+    _managers.clear()
@@ -0,0 +1,9 @@
+"""
+웹 대시보드/상태 API 모듈
+"""
+
+from .server import WebServer, Request, Response, StreamingResponse
+from .status_hub import StatusHub
+from .dashboard import DashboardServer
+
+__all__ = ["WebServer", "Request", "Response", "StreamingResponse", "StatusHub", "DashboardServer"]
@@ -0,0 +1,214 @@
+"""
+녹화 상태 웹 대시보드
+
+    GET /                 대시보드 페이지
+    GET /events           SSE (snapshot 후 delta 이벤트)
+    GET /api/status       현재 전체 상태 (JSON)
+    GET /api/recordings   녹화 파일 목록 (?q=검색어&limit=개수)
+    GET /api/metrics      내부 지표 (API 연결 풀 재사용/지연, 폴링 스케줄러 등, JSON)
+
+헬스체크를 지정하면 (Docker HEALTHCHECK용, 실패 항목이 있으면 503):
+
+    GET /healthz          동작 상태 (이벤트 루프, 폴링, 녹화 진행, 디스크)
+    GET /readyz           준비 상태 (녹화기 준비 완료, 종료 중이 아님 + /healthz 항목)
+
+진단 기능을 켜면 (DiagnosticsConfig.enabled):
+
+    GET /api/debug/loop           이벤트 루프 지연 통계와 최근 멈춤 스택 (JSON)
+    GET /api/debug/stalls         최근 멈춤 스택 (folded 형식)
+    GET /api/debug/profile        샘플링 프로파일 (?seconds=10&thread=loop|all, folded 형식)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .server import WebServer, Request, Response, StreamingResponse
+from .status_hub import StatusHub, StatusProvider
+from ..diagnostics import LoopMonitor, SamplingProfiler, ProfilerBusyError
+from ..health import HealthMonitor
+
+logger = logging.getLogger(__name__)
+
+
+STATIC_DIR = Path(__file__).parent / "static"
+RECORDING_EXTENSIONS = {".mp4", ".ts", ".mkv", ".flv"}
+
+
+class RecordingIndex:
+    """녹화 디렉터리 목록 캐시 (스캔은 스레드에서, 만료 시에만)"""
+
+    def __init__(self, directory: Path, ttl: float = 30.0):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self._entries: list[dict[str, Any]] = []
+        self._scanned_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def entries(self) -> list[dict[str, Any]]:
+        """최신순 녹화 파일 목록"""
+        async with self._lock:
+            if time.monotonic() - self._scanned_at > self.ttl:
+                self._entries = await asyncio.to_thread(self._scan)
+                self._scanned_at = time.monotonic()
+        return self._entries
+
+    async def search(self, query: str = "", limit: int = 200) -> list[dict[str, Any]]:
+        """파일명 검색 (대소문자 무시, 공백으로 구분된 단어 모두 포함)"""
+        terms = query.lower().split()
+        results = []
+        for entry in await self.entries():
+            if all(term in entry["search_key"] for term in terms):
+                results.append({k: v for k, v in entry.items() if k != "search_key"})
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _scan(self) -> list[dict[str, Any]]:
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in RECORDING_EXTENSIONS:
+                        continue
+                    stat = entry.stat()
+                    entries.append({
+                        "name": entry.name,
+                        "size": stat.st_size,
+                        "modified_at": stat.st_mtime,
+                        "search_key": entry.name.lower(),
+                    })
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda e: e["modified_at"], reverse=True)
+        return entries
+
+
+class DashboardServer:
+    """대시보드 웹 서버"""
+
+    def __init__(self,
+                 provider: StatusProvider,
+                 recording_path: Path,
+                 host: str = "0.0.0.0",
+                 port: int = 8080,
+                 update_interval: float = 1.0,
+                 loop_monitor: Optional[LoopMonitor] = None,
+                 max_profile_seconds: float = 60.0,
+                 metrics: Optional[Callable[[], dict[str, Any]]] = None,
+                 health: Optional[HealthMonitor] = None):
+        """
+        초기화
+
+        Args:
+            provider: 채널별 get_status_summary() 목록을 반환하는 함수
+            recording_path: 녹화 파일 디렉터리
+            host: 바인드 주소
+            port: 포트
+            update_interval: 상태 변경 확인 주기 (초)
+            loop_monitor: 이벤트 루프 감시기 (있으면 진단 API 제공)
+            max_profile_seconds: 프로파일 요청 최대 시간 (초)
+            metrics: 내부 지표를 반환하는 함수 (/api/metrics)
+            health: 헬스체크 (있으면 /healthz, /readyz 제공)
+        """
+        self.server = WebServer(host, port)
+        self.hub = StatusHub(provider, interval=update_interval)
+        self.recordings = RecordingIndex(recording_path)
+        self._page: Optional[bytes] = None
+
+        self.server.route("/", self._index)
+        self.server.route("/events", self._events)
+        self.server.route("/api/status", self._status)
+        self.server.route("/api/recordings", self._recordings)
+        self.server.route("/api/metrics", self._metrics)
+        self.metrics = metrics
+
+        self.health = health
+        if health:
+            self.server.route("/healthz", self._healthz)
+            self.server.route("/readyz", self._readyz)
+
+        self.loop_monitor = loop_monitor
+        self.profiler: Optional[SamplingProfiler] = None
+        self.max_profile_seconds = max_profile_seconds
+        if loop_monitor:
+            self.profiler = SamplingProfiler()
+            self.server.route("/api/debug/loop", self._debug_loop)
+            self.server.route("/api/debug/stalls", self._debug_stalls)
+            self.server.route("/api/debug/profile", self._debug_profile)
+
+    @property
+    def port(self) -> int:
+        return self.server.port
+
+    async def start(self):
+        """서버 시작"""
+        await self.server.start()
+        if self.health:
+            self.health.start()
+
+    async def close(self):
+        """서버 종료"""
+        if self.health:
+            await self.health.close()
+        await self.hub.close()
+        await self.server.close()
+
+    async def _index(self, request: Request) -> Response:
+        if self._page is None:
+            self._page = (STATIC_DIR / "dashboard.html").read_bytes()
+        return Response(body=self._page, content_type="text/html; charset=utf-8")
+
+    async def _events(self, request: Request) -> StreamingResponse:
+        return StreamingResponse(self.hub.subscribe(), headers={"X-Accel-Buffering": "no"})
+
+    async def _status(self, request: Request) -> Response:
+        return Response.json(self.hub.snapshot())
+
+    async def _recordings(self, request: Request) -> Response:
+        try:
+            limit = min(int(request.query.get("limit", 200)), 1000)
+        except ValueError:
+            return Response(status=400, body=b"invalid limit")
+        return Response.json(await self.recordings.search(request.query.get("q", ""), limit))
+
+    async def _metrics(self, request: Request) -> Response:
+        return Response.json(self.metrics() if self.metrics else {})
+
+    async def _healthz(self, request: Request) -> Response:
+        return self._health_response(self.health.liveness())
+
+    async def _readyz(self, request: Request) -> Response:
+        return self._health_response(self.health.readiness())
+
+    @staticmethod
+    def _health_response(report: dict[str, Any]) -> Response:
+        return Response.json(report, status=200 if report["healthy"] else 503)
+
+    async def _debug_loop(self, request: Request) -> Response:
+        return Response.json(self.loop_monitor.snapshot())
+
+    async def _debug_stalls(self, request: Request) -> Response:
+        return Response(body=self.loop_monitor.folded_stalls().encode("utf-8"))
+
+    async def _debug_profile(self, request: Request) -> Response:
+        try:
+            seconds = float(request.query.get("seconds", 10))
+        except ValueError:
+            return Response(status=400, body=b"invalid seconds")
+        if not 0 < seconds <= self.max_profile_seconds:
+            return Response(status=400, body=f"seconds must be in (0, {self.max_profile_seconds:g}]".encode())
+        thread = request.query.get("thread", "loop")
+        if thread not in ("loop", "all"):
+            return Response(status=400, body=b"thread must be loop or all")
+
+        thread_id = self.loop_monitor.loop_thread_id if thread == "loop" else None
+        try:
+            folded, samples = await self.profiler.profile(seconds, thread_id)
+        except ProfilerBusyError as e:
+            return Response(status=409, body=str(e).encode("utf-8"))
+        logger.info(f"프로파일 완료: {seconds:g}초, 샘플 {samples}개")
+        return Response(body=folded.encode("utf-8"), headers={"X-Profile-Samples": str(samples)})
@@ -0,0 +1,177 @@
+"""
+내장 HTTP 서버
+
+녹화 프로세스 안에서 대시보드/상태 API를 제공하기 위한 최소한의 asyncio HTTP/1.1
+서버입니다. 일반 요청은 응답 후 연결을 닫고, SSE 같은 스트리밍 응답은
+비동기 이터레이터가 끝날 때까지 연결을 유지합니다.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Awaitable, AsyncIterator, Union
+from urllib.parse import urlsplit, parse_qs, unquote
+
+logger = logging.getLogger(__name__)
+
+
+STATUS_TEXT = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+@dataclass
+class Request:
+    """HTTP 요청"""
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+
+
+@dataclass
+class Response:
+    """HTTP 응답"""
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "text/plain; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, data, status: int = 200) -> "Response":
+        """JSON 응답"""
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        return cls(status=status, body=body, content_type="application/json; charset=utf-8")
+
+
+@dataclass
+class StreamingResponse:
+    """스트리밍 응답 (SSE 등)"""
+    chunks: AsyncIterator[bytes]
+    content_type: str = "text/event-stream; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[Request], Awaitable[Union[Response, StreamingResponse]]]
+
+
+class WebServer:
+    """경로 기반 라우팅 HTTP 서버"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080):
+        self.host = host
+        self.port = port
+        self._routes: dict[str, Handler] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set[asyncio.Task] = set()
+
+    def route(self, path: str, handler: Handler):
+        """GET 경로 등록"""
+        self._routes[path] = handler
+
+    async def start(self):
+        """서버 시작"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"🌐 웹 서버 시작: http://{self.host}:{self.port}")
+
+    async def close(self):
+        """서버 종료 (스트리밍 연결 포함)"""
+        if self._server:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+
+            handler = self._routes.get(request.path)
+            if request.method not in ("GET", "HEAD"):
+                response = Response(status=405)
+            elif handler is None:
+                response = Response(status=404, body=b"Not Found")
+            else:
+                try:
+                    response = await handler(request)
+                except Exception as e:
+                    logger.error(f"웹 요청 처리 오류 ({request.path}): {e}")
+                    response = Response(status=500, body=b"Internal Server Error")
+
+            if isinstance(response, StreamingResponse):
+                await self._write_stream(writer, response)
+            else:
+                self._write_response(writer, response, head_only=request.method == "HEAD")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+        except (asyncio.TimeoutError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            return None
+
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            return None
+
+        headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        parts = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        return Request(method=method, path=unquote(parts.path), query=query, headers=headers)
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, response: Response, head_only: bool = False):
+        lines = [
+            f"HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, '')}",
+            f"Content-Type: {response.content_type}",
+            f"Content-Length: {len(response.body)}",
+            "Connection: close",
+        ]
+        lines += [f"{name}: {value}" for name, value in response.headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(response.body)
+
+    @staticmethod
+    async def _write_stream(writer: asyncio.StreamWriter, response: StreamingResponse):
+        lines = [
+            "HTTP/1.1 200 OK",
+            f"Content-Type: {response.content_type}",
+            "Cache-Control: no-cache",
+            "Connection: keep-alive",
+        ]
+        lines += [f"{name}: {value}" for name, value in response.headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        async for chunk in response.chunks:
+            writer.write(chunk)
+            await writer.drain()
@@ -0,0 +1,210 @@
+"""
+대시보드 상태 변경분(delta) 배포
+
+구독자가 있을 때만 주기적으로 채널별 상태를 모아 이전 값과 비교하고, 바뀐
+필드만 담은 SSE 이벤트를 한 번만 직렬화해 모든 구독자에게 같은 바이트로
+보냅니다. 느린 브라우저는 큐가 넘치면 버려지고 다시 접속하면 전체 스냅샷을
+받습니다.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+StatusProvider = Callable[[], list[dict[str, Any]]]
+
+
+class _Subscriber:
+    """SSE 구독자 (바운디드 큐)"""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def push(self, data: bytes):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # 더 보내지 않고 연결 종료 → 브라우저 EventSource가 재접속해 스냅샷부터 다시 받음
+            self.close()
+
+    def close(self):
+        """스트림 종료 표시 (None)"""
+        self.overflowed = True
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class StatusHub:
+    """채널 상태 스냅샷/델타 배포기"""
+
+    def __init__(self,
+                 provider: StatusProvider,
+                 interval: float = 1.0,
+                 heartbeat_interval: float = 15.0,
+                 queue_size: int = 64):
+        """
+        초기화
+
+        Args:
+            provider: 채널별 상태 목록을 반환하는 함수 (각 항목에 channel_id 필요)
+            interval: 변경 확인 주기 (초)
+            heartbeat_interval: 변경이 없을 때 연결 유지용 주석 전송 주기 (초)
+            queue_size: 구독자별 대기 이벤트 수 제한
+        """
+        self.provider = provider
+        self.interval = interval
+        self.heartbeat_interval = heartbeat_interval
+        self.queue_size = queue_size
+
+        self._state: dict[str, dict[str, Any]] = {}
+        self._sizes: dict[str, tuple[float, int]] = {}
+        self._subscribers: set[_Subscriber] = set()
+        self._sequence = 0
+        self._task: Optional[asyncio.Task] = None
+        self._last_sent = 0.0
+
+    @property
+    def subscriber_count(self) -> int:
+        """현재 구독자 수"""
+        return len(self._subscribers)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """마지막으로 계산된 전체 상태"""
+        if not self._state:
+            self._refresh()
+        return self._state
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """SSE 스트림 (전체 스냅샷 후 델타)"""
+        subscriber = _Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        self._ensure_running()
+
+        try:
+            yield _sse("snapshot", self._sequence, self.snapshot())
+            while True:
+                data = await subscriber.queue.get()
+                if data is None:
+                    return
+                yield data
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """배포 중지"""
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        """구독자가 있는 동안만 주기적으로 델타 계산"""
+        self._last_sent = time.monotonic()
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            try:
+                delta = self._refresh()
+            except Exception as e:
+                logger.error(f"대시보드 상태 수집 오류: {e}")
+                continue
+
+            now = time.monotonic()
+            if delta:
+                self._broadcast(_sse("delta", self._sequence, delta))
+            elif now - self._last_sent >= self.heartbeat_interval:
+                self._broadcast(b": keepalive\n\n")
+
+    def _broadcast(self, data: bytes):
+        self._last_sent = time.monotonic()
+        for subscriber in list(self._subscribers):
+            subscriber.push(data)
+
+    def _refresh(self) -> dict[str, Any]:
+        """
+        새 상태를 계산해 저장하고 변경분 반환
+
+        Returns:
+            {channel_id: {바뀐 필드: 값}, 사라진 채널: None}
+        """
+        now = time.monotonic()
+        current = {}
+        for summary in self.provider():
+            channel = _flatten(summary)
+            channel["bitrate_kbps"] = self._bitrate(channel["channel_id"], channel.get("file_size"), now)
+            current[channel["channel_id"]] = channel
+
+        delta: dict[str, Any] = {}
+        for channel_id, channel in current.items():
+            previous = self._state.get(channel_id)
+            if previous is None:
+                delta[channel_id] = channel
+                continue
+            changed = {key: value for key, value in channel.items() if previous.get(key) != value}
+            if changed:
+                delta[channel_id] = changed
+
+        for channel_id in self._state.keys() - current.keys():
+            delta[channel_id] = None
+            self._sizes.pop(channel_id, None)
+
+        self._state = current
+        if delta:
+            self._sequence += 1
+        return delta
+
+    def _bitrate(self, channel_id: str, file_size: Optional[int], now: float) -> Optional[int]:
+        """파일 크기 증가량으로 계산한 녹화 비트레이트 (kbps)"""
+        if not file_size:
+            self._sizes.pop(channel_id, None)
+            return None
+
+        previous = self._sizes.get(channel_id)
+        self._sizes[channel_id] = (now, file_size)
+        if not previous or now <= previous[0] or file_size < previous[1]:
+            return self._state.get(channel_id, {}).get("bitrate_kbps")
+        if file_size == previous[1]:
+            # 녹화 모니터가 파일 크기를 수 초 간격으로 갱신하므로 직전 값 유지
+            self._sizes[channel_id] = previous
+            return self._state.get(channel_id, {}).get("bitrate_kbps")
+
+        return int((file_size - previous[1]) * 8 / 1000 / (now - previous[0]))
+
+
+def _flatten(summary: dict[str, Any]) -> dict[str, Any]:
+    """get_status_summary() 결과를 대시보드용 평면 구조로 변환"""
+    recording = summary.get("recording_info") or {}
+    stream = summary.get("stream_info") or {}
+    thumbnail = stream.get("thumbnail_url")
+    return {
+        "channel_id": summary["channel_id"],
+        "stream_status": summary.get("stream_status"),
+        "streamer_name": stream.get("streamer_name"),
+        "title": stream.get("title"),
+        "category": stream.get("category"),
+        "viewer_count": stream.get("viewer_count"),
+        "thumbnail_url": thumbnail.replace("{type}", "480") if thumbnail else None,
+        "recording_status": recording.get("status"),
+        "file_name": recording.get("file_name"),
+        "file_size": recording.get("file_size"),
+        "recording_started_at": recording.get("started_at"),
+    }
+
+
+def _sse(event: str, sequence: int, data: Any) -> bytes:
+    """SSE 이벤트 직렬화"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"event: {event}\nid: {sequence}\ndata: {payload}\n\n".encode("utf-8")
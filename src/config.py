@@ -2,13 +2,20 @@
 치지직 자동 녹화 시스템 설정
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 import logging
-import re
 from datetime import datetime
 
+from .filename_template import compile_template
+
+
+VALID_QUALITIES = ["1080p", "720p", "480p", "360p", "144p", "best", "worst"]
+MIN_POLLING_INTERVAL = 5
+VALID_OUTPUT_MODES = ["auto", "direct", "pipe"]
+VALID_JSON_DECODERS = ["auto", "msgspec", "orjson", "json"]
+
 
 @dataclass
 class RecordingConfig:
@@ -22,66 +29,106 @@ class RecordingConfig:
     # 방송 상태 확인 주기 (초)
     polling_interval: int = 180
     
-    # 파일명 형식 (사용 가능한 변수: {date}, {time}, {category}, {title}, {streamer})
-    # 카테고리가 없는 경우 자동으로 제외됨
+    # 방송 종료 직후 재시작(끊김 후 재송출)에 대비해 짧은 간격으로 확인하는 시간과 간격 (초)
+    reconnect_check_seconds: int = 120
+    reconnect_check_interval: int = 15
+    
+    # 파일명 형식 (사용 가능한 변수: {date}, {time}, {category}, {title}, {streamer}, {channel})
+    # 카테고리가 없는 경우 자동으로 제외됨, [...]로 감싼 구간은 안의 값이 없으면 생략
     filename_format: str = "{date}_{category}_{title}"
     
     # 날짜 형식 (strftime 형식)
     date_format: str = "%Y%m%d_%H%M%S"
+    
+    # 채팅 함께 녹화 여부 ({파일명}.chat.jsonl.gz)
+    record_chat: bool = True
+    
+    # 제목/카테고리 변경 시점을 챕터 파일({파일명}.ffmeta)로 저장
+    write_chapters: bool = True
+    
+    # 녹화 종료 후 카테고리가 바뀐 지점에서 파일 분할 (재인코딩 없음)
+    split_on_category_change: bool = False
+    
+    # 녹화 중 청크 해시를 계산해 무결성 매니페스트({파일명}.manifest.json) 작성
+    write_manifest: bool = True
+    
+    # 녹화 중 HLS 세그먼트 연속성(빠짐/중복/불연속/타임스탬프 점프)을 추적해
+    # 끊김 보고서({파일명}.gaps.json) 작성
+    track_continuity: bool = True
+    
+    # 빠진 시간이 이 값(초) 이상이면 FFmpeg을 바로 다시 연결 (0이면 사용 안 함)
+    reconnect_gap_seconds: float = 10.0
+    
+    # 출력 방식 ("direct": FFmpeg이 파일에 직접 기록,
+    #           "pipe": FFmpeg 출력을 받아 사전 할당 + 큰 버퍼로 기록, 단편화 감소,
+    #           "auto": FFmpeg이 파일 출력을 지원하면 direct, 아니면 pipe)
+    output_mode: str = "auto"
+    
+    # pipe 모드 사전 할당 크기 계산용 예상 비트레이트 (kbps)
+    expected_bitrate_kbps: int = 8000
+    
+    # pipe 모드 기록 버퍼 크기 (MB)
+    write_buffer_mb: int = 4
 
-    def generate_filename(self, stream_info, extension: str = "mp4") -> str:
+    # 파일명 최대 길이 (UTF-8 바이트, 확장자 포함. 대부분의 파일시스템 제한은 255바이트)
+    max_filename_bytes: int = 255
+
+    def generate_filename(self, stream_info, extension: str = "mp4",
+                          now: Optional[datetime] = None,
+                          directory: Optional[Path] = None) -> str:
         """
         방송 정보를 바탕으로 파일명 생성
         
         Args:
             stream_info: 방송 정보
             extension: 파일 확장자
+            now: 파일명에 사용할 시각 (기본값: 현재 시각)
+            directory: 지정하면 이 디렉터리에 이미 있는 파일과 겹치지 않도록
+                       "_1", "_2" ... 접미사를 붙임
             
         Returns:
             생성된 파일명
         """
-        # 기본 변수들
-        now = datetime.now()
-        variables = {
-            "date": now.strftime(self.date_format),
-            "time": now.strftime("%H%M%S"),
-            "streamer": self._safe_filename(stream_info.streamer_name or "unknown"),
-            "title": self._safe_filename(stream_info.title or "untitled"),
-        }
-        
-        # 카테고리가 있는 경우에만 추가
-        if stream_info.category and stream_info.category.strip():
-            variables["category"] = self._safe_filename(stream_info.category)
-            filename = self.filename_format
-        else:
-            # 카테고리가 없는 경우 제거
-            filename = self.filename_format.replace("{category}_", "").replace("_{category}", "")
-            filename = filename.replace("{category}", "")  # 혹시 앞뒤에 언더바가 없는 경우
-        
-        # 변수 치환
-        filename = filename.format(**variables)
+        template = compile_template(self.filename_format, self.date_format, self.max_filename_bytes)
+        now = now or datetime.now()
         
-        # 연속된 언더바 정리
-        filename = re.sub(r'_+', '_', filename)
-        filename = filename.strip('_')
-        
-        return f"{filename}.{extension}"
+        index = 0
+        while True:
+            filename = template.render(stream_info, extension, now, index)
+            if directory is None or not (Path(directory) / filename).exists():
+                return filename
+            index += 1
+
+
+@dataclass
+class ChannelConfig:
+    """채널별 설정 (None이면 RecordingConfig 값을 따름)"""
+    channel_id: str
+    polling_interval: Optional[int] = None
+    quality: Optional[str] = None
+
+
+@dataclass
+class ChannelsConfig:
+    """채널 목록 파일 설정"""
+    # 채널 목록 파일 경로 (JSON, 존재하면 다중 채널 모드로 실행)
+    file_path: Path = Path("./config/channels.json")
     
-    def _safe_filename(self, text: str) -> str:
-        """파일명에 안전한 문자열로 변환"""
-        if not text:
-            return "unknown"
-        
-        # 특수문자 제거 및 공백을 언더바로 변경
-        safe = re.sub(r'[<>:"/\\|?*]', '', text)
-        safe = re.sub(r'\s+', '_', safe.strip())
-        safe = re.sub(r'_+', '_', safe)
-        
-        # 너무 긴 경우 자르기
-        if len(safe) > 50:
-            safe = safe[:50]
-            
-        return safe or "unknown"
+    # 채널 목록 파일 변경 확인 주기 (초)
+    reload_interval: float = 5.0
+    
+    # 동시에 폴링하는 최대 채널 수 (공용 스케줄러 작업자 수)
+    poll_workers: int = 16
+    
+    # 폴링 간격에 더하는 무작위 비율 (0.1이면 ±10%, 채널들의 폴링 시각 분산)
+    poll_jitter: float = 0.1
+    
+    # NID 계정의 팔로우 채널 목록으로 방송 상태 일괄 조회
+    # (팔로우한 채널은 방송 시작/종료가 감지될 때만 채널별로 폴링)
+    batch_status: bool = True
+    
+    # 일괄 조회 주기 (초)
+    batch_status_interval: float = 30.0
 
 
 @dataclass
@@ -95,6 +142,50 @@ class StorageConfig:
     
     # 임시 파일 정리 주기 (시간 단위)
     temp_cleanup_hours: int = 24
+    
+    # 아카이브 경로 (NAS 공유 폴더 등, None이면 녹화 경로에 그대로 둠)
+    # 녹화가 끝나면 녹화 파일과 사이드카 파일을 이 경로로 옮김
+    archive_path: Optional[Path] = None
+    
+    # 아카이브 이동 대역폭 상한 (MB/s, 0이면 무제한)
+    archive_bandwidth_mb: float = 50.0
+    
+    # 원본 삭제 전 아카이브 사본 체크섬 검증
+    verify_archive: bool = True
+
+
+@dataclass
+class UploadConfig:
+    """오브젝트 스토리지(S3 호환) 업로드 설정"""
+    # 업로드 활성화 여부
+    enabled: bool = False
+    
+    # 엔드포인트와 버킷 (예: https://s3.ap-northeast-2.amazonaws.com, MinIO 주소 등)
+    endpoint_url: Optional[str] = None
+    bucket: Optional[str] = None
+    region: str = "us-east-1"
+    
+    # 인증 정보 (환경변수 S3_ACCESS_KEY_ID / S3_SECRET_ACCESS_KEY에서 로드)
+    access_key: Optional[str] = None
+    secret_key: Optional[str] = None
+    
+    # 오브젝트 키 접두사 (키: {key_prefix}{채널 ID}/{파일명})
+    key_prefix: str = "recordings/"
+    
+    # 멀티파트 파트 크기 (MB, 최소 5) - 메모리 사용량은 파트 크기 × 동시 업로드 수
+    part_size_mb: int = 16
+    
+    # 동시에 올리는 파트 수
+    max_concurrency: int = 4
+    
+    # 기본 대역폭 상한 (MB/s, 0이면 무제한)
+    bandwidth_mb: float = 0
+    
+    # 시간대별 대역폭 상한 ("시작-끝=MB/s", 예: ["19:00-02:00=2", "02:00-09:00=0"])
+    bandwidth_schedule: list[str] = field(default_factory=list)
+    
+    # pipe 출력 모드(fragmented MP4)에서 녹화 중에 완성된 파트부터 업로드
+    upload_while_recording: bool = False
 
 
 @dataclass
@@ -111,6 +202,19 @@ class NotificationConfig:
     
     # 에러 발생 알림
     notify_error: bool = True
+    
+    # 디스코드 웹훅 URL (DISCORD_WEBHOOK_URL)
+    discord_webhook_url: Optional[str] = None
+    
+    # 텔레그램 봇 토큰/채팅 ID (TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+    telegram_bot_token: Optional[str] = None
+    telegram_chat_id: Optional[str] = None
+    
+    # 이벤트를 모아서 보내는 구간 (초)
+    coalesce_window_seconds: float = 3.0
+    
+    # 같은 종류의 이벤트가 이 개수 이상 모이면 요약 메시지 하나로 전송
+    digest_threshold: int = 3
 
 
 @dataclass
@@ -131,6 +235,19 @@ class LoggingConfig:
     # 콘솔 출력 여부
     console_output: bool = True
 
+    # 로그 파일을 JSON 한 줄 형식으로 기록 (수집기용, 콘솔은 항상 텍스트)
+    json_format: bool = False
+
+    # 같은 위치의 반복 로그 샘플링: 구간(초)마다 위치별로 남길 개수 (0이면 샘플링 안 함)
+    sample_burst: int = 20
+    sample_window_seconds: float = 10.0
+
+    # 이 레벨 이하만 샘플링 (경고/오류는 항상 기록)
+    sample_max_level: int = logging.DEBUG
+
+    # 요청마다 로그를 남기는 라이브러리 (WARNING 이상만 기록)
+    quiet_loggers: list[str] = field(default_factory=lambda: ["httpx", "httpcore"])
+
 
 @dataclass
 class SystemConfig:
@@ -146,6 +263,120 @@ class SystemConfig:
     
     # 동시 녹화 가능 수 (향후 다중 채널 지원용)
     max_concurrent_recordings: int = 1
+    
+    # API 응답 JSON 디코더 ("auto"는 msgspec > orjson > json 중 설치된 것)
+    json_decoder: str = "auto"
+    
+    # 종료 신호부터 모든 녹화 마무리까지 제한 시간 (초, docker stop 유예 시간 10초보다 짧게)
+    shutdown_timeout: float = 8.0
+    
+    # 종료 시 파일별 마무리 결과 보고서
+    shutdown_report_path: Path = Path("./logs/shutdown_report.json")
+    
+    # 무중단 업그레이드 소켓 (새 버전 프로세스가 녹화 중인 FFmpeg을 넘겨받음, None이면 사용 안 함)
+    handoff_socket: Optional[Path] = Path("./logs/handoff.sock")
+    
+    # 넘겨받기 제한 시간 (초, 넘기지 못하면 이전 프로세스가 녹화를 계속 맡음)
+    handoff_timeout: float = 10.0
+    
+    # FFmpeg 기능 확인 결과 캐시 (실행 파일 경로/수정 시각/크기가 같으면 다시 실행하지 않음)
+    ffmpeg_probe_cache: Optional[Path] = Path("./logs/ffmpeg_capabilities.json")
+
+
+@dataclass
+class PredictionConfig:
+    """방송 시작 예측 폴링 설정 (방송 중이 아닐 때 요일/시간대별로 간격 조절)"""
+    # 예측 폴링 사용 여부 (기록이 부족한 채널은 polling_interval 그대로)
+    enabled: bool = True
+    
+    # 방송 시작 기록 파일 (JSONL)
+    history_path: Path = Path("./logs/golive_history.jsonl")
+    
+    # 예측을 쓰기 시작하는 최소 방송 시작 기록 수
+    min_events: int = 5
+    
+    # 방송 시작 가능성이 높은/낮은 시간대의 폴링 간격 범위 (초)
+    # 하루 요청 수는 polling_interval로 계속 폴링할 때와 같게 배분
+    min_interval: float = 30.0
+    max_interval: float = 900.0
+    
+    # 기록 가중치가 절반이 되는 기간 (일, 최근 방송 시간대를 더 반영)
+    half_life_days: float = 56.0
+
+
+@dataclass
+class HttpConfig:
+    """치지직 API 연결 풀 설정 (모든 채널이 공유)"""
+    # HTTP/2 사용 (h2 패키지 필요, 없으면 HTTP/1.1 keepalive)
+    http2: bool = True
+    
+    # 최대 연결 수 / 유휴 상태로 유지할 연결 수
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    
+    # 유휴 연결 유지 시간 (초, 폴링 간격보다 길면 폴링마다 핸드셰이크하지 않음)
+    keepalive_expiry: float = 300.0
+    
+    # DNS 캐시 유지 시간 (초)
+    dns_ttl: float = 300.0
+
+
+@dataclass
+class WebConfig:
+    """웹 대시보드 설정"""
+    # 대시보드 활성화 여부
+    enabled: bool = True
+    
+    # 바인드 주소/포트 (docker-compose에서 8080 포트 매핑)
+    host: str = "0.0.0.0"
+    port: int = 8080
+    
+    # 상태 변경 확인 주기 (초)
+    update_interval: float = 1.0
+
+
+@dataclass
+class HealthConfig:
+    """헬스체크 설정 (대시보드의 /healthz, /readyz)"""
+    # 이 시간 동안 폴링에 성공하지 못한 채널이 있으면 실패 (초, 예정된 폴링 간격이 더 길면 그만큼 더 기다림)
+    poll_stale_seconds: float = 600.0
+    
+    # 녹화 중 파일이 이 시간 동안 커지지 않으면 실패 (초)
+    recording_stall_seconds: float = 120.0
+    
+    # 최근 이벤트 루프 지연이 이 이상이면 실패 (ms)
+    max_loop_lag_ms: int = 2000
+    
+    # 녹화 디스크 사용률이 이 이상이면 경고 (%)
+    disk_warn_percent: float = 90.0
+    
+    # 녹화 디스크 여유 공간이 이보다 적으면 실패 (MB)
+    disk_min_free_mb: int = 1024
+
+
+@dataclass
+class DiagnosticsConfig:
+    """런타임 진단 설정 (이벤트 루프 지연 감시, 프로파일 API)"""
+    # 진단 활성화 여부 (대시보드에 /api/debug/* 경로 추가)
+    enabled: bool = False
+    
+    # 지연 측정 간격 (초)
+    lag_interval: float = 0.25
+    
+    # 이 이상 늦으면 경고 (ms)
+    lag_threshold_ms: int = 100
+    
+    # 이 이상 루프가 응답하지 않으면 루프 스레드 스택 기록 (ms)
+    stall_threshold_ms: int = 500
+    
+    # 멈춤 스택 기록 파일 (folded 형식, flamegraph.pl 등으로 확인)
+    stall_log_path: Optional[Path] = Path("./logs/loop_stalls.folded")
+    
+    # asyncio 디버그 모드 (느린 콜백을 asyncio 로거에 기록, 부담이 있어 추적 중에만 사용)
+    asyncio_debug: bool = False
+    
+    # 프로파일 요청 최대 시간 (초)
+    max_profile_seconds: float = 60.0
 
 
 @dataclass
@@ -166,10 +397,17 @@ class Config:
     
     def __init__(self):
         self.recording = RecordingConfig()
+        self.channels = ChannelsConfig()
+        self.prediction = PredictionConfig()
         self.storage = StorageConfig()
+        self.upload = UploadConfig()
         self.notification = NotificationConfig()
         self.logging = LoggingConfig()
         self.system = SystemConfig()
+        self.http = HttpConfig()
+        self.web = WebConfig()
+        self.health = HealthConfig()
+        self.diagnostics = DiagnosticsConfig()
         self.docker = DockerConfig()
     
     def create_directories(self):
@@ -185,13 +423,24 @@ class Config:
         errors = []
         
         # 품질 설정 검사
-        valid_qualities = ["1080p", "720p", "480p", "360p", "144p", "best", "worst"]
-        if self.recording.quality not in valid_qualities:
-            errors.append(f"Invalid quality: {self.recording.quality}. Must be one of {valid_qualities}")
+        if self.recording.quality not in VALID_QUALITIES:
+            errors.append(f"Invalid quality: {self.recording.quality}. Must be one of {VALID_QUALITIES}")
         
         # 폴링 간격 검사
-        if self.recording.polling_interval < 5:
-            errors.append("Polling interval must be at least 5 seconds")
+        if self.recording.polling_interval < MIN_POLLING_INTERVAL:
+            errors.append(f"Polling interval must be at least {MIN_POLLING_INTERVAL} seconds")
+        
+        # 출력 방식 검사
+        if self.recording.output_mode not in VALID_OUTPUT_MODES:
+            errors.append(f"Invalid output mode: {self.recording.output_mode}. Must be one of {VALID_OUTPUT_MODES}")
+        
+        # 업로드 설정 검사
+        if self.upload.enabled:
+            errors.extend(self._validate_upload())
+        
+        # JSON 디코더 검사
+        if self.system.json_decoder not in VALID_JSON_DECODERS:
+            errors.append(f"Invalid JSON decoder: {self.system.json_decoder}. Must be one of {VALID_JSON_DECODERS}")
         
         # 로그 레벨 검사
         valid_log_levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR]
@@ -200,6 +449,24 @@ class Config:
         
         return errors
     
+    def _validate_upload(self) -> list[str]:
+        """업로드 설정 유효성 검사"""
+        from .chzzk_recorder.upload.bandwidth import BandwidthSchedule
+        
+        errors = []
+        for name in ("endpoint_url", "bucket", "access_key", "secret_key"):
+            if not getattr(self.upload, name):
+                errors.append(f"Upload is enabled but upload.{name} is not set")
+        if self.upload.part_size_mb < 5:
+            errors.append("Upload part size must be at least 5 MB")
+        if self.upload.max_concurrency < 1:
+            errors.append("Upload concurrency must be at least 1")
+        try:
+            BandwidthSchedule.parse(self.upload.bandwidth_mb, self.upload.bandwidth_schedule)
+        except ValueError as e:
+            errors.append(f"Invalid upload bandwidth schedule: {e}")
+        return errors
+    
     def get_log_level_name(self) -> str:
         """로그 레벨 이름 반환"""
         levels = {
@@ -0,0 +1,245 @@
+"""
+녹화 파일명 템플릿 엔진
+
+filename_format을 한 번만 파싱해 렌더링 계획(render plan)으로 만들어 두고,
+호출마다 변수 치환/정리/길이 제한만 수행합니다.
+
+템플릿 문법:
+    {date} {time} {streamer} {title} {category} {channel}
+        변수. date는 date_format(strftime), time은 %H%M%S 형식입니다.
+    [ ... ]
+        조건부 구간. 안의 변수가 하나라도 비어 있으면 구간 전체를 생략합니다.
+        예) "{date}[_{category}]_{title}"
+
+하위 호환을 위해 대괄호 밖의 {category}는 인접한 '_' 하나와 함께 조건부 구간으로
+취급합니다 ("{date}_{category}_{title}" → "{date}[_{category}]_{title}").
+
+파일명 길이는 UTF-8 바이트 기준으로 제한합니다 (NAS 파일시스템의 255바이트 제한,
+한글은 글자당 3바이트). 넘치면 제목 → 카테고리 → 스트리머 순으로 글자 경계에서
+자릅니다.
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Union
+
+
+VARIABLES = {"date", "time", "streamer", "title", "category", "channel"}
+
+# 값이 없으면 구간째 생략되는 변수 (대괄호 밖에 있을 때)
+OPTIONAL_VARIABLES = {"category"}
+
+# 값이 없을 때 대신 쓰는 값
+DEFAULTS = {"streamer": "unknown", "title": "untitled", "channel": "unknown"}
+
+# 길이 초과 시 자르는 순서
+TRUNCATE_ORDER = ("title", "category", "streamer")
+
+# 제목 외 필드의 최대 글자 수
+FIELD_MAX_CHARS = 50
+
+# 중복 회피 접미사(_99)용으로 남겨 둘 바이트
+SUFFIX_RESERVE_BYTES = 4
+
+_TOKEN = re.compile(r"\[|\]|\{(\w+)\}|[^\[\]{]+|\{")
+# 금지 문자는 제거, 제어 문자와 '_'는 공백으로 바꿔 split()에서 하나로 합침
+_FORBIDDEN = str.maketrans({c: None for c in '<>:"/\\|?*'} | {chr(i): " " for i in range(32)} | {"_": " "})
+
+# 렌더링 계획 항목: (변수명 또는 None, 리터럴) / 조건부 구간: (필수 변수들, 항목들)
+Piece = tuple[Optional[str], str]
+Segment = Union[Piece, tuple[frozenset, list[Piece]]]
+
+
+class FilenameTemplateError(ValueError):
+    """잘못된 파일명 템플릿"""
+    pass
+
+
+def sanitize_component(text: Optional[str]) -> str:
+    """
+    파일명 구성 요소 정리
+
+    금지 문자/제어 문자 제거, 공백은 '_'로, 연속 '_'는 하나로 합치고
+    앞뒤 '_'와 '.'을 제거합니다. 유니코드는 NFC로 정규화합니다.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)
+    return "_".join(text.translate(_FORBIDDEN).split()).strip("._")
+
+
+def truncate_bytes(text: str, max_bytes: int) -> str:
+    """UTF-8 바이트 기준으로 글자 경계에서 자르기"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max(max_bytes, 0)].decode("utf-8", errors="ignore").rstrip("._")
+
+
+class FilenameTemplate:
+    """컴파일된 파일명 템플릿"""
+
+    def __init__(self, template: str, date_format: str = "%Y%m%d_%H%M%S", max_bytes: int = 255):
+        """
+        초기화 (템플릿 파싱)
+
+        Args:
+            template: 파일명 형식
+            date_format: {date} 형식 (strftime)
+            max_bytes: 확장자를 포함한 파일명 최대 바이트 수
+
+        Raises:
+            FilenameTemplateError: 알 수 없는 변수나 짝이 맞지 않는 대괄호
+        """
+        self.template = template
+        self.date_format = date_format
+        self.max_bytes = max_bytes
+        self.plan: list[Segment] = _compile(template)
+        self.variables = {
+            name
+            for segment in self.plan
+            for name in ([segment[0]] if not isinstance(segment[0], frozenset) else segment[0])
+            if name
+        }
+
+    def render(self, stream_info, extension: str = "mp4",
+               now: Optional[datetime] = None, index: int = 0) -> str:
+        """
+        파일명 생성
+
+        Args:
+            stream_info: 방송 정보 (title, category, streamer_name, channel_id)
+            extension: 확장자
+            now: 파일명 시각 (기본값: 현재 시각)
+            index: 0보다 크면 중복 회피 접미사 "_{index}" 추가
+
+        Returns:
+            max_bytes 이내의 파일명
+        """
+        values = self._values(stream_info, now or datetime.now())
+        suffix = f"_{index}" if index > 0 else ""
+        tail = f"{suffix}.{extension}" if extension else suffix
+        budget = self.max_bytes - len(tail.encode("utf-8")) - (0 if index else SUFFIX_RESERVE_BYTES)
+
+        name = self._join(values)
+        overflow = len(name.encode("utf-8")) - budget
+        for field in TRUNCATE_ORDER:
+            if overflow <= 0:
+                break
+            value = values.get(field)
+            if not value:
+                continue
+            size = len(value.encode("utf-8"))
+            values[field] = truncate_bytes(value, max(size - overflow, 1))
+            name = self._join(values)
+            overflow = len(name.encode("utf-8")) - budget
+
+        if overflow > 0:
+            name = truncate_bytes(name, budget)
+
+        return f"{name or 'recording'}{tail}"
+
+    def _values(self, stream_info, now: datetime) -> dict[str, str]:
+        values = {}
+        needed = self.variables
+        if "date" in needed:
+            values["date"] = now.strftime(self.date_format)
+        if "time" in needed:
+            values["time"] = now.strftime("%H%M%S")
+        if "title" in needed:
+            values["title"] = sanitize_component(stream_info.title)
+        if "category" in needed:
+            values["category"] = sanitize_component(stream_info.category)[:FIELD_MAX_CHARS]
+        if "streamer" in needed:
+            values["streamer"] = sanitize_component(stream_info.streamer_name)[:FIELD_MAX_CHARS]
+        if "channel" in needed:
+            values["channel"] = sanitize_component(stream_info.channel_id)
+
+        for name in needed & DEFAULTS.keys():
+            values[name] = values.get(name) or DEFAULTS[name]
+        return values
+
+    def _join(self, values: dict[str, str]) -> str:
+        parts = []
+        for segment in self.plan:
+            if isinstance(segment[0], frozenset):
+                required, pieces = segment
+                if all(values.get(name) for name in required):
+                    parts += [values[name] if name else literal for name, literal in pieces]
+            else:
+                name, literal = segment
+                parts.append(values.get(name, "") if name else literal)
+        return "".join(parts).strip("_")
+
+
+def _compile(template: str) -> list[Segment]:
+    """템플릿을 렌더링 계획으로 변환"""
+    plan: list[Segment] = []
+    group: Optional[list[Piece]] = None
+
+    for match in _TOKEN.finditer(template):
+        token = match.group(0)
+        name = match.group(1)
+
+        if token == "[":
+            if group is not None:
+                raise FilenameTemplateError(f"조건부 구간은 중첩할 수 없습니다: {template}")
+            group = []
+            continue
+        if token == "]":
+            if group is None:
+                raise FilenameTemplateError(f"짝이 맞지 않는 ']': {template}")
+            plan.append((frozenset(n for n, _ in group if n), group))
+            group = None
+            continue
+        if token == "{":
+            raise FilenameTemplateError(f"닫히지 않은 '{{': {template}")
+        if name is not None and name not in VARIABLES:
+            raise FilenameTemplateError(f"알 수 없는 변수 {{{name}}} (사용 가능: {sorted(VARIABLES)})")
+
+        piece: Piece = (name, "") if name else (None, token)
+        (group if group is not None else plan).append(piece)
+
+    if group is not None:
+        raise FilenameTemplateError(f"닫히지 않은 '[': {template}")
+
+    return _wrap_optional(plan)
+
+
+def _wrap_optional(plan: list[Segment]) -> list[Segment]:
+    """대괄호 밖의 선택 변수를 인접한 '_' 하나와 함께 조건부 구간으로 변환"""
+    result: list[Segment] = []
+    i = 0
+    while i < len(plan):
+        segment = plan[i]
+        name = segment[0]
+        if isinstance(name, str) and name in OPTIONAL_VARIABLES:
+            following = plan[i + 1] if i + 1 < len(plan) else None
+            if following and following[0] is None and following[1].startswith("_"):
+                result.append((frozenset([name]), [segment, (None, "_")]))
+                rest = following[1][1:]
+                if rest:
+                    result.append((None, rest))
+                i += 2
+                continue
+            previous = result[-1] if result else None
+            if previous and previous[0] is None and previous[1].endswith("_"):
+                result[-1] = (None, previous[1][:-1])
+                result.append((frozenset([name]), [(None, "_"), segment]))
+            else:
+                result.append((frozenset([name]), [segment]))
+            i += 1
+            continue
+        result.append(segment)
+        i += 1
+    return [s for s in result if s != (None, "")]
+
+
+@lru_cache(maxsize=32)
+def compile_template(template: str, date_format: str = "%Y%m%d_%H%M%S",
+                     max_bytes: int = 255) -> FilenameTemplate:
+    """템플릿 컴파일 (같은 설정이면 캐시된 객체 반환)"""
+    return FilenameTemplate(template, date_format, max_bytes)
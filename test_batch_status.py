@@ -0,0 +1,231 @@
+"""
+방송 상태 일괄 조회 테스트 스크립트
+
+로컬 mock API(팔로우 채널 목록 + live-status)로 채널 300개를 관리할 때
+폴링 한 주기의 요청 수를 채널별 폴링과 비교하고, 방송 시작/종료가 일괄 조회로
+감지되어 해당 채널만 폴링되는지, 목록을 쓸 수 없으면 채널별 폴링으로
+돌아가는지, 예상하지 못한 응답이나 오류에도 일괄 조회 루프가 계속 도는지 확인합니다.
+"""
+
+import asyncio
+import logging
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.channel_manager import ChannelManager
+from src.chzzk_recorder.monitor import BatchStatusProvider, LiveStatus
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = 300
+# 계정이 팔로우한 채널 수 (나머지는 채널별 폴링)
+FOLLOWED = 290
+INTERVAL = 0.4
+
+
+class MockChzzkApi:
+    """팔로우 채널 목록과 live-status를 흉내 내는 mock API"""
+
+    def __init__(self, channel_ids: list[str], followed: list[str]):
+        self.channel_ids = channel_ids
+        self.followed = followed
+        self.live: set[str] = set()
+        self.requests: Counter = Counter()
+        self.polled: Counter = Counter()
+        self.auth_ok = True
+        # totalPage를 문자열로 응답 (예상하지 못한 응답 형태)
+        self.malformed = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/followings"):
+            self.requests["followings"] += 1
+            if not self.auth_ok:
+                return httpx.Response(401, json={"code": 401, "message": "인증 필요"})
+            page = int(request.url.params["page"])
+            size = int(request.url.params["size"])
+            items = [{"channelId": cid, "channel": {"channelId": cid, "channelName": f"채널 {cid[-4:]}"},
+                      "streamer": {"openLive": cid in self.live}, "liveInfo": {"liveTitle": None}}
+                     for cid in self.followed[page * size:(page + 1) * size]]
+            total_page = (len(self.followed) + size - 1) // size
+            if self.malformed:
+                total_page = str(total_page)
+            return httpx.Response(200, json={"code": 200, "message": None, "content": {
+                "totalCount": len(self.followed), "totalPage": total_page, "followingList": items}})
+        if path.endswith("/live-status"):
+            self.requests["live-status"] += 1
+            channel_id = path.split("/")[-2]
+            self.polled[channel_id] += 1
+            status = "OPEN" if channel_id in self.live else "CLOSE"
+            return httpx.Response(200, json={"code": 200, "content": {"status": status}})
+        if path.endswith("/live-detail"):
+            self.requests["live-detail"] += 1
+            return httpx.Response(200, json={"code": 200, "content": {"liveTitle": "방송", "status": "OPEN"}})
+        return httpx.Response(404)
+
+
+async def test_provider():
+    """페이지 나눔, 인증 실패, 오래된 결과"""
+    logger.info("=== 일괄 조회 파싱 테스트 ===")
+
+    channel_ids = [f"{i:032x}" for i in range(12)]
+    api = MockChzzkApi(channel_ids, channel_ids[:10])
+    api.live = {channel_ids[3]}
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    provider = BatchStatusProvider(client, decoder="json", page_size=4, max_age=0.2)
+
+    result = await provider.fetch()
+    assert result.requests == 3 and len(result.live) == 10
+    assert result.live[channel_ids[3]] is True and provider.is_offline(channel_ids[0])
+    assert not provider.covers(channel_ids[11]) and not provider.is_offline(channel_ids[11])
+    assert not provider.is_offline(channel_ids[3])
+
+    # 오래된 결과는 쓰지 않음
+    await asyncio.sleep(0.25)
+    assert not provider.is_offline(channel_ids[0])
+
+    api.auth_ok = False
+    assert await provider.fetch() is None and not provider.available
+    api.auth_ok = True
+    assert await provider.fetch() and provider.available
+
+    # 예상하지 못한 응답 형태는 실패로 처리
+    api.malformed = True
+    failures = provider.failures
+    assert await provider.fetch() is None and provider.failures == failures + 1
+    api.malformed = False
+    await client.aclose()
+    logger.info("✅ 일괄 조회 파싱 통과")
+
+
+async def test_manager_cycle():
+    """채널 300개 폴링 주기당 요청 수, 상태 변경 감지"""
+    logger.info(f"=== 채널 {CHANNELS}개 (팔로우 {FOLLOWED}개) 폴링 주기 테스트 ===")
+
+    channel_ids = [f"{i:032x}" for i in range(CHANNELS)]
+    api = MockChzzkApi(channel_ids, channel_ids[:FOLLOWED])
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Config()
+        config.channels.file_path = Path(tmp) / "channels.json"
+        config.recording.polling_interval = INTERVAL
+        config.recording.reconnect_check_interval = INTERVAL
+        config.channels.poll_jitter = 0.0
+        config.channels.batch_status_interval = INTERVAL
+        config.prediction.history_path = Path(tmp) / "golive_history.jsonl"
+        manager = ChannelManager("aut", "ses", config)
+        manager.batch._client = client
+        manager.scheduler.start()
+
+        started: list[str] = []
+        for name in ("httpx", "src"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+        for channel_id in channel_ids:
+            recorder = ChzzkAutoRecorder(channel_id, "aut", "ses", config, state=manager.states.get(channel_id))
+            recorder.monitor._client = client
+            recorder._running = True
+
+            async def handle_start(stream_info, channel_id=channel_id):
+                started.append(channel_id)
+            recorder._handle_stream_start = handle_start
+            recorder.attach_scheduler(manager.scheduler)
+            manager.recorders[channel_id] = recorder
+            manager.scheduler.add(channel_id, lambda r=recorder: manager._poll(r), recorder.polling_interval)
+
+        # 첫 주기: 모두 채널별 폴링 (상태를 모름)
+        await asyncio.sleep(INTERVAL / 2)
+        first = api.requests["live-status"]
+        assert first == CHANNELS, first
+
+        # 일괄 조회 후 한 주기: 팔로우하지 않은 채널만 채널별 폴링
+        api.requests.clear()
+        assert manager._reconcile(await manager.batch.fetch()) == []
+        await asyncio.sleep(INTERVAL)
+        batched = dict(api.requests)
+        logger.info(f"  폴링 한 주기 요청 수: 채널별 {first}개 → 일괄 조회 {sum(batched.values())}개 {batched}")
+        assert batched["live-status"] == CHANNELS - FOLLOWED
+        assert batched["followings"] == 1
+
+        # 팔로우한 채널의 방송 시작: 일괄 조회 결과로 해당 채널만 바로 폴링
+        api.polled.clear()
+        api.live.add(channel_ids[7])
+        assert manager._reconcile(await manager.batch.fetch()) == [channel_ids[7]]
+        await asyncio.sleep(0.05)
+        assert started == [channel_ids[7]], started
+        assert manager.recorders[channel_ids[7]].current_status == LiveStatus.ONLINE
+        assert api.polled[channel_ids[7]] == 1
+        assert all(api.polled[cid] == 0 for cid in channel_ids[:FOLLOWED] if cid != channel_ids[7])
+
+        # 방송 종료도 해당 채널만
+        api.live.clear()
+        assert manager._reconcile(await manager.batch.fetch()) == [channel_ids[7]]
+        await asyncio.sleep(0.05)
+        assert manager.recorders[channel_ids[7]].current_status == LiveStatus.OFFLINE
+
+        # 목록을 쓸 수 없으면 모든 채널을 다시 채널별 폴링
+        api.auth_ok = False
+        await manager.batch.fetch()
+        api.requests.clear()
+        await asyncio.sleep(INTERVAL * 1.2)
+        fallback = api.requests["live-status"]
+        logger.info(f"  목록 사용 불가 시 한 주기: live-status {fallback}개")
+        assert fallback >= CHANNELS
+        logger.info(f"  지표: {manager.metrics()['batch']}")
+
+        await manager.scheduler.close()
+        await client.aclose()
+    logger.info("✅ 일괄 조회 주기 통과")
+
+
+async def test_batch_loop_survives_errors():
+    """일괄 조회 중 예상하지 못한 오류가 나도 루프가 계속 돎"""
+    logger.info("=== 일괄 조회 루프 오류 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Config()
+        config.channels.file_path = Path(tmp) / "channels.json"
+        config.channels.batch_status_interval = 0.05
+        config.prediction.history_path = Path(tmp) / "golive_history.jsonl"
+        manager = ChannelManager("aut", "ses", config)
+        manager.batch.available = True
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            if calls <= 2:
+                raise RuntimeError("예상하지 못한 오류")
+            return None
+        manager.batch.fetch = fetch
+
+        task = asyncio.create_task(manager._batch_loop())
+        await asyncio.sleep(0.3)
+        assert not task.done(), "일괄 조회 루프가 종료됨"
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert calls > 2, calls
+        await manager.scheduler.close()
+    logger.info(f"✅ 오류 2회 후에도 계속 조회 ({calls}회)")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_provider()
+    await test_manager_cycle()
+    await test_batch_loop_survives_errors()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+채널 상태 테이블 테스트 스크립트
+
+방송 중이 아닌 채널 하나가 차지하는 메모리를 측정하고 (상태 레코드, 기존 방식의
+StreamInfo 보관, 채널별 ChzzkAutoRecorder 전체), 상세 정보 변경 감지와 오류 대기
+시간 계산을 확인합니다.
+"""
+
+import asyncio
+import gc
+import logging
+import tracemalloc
+from dataclasses import make_dataclass, fields
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.monitor import ChannelState, ChannelStateTable, LiveStatus, StreamInfo
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+# 기존 방식: __dict__를 가진 StreamInfo를 채널마다 보관
+DictStreamInfo = make_dataclass("DictStreamInfo", [("channel_id", str), ("status", LiveStatus),
+                                                   *[(f.name, f.type, f.default) for f in fields(StreamInfo)
+                                                     if f.name not in ("channel_id", "status")]])
+
+
+def measure(factory, count: int) -> float:
+    """객체 count개를 만들 때 늘어나는 메모리 (개당 바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def test_idle_channel_memory():
+    """방송 중이 아닌 채널 하나의 메모리"""
+    logger.info("=== 대기 채널 메모리 ===")
+
+    count = 5000
+    table = ChannelStateTable()
+    state_bytes = measure(lambda i: table.get(f"{i:032x}"), count)
+    old_bytes = measure(lambda i: DictStreamInfo(f"{i:032x}", LiveStatus.OFFLINE), count)
+    slotted_bytes = measure(lambda i: StreamInfo(f"{i:032x}", LiveStatus.OFFLINE), count)
+
+    config = Config()
+    recorder_count = 50
+
+    def make_recorder(i: int):
+        return ChzzkAutoRecorder(f"{i:032x}", "aut", "ses", config, state=table.get(f"{i:032x}"))
+
+    logging.disable(logging.INFO)
+    recorder_bytes = measure(make_recorder, recorder_count)
+    logging.disable(logging.NOTSET)
+
+    logger.info(f"  상태 레코드 (ChannelState, 테이블 항목 포함): {state_bytes:6.0f} B/채널")
+    logger.info(f"  기존 StreamInfo 보관 (__dict__):        {old_bytes:6.0f} B/채널")
+    logger.info(f"  StreamInfo (__slots__):                 {slotted_bytes:6.0f} B/채널")
+    logger.info(f"  채널별 ChzzkAutoRecorder 전체:           {recorder_bytes / 1024:6.1f} KB/채널")
+
+    assert not hasattr(StreamInfo("x", LiveStatus.OFFLINE), "__dict__")
+    assert not hasattr(ChannelState("x"), "__dict__")
+    assert slotted_bytes < old_bytes
+    assert state_bytes < recorder_bytes / 10
+    logger.info("✅ 대기 채널 메모리 측정 완료")
+
+
+def test_state_updates():
+    """상세 정보 변경 감지, 오류 대기 시간"""
+    logger.info("=== 상태 갱신 테스트 ===")
+
+    table = ChannelStateTable()
+    state = table.get("abc")
+    live = StreamInfo("abc", LiveStatus.ONLINE, title="방송", category="게임",
+                      hls_url="https://x/hls.m3u8", live_id=7, viewer_count=10)
+
+    assert state.record_success(live, next_due=100.0)
+    assert state.is_live and state.live_id == 7 and table.live_count() == 1
+    # 시청자 수만 바뀐 경우는 변경 아님
+    live.viewer_count = 20
+    assert not state.record_success(live, next_due=200.0)
+    live.category = "토크"
+    assert state.record_success(live, next_due=300.0)
+
+    assert [state.record_failure(now=1000.0) for _ in range(7)] == [10, 20, 40, 80, 160, 300, 300]
+    assert state.next_due == 1300.0
+
+    assert not state.record_success(StreamInfo("abc", LiveStatus.OFFLINE), next_due=400.0)
+    assert state.failures == 0 and state.backoff == 0 and state.detail_hash == 0
+    assert state.live_id == 7 and table.live_count() == 0
+
+    table.remove("abc")
+    assert len(table) == 0
+    logger.info("✅ 상태 갱신 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_idle_channel_memory()
+    test_state_updates()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
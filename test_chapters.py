@@ -0,0 +1,70 @@
+"""
+녹화 분할 테스트 스크립트
+
+가짜 FFmpeg(받은 인자를 기록하고 파트 파일을 만듦)으로 split_at_boundaries가
+확장자에 맞는 segment 출력 형식을 넘기는지(ts→mpegts, mkv→matroska 등, 모르는
+확장자는 옵션 없이 FFmpeg이 추정), 파트 파일 이름을 바꾸는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+from src.chzzk_recorder.recorder.chapters import split_at_boundaries
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+FAKE_FFMPEG = """#!{python}
+import json, sys
+from pathlib import Path
+args = sys.argv[1:]
+Path(args[args.index("-i") + 1] + ".args").write_text(json.dumps(args))
+parts = len(args[args.index("-segment_times") + 1].split(",")) + 1
+for n in range(parts):
+    Path(args[-1] % n).write_bytes(b"part")
+"""
+
+
+async def test_segment_format():
+    """확장자별 segment 출력 형식"""
+    logger.info("=== 녹화 분할 출력 형식 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ffmpeg = Path(tmp) / "fake-ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+        ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+        for suffix, expected in ((".mp4", "mp4"), (".ts", "mpegts"), (".mkv", "matroska"),
+                                 (".flv", "flv"), (".webm", None)):
+            video = Path(tmp) / f"recording{suffix}"
+            video.write_bytes(b"video")
+            parts = await split_at_boundaries(str(ffmpeg), video, [60.0, 120.0],
+                                              lambda index: f"recording_part{index + 1}{suffix}")
+            args = json.loads(Path(f"{video}.args").read_text())
+            segment_format = args[args.index("-segment_format") + 1] if "-segment_format" in args else None
+            logger.info(f"  {suffix}: -segment_format {segment_format}, 파트 {[p.name for p in parts]}")
+            assert segment_format == expected
+            assert [p.name for p in parts] == [f"recording_part{n}{suffix}" for n in (1, 2, 3)]
+            assert all(p.read_bytes() == b"part" for p in parts)
+    logger.info("✅ 녹화 분할 출력 형식 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    if os.name == "posix":
+        await test_segment_format()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
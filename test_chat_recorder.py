@@ -0,0 +1,248 @@
+"""
+치지직 채팅 녹화 테스트 스크립트
+
+실제 채팅 서버 대신 로컬 WebSocket 서버를 띄워 대량의 메시지를 흘려보내고,
+저장된 채팅 로그/인덱스가 영상 시간축과 맞는지, 잘못된 메시지로 세션이 끝나면
+재접속 전에 이전 연결을 닫는지, 버퍼가 가득 차 시작한 기록을 중지할 때 기다리는지
+확인합니다.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.chzzk_recorder.chat import ChatRecorder
+from src.chzzk_recorder.chat import websocket
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+CHANNEL_COUNT = 20
+MESSAGES_PER_CHANNEL = 5000
+BATCH_SIZE = 50
+
+
+class FakeMonitor:
+    """채팅 토큰만 발급하는 가짜 모니터"""
+
+    async def get_chat_access_token(self, chat_channel_id: str) -> str:
+        return f"token-{chat_channel_id}"
+
+
+class LocalChatServer:
+    """치지직 채팅 서버 흉내 (접속 후 메시지 묶음을 빠르게 전송)"""
+
+    def __init__(self, base_ms: int):
+        self.base_ms = base_ms
+        self.port = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        key = next(line.split(":", 1)[1].strip() for line in request.split("\r\n")
+                   if line.lower().startswith("sec-websocket-key"))
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {websocket.accept_key(key)}\r\n\r\n"
+        ).encode("latin-1"))
+
+        _, _, payload = await websocket.read_frame(reader)
+        connect = json.loads(payload)
+        cid = connect["cid"]
+        assert connect["bdy"]["accTkn"] == f"token-{cid}"
+
+        self._send(writer, {"ver": "2", "cmd": 10100, "bdy": {}})
+        self._send(writer, {"ver": "2", "cmd": 0})
+
+        for start in range(0, MESSAGES_PER_CHANNEL, BATCH_SIZE):
+            body = [{
+                "uid": f"user{i % 100}",
+                "msg": f"{cid} 메시지 {i}",
+                "msgTime": self.base_ms + i * 10,
+                "profile": json.dumps({"nickname": f"시청자{i % 100}"}),
+            } for i in range(start, start + BATCH_SIZE)]
+            self._send(writer, {"ver": "2", "cmd": 93101, "bdy": body})
+            await writer.drain()
+
+        try:
+            while True:
+                _, opcode, _ = await websocket.read_frame(reader)
+                if opcode == websocket.OP_CLOSE:
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, message: dict):
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        writer.write(websocket.encode_frame(websocket.OP_TEXT, data, mask=False))
+
+
+class BrokenChatServer(LocalChatServer):
+    """접속할 때마다 JSON이 아닌 메시지를 보내는 서버 (클라이언트가 연결을 닫았는지 기록)"""
+
+    def __init__(self):
+        super().__init__(0)
+        self.connections = 0
+        self.closed = 0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        key = next(line.split(":", 1)[1].strip() for line in request.split("\r\n")
+                   if line.lower().startswith("sec-websocket-key"))
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {websocket.accept_key(key)}\r\n\r\n"
+        ).encode("latin-1"))
+        await websocket.read_frame(reader)
+        writer.write(websocket.encode_frame(websocket.OP_TEXT, b"not json", mask=False))
+
+        try:
+            while True:
+                _, opcode, _ = await websocket.read_frame(reader)
+                if opcode == websocket.OP_CLOSE:
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        self.closed += 1
+        writer.close()
+
+
+async def test_session_error_closes_connection():
+    """세션이 오류로 끝나면 재접속 전에 연결을 닫음"""
+    logger.info("=== 채팅 세션 오류 연결 정리 테스트 ===")
+
+    server = BrokenChatServer()
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = ChatRecorder(FakeMonitor(), server_url=f"ws://127.0.0.1:{server.port}/chat")
+        stream_info = StreamInfo(channel_id="ch", status=LiveStatus.ONLINE, chat_channel_id="chat")
+        await recorder.start(stream_info, Path(tmp) / "video.mp4", datetime.now())
+        # 재접속 간격 1초, 2초 → 접속 2회 이상
+        await asyncio.sleep(1.5)
+        connections, closed = server.connections, server.closed
+        await recorder.stop()
+        await server.stop()
+
+    logger.info(f"접속 {connections}회, 닫힌 연결 {closed}개")
+    assert connections >= 2 and closed == connections, (connections, closed)
+    logger.info("✅ 오류로 끝난 세션의 연결을 모두 닫음")
+
+
+async def test_size_flush_awaited_on_stop():
+    """flush_size를 넘어 시작한 기록을 stop()이 기다림"""
+    logger.info("=== 채팅 버퍼 기록 대기 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started_at = datetime.now()
+        # 접속할 수 없는 서버 (메시지는 직접 넣음)
+        recorder = ChatRecorder(FakeMonitor(), flush_interval=60, flush_size=500,
+                                server_url="ws://127.0.0.1:9/chat")
+        stream_info = StreamInfo(channel_id="ch", status=LiveStatus.ONLINE, chat_channel_id="chat")
+        await recorder.start(stream_info, Path(tmp) / "video.mp4", started_at)
+
+        base_ms = int(started_at.timestamp() * 1000)
+        recorder._handle_messages("chat", [{"uid": "u", "msg": f"메시지 {i}", "msgTime": base_ms + i}
+                                           for i in range(1200)])
+        flush_task = recorder._flush_task
+        assert flush_task and not flush_task.done(), "버퍼 기록 태스크를 보관하지 않음"
+
+        info = await recorder.stop()
+        assert flush_task.done() and recorder._flush_task is None
+        with gzip.open(info.file_path, "rt", encoding="utf-8") as f:
+            assert sum(1 for _ in f) == 1200
+        assert info.message_count == 1200
+
+    logger.info("✅ 버퍼 기록 완료 후 중지")
+
+
+async def test_many_channels_one_loop():
+    """여러 채널의 채팅을 하나의 이벤트 루프에서 동시에 녹화"""
+    logger.info("=== 다중 채널 채팅 녹화 테스트 ===")
+
+    started_at = datetime.now()
+    server = LocalChatServer(int(started_at.timestamp() * 1000))
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorders = []
+        for n in range(CHANNEL_COUNT):
+            recorder = ChatRecorder(FakeMonitor(), flush_interval=0.2,
+                                    server_url=f"ws://127.0.0.1:{server.port}/chat")
+            stream_info = StreamInfo(channel_id=f"ch{n}", status=LiveStatus.ONLINE,
+                                     chat_channel_id=f"chat{n}")
+            await recorder.start(stream_info, Path(tmp) / f"video{n}.mp4", started_at)
+            recorders.append(recorder)
+
+        begin = time.perf_counter()
+        total = CHANNEL_COUNT * MESSAGES_PER_CHANNEL
+        while True:
+            await asyncio.sleep(0.1)
+            received = sum(r._writer.message_count + r._writer.pending_count for r in recorders)
+            if received >= total or time.perf_counter() - begin > 30:
+                break
+        elapsed = time.perf_counter() - begin
+
+        infos = [await r.stop() for r in recorders]
+        await server.stop()
+
+        logger.info(f"수신: {received}/{total}개, {elapsed:.2f}초 ({received / elapsed:,.0f} msg/s)")
+        assert received == total, "일부 메시지가 유실되었습니다"
+
+        info = infos[0]
+        with gzip.open(info.file_path, "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == MESSAGES_PER_CHANNEL
+        assert records[10]["t"] == 100, "영상 시간축 오프셋이 맞지 않습니다"
+        assert records[0]["n"] == "시청자0"
+
+        index = [line.split("\t") for line in info.index_path.read_text().splitlines()]
+        assert sum(int(count) for _, _, count in index) == MESSAGES_PER_CHANNEL
+
+        # 인덱스의 마지막 멤버만 읽어서 해당 구간 채팅 확인
+        offset_ms, position, count = index[-1]
+        with open(info.file_path, "rb") as f:
+            f.seek(int(position))
+            member = gzip.decompress(f.read()).decode("utf-8").splitlines()
+        assert len(member) == int(count)
+        assert json.loads(member[0])["t"] == int(offset_ms)
+
+        size_kb = sum(i.bytes_written for i in infos) / 1024
+        logger.info(f"✅ 저장 완료: 채널 {CHANNEL_COUNT}개, 압축 크기 {size_kb:.1f}KB, "
+                    f"인덱스 멤버 {len(index)}개")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_many_channels_one_loop()
+    await test_session_error_closes_connection()
+    await test_size_flush_awaited_on_stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
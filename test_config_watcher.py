@@ -0,0 +1,82 @@
+"""
+채널 목록 파일 감시 테스트 스크립트
+
+채널 목록 파일을 바꿔 가며 추가/제거/변경 diff가 올바르게 계산되는지,
+잘못된 파일은 무시되고 이전 상태가 유지되는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from src.chzzk_recorder.config_watcher import ConfigWatcher, ChannelsDiff, ChannelsState
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def write_channels(path: Path, data, bump: int):
+    """파일 기록 (mtime이 확실히 바뀌도록 조정)"""
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+async def test_channel_diffs():
+    """추가/제거/변경 diff 계산"""
+    logger.info("=== 채널 목록 diff 테스트 ===")
+
+    applied: list[tuple[ChannelsDiff, ChannelsState]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "channels.json"
+        watcher = ConfigWatcher(path, on_change=lambda d, s: applied.append((d, s)))
+
+        # 파일이 없으면 아무 일도 없음
+        assert await watcher.check() is None
+
+        write_channels(path, {"channels": ["a", {"channel_id": "b", "polling_interval": 30}]}, 1)
+        diff = await watcher.check()
+        assert [c.channel_id for c in diff.added] == ["a", "b"]
+        assert watcher.state.channels["b"].polling_interval == 30
+
+        # 변경 없는 재확인
+        assert await watcher.check() is None
+
+        write_channels(path, {
+            "quality": "720p",
+            "channels": [{"channel_id": "b", "polling_interval": 60}, "c"],
+        }, 2)
+        diff = await watcher.check()
+        assert [c.channel_id for c in diff.added] == ["c"]
+        assert diff.removed == ["a"]
+        assert [c.channel_id for c in diff.changed] == ["b"]
+        assert diff.settings_changed and watcher.state.quality == "720p"
+
+        # 잘못된 값은 적용하지 않고 이전 상태 유지
+        write_channels(path, {"channels": [{"channel_id": "b", "quality": "4k"}]}, 3)
+        assert await watcher.check() is None
+        assert set(watcher.state.channels) == {"b", "c"}
+
+        path.write_text("{ not json", encoding="utf-8")
+        assert await watcher.check() is None
+
+        assert len(applied) == 2
+        logger.info("✅ diff 계산 및 잘못된 파일 무시 확인")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_channel_diffs()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,254 @@
+"""
+녹화 연속성 검사 테스트 스크립트
+
+PROGRAM-DATE-TIME이 있는/없는 미디어 플레이리스트로 세그먼트 건너뜀, 타임스탬프 점프,
+불연속, 중복, 번호 되돌아감을 찾는지 확인하고, mock HLS 서버로 플레이리스트 확인 루프를,
+가짜 FFmpeg(stderr를 대량 출력한 뒤 세그먼트 건너뜀 경고)으로 stderr 드레인과
+끊김 감지 시 다시 연결, 끊김 보고서(.gaps.json) 작성을 검사합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import stat
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus, close_http_pools, http_pool_stats
+from src.chzzk_recorder.recorder import StreamRecorder, RecordingStatus
+from src.chzzk_recorder.recorder.continuity import (
+    ContinuityTracker, PlaylistWatcher, gaps_path, parse_media_playlist, select_variant
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(2025, 1, 1, 20, 0, tzinfo=timezone.utc)
+SEGMENT = 2.0
+
+
+def playlist(first: int, count: int, times: bool = True, skip: tuple[int, float] = None,
+             discontinuity: int = None, uris: dict[int, str] = None, ended: bool = False) -> str:
+    """세그먼트 first..first+count-1 플레이리스트 (skip=(번호, 초): 해당 번호부터 시각을 밀어냄)"""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:6", f"#EXT-X-TARGETDURATION:{SEGMENT:.0f}",
+             f"#EXT-X-MEDIA-SEQUENCE:{first}"]
+    for sequence in range(first, first + count):
+        offset = sequence * SEGMENT
+        if skip and sequence >= skip[0]:
+            offset += skip[1]
+        if sequence == discontinuity:
+            lines.append("#EXT-X-DISCONTINUITY")
+        if times:
+            moment = EPOCH + timedelta(seconds=offset)
+            lines.append(f"#EXT-X-PROGRAM-DATE-TIME:{moment.isoformat(timespec='milliseconds')}")
+        lines.append(f"#EXTINF:{SEGMENT:.3f},")
+        lines.append((uris or {}).get(sequence, f"seg{sequence}.ts"))
+    if ended:
+        lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def kinds(gaps) -> list[str]:
+    return [gap.kind for gap in gaps]
+
+
+def test_tracker():
+    """플레이리스트 연속성 판정"""
+    logger.info("=== 세그먼트 연속성 판정 테스트 ===")
+
+    tracker = ContinuityTracker()
+    # 처음에는 FFmpeg처럼 끝에서 3개부터
+    assert tracker.feed_playlist(parse_media_playlist(playlist(100, 6)), 0) == []
+    assert tracker.segments == 3
+    assert tracker.feed_playlist(parse_media_playlist(playlist(101, 6)), 2) == []
+
+    # 107~108이 빠짐: PROGRAM-DATE-TIME으로 정확히 4초
+    text = playlist(109, 4)
+    gaps = tracker.feed_playlist(parse_media_playlist(text), 4)
+    assert kinds(gaps) == ["skipped"], gaps
+    assert gaps[0].seconds == 4.0 and gaps[0].segments == 2 and not gaps[0].estimated
+
+    # 번호는 이어지는데 시각이 7.5초 뜀
+    gaps = tracker.feed_playlist(parse_media_playlist(playlist(110, 4, skip=(113, 7.5))), 6)
+    assert kinds(gaps) == ["timestamp_jump"] and gaps[0].seconds == 7.5, gaps
+
+    # 불연속과 중복 (이미 받은 세그먼트가 새 번호로)
+    gaps = tracker.feed_playlist(parse_media_playlist(
+        playlist(111, 5, skip=(113, 7.5), discontinuity=114, uris={115: "seg112.ts"})), 8)
+    assert kinds(gaps) == ["discontinuity", "duplicate"], gaps
+    assert tracker.missing_seconds == 11.5
+
+    # 번호가 되돌아감 (송출 재시작)
+    gaps = tracker.feed_playlist(parse_media_playlist(playlist(0, 4)), 10)
+    assert kinds(gaps) == ["reset"], gaps
+
+    # 플레이리스트를 한참 못 받은 뒤의 건너뜀은 녹화 누락으로 세지 않음
+    gaps = tracker.feed_playlist(parse_media_playlist(playlist(40, 4)), 100)
+    assert kinds(gaps) == ["unobserved"], gaps
+    assert tracker.missing_seconds == 11.5
+
+    # PROGRAM-DATE-TIME이 없으면 세그먼트 길이로 추정
+    tracker = ContinuityTracker()
+    tracker.feed_playlist(parse_media_playlist(playlist(0, 4, times=False)), 0)
+    gaps = tracker.feed_playlist(parse_media_playlist(playlist(8, 4, times=False)), 2)
+    assert gaps[0].kind == "skipped" and gaps[0].seconds == 8.0 and gaps[0].estimated
+
+    # FFmpeg이 따라가지 못해 건너뛴 세그먼트
+    gap = tracker.feed_ffmpeg_line("[hls @ 0x55d0] skipping 3 segments ahead, expired from playlists", 5)
+    assert gap.kind == "capture_skip" and gap.seconds == 6.0
+    assert tracker.feed_ffmpeg_line("[hls @ 0x55d0] Opening 'seg9.ts' for reading", 5) is None
+    report = tracker.report("test.mp4")
+    assert report["missing_seconds"] == 14.0 and report["counts"] == {"skipped": 1, "capture_skip": 1}
+    assert report["estimated"]
+    logger.info("✅ 세그먼트 연속성 판정 통과")
+
+
+async def test_watcher():
+    """마스터 플레이리스트 → 미디어 플레이리스트 확인 루프"""
+    logger.info("=== 플레이리스트 확인 루프 테스트 ===")
+
+    master = ("#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\nlow/index.m3u8\n"
+              "#EXT-X-STREAM-INF:BANDWIDTH=6000000,RESOLUTION=1920x1080\nhigh/index.m3u8\n")
+    assert select_variant(master, "https://cdn.example/live/master.m3u8") == \
+        "https://cdn.example/live/high/index.m3u8"
+    assert select_variant(playlist(0, 3), "https://cdn.example/live/index.m3u8") is None
+
+    fetches: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetches.append(request.url.path)
+        if request.url.path.endswith("master.m3u8"):
+            return httpx.Response(200, text=master)
+        media = sum(1 for path in fetches if path.endswith("high/index.m3u8"))
+        # 세 번째에 세그먼트 2개(8, 9)가 빠지고, 다섯 번째에 방송 종료
+        first = media * 2 + (4 if media >= 3 else 0)
+        return httpx.Response(200, text=playlist(first, 4, ended=media >= 5))
+
+    found = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    tracker = ContinuityTracker()
+    watcher = PlaylistWatcher("https://cdn.example/live/master.m3u8", tracker, time.monotonic(),
+                              on_gaps=found.extend, client=client)
+    # target duration(2초)마다 받지 않고 빨리 진행하도록
+    original_sleep = asyncio.sleep
+    asyncio.sleep = lambda delay: original_sleep(0)
+    try:
+        await asyncio.wait_for(watcher.run(lambda: True), 5)
+    finally:
+        asyncio.sleep = original_sleep
+    await client.aclose()
+
+    logger.info(f"  요청 {len(fetches)}개, 문제 {[(g.kind, g.seconds) for g in found]}")
+    assert fetches[0].endswith("master.m3u8") and fetches.count("/live/master.m3u8") == 1
+    assert kinds(found) == ["skipped"] and found[0].seconds == 4.0 and found[0].segments == 2
+    logger.info("✅ 플레이리스트 확인 루프 통과")
+
+
+async def test_watcher_variant_loop():
+    """변형 플레이리스트가 다시 마스터여도 쉬지 않고 돌지 않음"""
+    logger.info("=== 변형 플레이리스트 반복 테스트 ===")
+
+    master = "#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=6000000\nhigh/index.m3u8\n"
+    fetches: list[str] = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: fetches.append(request.url.path) or httpx.Response(200, text=master)))
+    watcher = PlaylistWatcher("https://cdn.example/live/master.m3u8", ContinuityTracker(),
+                              time.monotonic(), client=client)
+
+    sleeps = []
+    original_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await original_sleep(0)
+
+    asyncio.sleep = fake_sleep
+    try:
+        await asyncio.wait_for(watcher.run(lambda: len(fetches) < 6), 5)
+    finally:
+        asyncio.sleep = original_sleep
+    await client.aclose()
+
+    logger.info(f"  요청 {fetches}, 대기 {len(sleeps)}회, 실패 {watcher.failures}회")
+    # 변형은 한 번만 따라가고, 이후 요청마다 쉬었다가 다시 받음
+    assert fetches[0] == "/live/master.m3u8" and set(fetches[1:]) == {"/live/high/index.m3u8"}
+    assert len(sleeps) == len(fetches) - 1 and watcher.failures == len(fetches) - 1
+    logger.info("✅ 변형 플레이리스트 반복 통과")
+
+
+FAKE_FFMPEG = """#!{python}
+import signal, sys, time
+# 진행 로그를 대량 출력 (읽지 않으면 파이프가 가득 차서 여기서 멈춤)
+for n in range(20000):
+    sys.stderr.write(f"[hls @ 0x1] Opening 'seg{{n}}.ts' for reading\\n")
+sys.stderr.flush()
+signal.signal(signal.SIGTERM, lambda *_: sys.exit(255))
+with open(sys.argv[-1], "ab") as f:
+    for n in range(100):
+        f.write(b"x" * 65536)
+        f.flush()
+        if n == 20:
+            sys.stderr.write("[hls @ 0x1] skipping 8 segments ahead, expired from playlists\\n")
+            sys.stderr.flush()
+        time.sleep(0.1)
+"""
+
+
+async def test_recorder_reconnect():
+    """stderr 드레인 + 끊김 감지 시 다시 연결 + 끊김 보고서"""
+    logger.info("=== 끊김 감지 다시 연결 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ffmpeg = Path(tmp) / "fake-ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+        ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+        recorder = StreamRecorder(Path(tmp) / "recordings", ffmpeg_path=str(ffmpeg),
+                                  write_manifest=False, reconnect_gap_seconds=10)
+        errors = []
+        recorder.set_callbacks(on_error=lambda info, error: errors.append(error))
+        # 플레이리스트는 받을 수 없는 주소 (FFmpeg 로그의 건너뜀 경고만으로 판정)
+        stream = StreamInfo("abc", LiveStatus.ONLINE, title="테스트", hls_url="http://127.0.0.1:9/index.m3u8")
+
+        info = await recorder.start_recording(stream, "continuity.mp4")
+        assert info.status == RecordingStatus.RECORDING
+        started = time.monotonic()
+        while not errors and time.monotonic() - started < 15:
+            await asyncio.sleep(0.2)
+
+        logger.info(f"  오류 콜백: {errors}, 파일 {info.file_size / 1024:.0f}KB")
+        assert errors and "다시 연결" in str(errors[0])
+        assert info.status == RecordingStatus.ERROR and info.missing_seconds == 16.0
+        assert info.file_path.exists() and info.file_path.stat().st_size > 1024 * 1024
+
+        report = json.loads(gaps_path(info.file_path).read_text(encoding="utf-8"))
+        logger.info(f"  끊김 보고서: {report['counts']}, 빠진 시간 {report['missing_seconds']}초")
+        assert report["file"] == info.file_path.name and report["counts"] == {"capture_skip": 1}
+        # 플레이리스트 확인은 녹화별 클라이언트가 아니라 공유 풀로
+        assert any(stats["requests"] for stats in http_pool_stats())
+        await close_http_pools()
+    logger.info("✅ 끊김 감지 다시 연결 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_tracker()
+    await test_watcher()
+    await test_watcher_variant_loop()
+    if os.name == "posix":
+        await test_recorder_reconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+웹 대시보드 테스트 스크립트
+
+가짜 채널 상태 300개로 대시보드를 띄우고 여러 SSE 클라이언트를 연결해,
+처음에는 전체 스냅샷을, 이후에는 바뀐 필드만 받는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from src.chzzk_recorder.web import DashboardServer
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+CHANNEL_COUNT = 300
+CLIENT_COUNT = 20
+
+
+def make_summaries() -> list[dict]:
+    """get_status_summary() 형태의 가짜 상태"""
+    return [{
+        "channel_id": f"ch{n:03d}",
+        "is_running": True,
+        "stream_status": "offline",
+        "stream_info": None,
+        "recording_info": None,
+    } for n in range(CHANNEL_COUNT)]
+
+
+async def read_events(client: httpx.AsyncClient, url: str, count: int) -> list[tuple[str, dict]]:
+    """SSE 이벤트 count개 수신"""
+    events = []
+    async with client.stream("GET", url) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[6:])))
+                if len(events) >= count:
+                    break
+    return events
+
+
+async def test_sse_deltas():
+    """스냅샷 이후 변경분만 전송"""
+    logger.info("=== 대시보드 SSE 델타 테스트 ===")
+
+    summaries = make_summaries()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ["20250101_LoL_솔랭.mp4", "20250102_Valorant_랭크.mp4", "notes.txt"]:
+            (Path(tmp) / name).write_bytes(b"x" * 10)
+
+        dashboard = DashboardServer(lambda: summaries, Path(tmp), host="127.0.0.1", port=0,
+                                    update_interval=0.1)
+        await dashboard.start()
+        base_url = f"http://127.0.0.1:{dashboard.port}"
+
+        async with httpx.AsyncClient(timeout=10) as client:
+            readers = [asyncio.create_task(read_events(client, f"{base_url}/events", 2))
+                       for _ in range(CLIENT_COUNT)]
+            while dashboard.hub.subscriber_count < CLIENT_COUNT:
+                await asyncio.sleep(0.05)
+
+            # 채널 하나가 방송 시작 + 녹화 시작
+            summaries[7] = dict(summaries[7], stream_status="online", stream_info={
+                "title": "솔랭", "category": "LoL", "streamer_name": "테스트",
+                "viewer_count": 100, "thumbnail_url": "https://img/{type}.jpg",
+            }, recording_info={"status": "recording", "file_size": 1_000_000, "file_name": "a.mp4"})
+
+            results = await asyncio.wait_for(asyncio.gather(*readers), timeout=10)
+
+            for events in results:
+                (kind1, snapshot), (kind2, delta) = events
+                assert kind1 == "snapshot" and len(snapshot) == CHANNEL_COUNT
+                assert kind2 == "delta" and list(delta) == ["ch007"]
+                assert delta["ch007"]["thumbnail_url"] == "https://img/480.jpg"
+                assert "channel_id" not in delta["ch007"], "바뀌지 않은 필드가 포함되었습니다"
+
+            snapshot_size = len(json.dumps(results[0][0][1], ensure_ascii=False))
+            delta_size = len(json.dumps(results[0][1][1], ensure_ascii=False))
+            logger.info(f"클라이언트 {CLIENT_COUNT}개: 스냅샷 {snapshot_size:,}B → 델타 {delta_size:,}B")
+
+            # 상태 계산 비용
+            begin = time.perf_counter()
+            for _ in range(100):
+                dashboard.hub._refresh()
+            per_tick_ms = (time.perf_counter() - begin) * 10
+            logger.info(f"채널 {CHANNEL_COUNT}개 상태 비교: {per_tick_ms:.2f}ms/회")
+
+            response = await client.get(f"{base_url}/api/recordings", params={"q": "lol"})
+            assert [r["name"] for r in response.json()] == ["20250101_LoL_솔랭.mp4"]
+
+            response = await client.get(f"{base_url}/")
+            assert "EventSource" in response.text
+
+        await dashboard.close()
+        logger.info("✅ SSE 스냅샷/델타 및 녹화 목록 검색 확인")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_sse_deltas()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
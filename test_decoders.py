@@ -0,0 +1,168 @@
+"""
+API 응답 디코더 테스트 스크립트
+
+live-status/live-detail 응답 모양의 본문으로 디코더별 결과가 같은지,
+LiveMonitor가 선택한 디코더로 StreamInfo를 만드는지 확인하고
+디코더별 디코딩 시간을 비교합니다 (설치되지 않은 라이브러리는 건너뜀).
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from src.chzzk_recorder.monitor import LiveMonitor, LiveStatus
+from src.chzzk_recorder.monitor.decoders import (
+    JsonDecoder, available_decoders, get_decoder, LiveDetailPayload
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+HLS_URL = "https://livecloud.pstatic.net/chzzk/lip2_kr/cflexnmss2u0007/abcdef/hls_playlist.m3u8?hdnts=st=1"
+
+
+def encoding_tracks() -> list[dict]:
+    return [
+        {"encodingTrackId": quality, "videoProfile": "high", "audioProfile": "LC", "videoCodec": "H264",
+         "videoBitRate": bitrate, "audioBitRate": 192000, "videoFrameRate": "60.0", "videoWidth": width,
+         "videoHeight": height, "audioSamplingRate": 48000, "audioChannel": 2, "avoidReencoding": False}
+        for quality, bitrate, width, height in [
+            ("1080p", 8000000, 1920, 1080), ("720p", 5000000, 1280, 720),
+            ("480p", 1200000, 852, 480), ("360p", 500000, 640, 360)]
+    ]
+
+
+def live_status_body(status: str = "OPEN") -> bytes:
+    """live-status 응답 본문"""
+    return json.dumps({"code": 200, "message": None, "content": {
+        "liveTitle": "테스트 방송", "status": status, "concurrentUserCount": 1234, "accumulateCount": 56789,
+        "paidPromotion": False, "adult": False, "krOnlyViewing": False, "openDate": "2024-05-01 20:00:01",
+        "closeDate": None, "clipActive": True, "chatChannelId": "N1abcd", "tags": ["게임", "소통"],
+        "categoryType": "GAME", "liveCategory": "League_of_Legends", "liveCategoryValue": "리그 오브 레전드",
+        "livePollingStatusJson": json.dumps({"status": "STARTED", "isPublishing": True, "playableStatus": "PLAYABLE",
+                                             "trafficThrottling": -1, "callPeriodMilliSecond": 10000}),
+        "faultStatus": None, "userAdultStatus": None, "chatActive": True, "chatAvailableGroup": "ALL",
+    }}, ensure_ascii=False).encode()
+
+
+def live_detail_body() -> bytes:
+    """live-detail 응답 본문 (livePlaybackJson은 문자열)"""
+    playback = {
+        "meta": {"videoId": "ABCDEF", "streamSeq": 123456, "liveId": "7890", "paidLive": False,
+                 "cdnInfo": {"cdnType": "GCDN", "zeroRating": False}, "p2p": False},
+        "live": {"start": "2024-05-01T20:00:00.000", "open": "2024-05-01T20:00:01.000", "status": "STARTED"},
+        "media": [{"mediaId": "HLS", "protocol": "HLS", "path": HLS_URL, "encodingTrack": encoding_tracks()},
+                  {"mediaId": "LLHLS", "protocol": "HLS", "path": HLS_URL.replace("hls_", "ll_"),
+                   "encodingTrack": encoding_tracks()}],
+        "thumbnail": {"snapshotThumbnailTemplate": "https://livecloud-thumb.akamaized.net/{type}.jpg"},
+    }
+    return json.dumps({"code": 200, "message": None, "content": {
+        "liveId": 7890, "liveTitle": " 테스트 방송 ", "status": "OPEN", "liveImageUrl": "https://image/{type}.jpg",
+        "defaultThumbnailImageUrl": None, "concurrentUserCount": 1234, "accumulateCount": 56789,
+        "openDate": "2024-05-01T20:00:01Z", "closeDate": None, "adult": False, "chatChannelId": "N1abcd",
+        "categoryType": "GAME", "liveCategory": "League_of_Legends", "categoryValue": "리그 오브 레전드",
+        "tags": ["게임", "소통"], "chatActive": True, "chatAvailableGroup": "ALL", "paidPromotion": False,
+        "channel": {"channelId": "abc123", "channelName": "테스트 채널", "channelImageUrl": "https://image",
+                    "verifiedMark": True},
+        "livePollingStatusJson": json.dumps({"status": "STARTED", "isPublishing": True}),
+        "livePlaybackJson": json.dumps(playback),
+        "userAdultStatus": None, "p2pQuality": ["720p", "480p"],
+    }}, ensure_ascii=False).encode()
+
+
+def test_decoders_agree():
+    """디코더별 결과 비교, 없는 라이브러리 대체"""
+    logger.info(f"=== 디코더 결과 비교 (사용 가능: {available_decoders()}) ===")
+
+    detail = live_detail_body()
+    expected = JsonDecoder().live_detail(detail)
+    assert expected.channel_name == "테스트 채널" and expected.concurrent_user_count == 1234
+    for name in available_decoders():
+        decoder = get_decoder(name)
+        assert decoder.live_detail(detail) == expected, name
+        assert decoder.live_status(live_status_body()).status == "OPEN"
+        assert decoder.live_status(b'{"code":200,"content":null}') is None
+        assert decoder.live_detail(b'{"code":200,"content":null}') is None
+        # 필드 타입이 예상과 달라도 디코딩
+        odd = decoder.live_detail(json.dumps({"content": {"liveTitle": 1, "channel": "x"}}).encode())
+        assert isinstance(odd, LiveDetailPayload) and odd.channel_name is None
+        try:
+            decoder.live_status(b"{broken")
+            raise AssertionError("깨진 본문이 디코딩됨")
+        except ValueError:
+            pass
+
+    assert get_decoder("auto").name == available_decoders()[0]
+    try:
+        get_decoder("yaml")
+        raise AssertionError("알 수 없는 디코더가 생성됨")
+    except ValueError:
+        pass
+    logger.info("✅ 디코더 결과 동일")
+
+
+async def test_live_monitor():
+    """LiveMonitor가 디코더로 StreamInfo 생성"""
+    logger.info("=== LiveMonitor 디코딩 테스트 ===")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("live-status"):
+            return httpx.Response(200, content=live_status_body())
+        return httpx.Response(200, content=live_detail_body())
+
+    for name in available_decoders():
+        monitor = LiveMonitor("abc123", "aut", "ses", decoder=name)
+        await monitor._client.aclose()
+        monitor._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        info = await monitor.check_live_status()
+        await monitor.close()
+        assert info.status == LiveStatus.ONLINE and info.hls_url == HLS_URL
+        assert info.title == "테스트 방송" and info.streamer_name == "테스트 채널"
+        assert info.category == "리그 오브 레전드" and info.viewer_count == 1234
+        assert info.chat_channel_id == "N1abcd" and info.started_at.year == 2024
+    logger.info("✅ 디코더별 StreamInfo 동일")
+
+
+def bench(decoder, body: bytes, detail: bool, repeat: int = 5000) -> float:
+    decode = decoder.live_detail if detail else decoder.live_status
+    started = time.perf_counter()
+    for _ in range(repeat):
+        payload = decode(body)
+        if detail:
+            decoder.loads(payload.live_playback_json)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def test_benchmark():
+    """디코더별 폴링 1회 디코딩 시간"""
+    logger.info("=== 디코딩 시간 비교 ===")
+
+    status, detail = live_status_body(), live_detail_body()
+    baseline = None
+    for name in reversed(available_decoders()):
+        decoder = get_decoder(name)
+        status_us = bench(decoder, status, detail=False)
+        detail_us = bench(decoder, detail, detail=True)
+        baseline = baseline or detail_us
+        logger.info(f"  {name:8s} live-status {status_us:5.1f}us, live-detail+playback {detail_us:5.1f}us "
+                    f"(json 대비 {baseline / detail_us:.1f}배)")
+    logger.info("✅ 디코딩 시간 비교 완료")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_decoders_agree()
+    await test_live_monitor()
+    test_benchmark()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+런타임 진단 테스트 스크립트
+
+이벤트 루프를 막는 동기 콜백을 실행해 지연이 측정되고 멈춘 위치의 스택이
+잡히는지, 대시보드 진단 API로 folded 형식 프로파일을 받을 수 있는지 확인합니다.
+"""
+
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from src.chzzk_recorder.diagnostics import LoopMonitor
+from src.chzzk_recorder.web import DashboardServer
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def blocking_status_callback():
+    """루프를 막는 동기 콜백 (Popen.wait, subprocess.run 등을 흉내)"""
+    time.sleep(0.5)
+
+
+def checksum(n: int) -> int:
+    """CPU를 쓰는 작업"""
+    return sum(i * i for i in range(n))
+
+
+async def busy_worker(stop: asyncio.Event):
+    """루프에서 계산을 반복하는 태스크"""
+    while not stop.is_set():
+        checksum(20000)
+        await asyncio.sleep(0)
+
+
+async def test_stall_capture():
+    """루프 멈춤 감지 + 스택 기록"""
+    logger.info("=== 이벤트 루프 멈춤 감지 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stall_log = Path(tmp) / "stalls.folded"
+        monitor = LoopMonitor(interval=0.05, lag_threshold=0.05, stall_threshold=0.2, stall_log_path=stall_log)
+        monitor.start()
+        await asyncio.sleep(0.3)
+
+        asyncio.get_running_loop().call_soon(blocking_status_callback)
+        await asyncio.sleep(0.3)
+        await monitor.close()
+
+        snapshot = monitor.snapshot()
+        assert snapshot["lag"]["max_ms"] >= 400, snapshot["lag"]
+        assert snapshot["lag"]["p50_ms"] < 50
+        stall = snapshot["stalls"][0]
+        assert stall["ended"] and stall["duration_ms"] >= 400
+        assert "blocking_status_callback" in stall["stack"][-1], stall["stack"]
+
+        line = stall_log.read_text(encoding="utf-8").strip()
+        assert "blocking_status_callback" in line and line.rsplit(" ", 1)[1].isdigit()
+
+    logger.info(f"✅ {stall['duration_ms']:.0f}ms 멈춤, 위치: {stall['stack'][-1]}")
+
+
+async def test_profile_api():
+    """진단 API로 샘플링 프로파일 받기"""
+    logger.info("=== 프로파일 API 테스트 ===")
+
+    monitor = LoopMonitor(interval=0.05)
+    monitor.start()
+    stop = asyncio.Event()
+    worker = asyncio.create_task(busy_worker(stop))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dashboard = DashboardServer(lambda: [], Path(tmp), host="127.0.0.1", port=0, loop_monitor=monitor,
+                                    max_profile_seconds=5)
+        await dashboard.start()
+        base_url = f"http://127.0.0.1:{dashboard.port}"
+
+        async with httpx.AsyncClient(timeout=10) as client:
+            profile, busy = await asyncio.gather(
+                client.get(f"{base_url}/api/debug/profile", params={"seconds": 1}),
+                client.get(f"{base_url}/api/debug/profile", params={"seconds": 1}),
+            )
+            if profile.status_code != 200:
+                profile, busy = busy, profile
+            assert profile.status_code == 200 and busy.status_code == 409
+
+            loop_status = (await client.get(f"{base_url}/api/debug/loop")).json()
+            bad = await client.get(f"{base_url}/api/debug/profile", params={"seconds": 100})
+            assert bad.status_code == 400
+
+        stop.set()
+        await worker
+        await dashboard.close()
+    await monitor.close()
+
+    lines = profile.text.splitlines()
+    samples = int(profile.headers["X-Profile-Samples"])
+    hot = sum(int(line.rsplit(" ", 1)[1]) for line in lines if "checksum" in line)
+    assert all(line.startswith("MainThread;") for line in lines)
+    assert hot / samples > 0.5, f"checksum 비율: {hot}/{samples}"
+    assert loop_status["lag"]["samples"] > 0
+
+    logger.info(f"✅ 샘플 {samples}개 중 checksum {hot / samples:.0%}, 동시 요청은 409")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_stall_capture()
+    await test_profile_api()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,246 @@
+"""
+FFmpeg 기능 확인 테스트 스크립트
+
+실행 횟수를 기록하는 가짜 FFmpeg으로, 녹화기 여러 개가 동시에 시작해도 기능 확인이
+한 번만 실행되는지, 재시작 시 파일 캐시를 쓰는지, 실행 파일이 바뀌면 다시 확인하는지,
+확인 중에도 이벤트 루프가 멈추지 않는지, 확인한 기능으로 출력 방식을 고르고 필요한
+기능이 없으면 시작하지 않는지 검사합니다. 매번 `-version`을 실행하던 방식과 시작
+시간도 비교합니다.
+"""
+
+import asyncio
+import logging
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder, AutoRecorderError
+from src.chzzk_recorder.recorder import ffmpeg_probe
+from src.chzzk_recorder.recorder.ffmpeg_probe import (
+    get_ffmpeg_capabilities, parse_bsfs, parse_formats, parse_protocols, probe_ffmpeg
+)
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+MUXERS = """File formats:
+ D. = Demuxing supported
+ .E = Muxing supported
+ --
+  E 3g2             3GP2 (3GPP file format)
+  E hls             Apple HTTP Live Streaming
+  E ipod            iPod H.264 MP4 (MPEG-4 Part 14)
+  E matroska        Matroska
+  E mp4             MP4 (MPEG-4 Part 14)
+  E mpegts          MPEG-TS (MPEG-2 Transport Stream)
+"""
+
+BSFS = """Bitstream filters:
+aac_adtstoasc
+h264_mp4toannexb
+null
+"""
+
+PROTOCOLS = """Supported file protocols:
+Input:
+  file
+  hls
+  http
+  https
+  pipe
+  tcp
+  tls
+Output:
+  file
+  http
+  {pipe}
+  tcp
+"""
+
+# 실행할 때마다 counter 파일에 인자를 한 줄씩 기록 (확인 한 번에 0.2초)
+FAKE_FFMPEG = """#!{python}
+import sys, time
+with open({counter!r}, "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\\n")
+time.sleep(0.2)
+outputs = {outputs!r}
+print(outputs.get(sys.argv[-1], ""))
+"""
+
+
+def write_fake_ffmpeg(path: Path, counter: Path, pipe: bool = True, bsfs: str = BSFS):
+    outputs = {
+        "-version": "ffmpeg version 6.1-fake Copyright (c) 2000-2023 the FFmpeg developers",
+        "-muxers": MUXERS,
+        "-bsfs": bsfs,
+        "-protocols": PROTOCOLS.format(pipe="pipe" if pipe else ""),
+    }
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable, counter=str(counter), outputs=outputs),
+                    encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+
+def runs(counter: Path) -> int:
+    return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+
+def test_parsers():
+    """-muxers, -bsfs, -protocols 출력 해석"""
+    logger.info("=== 출력 해석 테스트 ===")
+    muxers = parse_formats(MUXERS)
+    assert {"mp4", "matroska", "mpegts", "hls"} <= muxers and "File" not in muxers and "D." not in muxers
+    assert parse_formats(" DE mov,mp4,m4a,3gp  QuickTime / MOV\n") is None  # "--" 없음
+    assert parse_formats(" --\n DE mov,mp4,m4a  QuickTime / MOV\n") == {"mov", "mp4", "m4a"}
+    assert parse_bsfs(BSFS) == {"aac_adtstoasc", "h264_mp4toannexb", "null"}
+    assert parse_bsfs("ffmpeg version fake") is None
+    inputs, outputs = parse_protocols(PROTOCOLS.format(pipe="pipe"))
+    assert "https" in inputs and "pipe" in outputs and "https" not in outputs
+    assert parse_protocols("") == (None, None)
+    logger.info("✅ 출력 해석 통과")
+
+
+async def test_probe_once(directory: Path):
+    """동시 요청 한 번 실행, 파일 캐시, 실행 파일 변경 시 다시 확인"""
+    logger.info("=== 한 번만 확인 테스트 ===")
+    ffmpeg = directory / "ffmpeg"
+    counter = directory / "runs.txt"
+    cache = directory / "ffmpeg_capabilities.json"
+    write_fake_ffmpeg(ffmpeg, counter)
+
+    # 확인하는 동안 이벤트 루프가 계속 도는지
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    started = time.monotonic()
+    results = await asyncio.gather(*(get_ffmpeg_capabilities(str(ffmpeg), cache) for _ in range(50)))
+    elapsed = time.monotonic() - started
+    ticking.cancel()
+    assert len({id(result) for result in results}) == 1, "동시 요청이 결과를 공유하지 않음"
+    assert runs(counter) == 4, counter.read_text()
+    assert ticks >= elapsed / 0.01 * 0.5, f"확인 중 이벤트 루프가 멈춤 (틱 {ticks}회/{elapsed:.2f}초)"
+    capabilities = results[0]
+    assert capabilities.version.startswith("ffmpeg version 6.1-fake")
+    assert capabilities.missing() == [] and capabilities.output_mode("auto") == "direct"
+    logger.info(f"  녹화기 50개 동시 시작: FFmpeg 실행 {runs(counter)}회, {elapsed:.2f}초, 루프 틱 {ticks}회")
+
+    # 재시작 (메모리 캐시 없음) → 파일 캐시 사용
+    ffmpeg_probe._probed.clear()
+    assert probe_ffmpeg(str(ffmpeg), cache) == capabilities
+    assert runs(counter) == 4
+    logger.info("  재시작: 파일 캐시 사용, FFmpeg 실행 0회")
+
+    # 실행 파일 교체 (크기/수정 시각 변경) → 다시 확인
+    write_fake_ffmpeg(ffmpeg, counter, pipe=False)
+    changed = probe_ffmpeg(str(ffmpeg), cache)
+    assert runs(counter) == 8 and changed.output_mode("pipe") == "direct"
+    logger.info("  실행 파일 교체: 다시 확인 (pipe 출력 없음 → direct)")
+
+    # 없는 실행 파일은 캐시하지 않음
+    assert probe_ffmpeg(str(directory / "missing-ffmpeg"), cache) is None
+    logger.info("✅ 한 번만 확인 통과")
+
+
+def test_output_mode():
+    """출력 방식 선택"""
+    logger.info("=== 출력 방식 선택 테스트 ===")
+    both = ffmpeg_probe.FfmpegCapabilities("ffmpeg", "v", output_protocols=frozenset({"file", "pipe"}))
+    file_only = ffmpeg_probe.FfmpegCapabilities("ffmpeg", "v", output_protocols=frozenset({"file"}))
+    pipe_only = ffmpeg_probe.FfmpegCapabilities("ffmpeg", "v", output_protocols=frozenset({"pipe"}))
+    unknown = ffmpeg_probe.FfmpegCapabilities("ffmpeg", "v")
+    # auto는 기존 방식(direct), pipe는 지정한 경우만
+    assert [both.output_mode(m) for m in ("auto", "direct", "pipe")] == ["direct", "direct", "pipe"]
+    assert [file_only.output_mode(m) for m in ("auto", "direct", "pipe")] == ["direct", "direct", "direct"]
+    assert [pipe_only.output_mode(m) for m in ("auto", "direct", "pipe")] == ["pipe", "pipe", "pipe"]
+    # 목록을 얻지 못하면 auto는 기존 기본값(direct), 지정한 방식은 그대로
+    assert [unknown.output_mode(m) for m in ("auto", "direct", "pipe")] == ["direct", "direct", "pipe"]
+    assert unknown.missing() == []
+    logger.info("✅ 출력 방식 선택 통과")
+
+
+async def test_prepare(directory: Path):
+    """녹화기 준비: 출력 방식 결정, 필요한 기능이 없으면 시작하지 않음, 재시작 시간"""
+    logger.info("=== 녹화기 준비 테스트 ===")
+    ffmpeg = directory / "ffmpeg"
+    counter = directory / "runs.txt"
+    write_fake_ffmpeg(ffmpeg, counter)
+
+    config = Config()
+    config.recording.recording_path = directory / "recordings"
+    config.recording.record_chat = False
+    config.system.ffmpeg_path = str(ffmpeg)
+    config.system.ffmpeg_probe_cache = directory / "ffmpeg_capabilities.json"
+    config.prediction.history_path = directory / "golive_history.jsonl"
+    config.logging.file_path = directory / "logs" / "recorder.log"
+
+    async def prepare(mode: str) -> ChzzkAutoRecorder:
+        config.recording.output_mode = mode
+        recorder = ChzzkAutoRecorder("a" * 32, "aut", "ses", config)
+        await recorder.prepare()
+        await recorder.stop()
+        return recorder
+
+    logging.getLogger("src").setLevel(logging.WARNING)
+    assert not (await prepare("auto")).recorder.pipe_output
+    assert not (await prepare("direct")).recorder.pipe_output
+    assert (await prepare("pipe")).recorder.pipe_output
+
+    # 재시작 반복: 기능 확인은 처음 한 번만
+    restarts = 20
+    before = runs(counter)
+    started = time.perf_counter()
+    for _ in range(restarts):
+        await prepare("auto")
+    cached = (time.perf_counter() - started) / restarts
+    assert runs(counter) == before
+
+    # 이전 방식: 시작할 때마다 `ffmpeg -version`
+    started = time.perf_counter()
+    for _ in range(5):
+        subprocess.run([str(ffmpeg), "-version"], capture_output=True, timeout=10)
+    uncached = (time.perf_counter() - started) / 5
+    logging.getLogger("src").setLevel(logging.INFO)
+    logger.info(f"  녹화기 준비 {cached * 1000:.1f}ms/회 (기능 확인 캐시), "
+                f"매번 -version 실행 {uncached * 1000:.1f}ms/회")
+
+    # pipe 출력이 없는 FFmpeg: pipe를 지정해도 direct
+    write_fake_ffmpeg(ffmpeg, counter, pipe=False)
+    assert not (await prepare("pipe")).recorder.pipe_output
+
+    # 필요한 비트스트림 필터가 없으면 시작하지 않음
+    write_fake_ffmpeg(ffmpeg, counter, bsfs="Bitstream filters:\nnull\n")
+    try:
+        await prepare("auto")
+        raise AssertionError("필요한 기능이 없는데 시작됨")
+    except AutoRecorderError as e:
+        assert "aac_adtstoasc" in str(e), e
+        logger.info(f"  {e}")
+    logger.info("✅ 녹화기 준비 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_parsers()
+    test_output_mode()
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_probe_once(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_prepare(Path(tmp))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""
+방송 시작 예측 폴링 테스트 스크립트
+
+규칙적인 스트리머(평일 저녁/주말 오후)와 불규칙한 스트리머의 12주 기록을 만들어
+요일/시간대별 폴링 간격, 요청 수 예산 유지, 기록 재생 평가(예상 감지 지연)를 확인하고
+기록 파일 저장/로드와 저장 중에도 이벤트 루프가 멈추지 않는지 검사합니다.
+"""
+
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.chzzk_recorder.monitor.golive_model import (
+    KST, GoLivePredictor, HazardModel, allocate_intervals, evaluate_history, slot_of
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+BASE_INTERVAL = 180
+WEEKS = 12
+START = datetime(2024, 1, 1, tzinfo=KST)  # 월요일
+
+
+def regular_history(seed: int = 1) -> list[datetime]:
+    """평일 20시 전후, 주말 14시 전후 (가끔 쉼)"""
+    rng = random.Random(seed)
+    starts = []
+    for day in range(WEEKS * 7):
+        date = START + timedelta(days=day)
+        if rng.random() < 0.15:
+            continue
+        hour = 20 if date.weekday() < 5 else 14
+        starts.append(date + timedelta(hours=hour, minutes=rng.gauss(0, 20)))
+    return starts
+
+
+def irregular_history(seed: int = 2) -> list[datetime]:
+    """아무 시각에나 하루 한 번 정도"""
+    rng = random.Random(seed)
+    return [START + timedelta(days=day, hours=rng.uniform(0, 24)) for day in range(WEEKS * 7)
+            if rng.random() < 0.8]
+
+
+def test_allocation():
+    """예산 유지, hazard가 큰 칸일수록 짧은 간격"""
+    logger.info("=== 간격 배분 테스트 ===")
+
+    rates = [0.001] * 168
+    rates[20] = 0.5
+    rates[44] = 0.01
+    budget = 7 * 86400 / BASE_INTERVAL
+    intervals = allocate_intervals(rates, budget, 30, 900)
+    requests = sum(3600 / interval for interval in intervals)
+    logger.info(f"  주당 요청 {requests:.0f} (예산 {budget:.0f}), 간격 {intervals[20]:.0f}s / "
+                f"{intervals[44]:.0f}s / {intervals[0]:.0f}s")
+    assert abs(requests - budget) / budget < 0.01
+    assert intervals[20] < intervals[44] < intervals[0]
+    assert 30 <= min(intervals) and max(intervals) <= 900
+    logger.info("✅ 간격 배분 통과")
+
+
+def test_regular_streamer():
+    """규칙적인 스트리머: 방송 시간대는 자주, 새벽은 드물게"""
+    logger.info("=== 규칙적인 스트리머 모델 ===")
+
+    starts = regular_history()
+    now = START + timedelta(weeks=WEEKS)
+    model = HazardModel.fit(starts, now, BASE_INTERVAL)
+
+    tuesday_evening = now + timedelta(days=1, hours=20)
+    tuesday_dawn = now + timedelta(days=1, hours=4)
+    logger.info(f"  화요일 20시 간격 {model.interval_at(tuesday_evening):.0f}s, "
+                f"4시 간격 {model.interval_at(tuesday_dawn):.0f}s, "
+                f"예상 지연 {model.expected_delay():.0f}s (고정 {BASE_INTERVAL / 2:.0f}s), "
+                f"요청/일 {model.requests_per_day():.0f} (고정 {86400 / BASE_INTERVAL:.0f})")
+    assert model.interval_at(tuesday_evening) < BASE_INTERVAL / 3
+    assert model.interval_at(tuesday_dawn) > BASE_INTERVAL * 1.5
+    assert abs(model.requests_per_day() - 86400 / BASE_INTERVAL) < 5
+    assert slot_of(tuesday_evening) == 24 + 20
+    logger.info("✅ 규칙적인 스트리머 통과")
+
+
+def test_replay_evaluation():
+    """기록 재생 평가: 같은 요청 수로 감지 지연 감소"""
+    logger.info("=== 기록 재생 평가 ===")
+
+    for name, starts in (("규칙적", regular_history()), ("불규칙", irregular_history())):
+        result = evaluate_history(name, starts, BASE_INTERVAL, min_events=5)
+        logger.info(f"  {name}: {result.evaluated}건, 감지 지연 {result.baseline_delay:.0f}s → "
+                    f"{result.model_delay:.0f}s, 요청/일 {result.baseline_requests_per_day:.0f} → "
+                    f"{result.model_requests_per_day:.0f}")
+        assert abs(result.model_requests_per_day - result.baseline_requests_per_day) < 5
+        if name == "규칙적":
+            assert result.model_delay < result.baseline_delay / 2
+        else:
+            # 규칙이 없으면 고정 간격보다 크게 나빠지지 않음
+            assert result.model_delay < result.baseline_delay * 1.1
+    logger.info("✅ 기록 재생 평가 통과")
+
+
+async def test_predictor_history():
+    """기록 저장/로드, 중복 제거, 기록 부족 시 기본 간격"""
+    logger.info("=== 방송 시작 기록 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "golive_history.jsonl"
+        predictor = GoLivePredictor(path, min_events=5)
+        starts = regular_history()
+        for start in starts[:4]:
+            await predictor.record("abc", start)
+        await predictor.record("abc", starts[0])
+        # 시간대 없는 시각은 KST로 간주
+        await predictor.record("abc", starts[1].replace(tzinfo=None))
+        assert len(predictor.history["abc"]) == 4
+        assert predictor.interval("abc", BASE_INTERVAL) == BASE_INTERVAL
+
+        for start in starts[4:]:
+            await predictor.record("abc", start)
+        reloaded = GoLivePredictor(path, min_events=5)
+        assert len(reloaded.history["abc"]) == len(starts)
+        now = START + timedelta(weeks=WEEKS, days=1, hours=20)
+        assert reloaded.interval("abc", BASE_INTERVAL, now) < BASE_INTERVAL / 3
+        assert reloaded.interval("xyz", BASE_INTERVAL, now) == BASE_INTERVAL
+    logger.info("✅ 방송 시작 기록 통과")
+
+
+async def test_record_off_loop():
+    """여러 채널 동시 방송 시작: 기록(fsync)하는 동안 이벤트 루프가 계속 돎"""
+    logger.info("=== 방송 시작 기록 비동기 저장 테스트 ===")
+    channels = 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "golive_history.jsonl"
+        predictor = GoLivePredictor(path)
+        started_at = START + timedelta(hours=20)
+
+        longest = 0.0
+        done = False
+
+        async def ticker():
+            nonlocal longest
+            while not done:
+                before = time.perf_counter()
+                await asyncio.sleep(0)
+                longest = max(longest, time.perf_counter() - before)
+
+        ticking = asyncio.create_task(ticker())
+        begin = time.perf_counter()
+        await asyncio.gather(*(predictor.record(f"ch{n}", started_at) for n in range(channels)))
+        elapsed = time.perf_counter() - begin
+        done = True
+        await ticking
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == channels and len(set(lines)) == channels
+        assert len(GoLivePredictor(path).history) == channels
+        logger.info(f"  {channels}개 채널 기록 {elapsed * 1000:.0f}ms, 루프 최대 멈춤 {longest * 1000:.1f}ms")
+    logger.info("✅ 방송 시작 기록 비동기 저장 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_allocation()
+    test_regular_streamer()
+    test_replay_evaluation()
+    await test_predictor_history()
+    await test_record_off_loop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
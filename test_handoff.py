@@ -0,0 +1,219 @@
+"""
+무중단 업그레이드(녹화 넘기기) 테스트 스크립트
+
+가짜 FFmpeg(일련번호를 계속 출력)으로 녹화하다가 녹화기를 떼어 내 다른 녹화기가
+넘겨받았을 때, FFmpeg이 재시작되지 않고 파일에 빠지거나 중복된 바이트 없이 이어지는지
+(pipe/direct 모드), 매니페스트가 파일과 맞는지 확인합니다. 핸드오프 소켓으로
+넘기다가 새 프로세스가 확인 없이 끊으면 이전 녹화기가 다시 맡는지, 확인을 보내면
+이전 쪽이 종료를 요청하는지도 검사합니다.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import stat
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.handoff import HandoffServer, PROTOCOL_VERSION, _recv, _send, take_over
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+from src.chzzk_recorder.recorder import StreamRecorder, RecordingStatus
+from src.chzzk_recorder.recorder.adoption import adoption_supported
+from src.chzzk_recorder.recorder.integrity import IntegrityManifest, manifest_path
+from src.chzzk_recorder.shutdown import ShutdownCoordinator
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+# 0부터 1씩 늘어나는 4바이트 정수를 계속 출력 (SIGTERM을 받으면 정상 종료)
+FAKE_FFMPEG = """#!{python}
+import signal, sys, time
+from array import array
+if sys.argv[-1].startswith("-"):
+    # -version, 기능 확인(-muxers 등)
+    print("ffmpeg version fake")
+    sys.exit(0)
+stopping = []
+signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+out = sys.stdout.buffer if sys.argv[-1] == "pipe:1" else open(sys.argv[-1], "ab")
+n = 0
+while not stopping:
+    out.write(array("I", range(n, n + 1024)).tobytes())
+    out.flush()
+    n += 1024
+    if n % 16384 == 0:
+        sys.stderr.write(f"[hls @ 0x1] Opening 'seg{{n}}.ts' for reading\\n")
+        sys.stderr.flush()
+    time.sleep(0.005)
+out.close()
+"""
+
+
+def write_fake_ffmpeg(directory: Path) -> Path:
+    ffmpeg = directory / "fake-ffmpeg"
+    ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+    return ffmpeg
+
+
+def check_sequence(path: Path) -> int:
+    """파일이 0부터 빠짐/중복 없이 이어지는지 확인 (정수 개수)"""
+    values = array("I", path.read_bytes())
+    assert values == array("I", range(len(values))), f"{path.name}: 일련번호가 끊김"
+    return len(values)
+
+
+def stream_for(name: str) -> StreamInfo:
+    return StreamInfo(f"{name:0>32}", LiveStatus.ONLINE, title=name,
+                      hls_url="http://127.0.0.1:9/index.m3u8")
+
+
+async def test_detach_adopt(directory: Path, ffmpeg: Path, pipe: bool):
+    """녹화기 → 다른 녹화기: FFmpeg 유지, 파일 연속"""
+    mode = "pipe" if pipe else "direct"
+    logger.info(f"=== 녹화 떼어 내기/넘겨받기 테스트 ({mode}) ===")
+
+    options = dict(ffmpeg_path=str(ffmpeg), write_buffer_size=256 * 1024, reconnect_gap_seconds=0)
+    old = StreamRecorder(directory, pipe_output=pipe, **options)
+    info = await old.start_recording(stream_for(mode), f"{mode}.mp4")
+    await asyncio.sleep(0.5)
+
+    detached = await old.detach()
+    assert detached and not old.is_recording() and detached.file_name == f"{mode}.mp4"
+    pid = detached.state["pid"]
+    # 아무도 읽지 않는 사이에도 FFmpeg은 계속 실행 (pipe 모드는 파이프가 차면 대기)
+    await asyncio.sleep(0.5)
+
+    # 넘겨받는 쪽 설정과 관계없이 녹화 중인 모드를 그대로 이어감
+    new = StreamRecorder(directory, pipe_output=not pipe, **options)
+    adopted = await new.adopt(detached)
+    assert detached.fds == [] and adopted.partial_path == info.partial_path
+    assert adopted.status == RecordingStatus.RECORDING and new._ffmpeg_process.pid == pid
+    assert (new._pipe_pump is not None) == pipe
+    await asyncio.sleep(1.0)
+
+    stopped = await new.stop_recording()
+    assert stopped.status == RecordingStatus.STOPPED and not stopped.partial_path
+    count = check_sequence(stopped.file_path)
+    manifest = IntegrityManifest.load(manifest_path(stopped.file_path))
+    assert manifest.size == stopped.file_path.stat().st_size
+    assert manifest.verify(stopped.file_path) == []
+    logger.info(f"  FFmpeg PID {pid} 유지, {count * 4 / 1024:.0f}KB 연속 기록, 매니페스트 일치")
+    logger.info(f"✅ {mode} 모드 넘겨받기 통과")
+
+
+def reject_after_receive(path: Path) -> int:
+    """녹화를 받은 뒤 확인 없이 연결을 끊는 새 프로세스 (받은 녹화 수)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(str(path))
+    _send(sock, {"type": "hello", "version": PROTOCOL_VERSION, "pid": os.getpid()})
+    received = 0
+    while True:
+        message, fds = _recv(sock)
+        for fd in fds:
+            os.close(fd)
+        if message["type"] != "capture":
+            break
+        received += 1
+    sock.close()
+    return received
+
+
+async def test_handoff_socket(directory: Path, ffmpeg: Path):
+    """핸드오프 소켓: 실패 시 이전 녹화기가 다시 맡고, 성공 시 종료 요청"""
+    logger.info("=== 핸드오프 소켓 테스트 ===")
+
+    config = Config()
+    config.recording.recording_path = directory / "recordings"
+    config.recording.record_chat = False
+    config.recording.output_mode = "pipe"
+    config.recording.write_buffer_mb = 1
+    config.recording.track_continuity = False
+    config.system.ffmpeg_path = str(ffmpeg)
+    config.system.ffmpeg_probe_cache = directory / "ffmpeg_capabilities.json"
+    config.prediction.history_path = directory / "golive_history.jsonl"
+
+    names = ["first", "second", "third"]
+    old = [ChzzkAutoRecorder(stream_for(name).channel_id, "aut", "ses", config) for name in names]
+    for recorder, name in zip(old, names):
+        recorder._running = True
+        recorder._current_recording = await recorder.recorder.start_recording(stream_for(name), f"{name}.mp4")
+    pids = [recorder.recorder._ffmpeg_process.pid for recorder in old]
+
+    async def stop_all():
+        await asyncio.gather(*(recorder.stop() for recorder in old))
+
+    shutdown = ShutdownCoordinator(deadline=4.0)
+    shutdown.manage(lambda: old, stop_all)
+    socket_path = directory / "handoff.sock"
+    server = HandoffServer(socket_path, shutdown, timeout=5.0)
+    assert await server.start()
+
+    # 확인 없이 끊기면 이전 녹화기가 계속 녹화
+    assert await asyncio.to_thread(reject_after_receive, socket_path) == len(names)
+    await asyncio.sleep(0.2)
+    assert not shutdown.requested and server.handed_over == 0
+    assert all(recorder.current_recording and recorder.current_recording.is_recording for recorder in old)
+    assert [recorder.recorder._ffmpeg_process.pid for recorder in old] == pids
+    logger.info("  확인 없이 끊김 → 이전 녹화기가 다시 맡음")
+
+    # 새 프로세스가 넘겨받음 (같은 프로세스라 이전 프로세스 종료는 기다리지 않음)
+    started = time.monotonic()
+    recordings = await take_over(socket_path, timeout=5.0, wait_previous=False)
+    assert sorted(r.file_name for r in recordings) == sorted(f"{name}.mp4" for name in names)
+    new = []
+    for recording in recordings:
+        recorder = ChzzkAutoRecorder(recording.channel_id, "aut", "ses", config)
+        recorder.queue_adoption(recording)
+        await recorder.prepare()
+        new.append(recorder)
+    logger.info(f"  넘겨받기 {time.monotonic() - started:.2f}초")
+    # 이전 쪽은 확인을 받은 뒤 종료 요청
+    await asyncio.wait_for(shutdown.wait(), 5)
+    assert server.handed_over == len(names) and not socket_path.exists()
+    assert all(recorder.current_recording is None for recorder in old)
+    assert sorted(r.recorder._ffmpeg_process.pid for r in new) == sorted(pids)
+    assert all(r.current_status == LiveStatus.ONLINE and r.current_recording.is_recording for r in new)
+
+    # 이전 쪽은 녹화 없이 종료
+    report = shutdown.report
+    assert report.clean == [] and report.killed == [] and report.failed == []
+
+    await asyncio.sleep(1.0)
+    await asyncio.gather(*(recorder.stop() for recorder in new))
+    for name in names:
+        path = config.recording.recording_path / f"{name}.mp4"
+        logger.info(f"  {name}.mp4: {check_sequence(path) * 4 / 1024:.0f}KB 연속")
+    leftovers = [p.name for p in config.recording.recording_path.iterdir() if p.name.endswith(".partial")]
+    assert leftovers == [], leftovers
+    await server.close()
+    logger.info("✅ 핸드오프 소켓 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    if not adoption_supported():
+        logger.info("pidfd를 지원하는 Linux에서만 실행합니다")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        ffmpeg = write_fake_ffmpeg(directory)
+        await test_detach_adopt(directory / "pipe", ffmpeg, pipe=True)
+        await test_detach_adopt(directory / "direct", ffmpeg, pipe=False)
+        await test_handoff_socket(directory, ffmpeg)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
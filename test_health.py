@@ -0,0 +1,182 @@
+"""
+헬스체크 테스트 스크립트
+
+가짜 FFmpeg 녹화 하나와 채널 몇 개로 대시보드를 띄우고 /healthz, /readyz가
+녹화기 준비/종료 여부, 채널별 마지막 폴링 성공, 녹화 파일 증가, 이벤트 루프 지연,
+디스크 여유 공간에 따라 200/503으로 응답하는지, docker/healthcheck.py가 HTTP 호출
+한 번으로 같은 결과를 종료 코드로 돌려주는지 확인합니다.
+"""
+
+import asyncio
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.health import HealthMonitor
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+from src.chzzk_recorder.shutdown import ShutdownCoordinator
+from src.chzzk_recorder.web import DashboardServer
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+FAKE_FFMPEG = """#!{python}
+import sys, time
+if sys.argv[-1] == "-version":
+    print("ffmpeg version fake")
+    sys.exit(0)
+output = open(sys.argv[-1], "ab")
+while True:
+    output.write(b"x" * 4096)
+    output.flush()
+    time.sleep(0.1)
+"""
+
+CHANNELS = 3
+
+
+def run_healthcheck(base_url: str, path: str = "/healthz") -> tuple[int, str]:
+    """docker/healthcheck.py 실행 (종료 코드, 출력)"""
+    result = subprocess.run([sys.executable, "docker/healthcheck.py", path], capture_output=True,
+                            text=True, env=dict(os.environ, HEALTHCHECK_URL=base_url), timeout=10)
+    return result.returncode, result.stdout
+
+
+async def expect(client: httpx.AsyncClient, path: str, status: int, failed: list[str] = ()) -> dict:
+    response = await client.get(path)
+    report = response.json()
+    assert response.status_code == status, (path, response.status_code, report)
+    assert report.get("failed_checks", []) == list(failed), (path, report)
+    return report
+
+
+async def test_health_endpoints(directory: Path):
+    """/healthz, /readyz 항목별 판단"""
+    logger.info("=== 헬스체크 엔드포인트 테스트 ===")
+
+    ffmpeg = directory / "fake-ffmpeg"
+    ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+    config = Config()
+    config.recording.recording_path = directory / "recordings"
+    config.recording.record_chat = False
+    config.recording.write_manifest = False
+    config.recording.track_continuity = False
+    config.system.ffmpeg_path = str(ffmpeg)
+    config.prediction.history_path = directory / "golive_history.jsonl"
+    config.health.disk_min_free_mb = 1
+    config.recording.recording_path.mkdir(parents=True)
+
+    recorders = [ChzzkAutoRecorder(f"channel{n:0>25}", "aut", "ses", config) for n in range(CHANNELS)]
+    shutdown = ShutdownCoordinator(deadline=4.0)
+    health = HealthMonitor(config.health, config.recording.recording_path, shutdown)
+    dashboard = DashboardServer(lambda: [r.get_status_summary() for r in recorders],
+                                config.recording.recording_path, host="127.0.0.1", port=0, health=health)
+    await dashboard.start()
+    base_url = f"http://127.0.0.1:{dashboard.port}"
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        # 녹화기 시작 전: 동작은 정상, 준비는 안 됨
+        await expect(client, "/healthz", 200)
+        await expect(client, "/readyz", 503, ["recorders"])
+
+        async def stop_all():
+            await asyncio.gather(*(recorder.stop() for recorder in recorders))
+
+        shutdown.manage(lambda: recorders, stop_all)
+        for recorder in recorders:
+            recorder._running = True
+            recorder.state.record_success(StreamInfo(recorder.channel_id, LiveStatus.OFFLINE),
+                                          time.monotonic() + 30)
+        report = await expect(client, "/readyz", 200)
+        logger.info(f"  준비 완료: {report['checks']['polling']['description']}, "
+                    f"{report['checks']['disk_space']['description']}")
+        assert (await asyncio.to_thread(run_healthcheck, base_url))[0] == 0
+
+        # 폴링 실패가 이어진 채널 → 실패 (이름 표시)
+        stale = recorders[1].state
+        stale.checked_at -= config.health.poll_stale_seconds + 1
+        stale.record_failure(time.monotonic())
+        report = await expect(client, "/healthz", 503, ["polling"])
+        assert report["checks"]["polling"]["stale_channels"] == [stale.channel_id]
+        code, output = await asyncio.to_thread(run_healthcheck, base_url)
+        assert code == 1 and stale.channel_id in output, output
+        logger.info(f"  {report['checks']['polling']['description']}")
+
+        # 예측 폴링으로 다음 폴링이 멀리 잡힌 채널은 그때까지 정상
+        stale.failures = 0
+        stale.next_due = stale.checked_at + config.health.poll_stale_seconds * 3
+        await expect(client, "/healthz", 200)
+
+        # 녹화: 파일이 커지면 정상, 멈추면 실패
+        stream = StreamInfo(recorders[0].channel_id, LiveStatus.ONLINE, title="live",
+                            hls_url="http://127.0.0.1:9/index.m3u8")
+        recording = await recorders[0].recorder.start_recording(stream, "live.mp4")
+        recorders[0]._current_recording = recording
+        started = recording.progress_at
+        await asyncio.sleep(5.5)
+        assert recording.progress_at > started, "녹화 모니터가 진행 시각을 갱신하지 않음"
+        report = await expect(client, "/healthz", 200)
+        logger.info(f"  {report['checks']['recordings']['description']}")
+        recording.progress_at -= config.health.recording_stall_seconds + 1
+        report = await expect(client, "/healthz", 503, ["recordings"])
+        assert report["checks"]["recordings"]["stalled_recordings"] == ["live.mp4"]
+        recording.progress_at = time.monotonic()
+
+        # 이벤트 루프 지연
+        config.health.max_loop_lag_ms = 500
+        time.sleep(1.2)
+        await asyncio.sleep(1.1)
+        report = await expect(client, "/healthz", 503, ["event_loop"])
+        logger.info(f"  {report['checks']['event_loop']['description']}")
+        config.health.max_loop_lag_ms = 60 * 1000
+
+        # 디스크: 사용률은 경고만, 여유 공간 부족은 실패
+        config.health.disk_warn_percent = 0
+        report = await expect(client, "/healthz", 200)
+        assert report["checks"]["disk_space"]["status"] == "warn"
+        config.health.disk_min_free_mb = 1 << 40
+        await expect(client, "/healthz", 503, ["disk_space"])
+        config.health.disk_min_free_mb = 1
+
+        # 요청당 처리 시간 (프로세스를 띄우지 않음)
+        started = time.perf_counter()
+        for _ in range(1000):
+            health.readiness()
+        logger.info(f"  /readyz 판단 {(time.perf_counter() - started) * 1000:.3f}µs/회 (채널 {CHANNELS}개)")
+
+        # 종료 중에는 준비 안 됨
+        shutdown.request()
+        await expect(client, "/readyz", 503, ["recorders"])
+        await asyncio.wait_for(shutdown.wait(), 6)
+
+    await dashboard.close()
+    logger.info("✅ 헬스체크 엔드포인트 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    if os.name != "posix":
+        logger.info("POSIX 환경에서만 실행합니다")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_health_endpoints(Path(tmp))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
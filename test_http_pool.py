@@ -0,0 +1,231 @@
+"""
+공용 HTTP 연결 풀 테스트 스크립트
+
+로컬 keepalive 서버(연결마다 TLS 핸드셰이크 대신 지연을 줌)에 채널 여러 개가
+폴링하도록 해서, 모니터마다 클라이언트를 만드는 기존 방식과 공유 HttpPool의
+새 연결 수, 연결당 요청 수, 폴링 지연 p50/p99를 비교합니다.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+
+import httpx
+
+from src.chzzk_recorder.monitor import LiveMonitor, LiveStatus, HttpPool, get_http_pool, close_http_pools
+from src.chzzk_recorder.monitor.http_pool import DnsCache, http2_available
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = 200
+ROUNDS = 4
+# 동시에 폴링하는 채널 수 (폴링 시각이 분산된 상황)
+CONCURRENCY = 4
+# 새 연결마다 주는 지연 (TLS 핸드셰이크 대신)
+HANDSHAKE_DELAY = 0.02
+
+BODY = b'{"code":200,"message":null,"content":{"status":"CLOSE"}}'
+
+
+class KeepAliveServer:
+    """요청마다 live-status 응답을 보내고 연결을 유지하는 HTTP/1.1 서버"""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.port = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await asyncio.sleep(HANDSHAKE_DELAY)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                self.requests += 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\nConnection: keep-alive\r\n\r\n%s" % (len(BODY), BODY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def make_monitors(port: int, pool: HttpPool = None) -> list[LiveMonitor]:
+    monitors = []
+    for i in range(CHANNELS):
+        monitor = LiveMonitor(f"{i:032x}", "aut", "ses", client=pool.client if pool else None)
+        # 이름 조회가 일어나도록 localhost로 연결
+        monitor.LIVE_STATUS_URL = f"http://localhost:{port}/polling/v2/channels/{{channel_id}}/live-status"
+        monitors.append(monitor)
+    return monitors
+
+
+async def poll_all(monitors: list[LiveMonitor]) -> list[float]:
+    """모든 채널을 ROUNDS번 폴링 (동시에 CONCURRENCY개), 폴링별 지연 반환"""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def poll(monitor: LiveMonitor):
+        async with semaphore:
+            started = time.perf_counter()
+            info = await monitor.check_live_status()
+            latencies.append(time.perf_counter() - started)
+            assert info.status == LiveStatus.OFFLINE
+
+    for _ in range(ROUNDS):
+        await asyncio.gather(*(poll(monitor) for monitor in monitors))
+    return sorted(latencies)
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * ratio))] * 1000
+
+
+async def run(pool: HttpPool = None) -> tuple[int, int, list[float]]:
+    server = KeepAliveServer()
+    await server.start()
+    monitors = make_monitors(server.port, pool)
+    logging.disable(logging.INFO)
+    try:
+        latencies = await poll_all(monitors)
+    finally:
+        for monitor in monitors:
+            await monitor.close()
+        logging.disable(logging.NOTSET)
+        await server.close()
+    return server.connections, server.requests, latencies
+
+
+async def test_shared_pool():
+    """모니터별 클라이언트 vs 공유 풀"""
+    logger.info(f"=== {CHANNELS}채널 x {ROUNDS}회 폴링 (동시 {CONCURRENCY}) ===")
+
+    base_connections, base_requests, base_latencies = await run()
+    pool = HttpPool(http2=True, max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY,
+                    cookies={"NID_AUT": "aut", "NID_SES": "ses"})
+    pool_connections, pool_requests, pool_latencies = await run(pool)
+    stats = pool.stats()
+    await pool.aclose()
+    closed_stats = pool.stats()
+
+    for name, connections, requests, latencies in (
+            ("모니터별 클라이언트", base_connections, base_requests, base_latencies),
+            ("공유 HttpPool     ", pool_connections, pool_requests, pool_latencies)):
+        logger.info(f"  {name}: 연결 {connections:4d}개, 연결당 요청 {requests / connections:5.1f}, "
+                    f"p50 {percentile(latencies, 0.5):5.1f}ms, p99 {percentile(latencies, 0.99):5.1f}ms")
+    logger.info(f"  풀 통계: {stats}")
+
+    assert base_requests == pool_requests == CHANNELS * ROUNDS
+    assert pool_connections <= CONCURRENCY < base_connections
+    assert stats["connections_opened"] == pool_connections
+    assert stats["requests"] == pool_requests and stats["requests_per_connection"] >= ROUNDS
+    # 새 연결마다 이름을 조회하지 않음
+    assert stats["dns_misses"] == 1 and stats["dns_hits"] == pool_connections - 1
+    assert stats["http2"] == http2_available()
+    # keepalive 연결은 풀을 닫을 때까지 열려 있음
+    assert stats["open_connections"] == pool_connections
+    assert closed_stats["open_connections"] == 0
+    logger.info("✅ 공유 풀이 연결을 재사용")
+
+
+async def test_transport_errors():
+    """연결/응답 오류는 httpx 예외로 전달"""
+    logger.info("=== 전송 오류 테스트 ===")
+
+    pool = HttpPool(http2=False, timeout=1.0)
+    # 닫힌 포트
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    try:
+        await pool.client.get(f"http://127.0.0.1:{port}/")
+        raise AssertionError("연결 오류가 전달되지 않음")
+    except httpx.ConnectError:
+        pass
+
+    # 응답 도중 연결을 끊는 서버
+    async def truncate(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\npartial")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(truncate, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        await pool.client.get(f"http://127.0.0.1:{port}/")
+        raise AssertionError("응답 오류가 전달되지 않음")
+    except httpx.RemoteProtocolError:
+        pass
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    stats = pool.stats()
+    await pool.aclose()
+    # 끊긴 연결은 풀에 남지 않음
+    assert stats["requests"] == 2 and stats["errors"] == 1 and stats["open_connections"] == 0
+    logger.info("✅ 전송 오류 통과")
+
+
+async def test_dns_cache():
+    """DNS 캐시 TTL"""
+    logger.info("=== DNS 캐시 테스트 ===")
+
+    cache = DnsCache(ttl=0.1)
+    first = await cache.resolve("localhost", 80)
+    assert first and await cache.resolve("localhost", 80) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    await asyncio.sleep(0.15)
+    await cache.resolve("localhost", 80)
+    assert cache.misses == 2
+    cache.invalidate("localhost", 80)
+    await cache.resolve("localhost", 80)
+    assert cache.misses == 3
+    logger.info("✅ DNS 캐시 통과")
+
+
+async def test_shared_registry():
+    """같은 쿠키/설정이면 같은 풀"""
+    logger.info("=== 공유 풀 등록 테스트 ===")
+
+    first = get_http_pool("aut", "ses", timeout=10)
+    assert get_http_pool("aut", "ses", timeout=10) is first
+    assert get_http_pool("aut2", "ses", timeout=10) is not first
+    assert first.client.cookies.get("NID_AUT") == "aut"
+    await close_http_pools()
+    assert get_http_pool("aut", "ses", timeout=10) is not first
+    await close_http_pools()
+    logger.info("✅ 공유 풀 등록 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_shared_pool()
+    await test_transport_errors()
+    await test_dns_cache()
+    await test_shared_registry()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+무결성 매니페스트 테스트 스크립트
+
+녹화 중 계산한 청크 해시가 완성된 파일을 처음부터 다시 읽어 계산한 값과 같은지
+(pipe/direct 모드), 손상된 청크를 찾아내고 아카이브 이동 시 그 청크만 다시
+복사하는지 확인합니다.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from src.chzzk_recorder.recorder.integrity import (
+    ChunkHasher, IntegrityManifest, build_manifest, manifest_path, CHUNK_SIZE
+)
+from src.chzzk_recorder.recorder.output_writer import PreallocatingWriter
+from src.chzzk_recorder.storage import TieringMover
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def test_capture_hashing():
+    """녹화 중 해시 == 완성 파일 해시"""
+    logger.info("=== 녹화 중 청크 해시 테스트 ===")
+
+    payload = os.urandom(3 * CHUNK_SIZE + 777)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # pipe 모드: 기록기가 쓰는 데이터를 그대로 해시
+        path = Path(tmp) / "pipe.mp4"
+        hasher = ChunkHasher()
+        writer = PreallocatingWriter(path, buffer_size=1024 * 1024, on_chunk=hasher.update)
+        for offset in range(0, len(payload), 65536):
+            writer.write(payload[offset:offset + 65536])
+        writer.close()
+        manifest, expected = hasher.finish(path.name), build_manifest(path)
+        assert manifest.chunks == expected.chunks and manifest.root == expected.root
+
+        # direct 모드: 커지는 파일을 주기적으로 따라 읽고, 종료 시 앞부분이 다시 기록됨
+        path = Path(tmp) / "direct.mp4"
+        hasher = ChunkHasher()
+        with open(path, "wb") as f:
+            f.write(b"\0" * 40)  # mdat 크기 자리
+            for offset in range(40, len(payload), 1024 * 1024):
+                f.write(payload[offset:offset + 1024 * 1024])
+                f.flush()
+                hasher.update_from_file(path)
+            f.seek(0)
+            f.write(payload[:40])  # 종료 시 헤더 갱신
+            f.seek(0, os.SEEK_END)
+            f.write(b"moov" * 100)
+        hasher.update_from_file(path)
+        manifest = hasher.finish(path.name, rehash_head_from=path)
+        expected = build_manifest(path)
+        assert manifest.chunks == expected.chunks and manifest.root == expected.root
+        assert manifest.size == path.stat().st_size
+
+        # 손상 청크 찾기
+        manifest.save(manifest_path(path))
+        loaded = IntegrityManifest.load(manifest_path(path))
+        assert loaded.verify(path) == []
+        with open(path, "r+b") as f:
+            f.seek(2 * CHUNK_SIZE + 123)
+            f.write(b"\xff")
+        assert loaded.verify(path) == [2]
+
+    logger.info("✅ pipe/direct 모드 해시가 전체 재계산 값과 일치, 손상 청크 탐지")
+
+
+class CorruptingMover(TieringMover):
+    """복사 직후 사본 청크 하나를 손상시키는 이동기 (전송 오류 재현)"""
+
+    def _copy(self, job):
+        super()._copy(job)
+        if job.source_path.suffix == ".mp4":
+            with open(job.temp_path, "r+b") as f:
+                f.seek(CHUNK_SIZE + 5)
+                f.write(b"\x00\x01\x02")
+
+
+async def test_manifest_guided_move():
+    """매니페스트로 검증하고 어긋난 청크만 다시 복사"""
+    logger.info("=== 매니페스트 기반 아카이브 검증 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch, archive = Path(tmp) / "scratch", Path(tmp) / "archive"
+        scratch.mkdir()
+        video = scratch / "rec.mp4"
+        payload = os.urandom(4 * CHUNK_SIZE)
+        video.write_bytes(payload)
+        manifest = build_manifest(video)
+        manifest.save(manifest_path(video))
+
+        mover = CorruptingMover(scratch, archive, bandwidth_bytes=0, rename_on_same_device=False)
+        mover.enqueue(video)
+        await asyncio.wait_for(mover.join(), timeout=30)
+        await mover.close()
+
+        assert (archive / "rec.mp4").read_bytes() == payload
+        assert (archive / "rec.manifest.json").exists()
+        catalog = (archive / "catalog.jsonl").read_text(encoding="utf-8")
+        assert manifest.root in catalog
+
+    logger.info("✅ 손상된 청크 1개만 다시 복사 후 검증 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    test_capture_hashing()
+    await test_manifest_guided_move()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+로깅 파이프라인 테스트 스크립트
+
+채널 500개가 DEBUG 레벨로 폴링 로그를 남길 때 이벤트 루프 쪽 로깅 비용이
+파일에 직접 쓰는 기존 방식보다 작은지, 채널 컨텍스트가 태스크별로 붙는지,
+반복 로그 샘플링과 종료 시 남은 로그 출력이 되는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import logging.handlers
+import tempfile
+import time
+from pathlib import Path
+
+from src.chzzk_recorder.log_pipeline import bind_channel, configure_logging
+from src.config import LoggingConfig
+
+
+logger = logging.getLogger(__name__)
+
+# 채널 수, 채널별 폴링 횟수
+CHANNELS = 500
+POLLS = 20
+
+poll_logger = logging.getLogger("test.poll")
+
+
+def log_poll():
+    """같은 위치에서 반복되는 폴링 로그"""
+    poll_logger.debug("폴링")
+
+
+async def channel_task(channel_id: str):
+    """채널 모니터링 흉내: 폴링마다 DEBUG 로그"""
+    bind_channel(channel_id)
+    status = {"status": "CLOSE", "liveTitle": "제목", "concurrentUserCount": 0}
+    for _ in range(POLLS):
+        poll_logger.debug("상태 응답: %s", status)
+        await asyncio.sleep(0)
+
+
+async def run_channels() -> float:
+    """모든 채널 태스크 실행, 루프에서 쓴 시간"""
+    started = time.perf_counter()
+    await asyncio.gather(*(channel_task(f"channel{i:03d}") for i in range(CHANNELS)))
+    return time.perf_counter() - started
+
+
+def make_config(tmp: str, **kwargs) -> LoggingConfig:
+    return LoggingConfig(level=logging.DEBUG, file_path=Path(tmp) / "recorder.log", console_output=False,
+                         **kwargs)
+
+
+async def test_hot_path_cost():
+    """큐 기반 파이프라인과 파일 직접 출력 비교"""
+    print("=== 로깅 비용 테스트 ===")
+
+    # 로그를 남기지 않을 때 (태스크 전환 비용만)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    baseline_seconds = await run_channels()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 기존 방식: 루프 스레드에서 포맷 + 파일 쓰기
+        direct = logging.handlers.RotatingFileHandler(Path(tmp) / "direct.log", maxBytes=100 * 1024 * 1024,
+                                                      encoding="utf-8")
+        direct.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        root.addHandler(direct)
+        root.setLevel(logging.DEBUG)
+        direct_seconds = await run_channels()
+        root.removeHandler(direct)
+        direct.close()
+
+        # 샘플링 없이 큐로만 넘기는 경우와 기본 샘플링
+        pipeline = configure_logging(make_config(tmp, sample_burst=0))
+        queued_seconds = await run_channels()
+        pipeline.close()
+        written = (Path(tmp) / "recorder.log").read_text(encoding="utf-8").count("상태 응답")
+        assert written == CHANNELS * POLLS, written
+
+        pipeline = configure_logging(make_config(tmp, sample_burst=20))
+        sampled_seconds = await run_channels()
+        pipeline.close()
+
+    records = CHANNELS * POLLS
+    print(f"  로그 없음: {baseline_seconds * 1e6 / records:.1f}us/폴링")
+    print(f"  직접 출력: {direct_seconds * 1e6 / records:.1f}us/로그")
+    print(f"  큐 출력:   {queued_seconds * 1e6 / records:.1f}us/로그")
+    print(f"  샘플링:    {sampled_seconds * 1e6 / records:.1f}us/로그 ({pipeline.sampling.dropped}개 생략)")
+    assert sampled_seconds < direct_seconds
+    assert pipeline.sampling.dropped == records - 20
+    print("✅ 루프에서 파일 I/O 없이 모든 로그 기록, 샘플링 시 직접 출력보다 비용이 작음")
+
+
+async def test_context_and_sampling():
+    """채널 컨텍스트, 생략 개수 표시, JSON 형식, 종료 시 출력"""
+    print("=== 채널 컨텍스트/샘플링 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp, json_format=True, sample_burst=2, sample_window_seconds=0.2)
+        pipeline = configure_logging(config)
+
+        async def channel(channel_id: str):
+            bind_channel(channel_id)
+            for _ in range(5):
+                log_poll()
+            logger.warning("경고는 샘플링하지 않음")
+
+        await asyncio.gather(channel("alpha"), channel("beta"))
+        await asyncio.sleep(0.25)
+        log_poll()
+        logging.getLogger("httpx").info("HTTP Request: GET ...")
+        pipeline.close()
+
+        entries = [json.loads(line) for line in config.file_path.read_text(encoding="utf-8").splitlines()]
+
+    polls = [e for e in entries if e["event"] == "폴링"]
+    warnings = [e for e in entries if e["level"] == "warning"]
+    assert len(polls) == 3, polls
+    assert polls[-1]["sampled_skipped"] == 8
+    assert "channel" not in polls[-1]
+    assert sorted(e["channel"] for e in warnings) == ["alpha", "beta"]
+    assert not any(e["logger"] == "httpx" for e in entries)
+    assert all(e["timestamp"] for e in entries)
+    print(f"✅ 기록 {len(entries)}줄, 채널별 컨텍스트 분리, 생략 {polls[-1]['sampled_skipped']}개 표시")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_hot_path_cost()
+    await test_context_and_sampling()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""
+알림 디스패처 테스트 스크립트
+
+로컬 HTTP 서버를 디스코드 웹훅/텔레그램 API 대신 띄워 놓고,
+동시 다발 이벤트가 요약 메시지로 합쳐지는지, 429/5xx 응답 후 재시도되는지,
+notify()가 호출자를 막지 않는지, 가짜 FFmpeg으로 녹화를 시작/종료/실패시켰을 때
+main.py의 콜백을 거쳐 실제로 알림이 전송되는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import main as app
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+from src.chzzk_recorder.notification import NotificationDispatcher, NotificationEvent
+from src.config import Config, NotificationConfig
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+FAKE_FFMPEG = """#!{python}
+import sys, time
+output = open(sys.argv[-1], "ab")
+while True:
+    output.write(b"x" * 4096)
+    output.flush()
+    time.sleep(0.1)
+"""
+
+
+class LocalWebhookServer:
+    """웹훅 흉내 서버 (처음 요청은 429, 두 번째는 500으로 응답)"""
+
+    def __init__(self):
+        self.port = 0
+        self.received: list[tuple[str, dict]] = []
+        self.request_count = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+                path = head.split(" ")[1]
+                length = next(int(line.split(":")[1]) for line in head.split("\r\n")
+                              if line.lower().startswith("content-length"))
+                body = json.loads(await reader.readexactly(length))
+
+                self.request_count += 1
+                if self.request_count == 1:
+                    status, payload = "429 Too Many Requests", b'{"retry_after": 0.2}'
+                elif self.request_count == 2:
+                    status, payload = "500 Internal Server Error", b"{}"
+                else:
+                    self.received.append((path, body))
+                    status, payload = "200 OK", b'{"ok": true}'
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+async def test_burst_is_coalesced():
+    """40개 채널 동시 방송 시작 → 대상별 요약 메시지 1건"""
+    logger.info("=== 알림 묶음 전송 테스트 ===")
+
+    server = LocalWebhookServer()
+    await server.start()
+    base_url = f"http://127.0.0.1:{server.port}"
+
+    dispatcher = NotificationDispatcher(
+        NotificationConfig(
+            discord_webhook_url=f"{base_url}/discord",
+            telegram_bot_token="TOKEN",
+            telegram_chat_id="42",
+            coalesce_window_seconds=0.3,
+        ),
+        telegram_api_url=f"{base_url}/telegram"
+    )
+    dispatcher.start()
+
+    begin = time.perf_counter()
+    for n in range(40):
+        dispatcher.notify(NotificationEvent("start", f"streamer{n}", "방송 시작", title=f"방송 {n}"))
+    dispatcher.notify(NotificationEvent("error", "streamer7", "FFmpeg 프로세스 예상치 못한 종료"))
+    elapsed_ms = (time.perf_counter() - begin) * 1000
+    logger.info(f"notify() 41회: {elapsed_ms:.2f}ms")
+    assert elapsed_ms < 50, "notify()가 호출자를 막았습니다"
+
+    await dispatcher.close(timeout=15)
+    await server.stop()
+
+    discord = [body for path, body in server.received if path == "/discord"]
+    telegram = [body for path, body in server.received if path.startswith("/telegram/botTOKEN")]
+    logger.info(f"수신: discord {len(discord)}건, telegram {len(telegram)}건 "
+                f"(총 요청 {server.request_count}건, 429/500 재시도 포함)")
+
+    assert len(discord) + len(telegram) == 4
+    digest = next(body["content"] for body in discord if "40건" in body["content"])
+    assert "streamer39: 방송 39" in digest
+    assert any("streamer7" in body["content"] and "❌" in body["content"] for body in discord)
+    assert all(body["chat_id"] == "42" for body in telegram)
+    logger.info("✅ 요약 전송 및 재시도 확인")
+
+
+async def test_recorder_callbacks_notify(directory: Path):
+    """녹화 시작/종료/실패 → main.py 콜백 → 디스패처 → 웹훅"""
+    logger.info("=== 녹화 콜백 알림 테스트 ===")
+
+    server = LocalWebhookServer()
+    await server.start()
+    dispatcher = NotificationDispatcher(NotificationConfig(
+        discord_webhook_url=f"http://127.0.0.1:{server.port}/discord",
+        coalesce_window_seconds=0.1,
+    ))
+    dispatcher.start()
+    app.notifier = dispatcher
+
+    ffmpeg = directory / "fake-ffmpeg"
+    ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+    config = Config()
+    config.recording.recording_path = directory / "recordings"
+    config.recording.record_chat = False
+    config.recording.write_manifest = False
+    config.recording.track_continuity = False
+    config.system.ffmpeg_path = str(ffmpeg)
+    config.prediction.history_path = directory / "golive_history.jsonl"
+
+    def auto_recorder(channel_id: str) -> ChzzkAutoRecorder:
+        recorder = ChzzkAutoRecorder(channel_id, "aut", "ses", config)
+        recorder.set_callbacks(
+            on_recording_start=app.on_recording_start,
+            on_recording_stop=app.on_recording_stop,
+            on_status_change=app.on_status_change,
+            on_error=app.on_error
+        )
+        return recorder
+
+    stream = StreamInfo("a" * 32, LiveStatus.ONLINE, title="저녁 방송", category="Talk",
+                        streamer_name="streamer", hls_url="http://127.0.0.1:9/index.m3u8")
+    recorder = auto_recorder(stream.channel_id)
+    await recorder._handle_stream_start(stream)
+    assert recorder._current_recording and recorder._current_recording.is_recording
+    await asyncio.sleep(0.5)
+    await recorder._handle_stream_stop(stream)
+    await recorder.stop()
+
+    # FFmpeg을 실행할 수 없는 채널: 녹화 시작 실패 → 오류 알림
+    config.system.ffmpeg_path = str(directory / "missing-ffmpeg")
+    failing = auto_recorder("b" * 32)
+    await failing._handle_stream_start(replace_channel(stream, "b" * 32))
+    await failing.stop()
+
+    await dispatcher.close(timeout=15)
+    await server.stop()
+    app.notifier = None
+
+    text = "\n".join(body["content"] for path, body in server.received)
+    logger.info(f"수신 {len(server.received)}건:\n{text}")
+    assert "녹화 시작" in text and "저녁 방송" in text, text
+    assert "녹화 완료" in text, text
+    assert "❌" in text and "missing-ffmpeg" in text, text
+    logger.info("✅ 녹화 콜백에서 알림 전송 확인")
+
+
+def replace_channel(stream: StreamInfo, channel_id: str) -> StreamInfo:
+    return StreamInfo(channel_id, stream.status, title=stream.title, category=stream.category,
+                      streamer_name=stream.streamer_name, hls_url=stream.hls_url)
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_burst_is_coalesced()
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_recorder_callbacks_notify(Path(tmp))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+녹화 출력 파일 관리 테스트 스크립트
+
+같은 파일명으로 동시에 녹화를 시작해도 서로 덮어쓰지 않는지, 녹화 중에는
+.partial로만 존재하다가 최종화 시 원래 이름으로 옮겨지는지 확인합니다.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.chzzk_recorder.recorder.output_manager import (
+    OutputManager, partial_name, PARTIAL_SUFFIX, MAX_NAME_BYTES
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def test_reserve_and_finalize():
+    """예약 -> 최종화"""
+    logger.info("=== 출력 파일 예약/최종화 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        manager = OutputManager(directory)
+
+        # 같은 이름을 여러 스레드에서 동시에 예약 (재시작/같은 초 시작 상황)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            reservations = list(pool.map(lambda _: manager.reserve("20250101_솔랭.mp4"), range(50)))
+
+        finals = {r.final_path.name for r in reservations}
+        assert len(finals) == 50, "같은 파일명이 두 번 예약되었습니다"
+        assert manager.in_progress == {r.final_path for r in reservations}
+        assert all(r.partial_path.name.endswith(PARTIAL_SUFFIX) for r in reservations)
+
+        # 녹화 중에는 최종 파일명이 존재하지 않음 (동기화 도구는 *.partial만 보게 됨)
+        visible = [p for p in directory.iterdir() if not p.name.endswith(PARTIAL_SUFFIX)]
+        assert visible == []
+
+        for n, reservation in enumerate(reservations):
+            reservation.partial_path.write_bytes(b"x" * (n + 1))
+
+        # 최종화 전에 누군가 같은 이름의 파일을 만들어도 덮어쓰지 않음
+        first = reservations[0]
+        first.final_path.write_bytes(b"existing")
+        final = manager.finalize(first)
+        assert final != first.final_path and final.read_bytes() == b"x"
+        assert first.final_path.read_bytes() == b"existing"
+
+        for reservation in reservations[1:]:
+            assert manager.finalize(reservation) == reservation.final_path
+
+        assert manager.in_progress == frozenset()
+        assert not any(p.name.endswith(PARTIAL_SUFFIX) for p in directory.iterdir())
+
+        # 내용이 없는 녹화는 파일을 남기지 않음
+        empty = manager.reserve("empty.mp4")
+        assert manager.finalize(empty) is None and not any(directory.glob("empty*"))
+
+    logger.info("✅ 동시 예약 50건 충돌 없음, 최종화 시 기존 파일 보존")
+
+
+def test_recover_and_long_names():
+    """중단된 녹화 복구, 긴 파일명"""
+    logger.info("=== 중단된 녹화 복구 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        manager = OutputManager(directory)
+
+        # 이전 실행에서 남은 partial 파일 (오래됨) / 다른 녹화가 쓰는 중인 파일 (최근)
+        stale = directory / ("old.mp4" + PARTIAL_SUFFIX)
+        stale.write_bytes(b"old")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+        fresh = directory / ("fresh.mp4" + PARTIAL_SUFFIX)
+        fresh.write_bytes(b"fresh")
+        owned = manager.reserve("mine.mp4")
+        owned.partial_path.write_bytes(b"mine")
+        os.utime(owned.partial_path, (old, old))
+
+        recovered = manager.recover_stale()
+        assert recovered == [directory / "old.mp4"]
+        assert fresh.exists() and owned.partial_path.exists()
+
+        # 255바이트 파일명 + .partial
+        long_name = "가" * 83 + ".mp4"
+        assert len(long_name.encode("utf-8")) == 253
+        name = partial_name(long_name)
+        assert len(name.encode("utf-8")) <= MAX_NAME_BYTES and name.endswith(PARTIAL_SUFFIX)
+        reservation = manager.reserve(long_name)
+        reservation.partial_path.write_bytes(b"x")
+        assert manager.finalize(reservation).name == long_name
+
+    logger.info("✅ 오래된 partial만 복구, 긴 파일명 처리 확인")
+
+
+def main():
+    """메인 테스트 함수"""
+    test_reserve_and_finalize()
+    test_recover_and_long_names()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+녹화 파일 기록기 테스트 스크립트
+
+사전 할당/큰 버퍼 기록기가 받은 데이터를 그대로 기록하고 종료 시 실제 크기로
+잘라내는지 확인하고, 여러 파일이 동시에 커지는 상황에서 FFmpeg식 작은 append와
+write 호출 수, extent 수(단편화)를 비교합니다. 기록 스레드가 실패하면(디스크 가득 참 등)
+녹화가 오류로 끝나 다시 연결되는지도 확인합니다.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+from src.chzzk_recorder.recorder import StreamRecorder, RecordingStatus
+from src.chzzk_recorder.recorder.output_writer import (
+    PreallocatingWriter, extent_size_for, count_extents, BLOCK_SIZE
+)
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 동시에 녹화되는 파일 수 / 파일당 크기 / FFmpeg 기록 단위
+FILE_COUNT = 8
+FILE_SIZE = 64 * 1024 * 1024
+FFMPEG_WRITE_SIZE = 32 * 1024
+
+# stdout으로 계속 출력하는 가짜 FFmpeg (읽는 쪽이 없으면 파이프가 가득 차 멈춤)
+FAKE_FFMPEG = """#!{python}
+import sys, time
+while True:
+    sys.stdout.buffer.write(b"x" * 65536)
+    sys.stdout.buffer.flush()
+    time.sleep(0.01)
+"""
+
+
+def test_pipe_roundtrip():
+    """pipe -> 기록기 데이터 보존 및 잘라내기"""
+    logger.info("=== pipe 기록 테스트 ===")
+
+    payload = os.urandom(10 * 1024 * 1024 + 12345)
+    chunks = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "out.mp4.partial"
+        writer = PreallocatingWriter(path, extent_size=extent_size_for(8000), buffer_size=1024 * 1024,
+                                     on_chunk=lambda chunk: chunks.append(bytes(chunk)))
+
+        read_fd, write_fd = os.pipe()
+
+        def produce():
+            with os.fdopen(write_fd, "wb") as f:
+                for offset in range(0, len(payload), 188 * 7):
+                    f.write(payload[offset:offset + 188 * 7])
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        with os.fdopen(read_fd, "rb") as stream:
+            assert writer.write_from(stream) == len(payload)
+        producer.join()
+
+        # 닫기 전: 사전 할당으로 파일이 데이터보다 큼
+        assert path.stat().st_size >= extent_size_for(8000)
+        writer.close()
+
+        assert path.stat().st_size == len(payload)
+        assert path.read_bytes() == payload
+        assert b"".join(chunks) == payload
+        assert all(len(c) == 1024 * 1024 for c in chunks[:-1])
+        assert writer.stats.write_calls == len(chunks)
+        assert writer.stats.fallocate_calls == 1
+
+    logger.info(f"✅ {len(payload):,}B 보존, write {writer.stats.write_calls}회, "
+                f"fallocate {writer.stats.fallocate_calls}회")
+
+
+async def _pump_failure(directory: Path):
+    ffmpeg = directory / "fake-ffmpeg"
+    ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable), encoding="utf-8")
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+    recorder = StreamRecorder(directory / "recordings", ffmpeg_path=str(ffmpeg), pipe_output=True,
+                              write_chapters=False, write_manifest=False, track_continuity=False)
+    errors = []
+    failed = asyncio.Event()
+
+    def on_error(recording_info, error):
+        errors.append(error)
+        failed.set()
+
+    recorder.set_callbacks(on_error=on_error)
+    stream = StreamInfo("a" * 32, LiveStatus.ONLINE, title="live", hls_url="http://127.0.0.1:9/index.m3u8")
+
+    original = PreallocatingWriter.write_from_fd
+
+    def fail(self, fd, stop=None):
+        # 0.3초 동안은 정상 기록한 뒤 디스크가 가득 참
+        full = threading.Event()
+        threading.Timer(0.3, full.set).start()
+        original(self, fd, full)
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    PreallocatingWriter.write_from_fd = fail
+    try:
+        recording = await recorder.start_recording(stream, "live.mp4")
+        await asyncio.wait_for(failed.wait(), timeout=30)
+    finally:
+        PreallocatingWriter.write_from_fd = original
+
+    process = recorder._ffmpeg_process
+    assert recording.status == RecordingStatus.ERROR, recording.status
+    assert "No space left" in recording.error_message, recording.error_message
+    assert process is None or process.poll() is not None, "FFmpeg이 종료되지 않음"
+    # 실패 전까지 기록한 부분은 최종 파일로 보존
+    assert not recording.partial_path and recording.file_path.stat().st_size > 0
+    return recording
+
+
+def test_pump_failure_ends_recording():
+    """기록 스레드 실패 → FFmpeg 종료, 녹화 오류 (다시 연결 가능)"""
+    logger.info("=== 기록 실패 처리 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = asyncio.run(_pump_failure(Path(tmp)))
+    logger.info(f"✅ 기록 실패 후 녹화 오류로 종료: {recording.error_message}")
+
+
+def bench_concurrent_growth():
+    """여러 파일 동시 기록: 작은 append vs 사전 할당 + 큰 버퍼"""
+    logger.info("=== 동시 기록 단편화 벤치마크 ===")
+
+    block = os.urandom(FFMPEG_WRITE_SIZE)
+    rounds = FILE_SIZE // FFMPEG_WRITE_SIZE
+
+    with tempfile.TemporaryDirectory(dir=os.environ.get("BENCH_DIR")) as tmp:
+        # FFmpeg 직접 기록 방식
+        paths = [Path(tmp) / f"direct{n}.mp4" for n in range(FILE_COUNT)]
+        fds = [os.open(p, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644) for p in paths]
+        begin = time.perf_counter()
+        writes = 0
+        for _ in range(rounds):
+            for fd in fds:
+                os.write(fd, block)
+                writes += 1
+            if _ % 256 == 0:
+                for fd in fds:
+                    os.fdatasync(fd)  # 주기적 writeback (장시간 녹화 중 메모리 압박 재현)
+        for fd in fds:
+            os.fsync(fd)
+            os.close(fd)
+        direct_time = time.perf_counter() - begin
+        direct_extents = [count_extents(p) for p in paths]
+
+        # 사전 할당 기록기
+        paths = [Path(tmp) / f"pipe{n}.mp4" for n in range(FILE_COUNT)]
+        writers = [PreallocatingWriter(p, extent_size=extent_size_for(8000)) for p in paths]
+        begin = time.perf_counter()
+        for _ in range(rounds):
+            for writer in writers:
+                writer.write(block)
+            if _ % 256 == 0:
+                for writer in writers:
+                    os.fdatasync(writer._fd)
+        for writer in writers:
+            writer.close()
+        for p in paths:
+            fd = os.open(p, os.O_RDONLY)
+            os.fsync(fd)
+            os.close(fd)
+        pipe_time = time.perf_counter() - begin
+        pipe_extents = [count_extents(p) for p in paths]
+        pipe_writes = sum(w.stats.write_calls for w in writers)
+        fallocates = sum(w.stats.fallocate_calls for w in writers)
+
+        assert all(p.stat().st_size == FILE_SIZE for p in paths)
+        assert all(w.stats.bytes_written % BLOCK_SIZE == 0 for w in writers)
+
+    def avg(values):
+        values = [v for v in values if v is not None]
+        return f"{sum(values) / len(values):.1f}" if values else "측정 불가"
+
+    logger.info(f"파일 {FILE_COUNT}개 x {FILE_SIZE // 1024 // 1024}MB 동시 기록")
+    logger.info(f"  직접 기록 : write {writes:,}회, 파일당 extent {avg(direct_extents)}, {direct_time:.2f}초")
+    logger.info(f"  사전 할당 : write {pipe_writes:,}회 + fallocate {fallocates}회, "
+                f"파일당 extent {avg(pipe_extents)}, {pipe_time:.2f}초")
+
+
+def main():
+    """메인 테스트 함수"""
+    test_pipe_roundtrip()
+    test_pump_failure_ends_recording()
+    bench_concurrent_growth()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+HLS URL 추출 테스트 스크립트
+
+live-detail 응답 모양의 재생 정보로 HLS URL 추출 결과를 확인하고,
+기존 방식(두 번 디코딩 + 여러 차례 재귀 탐색)과 추출 시간을 비교합니다.
+"""
+
+import json
+import logging
+import time
+
+from src.chzzk_recorder.monitor.playback_parser import PlaybackParser, find_hls_url, format_path
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+HLS_URL = "https://livecloud.pstatic.net/chzzk/lip2_kr/cflexnmss2u0007/abcdef/hls_playlist.m3u8?hdnts=st=1"
+LLHLS_URL = "https://livecloud.pstatic.net/chzzk/lip2_kr/cflexnmss2u0007/abcdef/hdntl=exp/playlist.m3u8"
+
+
+def encoding_tracks() -> list[dict]:
+    return [
+        {"encodingTrackId": quality, "videoProfile": "high", "audioProfile": "LC", "videoCodec": "H264",
+         "videoBitRate": bitrate, "audioBitRate": 192000, "videoFrameRate": "60.0", "videoWidth": width,
+         "videoHeight": height, "audioSamplingRate": 48000, "audioChannel": 2, "avoidReencoding": False,
+         "videoDynamicRange": "SDR"}
+        for quality, bitrate, width, height in [
+            ("1080p", 8000000, 1920, 1080), ("720p", 5000000, 1280, 720),
+            ("480p", 1200000, 852, 480), ("360p", 500000, 640, 360), ("144p", 200000, 256, 144)]
+    ]
+
+
+def playback(media_order: tuple[str, ...] = ("HLS", "LLHLS")) -> dict:
+    """livePlaybackJson 디코딩 결과 모양"""
+    urls = {"HLS": HLS_URL, "LLHLS": LLHLS_URL}
+    return {
+        "meta": {"videoId": "ABCDEF", "streamSeq": 123456, "liveId": "7890", "paidLive": False,
+                 "cdnInfo": {"cdnType": "GCDN", "zeroRating": False}, "p2p": False, "cmcdEnabled": False},
+        "serviceMeta": {"contentType": "VIDEO"},
+        "live": {"start": "2024-05-01T20:00:00.000", "open": "2024-05-01T20:00:01.000", "timeMachine": True,
+                 "status": "STARTED"},
+        "api": [{"name": "p2p-config", "path": "https://apis.naver.com/live_commerce_web/p2p/config"}],
+        "media": [{"mediaId": media_id, "protocol": media_id, "path": urls[media_id],
+                   "latency": "LOW" if media_id == "LLHLS" else "NORMAL", "encodingTrack": encoding_tracks()}
+                  for media_id in media_order],
+        "thumbnail": {"snapshotThumbnailTemplate": "https://livecloud-thumb.akamaized.net/{type}.jpg",
+                      "types": ["480", "720", "1080"]},
+        "multiview": [],
+    }
+
+
+def content_for(playback_obj) -> dict:
+    """live-detail content (livePlaybackJson은 문자열)"""
+    return {"liveTitle": "테스트 방송", "livePlaybackJson": json.dumps(playback_obj), "livePlayback": {}}
+
+
+def legacy_extract(content: dict):
+    """기존 LiveMonitor 방식 (비교용): 디코딩, media/json.media 확인, 재귀 탐색, 실패 시 재디코딩 후 재탐색"""
+    live_playback = content.get("livePlayback", {})
+    raw = content.get("livePlaybackJson")
+    if isinstance(raw, str):
+        live_playback = json.loads(raw)
+    hls_url = None
+    for media in live_playback.get("media", []):
+        if media.get("mediaId") == "HLS":
+            return media.get("path")
+    json_data = live_playback.get("json")
+    if isinstance(json_data, dict):
+        for media in json_data.get("media", []):
+            if media.get("mediaId") == "HLS":
+                return media.get("path")
+
+    def find(obj):
+        nonlocal hls_url
+        if hls_url:
+            return
+        if isinstance(obj, dict):
+            for value in obj.values():
+                if isinstance(value, str) and ".m3u8" in value:
+                    hls_url = value
+                    return
+                find(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                find(item)
+
+    find(live_playback)
+    if not hls_url and isinstance(raw, str):
+        find(json.loads(raw))
+    return hls_url
+
+
+def test_shapes():
+    """알려진 모양, 순서 변경, 알 수 없는 모양, URL 없음"""
+    logger.info("=== 모양별 추출 테스트 ===")
+
+    parser = PlaybackParser()
+    assert parser.extract(content_for(playback())) == HLS_URL
+    assert format_path(parser.path) == "media[0].path"
+    assert parser.extract(content_for(playback())) == HLS_URL
+    assert parser.hits == 1
+
+    # LLHLS가 앞으로 오면 기억한 경로는 LLHLS를 가리키므로 다시 찾음
+    assert parser.extract(content_for(playback(("LLHLS", "HLS")))) == HLS_URL
+    assert format_path(parser.path) == "media[1].path"
+
+    # livePlayback.json.media 모양 (livePlaybackJson 없음)
+    legacy_shape = {"livePlayback": {"json": {"media": [{"mediaId": "HLS", "path": HLS_URL}]}}}
+    assert PlaybackParser().extract(legacy_shape) == HLS_URL
+
+    # 알 수 없는 모양: 깊은 곳의 .m3u8 (재귀 한도보다 깊어도 동작)
+    deep: dict = {"url": HLS_URL}
+    for i in range(2000):
+        deep = {"level": deep, "name": f"n{i}"}
+    path, url = find_hls_url({"stream": [deep]})
+    assert url == HLS_URL and len(path) == 2003
+
+    # 깨진 livePlaybackJson, URL 없음
+    assert PlaybackParser().extract({"livePlaybackJson": "{broken"}) is None
+    assert PlaybackParser().extract(content_for({"media": []})) is None
+    logger.info("✅ 모양별 추출 통과")
+
+
+def bench(label: str, func, contents: list[dict], repeat: int = 2000) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in contents:
+            func(content)
+    per_call = (time.perf_counter() - started) / (repeat * len(contents)) * 1e6
+    logger.info(f"  {label}: {per_call:.1f}us/회")
+    return per_call
+
+
+def test_benchmark():
+    """기존 방식과 추출 시간 비교"""
+    logger.info("=== 추출 시간 비교 ===")
+    # 경로를 새로 찾을 때마다 남기는 로그 제외
+    logging.getLogger("src.chzzk_recorder.monitor.playback_parser").setLevel(logging.WARNING)
+
+    # 일반 응답, media 목록이 없는 응답 (전체 탐색), URL이 없는 응답 (기존 방식은 재디코딩)
+    normal = [content_for(playback())]
+    unknown_shape = [content_for({"meta": playback()["meta"], "streams": {"main": {"variants": [
+        {"tracks": encoding_tracks(), "hls": {"url": HLS_URL}}]}}})]
+    no_url = [content_for({**playback(), "media": [{"mediaId": "DASH", "path": "https://x/manifest.mpd",
+                                                     "encodingTrack": encoding_tracks()}]})]
+
+    for name, contents in (("일반 응답", normal), ("media 없음", unknown_shape), ("URL 없음", no_url)):
+        logger.info(f"{name}")
+        assert legacy_extract(contents[0]) == PlaybackParser().extract(contents[0])
+        legacy = bench("기존 방식", legacy_extract, contents)
+        bench("경로 기억 없음", lambda c: PlaybackParser().extract(c), contents)
+        parser = PlaybackParser()
+        warm = bench("경로 기억", parser.extract, contents)
+        # 디코딩 시간이 대부분이라 일반 응답은 차이가 작음, 탐색이 많은 경우만 비교
+        if contents is not normal:
+            assert warm < legacy, name
+
+    # 디코딩을 뺀 순수 탐색 비용
+    decoded = json.loads(unknown_shape[0]["livePlaybackJson"])
+    parser = PlaybackParser()
+    parser.extract(unknown_shape[0])
+    bench("탐색만 (경로 기억 없음)", find_hls_url, [decoded])
+    bench("탐색만 (경로 기억)", parser._from_cached_path, [decoded])
+    logger.info("✅ 추출 시간 비교 완료")
+
+
+def main():
+    """메인 테스트 함수"""
+    test_shapes()
+    test_benchmark()
+
+
+if __name__ == "__main__":
+    main()
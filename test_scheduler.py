@@ -0,0 +1,230 @@
+"""
+폴링 스케줄러 테스트 스크립트
+
+채널 수가 늘어도 태스크 수가 그대로인지 (채널별 sleep 루프 방식과 비교),
+채널별 간격/지터, 우선 확인(bump), 간격 변경, 폴링 중 제거 대기를 확인하고
+방송 종료 직후 짧은 간격으로 다시 확인하는지 검사합니다.
+"""
+
+import asyncio
+import logging
+import time
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.monitor import LiveStatus, StreamInfo
+from src.chzzk_recorder.monitor.scheduler import PollScheduler
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def sleep_loops(count: int, interval: float, duration: float) -> tuple[int, int]:
+    """기존 방식: 채널마다 폴링 + sleep 루프 태스크"""
+    polls = 0
+
+    async def loop():
+        nonlocal polls
+        while True:
+            await asyncio.sleep(0)
+            polls += 1
+            await asyncio.sleep(interval)
+
+    tasks = [asyncio.create_task(loop()) for _ in range(count)]
+    await asyncio.sleep(duration)
+    task_count = len(asyncio.all_tasks())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return task_count, polls
+
+
+async def scheduled(count: int, interval: float, duration: float) -> tuple[int, int, dict]:
+    """스케줄러 방식: 힙 하나 + 작업자 16개"""
+    polls: dict[str, int] = {}
+
+    def make_poll(channel_id: str):
+        async def poll():
+            await asyncio.sleep(0)
+            polls[channel_id] = polls.get(channel_id, 0) + 1
+        return poll
+
+    scheduler = PollScheduler(workers=16, jitter=0.1)
+    scheduler.start()
+    for i in range(count):
+        channel_id = f"{i:032x}"
+        scheduler.add(channel_id, make_poll(channel_id), interval, delay=i / count * interval)
+    await asyncio.sleep(duration)
+    task_count = len(asyncio.all_tasks())
+    stats = scheduler.stats()
+    await scheduler.close()
+    assert len(polls) == count and min(polls.values()) >= 2, "폴링되지 않은 채널이 있음"
+    return task_count, sum(polls.values()), stats
+
+
+async def test_scale():
+    """채널 수별 태스크 수"""
+    logger.info("=== 채널 수별 태스크 수 ===")
+
+    interval, duration = 0.5, 1.6
+    for count in (100, 500, 2000):
+        started = time.process_time()
+        loop_tasks, loop_polls = await sleep_loops(count, interval, duration)
+        loop_cpu = time.process_time() - started
+
+        started = time.process_time()
+        sched_tasks, sched_polls, stats = await scheduled(count, interval, duration)
+        sched_cpu = time.process_time() - started
+
+        logger.info(f"  {count:5d}채널: sleep 루프 태스크 {loop_tasks:5d}개 ({loop_polls}회, CPU {loop_cpu:.2f}s) / "
+                    f"스케줄러 태스크 {sched_tasks:3d}개 ({sched_polls}회, CPU {sched_cpu:.2f}s, "
+                    f"힙 {stats['heap_size']})")
+        assert loop_tasks > count
+        # 메인 태스크 + 디스패처 + 작업자 16개
+        assert sched_tasks == 1 + 1 + 16
+    logger.info("✅ 채널 수와 무관하게 태스크 수 일정")
+
+
+async def test_intervals_and_bump():
+    """채널별 간격, 반환값 간격, bump, set_interval"""
+    logger.info("=== 간격/우선 확인 테스트 ===")
+
+    loop = asyncio.get_running_loop()
+    times: dict[str, list[float]] = {"fast": [], "slow": [], "dynamic": []}
+
+    def make_poll(name: str, result=None):
+        async def poll():
+            times[name].append(loop.time())
+            return result
+        return poll
+
+    scheduler = PollScheduler(workers=2, jitter=0.0)
+    scheduler.start()
+    scheduler.add("fast", make_poll("fast"), 0.1)
+    scheduler.add("slow", make_poll("slow"), 10.0)
+    scheduler.add("dynamic", make_poll("dynamic", result=0.2), 10.0)
+    await asyncio.sleep(0.55)
+
+    assert 5 <= len(times["fast"]) <= 7, times["fast"]
+    assert len(times["slow"]) == 1
+    assert 2 <= len(times["dynamic"]) <= 4, times["dynamic"]
+
+    # 우선 확인: 10초 뒤 예정이던 채널을 바로 폴링
+    scheduler.bump("slow")
+    await asyncio.sleep(0.05)
+    assert len(times["slow"]) == 2
+    # 더 늦은 bump는 기존 예약을 늦추지 않음
+    due = scheduler.next_due("fast")
+    scheduler.bump("fast", delay=5.0)
+    assert scheduler.next_due("fast") == due
+
+    # 간격 변경: 바로 한 번 폴링한 뒤 새 간격
+    scheduler.set_interval("slow", 0.1)
+    await asyncio.sleep(0.35)
+    assert len(times["slow"]) >= 5, times["slow"]
+
+    await scheduler.close()
+    logger.info("✅ 간격/우선 확인 통과")
+
+
+async def test_jitter():
+    """지터로 같은 간격의 채널들이 흩어지는지"""
+    logger.info("=== 지터 테스트 ===")
+
+    scheduler = PollScheduler(workers=4, jitter=0.2)
+    scheduler.start()
+
+    async def poll():
+        return None
+
+    for i in range(200):
+        scheduler.add(str(i), poll, 1.0)
+    await asyncio.sleep(0.05)
+    dues = sorted(scheduler.next_due(str(i)) for i in range(200))
+    spread = dues[-1] - dues[0]
+    await scheduler.close()
+    logger.info(f"  같은 시각에 등록한 200채널의 다음 폴링 시각 분산: {spread:.3f}s")
+    assert spread > 0.2
+    logger.info("✅ 지터 통과")
+
+
+async def test_remove_waits():
+    """폴링 중 제거, 폴링 중 bump, 오류 후 계속"""
+    logger.info("=== 제거/오류 테스트 ===")
+
+    scheduler = PollScheduler(workers=2, jitter=0.0)
+    scheduler.start()
+    events = []
+    release = asyncio.Event()
+
+    async def slow_poll():
+        events.append("start")
+        await release.wait()
+        events.append("end")
+
+    failures = 0
+
+    async def broken_poll():
+        nonlocal failures
+        failures += 1
+        raise RuntimeError("폴링 실패")
+
+    scheduler.add("slow", slow_poll, 0.05)
+    scheduler.add("broken", broken_poll, 0.05)
+    await asyncio.sleep(0.02)
+    assert events == ["start"] and scheduler.next_due("slow") is None
+
+    # 폴링 중 bump는 끝난 뒤 반영
+    scheduler.bump("slow", delay=0.0)
+    remover = asyncio.create_task(scheduler.remove("slow"))
+    await asyncio.sleep(0.02)
+    assert not remover.done(), "폴링이 끝나기 전에 제거 완료"
+    release.set()
+    await remover
+    assert events == ["start", "end"] and "slow" not in scheduler
+    await asyncio.sleep(0.1)
+    assert events == ["start", "end"], "제거된 채널이 다시 폴링됨"
+    assert failures >= 3, "오류 후 다시 폴링되지 않음"
+
+    await scheduler.close()
+    logger.info("✅ 제거/오류 통과")
+
+
+async def test_reconnect_check():
+    """방송 종료 직후에는 짧은 간격으로 확인"""
+    logger.info("=== 방송 종료 후 재확인 간격 테스트 ===")
+
+    config = Config()
+    config.recording.polling_interval = 180
+    recorder = ChzzkAutoRecorder("abc123", "aut", "ses", config)
+    statuses = iter([LiveStatus.OFFLINE, LiveStatus.OFFLINE])
+
+    async def check_live_status():
+        return StreamInfo("abc123", next(statuses))
+
+    recorder.monitor.check_live_status = check_live_status
+    recorder.state.status = LiveStatus.ONLINE
+    assert await recorder.poll_once() == config.recording.reconnect_check_interval
+
+    recorder._offline_since -= config.recording.reconnect_check_seconds
+    assert await recorder.poll_once() == 180
+    await recorder.monitor.close()
+    logger.info("✅ 재확인 간격 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_scale()
+    await test_intervals_and_bump()
+    await test_jitter()
+    await test_remove_waits()
+    await test_reconnect_check()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+종료 처리 테스트 스크립트
+
+가짜 FFmpeg(SIGTERM을 받으면 1.5초 동안 파일을 마무리) 녹화 10개와 SIGTERM을 무시하는
+녹화 1개를 띄운 뒤 SIGTERM을 보내, 모든 녹화가 동시에 마무리되어 제한 시간 안에
+끝나는지, 끝나지 않은 녹화는 강제 종료되고 보고서에 파일별 결과가 남는지 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.chzzk_recorder.auto_recorder import ChzzkAutoRecorder
+from src.chzzk_recorder.monitor import StreamInfo, LiveStatus
+from src.chzzk_recorder.shutdown import ShutdownCoordinator
+from src.config import Config
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS = 10
+# 가짜 FFmpeg이 SIGTERM 후 파일을 마무리하는 시간
+FINALIZE_SECONDS = 1.5
+DEADLINE = 4.0
+
+FAKE_FFMPEG = """#!{python}
+import signal, sys, time
+output = open(sys.argv[-1], "ab")
+
+def finalize(*_):
+    time.sleep({finalize})
+    output.write(b"moov")
+    output.close()
+    sys.exit(0)
+
+if "stubborn" in sys.argv[-1]:
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+else:
+    signal.signal(signal.SIGTERM, finalize)
+while True:
+    output.write(b"x" * 4096)
+    output.flush()
+    time.sleep(0.1)
+"""
+
+
+async def test_parallel_shutdown():
+    """SIGTERM → 모든 녹화 동시 마무리, 제한 시간 초과 녹화 강제 종료"""
+    logger.info(f"=== 녹화 {RECORDINGS + 1}개 종료 테스트 (제한 {DEADLINE:g}초) ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ffmpeg = Path(tmp) / "fake-ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG.format(python=sys.executable, finalize=FINALIZE_SECONDS),
+                          encoding="utf-8")
+        ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+
+        config = Config()
+        config.recording.recording_path = Path(tmp) / "recordings"
+        config.recording.record_chat = False
+        config.recording.write_manifest = False
+        config.recording.track_continuity = False
+        config.system.ffmpeg_path = str(ffmpeg)
+        config.prediction.history_path = Path(tmp) / "golive_history.jsonl"
+
+        names = [f"recording{n}" for n in range(RECORDINGS)] + ["stubborn"]
+        recorders = []
+        for name in names:
+            recorder = ChzzkAutoRecorder(f"{name:0>32}", "aut", "ses", config)
+            recorder._running = True
+            recorders.append(recorder)
+
+        async def start(recorder, name):
+            stream = StreamInfo(recorder.channel_id, LiveStatus.ONLINE, title=name,
+                                hls_url="http://127.0.0.1:9/index.m3u8")
+            recorder._current_recording = await recorder.recorder.start_recording(stream, f"{name}.mp4")
+
+        for name in ("httpx", "src"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+        await asyncio.gather(*(start(recorder, name) for recorder, name in zip(recorders, names)))
+        logging.getLogger("src").setLevel(logging.INFO)
+
+        async def stop_all():
+            await asyncio.gather(*(recorder.stop() for recorder in recorders))
+
+        report_path = Path(tmp) / "shutdown_report.json"
+        flushed = []
+        shutdown = ShutdownCoordinator(DEADLINE, report_path)
+        shutdown.manage(lambda: recorders, stop_all)
+        shutdown.add_flush(lambda: flushed.append(True))
+        shutdown.install()
+
+        started = time.monotonic()
+        os.kill(os.getpid(), signal.SIGTERM)
+        report = await asyncio.wait_for(shutdown.wait(), DEADLINE + 2)
+        elapsed = time.monotonic() - started
+
+        logger.info(f"  종료 {elapsed:.1f}초 (순차 처리 시 최소 {FINALIZE_SECONDS * RECORDINGS:.0f}초): "
+                    f"정상 {len(report.clean)}개, 강제 종료 {report.killed}, 실패 {report.failed}")
+        assert elapsed < DEADLINE + 0.5
+        assert sorted(report.clean) == sorted(f"{name}.mp4" for name in names[:-1])
+        assert report.killed == ["stubborn.mp4"] and report.failed == []
+        assert report.signal == "SIGTERM" and flushed == [True]
+        for recorder in recorders[:-1]:
+            path = config.recording.recording_path / f"{recorder.current_recording.stream_info.title}.mp4"
+            assert path.read_bytes().endswith(b"moov"), path
+        assert json.loads(report_path.read_text(encoding="utf-8"))["killed"] == ["stubborn.mp4"]
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+    logger.info("✅ 종료 처리 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    if os.name != "posix":
+        logger.info("POSIX 환경에서만 실행합니다")
+        return
+    await test_parallel_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+아카이브 이동 테스트 스크립트
+
+녹화 파일과 사이드카 파일이 아카이브로 옮겨지고 (체크섬 검증, 카탈로그 기록),
+중간에 멈춘 이동이 저널 위치부터 이어서 진행되는지 확인합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.chzzk_recorder.storage import TieringMover
+from src.chzzk_recorder.storage.tiering import JOURNAL_DIR_NAME, TEMP_SUFFIX
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+VIDEO_SIZE = 48 * 1024 * 1024
+
+
+def make_recording(directory: Path, name: str) -> tuple[Path, dict[str, str]]:
+    """가짜 녹화 파일 + 사이드카 생성"""
+    video = directory / f"{name}.mp4"
+    video.write_bytes(os.urandom(VIDEO_SIZE))
+    (directory / f"{name}.ffmeta").write_text(";FFMETADATA1\n", encoding="utf-8")
+    (directory / f"{name}.chat.jsonl.gz").write_bytes(os.urandom(1000))
+    # 이름이 비슷한 다른 녹화는 함께 옮기지 않음
+    (directory / f"{name}_1.mp4").write_bytes(b"other")
+    digests = {p.name: hashlib.blake2b(p.read_bytes()).hexdigest()
+               for p in directory.iterdir() if p.name.startswith(name + ".")}
+    return video, digests
+
+
+async def test_move_and_catalog():
+    """이동 + 검증 + 카탈로그"""
+    logger.info("=== 아카이브 이동 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch, archive = Path(tmp) / "scratch", Path(tmp) / "archive"
+        scratch.mkdir()
+        video, digests = make_recording(scratch, "20250101_LoL_솔랭")
+
+        mover = TieringMover(scratch, archive, bandwidth_bytes=0, rename_on_same_device=False)
+        begin = time.perf_counter()
+        jobs = mover.enqueue(video)
+        assert [Path(j.source).name for j in jobs][0] == video.name and len(jobs) == 3
+        await asyncio.wait_for(mover.join(), timeout=30)
+        elapsed = time.perf_counter() - begin
+
+        for name, digest in digests.items():
+            assert hashlib.blake2b((archive / name).read_bytes()).hexdigest() == digest
+            assert not (scratch / name).exists()
+        assert (scratch / "20250101_LoL_솔랭_1.mp4").exists()
+        assert not list((scratch / JOURNAL_DIR_NAME).iterdir())
+
+        catalog = [json.loads(line) for line in (archive / "catalog.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert {e["name"] for e in catalog} == set(digests)
+        assert all(e["blake2b"] == digests[e["name"]] for e in catalog)
+
+        await mover.close()
+        logger.info(f"✅ 파일 {len(digests)}개 이동/검증/카탈로그 ({VIDEO_SIZE / elapsed / 1024 / 1024:.0f}MB/s)")
+
+
+async def test_resume_and_throttle():
+    """대역폭 제한 + 중단 후 재개"""
+    logger.info("=== 아카이브 이동 재개 테스트 ===")
+
+    rate = 32 * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch, archive = Path(tmp) / "scratch", Path(tmp) / "archive"
+        scratch.mkdir()
+        video, digests = make_recording(scratch, "resume")
+
+        mover = TieringMover(scratch, archive, bandwidth_bytes=rate, rename_on_same_device=False)
+        mover.enqueue(video)
+        await asyncio.sleep(0.5)
+        await mover.close()
+
+        journals = [json.loads(p.read_text(encoding="utf-8")) for p in (scratch / JOURNAL_DIR_NAME).glob("*.json")]
+        journal = next(j for j in journals if j["source"] == str(video))
+        copied = journal["copied"]
+        temp = archive / (video.name + TEMP_SUFFIX)
+        assert 0 < copied < VIDEO_SIZE and temp.stat().st_size == copied
+        assert copied <= rate * 0.5 * 1.5, f"대역폭 제한 초과: {copied:,}B / 0.5초"
+        logger.info(f"중단 시점: {copied / VIDEO_SIZE:.0%} 복사됨 (제한 {rate // 1024 // 1024}MB/s)")
+
+        # 새 프로세스 가정: 저널에서 재개
+        mover = TieringMover(scratch, archive, bandwidth_bytes=0, rename_on_same_device=False)
+        mover.start()
+        await asyncio.wait_for(mover.join(), timeout=30)
+        await mover.close()
+
+        for name, digest in digests.items():
+            assert hashlib.blake2b((archive / name).read_bytes()).hexdigest() == digest
+        assert not temp.exists() and not video.exists()
+        logger.info("✅ 저널 위치부터 이어서 복사 후 검증 통과")
+
+
+async def main():
+    """메인 테스트 함수"""
+    await test_move_and_catalog()
+    await test_resume_and_throttle()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())